@@ -0,0 +1,25 @@
+"""
+Gunicorn configuration for CPA WorkflowPilot
+
+Dashboard streams (/dashboard/stream) hold connections open, so the app is
+served by gevent workers: each idle connection is a greenlet instead of an
+OS thread. Usage:
+
+    gunicorn -c gunicorn.conf.py
+"""
+
+import os
+
+wsgi_app = 'src.app:create_app()'
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5004')
+
+worker_class = 'gevent'
+workers = int(os.environ.get('GUNICORN_WORKERS', 2))
+
+# Max simultaneous connections (including open dashboard streams) per worker
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 2000))
+
+# Streams send a heartbeat every 15s; keep the worker timeout well above it
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 60))
+graceful_timeout = 30
+keepalive = 75
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Export Streaming Benchmark
+
+Compares the old buffered export (load every row, build the whole file in
+memory) with the streaming export helpers on a synthetic task table. Each
+mode runs in its own process so peak RSS is measured independently.
+
+    python scripts/benchmark_export_streaming.py --rows 200000 --format csv
+    python scripts/benchmark_export_streaming.py --database-url postgresql://... --rows 200000
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from sqlalchemy import Column, Date, DateTime, Float, Integer, MetaData, String, Table, Text, create_engine, select
+from sqlalchemy.orm import Session
+
+from src.shared.utils.streaming_export import iter_csv, iter_json, format_export_value
+
+metadata = MetaData()
+tasks = Table(
+    'benchmark_export_task', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('title', String(200)),
+    Column('description', Text),
+    Column('status', String(20)),
+    Column('priority', String(10)),
+    Column('due_date', Date),
+    Column('created_at', DateTime),
+    Column('estimated_hours', Float),
+)
+KEYS = [column.name for column in tasks.columns]
+LABELS = [key.replace('_', ' ').title() for key in KEYS]
+
+
+def populate(database_url: str, rows: int):
+    engine = create_engine(database_url)
+    metadata.drop_all(engine)
+    metadata.create_all(engine)
+
+    base = datetime(2024, 1, 1)
+    with engine.begin() as connection:
+        batch = []
+        for i in range(rows):
+            batch.append({
+                'title': f'Task {i}',
+                'description': 'Reconcile ledger entries and prepare workpapers ' * 3,
+                'status': ('Not Started', 'In Progress', 'Completed')[i % 3],
+                'priority': ('Low', 'Medium', 'High')[i % 3],
+                'due_date': (base + timedelta(days=i % 365)).date(),
+                'created_at': base + timedelta(minutes=i),
+                'estimated_hours': (i % 40) / 4,
+            })
+            if len(batch) == 10000:
+                connection.execute(tasks.insert(), batch)
+                batch = []
+        if batch:
+            connection.execute(tasks.insert(), batch)
+    engine.dispose()
+
+
+def buffered_chunks(session: Session, format: str):
+    """The previous implementation: every row as a dict, then one big string"""
+    rows = [dict(row._mapping) for row in session.execute(select(tasks).order_by(tasks.c.id)).all()]
+    dtos = [{key: format_export_value(value) for key, value in row.items()} for row in rows]
+
+    if format == 'csv':
+        output = io.StringIO()
+        writer = csv.writer(output)
+        writer.writerow(LABELS)
+        for dto in dtos:
+            writer.writerow([dto[key] for key in KEYS])
+        yield output.getvalue()
+    else:
+        yield json.dumps({'export_date': datetime.now().isoformat(), 'firm_id': 1, 'tasks': dtos}, default=str)
+
+
+def streaming_chunks(session: Session, format: str, batch_size: int):
+    query = select(*tasks.columns).order_by(tasks.c.id).execution_options(stream_results=True, yield_per=batch_size)
+    rows = (tuple(row) for row in session.execute(query))
+
+    if format == 'csv':
+        return iter_csv(LABELS, rows)
+    return iter_json({'export_date': datetime.now().isoformat(), 'firm_id': 1}, 'tasks', KEYS, rows)
+
+
+def run_mode(args):
+    engine = create_engine(args.database_url)
+    with Session(engine) as session:
+        start = time.perf_counter()
+        if args.mode == 'buffered':
+            chunks = buffered_chunks(session, args.format)
+        else:
+            chunks = streaming_chunks(session, args.format, args.batch_size)
+
+        first_byte = None
+        total_bytes = 0
+        for chunk in chunks:
+            if first_byte is None:
+                first_byte = time.perf_counter() - start
+            total_bytes += len(chunk.encode('utf-8'))
+        elapsed = time.perf_counter() - start
+
+    # ru_maxrss is KB on Linux, bytes on macOS
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_rss_mb = peak_rss / (1024 * 1024) if sys.platform == 'darwin' else peak_rss / 1024
+
+    print(json.dumps({
+        'mode': args.mode,
+        'ttfb_ms': round((first_byte or elapsed) * 1000, 1),
+        'total_ms': round(elapsed * 1000, 1),
+        'bytes': total_bytes,
+        'peak_rss_mb': round(peak_rss_mb, 1)
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark buffered vs streaming exports')
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--format', choices=['csv', 'json'], default='csv')
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--database-url', default=None, help='Defaults to a temporary SQLite file')
+    parser.add_argument('--mode', choices=['buffered', 'streaming'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args)
+        return
+
+    temp_dir = None
+    if not args.database_url:
+        temp_dir = tempfile.TemporaryDirectory()
+        args.database_url = f"sqlite:///{os.path.join(temp_dir.name, 'export_benchmark.db')}"
+
+    print(f"Populating {args.rows} rows...")
+    populate(args.database_url, args.rows)
+
+    results = []
+    for mode in ('buffered', 'streaming'):
+        output = subprocess.run(
+            [sys.executable, __file__, '--mode', mode, '--format', args.format,
+             '--batch-size', str(args.batch_size), '--database-url', args.database_url],
+            check=True, capture_output=True, text=True
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+
+    print("=" * 60)
+    print(f"{'mode':<12}{'ttfb ms':>12}{'total ms':>12}{'MB out':>10}{'peak RSS MB':>14}")
+    for result in results:
+        print(f"{result['mode']:<12}{result['ttfb_ms']:>12}{result['total_ms']:>12}"
+              f"{result['bytes'] / (1024 * 1024):>10.1f}{result['peak_rss_mb']:>14}")
+
+    if temp_dir:
+        temp_dir.cleanup()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Search Index Benchmark
+
+Compares the old ``ILIKE '%term%'`` task search with the full-text search
+index at several table sizes, using the same index DDL and queries as the
+application. Rows are spread over many firms so the firm partitioning is
+exercised.
+
+    python scripts/benchmark_search_index.py --sizes 100000,500000,1000000
+    python scripts/benchmark_search_index.py --database-url postgresql://... --sizes 100000
+"""
+
+import argparse
+import itertools
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from sqlalchemy import create_engine, text
+
+from src.shared.database.search_index import BACKENDS, query_terms
+
+VOCABULARY_SIZE = 20000
+SYLLABLES = ['ka', 'lo', 'mi', 'ren', 'tor', 'vel', 'san', 'dri', 'po', 'qua', 'ber', 'nix', 'ta', 'ul', 'ex']
+
+
+def make_vocabulary(rng):
+    """Pseudo-words with a Zipf-like frequency, like names and terms in real task titles"""
+    words = set()
+    while len(words) < VOCABULARY_SIZE:
+        words.add(''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    words = sorted(words)
+    rng.shuffle(words)
+    cum_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(words))))
+    return words, cum_weights
+
+
+def make_queries(words):
+    """Common, mid-frequency and rare words, a typed prefix, two words, and a miss"""
+    return [words[5], words[200], words[5000][:4], f"{words[50]} {words[300]}", words[15000], 'zzzqx']
+
+
+SCHEMA = [
+    "CREATE TABLE project (id INTEGER PRIMARY KEY, name VARCHAR(200), firm_id INTEGER)",
+    "CREATE TABLE client (id INTEGER PRIMARY KEY, name VARCHAR(120), email VARCHAR(120), "
+    "contact_person VARCHAR(100), firm_id INTEGER, is_active BOOLEAN)",
+    "CREATE TABLE task (id INTEGER PRIMARY KEY, title VARCHAR(200), description TEXT, "
+    "project_id INTEGER, firm_id INTEGER)",
+]
+
+
+def populate(engine, rows: int, firms: int):
+    rng = random.Random(42)
+    words, cum_weights = make_vocabulary(rng)
+    with engine.begin() as connection:
+        for table in ('task', 'project', 'client'):
+            connection.exec_driver_sql(f"DROP TABLE IF EXISTS {table}")
+        for statement in SCHEMA:
+            connection.exec_driver_sql(statement)
+
+        batch = []
+        for task_id in range(1, rows + 1):
+            batch.append({
+                'id': task_id,
+                'title': ' '.join(rng.choices(words, cum_weights=cum_weights, k=4)).capitalize(),
+                'description': ' '.join(rng.choices(words, cum_weights=cum_weights, k=12)),
+                'firm_id': rng.randint(1, firms),
+            })
+            if len(batch) == 20000:
+                connection.execute(text(
+                    "INSERT INTO task (id, title, description, project_id, firm_id) "
+                    "VALUES (:id, :title, :description, NULL, :firm_id)"), batch)
+                batch = []
+        if batch:
+            connection.execute(text(
+                "INSERT INTO task (id, title, description, project_id, firm_id) "
+                "VALUES (:id, :title, :description, NULL, :firm_id)"), batch)
+
+
+def time_queries(run, queries, repeats: int):
+    latencies = []
+    for _ in range(repeats):
+        for query in queries:
+            start = time.perf_counter()
+            run(query)
+            latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    return statistics.median(latencies), latencies[int(len(latencies) * 0.95) - 1]
+
+
+def benchmark(database_url: str, rows: int, firms: int, repeats: int):
+    engine = create_engine(database_url)
+    backend = BACKENDS[engine.dialect.name]()
+    populate(engine, rows, firms)
+    queries = make_queries(make_vocabulary(random.Random(42))[0])
+
+    with engine.connect() as connection:
+        def like_search(query):
+            pattern = f'%{query}%'
+            connection.execute(text(
+                "SELECT id FROM task WHERE firm_id = :firm_id AND "
+                "(title LIKE :pattern OR description LIKE :pattern) ORDER BY id DESC LIMIT 20"
+            ), {'firm_id': 7, 'pattern': pattern}).fetchall()
+
+        like = time_queries(like_search, queries, repeats)
+
+    start = time.perf_counter()
+    with engine.begin() as connection:
+        for statement in backend.install_statements() + backend.backfill_statements():
+            connection.exec_driver_sql(statement)
+    build_seconds = time.perf_counter() - start
+
+    with engine.connect() as connection:
+        def index_search(query):
+            backend.search(connection, 7, 'task', query_terms(query), 20)
+
+        indexed = time_queries(index_search, queries, repeats)
+
+    engine.dispose()
+    return like, indexed, build_seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark LIKE vs full-text task search')
+    parser.add_argument('--sizes', default='100000,500000,1000000')
+    parser.add_argument('--firms', type=int, default=50)
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--database-url', default=None, help='Defaults to a temporary SQLite file')
+    args = parser.parse_args()
+
+    temp_dir = None
+    database_url = args.database_url
+    if not database_url:
+        temp_dir = tempfile.TemporaryDirectory()
+        database_url = f"sqlite:///{os.path.join(temp_dir.name, 'search_benchmark.db')}"
+
+    print(f"{'rows':>10}{'LIKE p50':>12}{'LIKE p95':>12}{'index p50':>12}{'index p95':>12}{'build s':>10}")
+    for size in (int(s) for s in args.sizes.split(',')):
+        (like_p50, like_p95), (index_p50, index_p95), build = benchmark(database_url, size, args.firms, args.repeats)
+        print(f"{size:>10}{like_p50:>11.2f}ms{like_p95:>10.2f}ms{index_p50:>10.2f}ms{index_p95:>10.2f}ms{build:>10.1f}")
+
+    if temp_dir:
+        temp_dir.cleanup()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Workflow Status Cache Benchmark
+
+Counts TaskStatus queries for a typical page's worth of status reads
+(task names, colors and completion, project workflow names, Kanban
+columns, a Kanban move's status checks), first through the TaskStatus
+relationships and per-call queries the code used before, then through
+the status cache cold and warm.
+
+    python scripts/benchmark_status_cache.py --tasks 200 --projects 50
+    python scripts/benchmark_status_cache.py --database-url postgresql://... --tasks 200
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from flask import Flask
+from sqlalchemy import event
+
+from src.shared.database.db_import import db
+from src.models.auth import Firm
+from src.modules.client.models import Client
+from src.modules.project.models import Project, Task, TaskStatus, WorkType
+from src.modules.project.repository import ProjectRepository
+from src.modules.project.status_cache import workflow_statuses
+
+STATUS_TABLE = re.compile(r'\b(FROM|JOIN) task_status\b')
+
+
+def populate(work_types: int, statuses: int, projects: int, tasks: int):
+    rng = random.Random(42)
+    db.session.add(Firm(id=1, name='Benchmark Firm', access_code='BENCH'))
+    db.session.add(Client(id=1, name='Benchmark Client', firm_id=1))
+    status_ids = {}
+    for work_type_id in range(1, work_types + 1):
+        db.session.add(WorkType(id=work_type_id, name=f'Work type {work_type_id}', firm_id=1, position=work_type_id))
+        for position in range(1, statuses + 1):
+            status_id = (work_type_id - 1) * statuses + position
+            status_ids.setdefault(work_type_id, []).append(status_id)
+            db.session.add(TaskStatus(id=status_id, name=f'Step {position}', firm_id=1, work_type_id=work_type_id,
+                                      position=position, is_default=position == 1, is_terminal=position == statuses))
+    db.session.flush()
+
+    project_rows, task_rows = [], []
+    for project_id in range(1, projects + 1):
+        work_type_id = rng.randint(1, work_types)
+        project_rows.append({'id': project_id, 'name': f'Project {project_id}', 'client_id': 1, 'firm_id': 1,
+                             'work_type_id': work_type_id, 'current_status_id': rng.choice(status_ids[work_type_id])})
+    for task_id in range(1, tasks + 1):
+        project = rng.choice(project_rows)
+        task_rows.append({'id': task_id, 'title': f'Task {task_id}', 'firm_id': 1, 'project_id': project['id'],
+                          'status': 'Not Started', 'priority': 'Medium',
+                          'status_id': rng.choice(status_ids[project['work_type_id']])})
+    db.session.execute(Project.__table__.insert(), project_rows)
+    db.session.execute(Task.__table__.insert(), task_rows)
+    db.session.commit()
+    return status_ids
+
+
+def legacy_page(status_ids):
+    """Status reads as the code did them before the cache"""
+    for task in Task.query.all():
+        status = task.task_status_ref
+        (status.name, status.color, status.is_terminal)
+    for project in Project.query.all():
+        project.current_status.name
+        TaskStatus.query.filter_by(work_type_id=project.work_type_id).order_by(TaskStatus.position.asc()).all()
+    db.session.query(TaskStatus.id, TaskStatus.name, TaskStatus.color, TaskStatus.position,
+                     WorkType.name).join(WorkType).filter(WorkType.firm_id == 1).all()
+    work_type_id, ids = next(iter(status_ids.items()))
+    TaskStatus.query.filter_by(id=ids[1], work_type_id=work_type_id).first()
+    db.session.get(TaskStatus, ids[0])
+
+
+def cached_page(status_ids):
+    """The same reads through the model properties and the status cache"""
+    for task in Task.query.all():
+        (task.current_status, task.status_color, task.is_completed)
+    for project in Project.query.all():
+        project.current_workflow_status_name
+        project.workflow_statuses
+    ProjectRepository().get_kanban_columns(1)
+    work_type_id, ids = next(iter(status_ids.items()))
+    workflow_statuses.get(ids[1])
+    workflow_statuses.get(ids[0])
+
+
+def measure(page, status_ids, counter, before=None):
+    db.session.expire_all()
+    if before:
+        before()
+    counter[:] = [0, 0]
+    start = time.perf_counter()
+    page(status_ids)
+    return (time.perf_counter() - start) * 1000, counter[0], counter[1]
+
+
+def benchmark(database_url: str, work_types: int, statuses: int, projects: int, tasks: int):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = database_url
+    db.init_app(app)
+
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        status_ids = populate(work_types, statuses, projects, tasks)
+
+        counter = [0, 0]
+
+        def count(conn, cursor, statement, *args):
+            counter[0] += 1
+            counter[1] += bool(STATUS_TABLE.search(statement))
+
+        event.listen(db.engine, 'before_cursor_execute', count)
+
+        print(f"{tasks} tasks, {projects} projects, {work_types} work types x {statuses} statuses")
+        print(f"{'page':<24}{'ms':>10}{'queries':>10}{'status queries':>16}")
+        for name, page, before in [
+            ('relationships', legacy_page, None),
+            ('status cache (cold)', cached_page, workflow_statuses.invalidate),
+            ('status cache (warm)', cached_page, None),
+        ]:
+            elapsed, queries, status_queries = measure(page, status_ids, counter, before)
+            print(f"{name:<24}{elapsed:>10.2f}{queries:>10}{status_queries:>16}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database-url', help='Defaults to a temporary SQLite file')
+    parser.add_argument('--work-types', type=int, default=8)
+    parser.add_argument('--statuses', type=int, default=6)
+    parser.add_argument('--projects', type=int, default=50)
+    parser.add_argument('--tasks', type=int, default=200)
+    args = parser.parse_args()
+
+    if args.database_url:
+        benchmark(args.database_url, args.work_types, args.statuses, args.projects, args.tasks)
+        return
+    with tempfile.TemporaryDirectory() as directory:
+        database_url = f"sqlite:///{os.path.join(directory, 'status_cache_benchmark.db')}"
+        benchmark(database_url, args.work_types, args.statuses, args.projects, args.tasks)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Task Closure Benchmark
+
+Compares the old parent_task walks (root task, hierarchy level, recursive
+subtasks: one lazy load per step) with the closure-table queries behind
+Task.root_task, Task.task_hierarchy_level and
+Task.get_all_subtasks_recursive, on a synthetic subtask tree.
+
+    python scripts/benchmark_task_closure.py --nodes 10000
+    python scripts/benchmark_task_closure.py --database-url postgresql://... --nodes 10000
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from flask import Flask
+from sqlalchemy import event, text
+
+from src.shared.database.db_import import db
+from src.models.auth import Firm
+from src.modules.project.models import Task
+from src.modules.project.task_closure import rebuild
+
+
+def legacy_root(task):
+    current = task
+    while current.parent_task:
+        current = current.parent_task
+    return current
+
+
+def legacy_level(task):
+    level = 0
+    current = task
+    while current.parent_task:
+        level += 1
+        current = current.parent_task
+    return level
+
+
+def legacy_subtree(task):
+    all_subtasks = []
+    for subtask in task.subtasks:
+        all_subtasks.append(subtask)
+        all_subtasks.extend(legacy_subtree(subtask))
+    return all_subtasks
+
+
+def populate(nodes: int, roots: int, max_depth: int):
+    """A forest of ``roots`` trees; each node hangs off a random earlier node above ``max_depth``"""
+    rng = random.Random(42)
+    db.session.add(Firm(id=1, name='Benchmark Firm', access_code='BENCH'))
+    db.session.flush()
+
+    depth = {}
+    rows = []
+    for task_id in range(1, nodes + 1):
+        parent_id = None
+        if task_id > roots:
+            parent_id = rng.randint(1, task_id - 1)
+            while depth[parent_id] >= max_depth:
+                parent_id = rng.randint(1, task_id - 1)
+        depth[task_id] = depth[parent_id] + 1 if parent_id else 0
+        rows.append({'id': task_id, 'title': f'Task {task_id}', 'firm_id': 1, 'status': 'Not Started',
+                     'priority': 'Medium', 'parent_task_id': parent_id, 'subtask_order': task_id})
+    db.session.execute(Task.__table__.insert(), rows)
+    db.session.commit()
+    return depth
+
+
+def measure(operation, task_ids, counter):
+    latencies, queries = [], []
+    for task_id in task_ids:
+        db.session.expire_all()
+        task = db.session.get(Task, task_id)
+        counter[0] = 0
+        start = time.perf_counter()
+        operation(task)
+        latencies.append((time.perf_counter() - start) * 1000)
+        queries.append(counter[0])
+    return statistics.median(latencies), max(latencies), statistics.mean(queries)
+
+
+def benchmark(database_url: str, nodes: int, roots: int, max_depth: int, samples: int):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = database_url
+    db.init_app(app)
+
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        depth = populate(nodes, roots, max_depth)
+
+        start = time.perf_counter()
+        closure_rows = rebuild()
+        build_seconds = time.perf_counter() - start
+
+        counter = [0]
+        event.listen(db.engine, 'before_cursor_execute', lambda *args: counter.__setitem__(0, counter[0] + 1))
+
+        rng = random.Random(7)
+        deep = sorted(depth, key=lambda task_id: -depth[task_id])[:samples * 10]
+        leaves = rng.sample(deep, samples)
+        tops = rng.sample(range(1, roots + 1), min(samples, roots))
+
+        print(f"{nodes} tasks, {roots} roots, max depth {max(depth.values())}, "
+              f"{closure_rows} closure rows built in {build_seconds:.2f}s")
+        print(f"{'lookup':<28}{'median ms':>12}{'max ms':>10}{'queries':>10}")
+        for name, operation, task_ids in [
+            ('root (parent walk)', legacy_root, leaves),
+            ('root (closure)', lambda task: task.root_task, leaves),
+            ('level (parent walk)', legacy_level, leaves),
+            ('level (closure)', lambda task: task.task_hierarchy_level, leaves),
+            ('subtree (recursive)', legacy_subtree, tops),
+            ('subtree (closure)', lambda task: task.get_all_subtasks_recursive(), tops),
+        ]:
+            median, worst, queries = measure(operation, task_ids, counter)
+            print(f"{name:<28}{median:>12.2f}{worst:>10.2f}{queries:>10.0f}")
+
+        db.session.execute(text("DELETE FROM task_closure"))
+        db.session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database-url', help='Defaults to a temporary SQLite file')
+    parser.add_argument('--nodes', type=int, default=10000)
+    parser.add_argument('--roots', type=int, default=50)
+    parser.add_argument('--max-depth', type=int, default=12)
+    parser.add_argument('--samples', type=int, default=50)
+    args = parser.parse_args()
+
+    if args.database_url:
+        benchmark(args.database_url, args.nodes, args.roots, args.max_depth, args.samples)
+        return
+    with tempfile.TemporaryDirectory() as directory:
+        database_url = f"sqlite:///{os.path.join(directory, 'closure_benchmark.db')}"
+        benchmark(database_url, args.nodes, args.roots, args.max_depth, args.samples)
+
+
+if __name__ == '__main__':
+    main()
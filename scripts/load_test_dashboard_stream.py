@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Dashboard Stream Load Test
+
+Opens many concurrent /dashboard/stream connections against a running server
+(gunicorn -c gunicorn.conf.py), publishes updates to the firm's dashboard
+channel and reports how many listeners received each one and how fast.
+
+    python scripts/load_test_dashboard_stream.py --listeners 1000 \\
+        --cookie "session=<logged-in session cookie>" --firm-id 1
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+import httpx
+import redis
+
+
+class StreamLoadTest:
+    """Drives N SSE listeners and measures update fan-out"""
+
+    def __init__(self, args):
+        self.args = args
+        self.connected = 0
+        self.failed = 0
+        self.heartbeats = 0
+        self.received = {}  # update id -> list of latencies (seconds)
+        self.sent_at = {}
+        self.ready = asyncio.Event()
+
+    async def listener(self, client: httpx.AsyncClient):
+        url = f"{self.args.url.rstrip('/')}/dashboard/stream"
+        try:
+            async with client.stream('GET', url, headers={'Cookie': self.args.cookie}) as response:
+                if response.status_code != 200:
+                    self.failed += 1
+                    return
+
+                self.connected += 1
+                if self.connected >= self.args.listeners:
+                    self.ready.set()
+
+                async for line in response.aiter_lines():
+                    if line.startswith(': heartbeat'):
+                        self.heartbeats += 1
+                    elif line.startswith('data: '):
+                        update = json.loads(line[6:])
+                        token = update.get('load_test_token')
+                        if token in self.sent_at:
+                            self.received.setdefault(token, []).append(time.monotonic() - self.sent_at[token])
+        except (httpx.HTTPError, asyncio.CancelledError):
+            pass
+        except Exception:
+            self.failed += 1
+
+    async def publisher(self):
+        client = redis.Redis.from_url(self.args.redis_url, decode_responses=True)
+        channel = f"dashboard:notifications:{self.args.firm_id}"
+
+        try:
+            await asyncio.wait_for(self.ready.wait(), timeout=self.args.connect_timeout)
+        except asyncio.TimeoutError:
+            print(f"Only {self.connected}/{self.args.listeners} listeners connected in time")
+
+        for index in range(self.args.updates):
+            token = f"load-test-{index}"
+            self.sent_at[token] = time.monotonic()
+            client.publish(channel, json.dumps({
+                'update_type': 'load_test',
+                'load_test_token': token,
+                'firm_id': self.args.firm_id
+            }))
+            await asyncio.sleep(self.args.interval)
+
+        # Give the last update time to arrive
+        await asyncio.sleep(max(self.args.interval, 2))
+
+    async def run(self):
+        limits = httpx.Limits(max_connections=self.args.listeners + 10)
+        timeout = httpx.Timeout(None, connect=self.args.connect_timeout)
+
+        async with httpx.AsyncClient(limits=limits, timeout=timeout) as client:
+            listeners = [asyncio.create_task(self.listener(client)) for _ in range(self.args.listeners)]
+            await self.publisher()
+            for task in listeners:
+                task.cancel()
+            await asyncio.gather(*listeners, return_exceptions=True)
+
+        return self.report()
+
+    def report(self) -> bool:
+        print("=" * 60)
+        print(f"Listeners connected: {self.connected}/{self.args.listeners} (failed: {self.failed})")
+        print(f"Heartbeats received: {self.heartbeats}")
+
+        ok = self.connected >= self.args.listeners
+        for token in sorted(self.sent_at, key=lambda t: int(t.rsplit('-', 1)[1])):
+            latencies = self.received.get(token, [])
+            delivered = len(latencies)
+            if delivered < self.connected:
+                ok = False
+            if latencies:
+                p95 = sorted(latencies)[int(len(latencies) * 0.95) - 1] if len(latencies) > 1 else latencies[0]
+                print(f"{token}: delivered to {delivered} listeners, "
+                      f"median {statistics.median(latencies) * 1000:.1f}ms, p95 {p95 * 1000:.1f}ms")
+            else:
+                print(f"{token}: not delivered")
+
+        print("PASS" if ok else "FAIL")
+        return ok
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Load test the dashboard SSE stream')
+    parser.add_argument('--url', default=os.environ.get('LOAD_TEST_URL', 'http://localhost:5004'))
+    parser.add_argument('--cookie', default=os.environ.get('LOAD_TEST_COOKIE', ''),
+                        help='Cookie header of a logged-in session')
+    parser.add_argument('--firm-id', type=int, default=1, help='Firm ID of the logged-in session')
+    parser.add_argument('--redis-url', default=os.environ.get('REDIS_URL', 'redis://localhost:6379/0'))
+    parser.add_argument('--listeners', type=int, default=1000)
+    parser.add_argument('--updates', type=int, default=5)
+    parser.add_argument('--interval', type=float, default=1.0, help='Seconds between published updates')
+    parser.add_argument('--connect-timeout', type=float, default=60.0)
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    success = asyncio.run(StreamLoadTest(parse_args()).run())
+    sys.exit(0 if success else 1)
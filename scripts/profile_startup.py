@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Startup Import Profiler
+
+Runs the app factory (or any statement) in a fresh interpreter under
+``python -X importtime`` and prints the slowest imports, optionally writing
+the report to a file for CI and failing when imports exceed a budget.
+
+    python scripts/profile_startup.py
+    python scripts/profile_startup.py --statement "import src.workers" --top 40
+    python scripts/profile_startup.py --output startup_importtime.txt --budget-ms 1500
+"""
+
+import argparse
+import os
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from src.shared.utils.import_profile import profile_imports, summarize
+
+DEFAULT_STATEMENT = 'from src.app import create_app; create_app()'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Profile cold-start imports')
+    parser.add_argument('--statement', default=DEFAULT_STATEMENT,
+                        help=f'Python statement to profile (default: {DEFAULT_STATEMENT!r})')
+    parser.add_argument('--top', type=int, default=25, help='Slowest imports to list')
+    parser.add_argument('--output', help='Also write the report to this file')
+    parser.add_argument('--budget-ms', type=float,
+                        help='Exit non-zero if total import time exceeds this many milliseconds')
+    args = parser.parse_args()
+
+    # The app imports both package-style (src.modules...) and legacy top-level names
+    pythonpath = os.pathsep.join(filter(None, [ROOT, os.path.join(ROOT, 'src'), os.environ.get('PYTHONPATH')]))
+    profile = profile_imports(args.statement, cwd=ROOT, env={'PYTHONPATH': pythonpath})
+    report = summarize(profile, top=args.top)
+    print(report, end='')
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(report)
+        print(f"Report written to {args.output}")
+
+    if profile['returncode'] != 0:
+        sys.exit(profile['returncode'])
+    if args.budget_ms is not None and profile['import_ms'] > args.budget_ms:
+        print(f"Import time {profile['import_ms']:.1f} ms exceeds budget of {args.budget_ms:.0f} ms")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
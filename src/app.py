@@ -1,21 +1,13 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, session, jsonify, send_file
-from datetime import datetime, date, timedelta
-import calendar
-import time
-from pathlib import Path
-from dateutil.relativedelta import relativedelta
-from werkzeug.utils import secure_filename
-import mimetypes
-import uuid
+from flask import Flask, request, redirect, url_for, flash, session, send_file
 
 # Import configuration and core utilities
-from config import get_config
-from core.db_import import db
+from src.config import get_config
+from src.shared.database.db_import import db
 from flask_migrate import Migrate
 import os
 
 # Import models
-from models import (
+from src.models import (
     Firm, User, Template, TemplateTask, Project, Task, ActivityLog, 
     Client, TaskComment, WorkType, TaskStatus, Contact, ClientContact, 
     Attachment, ClientUser, DocumentChecklist, ChecklistItem, 
@@ -25,9 +17,21 @@ from models import (
 
 migrate = Migrate()
 
+# Module packages whose register_module hook adds their blueprints; route
+# modules are imported by name at registration (see src/shared/bootstrap.py)
+MODULES = (
+    'src.modules.auth',
+    'src.modules.admin',
+    'src.modules.dashboard',
+    'src.modules.project',
+    'src.modules.client',
+    'src.modules.document',
+    'src.modules.export',
+)
+
 def create_app(config_name='default'):
     # Create Flask application
-    app = Flask(__name__)
+    app = Flask(__name__, template_folder='../templates', static_folder='../static')
 
     # Load configuration
     config_class = get_config(config_name)
@@ -37,18 +41,36 @@ def create_app(config_name='default'):
     os.makedirs('instance', exist_ok=True)
     os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
+    # Behind PROXY_FIX_X_FOR trusted proxies, request.remote_addr is the client's
+    # forwarded address rather than the nearest proxy's
+    if app.config.get('PROXY_FIX_X_FOR'):
+        from werkzeug.middleware.proxy_fix import ProxyFix
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config['PROXY_FIX_X_FOR'])
+
     # Initialize extensions
     db.init_app(app)
     migrate.init_app(app, db)
 
+    # Query count, DB time and N+1 warnings per request (SQL_PROFILER_ENABLED)
+    from src.shared.database.query_profiler import init_query_profiler
+    init_query_profiler(app)
+
+    # Write activity logged after a request's last commit when the request ends
+    from src.shared.services.activity_buffer import init_activity_buffer
+    init_activity_buffer(app)
+
     # Register Jinja2 template filters
-    from utils.template_filters import register_template_filters
+    from src.shared.utils.template_filters import register_template_filters
     register_template_filters(app)
     
     # Register blueprints
-    from blueprints import ALL_BLUEPRINTS
-    for blueprint in ALL_BLUEPRINTS:
-        app.register_blueprint(blueprint)
+    from src.shared.bootstrap import register_modules
+    register_modules(app, MODULES)
+
+    # Services resolve with their registered lifetimes; per-request instances
+    # are disposed when the app context tears down
+    from src.shared.di_container import init_service_container
+    init_service_container(app)
     
     # SEO routes
     @app.route('/robots.txt')
@@ -111,29 +133,18 @@ def create_app(config_name='default'):
         else:
             return redirect(url_for('auth.login'))
 
-    from utils.consolidated import generate_access_code
-    from services.activity_logging_service import ActivityLoggingService as ActivityService
-    from services.task_service import TaskService
-    from services.client_service import ClientService
-
     # Business logic functions moved to appropriate services:
     # - perform_checklist_ai_analysis -> DocumentService.perform_checklist_ai_analysis
     # - would_create_circular_dependency -> TaskService.would_create_circular_dependency
     # - check_and_update_project_completion -> ProjectService.check_and_update_project_completion
 
     # AI Document Analysis Integration
-    # AI services are now auto-detected based on available API keys in config
-    from services.ai_service import AIService
-
-    with app.app_context():
-        print("AI Services status determined by configuration:")
-        print("   Azure Document Intelligence:", "Available" if app.config.get('AZURE_DOCUMENT_INTELLIGENCE_ENDPOINT') and app.config.get('AZURE_DOCUMENT_INTELLIGENCE_KEY') else "Not configured")
-        print("   Gemini API:", "Available" if app.config.get('GEMINI_API_KEY') else "Not configured")
-        print("   Overall AI Services:", "Available" if config_class().AI_SERVICES_AVAILABLE else "Not configured")
-        
-        # Test AI service initialization
-        ai_service = AIService(app.config)
-        print(f"   AI Service Status: {'Ready' if ai_service.is_available() else 'Not available'}")
+    # AI services are auto-detected from API keys in config; provider SDKs are
+    # imported when AIAnalysisService first creates a provider, not at startup
+    print("AI Services status determined by configuration:")
+    print("   Azure Document Intelligence:", "Available" if app.config.get('AZURE_DOCUMENT_INTELLIGENCE_ENDPOINT') and app.config.get('AZURE_DOCUMENT_INTELLIGENCE_KEY') else "Not configured")
+    print("   Gemini API:", "Available" if app.config.get('GEMINI_API_KEY') else "Not configured")
+    print("   Overall AI Services:", "Available" if config_class().AI_SERVICES_AVAILABLE else "Not configured")
 
     # Recurring tasks are now integrated into the Task model
     
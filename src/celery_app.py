@@ -19,13 +19,20 @@ def create_celery_app(app=None):
         broker_url=os.environ.get('CELERY_BROKER_URL', 'redis://localhost:6379/1'),
         result_backend=os.environ.get('CELERY_RESULT_BACKEND', 'redis://localhost:6379/1'),
         
-        # Task routing
-        task_routes={
-            'workers.ai_worker.*': {'queue': 'ai_analysis'},
-            'workers.document_worker.*': {'queue': 'document_processing'},
-            'workers.notification_worker.*': {'queue': 'notifications'},
-            'workers.system_worker.*': {'queue': 'system'},
-        },
+        # Task routing - AI tasks go to per-firm shards of the interactive or
+        # batch lane (see workers/fair_routing.py), everything else by module
+        task_routes=(
+            'src.workers.fair_routing.route_ai_task',
+            {
+                'workers.document_worker.*': {'queue': 'document_processing'},
+                'workers.notification_worker.*': {'queue': 'notifications'},
+                'workers.system_worker.*': {'queue': 'system'},
+                'workers.export_worker.*': {'queue': 'exports'},
+            },
+        ),
+        
+        # Poll lane shard queues round-robin so firms take turns
+        broker_transport_options={'queue_order_strategy': 'round_robin'},
         
         # Task execution settings
         task_serializer='json',
@@ -66,6 +73,22 @@ def create_celery_app(app=None):
                 'task': 'workers.system_worker.system_health_check',
                 'schedule': timedelta(minutes=15),  # Run every 15 minutes
             },
+            'cleanup-export-files': {
+                'task': 'workers.export_worker.cleanup_export_files',
+                'schedule': timedelta(hours=1),  # Run every hour
+            },
+            'flush-activity-log': {
+                'task': 'workers.system_worker.flush_activity_log',
+                'schedule': timedelta(seconds=10),  # Drains rows queued by the background writer
+            },
+            'maintain-activity-log': {
+                'task': 'workers.system_worker.maintain_activity_log',
+                'schedule': timedelta(days=1),   # Partitions, rotation and retention
+            },
+            'repair-project-progress': {
+                'task': 'workers.system_worker.repair_project_progress',
+                'schedule': timedelta(days=1),   # Reports and fixes task counter drift
+            },
         },
         
         # Security settings
@@ -90,6 +113,10 @@ def create_celery_app(app=None):
             'rate_limit': '5/m',   # Max 5 large document processing per minute
             'time_limit': 600,     # 10 minutes max
         },
+        'workers.export_worker.build_export_file': {
+            'time_limit': 3600,     # Large-firm exports can take a while off the request path
+            'soft_time_limit': 3300,
+        },
         'workers.notification_worker.send_email': {
             'rate_limit': '100/m', # Max 100 emails per minute
             'retry_backoff': True,
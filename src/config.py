@@ -18,6 +18,10 @@ class BaseConfig:
     # WARNING: The fallback is for development only. In production, this MUST be set
     # as an environment variable for session persistence and security.
     SECRET_KEY = os.environ.get('SECRET_KEY', secrets.token_hex(32))
+
+    # Key for hashed access code lookups; must be stable across restarts, so it
+    # never falls back to the random development SECRET_KEY above
+    ACCESS_CODE_HASH_KEY = os.environ.get('ACCESS_CODE_HASH_KEY') or os.environ.get('SECRET_KEY')
     
     # Session Configuration for better persistence
     SESSION_COOKIE_HTTPONLY = True
@@ -28,6 +32,13 @@ class BaseConfig:
     
     # Database Configuration
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # Per-request query count/time headers and N+1 warnings (see query_profiler)
+    SQL_PROFILER_ENABLED = os.environ.get('SQL_PROFILER_ENABLED', 'false').lower() == 'true'
+
+    # Reverse proxies in front of the app whose X-Forwarded-For is trusted for the
+    # client address (failed-attempt throttles key on it); 0 = clients connect directly
+    PROXY_FIX_X_FOR = int(os.environ.get('PROXY_FIX_X_FOR', 0))
     
     # File Upload Configuration
     UPLOAD_FOLDER = os.path.abspath('uploads')
@@ -67,6 +78,7 @@ class DevelopmentConfig(BaseConfig):
     
     # Development-specific settings
     SQLALCHEMY_ECHO = False  # Set to True for SQL query debugging
+    SQL_PROFILER_ENABLED = os.environ.get('SQL_PROFILER_ENABLED', 'true').lower() == 'true'
 
 
 class ProductionConfig(BaseConfig):
@@ -0,0 +1,70 @@
+"""
+Add hashed lookup columns for access codes and share tokens
+
+Adds an indexed HMAC column next to firm.access_code, client_user.access_code
+and document_checklist.access_token, fills it from the existing values, and
+adds document_checklist.public_access_enabled for the share-link flow.
+
+Run with the same ACCESS_CODE_HASH_KEY (or SECRET_KEY) the app uses; see
+src/shared/utils/access_codes.py.
+
+Revision ID: add_access_code_hashes
+Revises: add_checklist_item_status
+Create Date: 2024-08-22 12:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+from src.shared.utils.access_codes import hash_access_code
+
+# revision identifiers
+revision = 'add_access_code_hashes'
+down_revision = 'add_checklist_item_status'
+branch_labels = None
+depends_on = None
+
+# (table, code column, hash column)
+HASHED_CODES = [
+    ('firm', 'access_code', 'access_code_hash'),
+    ('client_user', 'access_code', 'access_code_hash'),
+    ('document_checklist', 'access_token', 'access_token_hash'),
+]
+
+
+def upgrade():
+    """Add hash columns, backfill them and index them"""
+    bind = op.get_bind()
+
+    op.add_column('document_checklist', sa.Column('public_access_enabled', sa.Boolean(), nullable=False,
+                                                  server_default=sa.false()))
+    print("✅ Added document_checklist.public_access_enabled")
+
+    for table, code_column, hash_column in HASHED_CODES:
+        op.add_column(table, sa.Column(hash_column, sa.String(64), nullable=True))
+
+        rows = bind.execute(sa.text(
+            f"SELECT id, {code_column} FROM {table} WHERE {code_column} IS NOT NULL"
+        )).all()
+        if rows:
+            bind.execute(
+                sa.text(f"UPDATE {table} SET {hash_column} = :code_hash WHERE id = :id"),
+                [{'id': row_id, 'code_hash': hash_access_code(code)} for row_id, code in rows]
+            )
+
+        op.create_index(f'ix_{table}_{hash_column}', table, [hash_column], unique=True)
+        print(f"✅ Hashed {len(rows)} {table}.{code_column} values")
+
+
+def downgrade():
+    """Drop hash columns and public_access_enabled"""
+    for table, _, hash_column in HASHED_CODES:
+        op.drop_index(f'ix_{table}_{hash_column}', table_name=table)
+        op.drop_column(table, hash_column)
+    op.drop_column('document_checklist', 'public_access_enabled')
+    print("✅ Removed access code hash columns")
+
+
+if __name__ == '__main__':
+    print("This is a migration file. Use Flask-Migrate to run it:")
+    print("flask db upgrade")
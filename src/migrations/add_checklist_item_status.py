@@ -0,0 +1,58 @@
+"""
+Add status tracking to checklist items
+
+Adds checklist_item.status and checklist_item.updated_at (already written by
+the client portal) plus a (checklist_id, status) index so per-checklist counts
+come from one grouped index scan. Items with an uploaded document are
+backfilled as 'uploaded'.
+
+See DocumentChecklist.aggregate_stats in src/modules/document/models.py.
+
+Revision ID: add_checklist_item_status
+Revises: add_task_closure
+Create Date: 2024-08-15 12:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = 'add_checklist_item_status'
+down_revision = 'add_task_closure'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Add status/updated_at columns, index them and backfill uploads"""
+    columns = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('checklist_item')}
+
+    if 'status' not in columns:
+        op.add_column('checklist_item', sa.Column('status', sa.String(20), nullable=False, server_default='pending'))
+        print("✅ Added checklist_item.status")
+    if 'updated_at' not in columns:
+        op.add_column('checklist_item', sa.Column('updated_at', sa.DateTime(), nullable=True))
+        print("✅ Added checklist_item.updated_at")
+
+    op.create_index('ix_checklist_item_checklist_status', 'checklist_item', ['checklist_id', 'status'])
+    print("✅ Created ix_checklist_item_checklist_status")
+
+    result = op.get_bind().execute(sa.text("""
+        UPDATE checklist_item SET status = 'uploaded'
+        WHERE status = 'pending'
+          AND id IN (SELECT checklist_item_id FROM client_document)
+    """))
+    print(f"✅ Marked {result.rowcount} items with documents as uploaded")
+
+
+def downgrade():
+    """Drop the index and status columns"""
+    op.drop_index('ix_checklist_item_checklist_status', table_name='checklist_item')
+    op.drop_column('checklist_item', 'updated_at')
+    op.drop_column('checklist_item', 'status')
+    print("✅ Removed checklist_item status tracking")
+
+
+if __name__ == '__main__':
+    print("This is a migration file. Use Flask-Migrate to run it:")
+    print("flask db upgrade")
@@ -0,0 +1,51 @@
+"""
+Add denormalized task counters to Project
+
+Adds project.task_count and project.completed_task_count and fills them
+from the task table with one set-based UPDATE. From then on they are kept
+current by src/modules/project/progress.py.
+
+Revision ID: add_project_task_counts
+Revises: partition_activity_log
+Create Date: 2024-08-05 12:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.sql import text
+
+# revision identifiers
+revision = 'add_project_task_counts'
+down_revision = 'partition_activity_log'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Add the counter columns and backfill them"""
+    op.add_column('project', sa.Column('task_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('project', sa.Column('completed_task_count', sa.Integer(), nullable=False, server_default='0'))
+    print("✅ Added project task counters")
+
+    connection = op.get_bind()
+    result = connection.execute(text("""
+        UPDATE project
+        SET task_count = (SELECT COUNT(*) FROM task WHERE task.project_id = project.id),
+            completed_task_count = (
+                SELECT COUNT(*) FROM task
+                WHERE task.project_id = project.id AND task.status = 'Completed'
+            )
+    """))
+    print(f"✅ Backfilled task counters for {result.rowcount} projects")
+
+
+def downgrade():
+    """Drop the counter columns"""
+    op.drop_column('project', 'completed_task_count')
+    op.drop_column('project', 'task_count')
+    print("✅ Dropped project task counters")
+
+
+if __name__ == '__main__':
+    print("This is a migration file. Use Flask-Migrate to run it:")
+    print("flask db upgrade")
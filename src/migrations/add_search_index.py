@@ -0,0 +1,58 @@
+"""
+Add full-text search index for tasks, projects and clients
+
+Creates the dialect-specific search index (SQLite FTS5 or PostgreSQL
+tsvector + trigram), the triggers that keep it in sync with the task,
+project and client tables, and backfills existing rows.
+
+See src/shared/database/search_index.py for the index layout.
+
+Revision ID: add_search_index
+Revises: remove_legacy_status
+Create Date: 2024-07-15 12:00:00.000000
+"""
+
+from alembic import op
+
+from src.shared.database.search_index import BACKENDS
+
+# revision identifiers
+revision = 'add_search_index'
+down_revision = 'remove_legacy_status'
+branch_labels = None
+depends_on = None
+
+
+def _backend():
+    connection = op.get_bind()
+    backend_class = BACKENDS.get(connection.dialect.name)
+    if backend_class is None:
+        raise Exception(f"Search index is not supported on {connection.dialect.name}")
+    return connection, backend_class()
+
+
+def upgrade():
+    """Create the search index and triggers, then index existing rows"""
+    connection, backend = _backend()
+
+    for statement in backend.install_statements():
+        connection.exec_driver_sql(statement)
+    print("✅ Created search index and sync triggers")
+
+    for statement in backend.backfill_statements():
+        connection.exec_driver_sql(statement)
+    print("✅ Indexed existing tasks, projects and clients")
+
+
+def downgrade():
+    """Drop the search index (searches fall back to LIKE)"""
+    connection, backend = _backend()
+
+    for statement in backend.drop_statements():
+        connection.exec_driver_sql(statement)
+    print("✅ Dropped search index and sync triggers")
+
+
+if __name__ == '__main__':
+    print("This is a migration file. Use Flask-Migrate to run it:")
+    print("flask db upgrade")
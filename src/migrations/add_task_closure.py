@@ -0,0 +1,50 @@
+"""
+Add the task_closure table for subtask ancestry
+
+Creates task_closure (ancestor_id, descendant_id, depth) and fills it from
+task.parent_task_id with one recursive query.
+
+See src/modules/project/task_closure.py for how it is maintained.
+
+Revision ID: add_task_closure
+Revises: add_project_task_counts
+Create Date: 2024-08-08 12:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+from src.modules.project.task_closure import rebuild
+
+# revision identifiers
+revision = 'add_task_closure'
+down_revision = 'add_project_task_counts'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create task_closure and backfill it from existing subtasks"""
+    op.create_table(
+        'task_closure',
+        sa.Column('ancestor_id', sa.Integer(), sa.ForeignKey('task.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('descendant_id', sa.Integer(), sa.ForeignKey('task.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('depth', sa.Integer(), nullable=False)
+    )
+    op.create_index('ix_task_closure_descendant_depth', 'task_closure', ['descendant_id', 'depth'])
+    print("✅ Created task_closure")
+
+    rows = rebuild(op.get_bind())
+    print(f"✅ Backfilled {rows} task ancestry rows")
+
+
+def downgrade():
+    """Drop task_closure"""
+    op.drop_index('ix_task_closure_descendant_depth', table_name='task_closure')
+    op.drop_table('task_closure')
+    print("✅ Dropped task_closure")
+
+
+if __name__ == '__main__':
+    print("This is a migration file. Use Flask-Migrate to run it:")
+    print("flask db upgrade")
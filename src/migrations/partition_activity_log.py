@@ -0,0 +1,61 @@
+"""
+Partition activity_log by month and add daily activity rollups
+
+Converts activity_log into monthly partitions (PostgreSQL) or a hot table
+plus monthly shard tables (SQLite), moving the existing rows, and creates
+activity_daily_rollup backfilled from them.
+
+See src/shared/database/activity_storage.py for the storage layout.
+
+Revision ID: partition_activity_log
+Revises: add_search_index
+Create Date: 2024-08-01 12:00:00.000000
+"""
+
+from datetime import datetime
+
+from alembic import op
+
+from src.shared.database.activity_storage import BACKENDS, ActivityStorage
+
+# revision identifiers
+revision = 'partition_activity_log'
+down_revision = 'add_search_index'
+branch_labels = None
+depends_on = None
+
+
+def _backend():
+    connection = op.get_bind()
+    backend_class = BACKENDS.get(connection.dialect.name)
+    if backend_class is None:
+        raise Exception(f"Partitioned activity storage is not supported on {connection.dialect.name}")
+    return connection, backend_class()
+
+
+def upgrade():
+    """Partition activity_log, moving existing rows, then backfill the daily rollup"""
+    from src.models.auth import ActivityDailyRollup
+
+    connection, backend = _backend()
+
+    backend.install(connection, datetime.utcnow())
+    print(f"✅ Partitioned activity_log into {len(backend.month_tables(connection))} month tables")
+
+    ActivityDailyRollup.__table__.create(connection, checkfirst=True)
+    rollups = ActivityStorage().rebuild_rollups(connection)
+    print(f"✅ Backfilled {rollups} daily activity rollup rows")
+
+
+def downgrade():
+    """Fold the month tables back into a plain activity_log and drop the rollup"""
+    connection, backend = _backend()
+
+    backend.uninstall(connection)
+    op.drop_table('activity_daily_rollup')
+    print("✅ Restored unpartitioned activity_log")
+
+
+if __name__ == '__main__':
+    print("This is a migration file. Use Flask-Migrate to run it:")
+    print("flask db upgrade")
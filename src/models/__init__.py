@@ -11,7 +11,7 @@ Organized database models by functional area
 # - src.modules.auth.models for authentication models
 
 # Legacy imports for backward compatibility (WILL BE REMOVED)
-from .auth import Firm, User, ActivityLog
+from .auth import Firm, User, ActivityLog, ActivityDailyRollup
 
 # Import essential models for backwards compatibility
 # Using try/except to handle missing modules gracefully
@@ -67,7 +67,7 @@ except ImportError as e:
 # Export all models for backwards compatibility
 __all__ = [
     # Auth models
-    'Firm', 'User', 'ActivityLog',
+    'Firm', 'User', 'ActivityLog', 'ActivityDailyRollup',
     
     # Project models
     'Project', 'Template', 'TemplateTask', 'WorkType', 'TaskStatus',
@@ -3,13 +3,17 @@ Authentication and user management models
 """
 
 from datetime import datetime
+from sqlalchemy.orm import validates
+
 from src.shared.database.db_import import db
+from src.shared.utils.access_codes import access_code_cache, hash_access_code
 
 
 class Firm(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(120), nullable=False)
     access_code = db.Column(db.String(255), unique=True, nullable=False)
+    access_code_hash = db.Column(db.String(64), unique=True, index=True)  # Lookup key, see access_codes.py
     is_active = db.Column(db.Boolean, default=True, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
@@ -18,6 +22,14 @@ class Firm(db.Model):
     templates = db.relationship('Template', backref='firm', lazy=True)
     projects = db.relationship('Project', backref='firm', lazy=True)
     clients = db.relationship('Client', backref='firm', lazy=True)
+    
+    @validates('access_code')
+    def _hash_access_code(self, key, access_code):
+        """Keep access_code_hash in step and drop cached lookups of the old and new code"""
+        access_code_cache.discard('firm', self.access_code_hash)
+        self.access_code_hash = hash_access_code(access_code)
+        access_code_cache.discard('firm', self.access_code_hash)
+        return access_code
 
 
 class User(db.Model):
@@ -32,10 +44,35 @@ class User(db.Model):
 
 
 class ActivityLog(db.Model):
+    # Partitioned by month on timestamp (see src/shared/database/activity_storage.py)
+    __table_args__ = (
+        db.Index('ix_activity_log_user_time', 'user_id', 'timestamp'),
+        db.Index('ix_activity_log_project_time', 'project_id', 'timestamp'),
+        db.Index('ix_activity_log_task_time', 'task_id', 'timestamp'),
+        db.Index('ix_activity_log_time', 'timestamp'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     action = db.Column(db.String(255), nullable=False)
     timestamp = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     project_id = db.Column(db.Integer, db.ForeignKey('project.id'))
     task_id = db.Column(db.Integer, db.ForeignKey('task.id'))
-    details = db.Column(db.Text)
\ No newline at end of file
+    details = db.Column(db.Text)
+
+
+class ActivityDailyRollup(db.Model):
+    """Activity counts per day, firm, user and project (0 = no project)"""
+    __tablename__ = 'activity_daily_rollup'
+
+    day = db.Column(db.Date, primary_key=True)
+    firm_id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, primary_key=True)
+    project_id = db.Column(db.Integer, primary_key=True, default=0)
+    activity_count = db.Column(db.Integer, nullable=False, default=0)
+    last_activity_at = db.Column(db.DateTime, nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_activity_daily_rollup_firm_day', 'firm_id', 'day'),
+        db.Index('ix_activity_daily_rollup_user_day', 'user_id', 'day'),
+    )
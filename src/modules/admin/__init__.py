@@ -3,10 +3,13 @@ Admin module for CPA WorkflowPilot
 Handles administration, user management, and templates
 """
 
-from .routes import admin_bp
-from .users_routes import users_bp
+# Imported when the app registers this module, not when the package is imported
+BLUEPRINTS = (
+    f'{__name__}.routes:admin_bp',
+    f'{__name__}.users_routes:users_bp',
+)
 
 def register_module(app):
     """Register the admin module with the Flask app"""
-    app.register_blueprint(admin_bp)
-    app.register_blueprint(users_bp)
\ No newline at end of file
+    from src.shared.bootstrap import register_blueprints
+    register_blueprints(app, BLUEPRINTS)
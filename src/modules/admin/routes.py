@@ -294,3 +294,16 @@ def admin_process_recurring():
     # TODO: Implement recurring task processing in appropriate service
     # This functionality was not implemented in the original utils
     return jsonify({'success': False, 'message': 'Recurring task processing not yet implemented'})
+
+
+@admin_bp.route('/api/queue-depth', methods=['GET'])
+def admin_queue_depth():
+    """Pending and in-flight AI work per lane and per firm"""
+    from .service import AdminService
+    from src.shared.utils.tenant_queues import TenantQueueTracker
+    
+    if not AdminService().is_admin_authenticated():
+        return jsonify({'error': 'Access denied'}), 403
+    
+    depths = TenantQueueTracker().get_depths()
+    return jsonify(depths), (200 if depths.get('success') else 503)
@@ -24,7 +24,7 @@ from sqlalchemy import func
 class AdminService(BaseService, IAdminService):
     """Service class for administrative business operations"""
     
-    def __init__(self, admin_repository=None):
+    def __init__(self, admin_repository: Optional[AdminRepository] = None):
         super().__init__()
         # Use dependency injection - accept repository as constructor parameter
         if admin_repository is None:
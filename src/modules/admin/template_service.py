@@ -26,6 +26,21 @@ class TemplateService(BaseService):
         """Get template by ID with firm access check"""
         return Template.query.filter_by(id=template_id, firm_id=firm_id).first()
     
+    def _insert_template_tasks(self, template_id: int, tasks_data: List[Dict[str, Any]]):
+        """Insert the titled entries of ``tasks_data`` with a single executemany, keeping their form order"""
+        rows = [
+            {
+                'title': task_data['title'].strip(),
+                'description': task_data.get('description', '').strip(),
+                'recurrence_rule': task_data.get('recurrence_rule'),
+                'order': i,
+                'template_id': template_id
+            }
+            for i, task_data in enumerate(tasks_data) if task_data.get('title', '').strip()
+        ]
+        if rows:
+            db.session.execute(TemplateTask.__table__.insert(), rows)
+    
     @transactional
     def create_template(self, name: str, description: str, task_dependency_mode: bool,
                        firm_id: int, tasks_data: List[Dict[str, Any]], user_id: int = None) -> Dict[str, Any]:
@@ -47,17 +62,8 @@ class TemplateService(BaseService):
             db.session.add(template)
             db.session.flush()  # Get template ID
             
-            # Add template tasks
-            for i, task_data in enumerate(tasks_data):
-                if task_data.get('title', '').strip():
-                    template_task = TemplateTask(
-                        title=task_data['title'].strip(),
-                        description=task_data.get('description', '').strip(),
-                        recurrence_rule=task_data.get('recurrence_rule'),
-                        order=i,
-                        template_id=template.id
-                    )
-                    db.session.add(template_task)
+            # Add template tasks (one multi-row INSERT)
+            self._insert_template_tasks(template.id, tasks_data)
             
             # Auto-create work type from template
             work_type_created = False
@@ -117,17 +123,8 @@ class TemplateService(BaseService):
             # Remove existing template tasks
             TemplateTask.query.filter_by(template_id=template_id).delete()
             
-            # Add updated template tasks
-            for i, task_data in enumerate(tasks_data):
-                if task_data.get('title', '').strip():
-                    template_task = TemplateTask(
-                        title=task_data['title'].strip(),
-                        description=task_data.get('description', '').strip(),
-                        recurrence_rule=task_data.get('recurrence_rule'),
-                        order=i,
-                        template_id=template.id
-                    )
-                    db.session.add(template_task)
+            # Add updated template tasks (one multi-row INSERT)
+            self._insert_template_tasks(template.id, tasks_data)
             
             # Log activity if user_id provided
             if user_id:
@@ -75,8 +75,12 @@ class UserService(BaseService):
         }
     
     def get_users_by_firm(self, firm_id):
-        """Get all users for a firm"""
-        return self.auth_service.get_users_for_firm(firm_id)
+        """Get all users for a firm with their open, overdue and completed task counts"""
+        return self.auth_service.get_users_by_firm(firm_id)
+    
+    def get_user_directory_page(self, firm_id, cursor=None, limit=50):
+        """Get one cursor-paginated page of the firm's users with task counts"""
+        return self.auth_service.get_user_directory_page(firm_id, cursor=cursor, limit=limit)
     
     @transactional
     def update_user(self, user_id, name, role, firm_id, updated_by_user_id):
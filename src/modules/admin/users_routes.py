@@ -24,6 +24,24 @@ def list_users():
     return render_template('admin/users.html', users=users)
 
 
+@users_bp.route('/api/directory', methods=['GET'])
+def user_directory():
+    """Cursor-paginated users with open, overdue and completed task counts"""
+    from flask import jsonify
+    from src.shared.exceptions import ValidationError
+    
+    firm_id = SessionService.get_current_firm_id()
+    try:
+        page = UserService().get_user_directory_page(
+            firm_id,
+            cursor=request.args.get('cursor'),
+            limit=request.args.get('limit', 50, type=int)
+        )
+    except ValidationError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    return jsonify(page)
+
+
 @users_bp.route('/create', methods=['GET', 'POST'])
 def create_user():
     if request.method == 'POST':
@@ -2,8 +2,12 @@
 Authentication module for CPA WorkflowPilot
 """
 
-from .routes import auth_bp
+# Imported when the app registers this module, not when the package is imported
+BLUEPRINTS = (
+    f'{__name__}.routes:auth_bp',
+)
 
 def register_module(app):
     """Register the auth module with the Flask app"""
-    app.register_blueprint(auth_bp)
\ No newline at end of file
+    from src.shared.bootstrap import register_blueprints
+    register_blueprints(app, BLUEPRINTS)
@@ -4,7 +4,9 @@ Provides data access layer for firm-related operations.
 """
 
 from typing import List, Dict, Any, Optional
+from src.shared.database.db_import import db
 from src.shared.repositories import CachedRepository
+from src.shared.utils.access_codes import access_code_cache, hash_access_code
 from src.models import Firm
 
 
@@ -15,13 +17,19 @@ class FirmRepository(CachedRepository[Firm]):
         super().__init__(Firm, cache_ttl=3600)  # 1 hour cache for firms
     
     def get_by_access_code(self, access_code: str, active_only: bool = True) -> Optional[Firm]:
-        """Get firm by access code"""
-        query = Firm.query.filter(Firm.access_code == access_code)
+        """Get firm by access code (hashed lookup behind the access code cache)"""
+        firm_id = access_code_cache.resolve('firm', access_code, self._get_id_by_code_hash)
+        firm = db.session.get(Firm, firm_id) if firm_id is not None else None
         
-        if active_only:
-            query = query.filter(Firm.is_active == True)
-        
-        return query.first()
+        # Another process may have changed the code since this one cached it
+        if not firm or firm.access_code_hash != hash_access_code(access_code):
+            return None
+        if active_only and not firm.is_active:
+            return None
+        return firm
+    
+    def _get_id_by_code_hash(self, code_hash: str) -> Optional[int]:
+        return db.session.query(Firm.id).filter(Firm.access_code_hash == code_hash).scalar()
     
     def get_active_firms(self) -> List[Firm]:
         """Get all active firms"""
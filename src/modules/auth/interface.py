@@ -39,6 +39,22 @@ class IAuthService(ABC):
         """
         pass
     
+    @abstractmethod
+    def get_user_directory_page(self, firm_id: int, cursor: Optional[str] = None,
+                                limit: int = 50) -> Dict[str, Any]:
+        """
+        Get one page of a firm's users with their task counts
+        
+        Args:
+            firm_id: Firm ID
+            cursor: ``next_cursor`` of the previous page (None for the first)
+            limit: Page size
+            
+        Returns:
+            Dictionary with ``users`` and ``next_cursor`` (None on the last page)
+        """
+        pass
+    
     @abstractmethod
     def get_user_by_id(self, user_id: int, firm_id: int) -> Optional[Dict[str, Any]]:
         """
@@ -3,7 +3,10 @@ Authentication-related models for CPA WorkflowPilot
 """
 
 from datetime import datetime
+from sqlalchemy.orm import validates
+
 from src.shared.database.db_import import db
+from src.shared.utils.access_codes import access_code_cache, hash_access_code
 
 
 class ClientUser(db.Model):
@@ -14,6 +17,7 @@ class ClientUser(db.Model):
     client_id = db.Column(db.Integer, db.ForeignKey('client.id'), nullable=False)
     email = db.Column(db.String(255), unique=True, nullable=False)
     access_code = db.Column(db.String(20), unique=True, nullable=False)
+    access_code_hash = db.Column(db.String(64), unique=True, index=True)  # Lookup key, see access_codes.py
     is_active = db.Column(db.Boolean, default=True, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     last_login = db.Column(db.DateTime)
@@ -27,10 +31,18 @@ class ClientUser(db.Model):
         import random
         while True:
             code = ''.join(random.choices(string.ascii_uppercase + string.digits, k=8))
-            if not ClientUser.query.filter_by(access_code=code).first():
+            if not ClientUser.query.filter_by(access_code_hash=hash_access_code(code)).first():
                 self.access_code = code
                 break
     
+    @validates('access_code')
+    def _hash_access_code(self, key, access_code):
+        """Keep access_code_hash in step and drop cached lookups of the old and new code"""
+        access_code_cache.discard('client_user', self.access_code_hash)
+        self.access_code_hash = hash_access_code(access_code)
+        access_code_cache.discard('client_user', self.access_code_hash)
+        return access_code
+    
     def update_last_login(self):
         """Update last login timestamp"""
         self.last_login = datetime.utcnow()
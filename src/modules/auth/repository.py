@@ -3,8 +3,9 @@ User Repository for CPA WorkflowPilot
 Provides data access layer for user-related operations.
 """
 
-from typing import List, Dict, Any, Optional
-from sqlalchemy import or_, and_
+from datetime import date
+from typing import List, Dict, Any, Optional, Tuple
+from sqlalchemy import or_, and_, func
 
 from src.shared.database.db_import import db
 from src.models import User
@@ -26,6 +27,40 @@ class UserRepository(CachedRepository[User]):
         
         return query.order_by(User.name.asc()).all()
     
+    def get_directory(self, firm_id: int, after: Optional[Tuple[str, int]] = None,
+                      limit: Optional[int] = None) -> List[Any]:
+        """
+        Users of a firm with their task counts, from one LEFT JOIN ... GROUP BY
+
+        Rows are ordered by (name, id); ``after`` is the last (name, id) of the
+        previous page, so paging stays stable and index-friendly.
+
+        Returns:
+            Rows with id, name, role, firm_id, created_at, task_count,
+            open_task_count, overdue_task_count and completed_task_count
+        """
+        from src.modules.project.models import Task
+        
+        completed = Task.status == 'Completed'
+        query = db.session.query(
+            User.id, User.name, User.role, User.firm_id, User.created_at,
+            func.count(Task.id).label('task_count'),
+            func.count(Task.id).filter(~completed).label('open_task_count'),
+            func.count(Task.id).filter(~completed, Task.due_date < date.today()).label('overdue_task_count'),
+            func.count(Task.id).filter(completed).label('completed_task_count')
+        ).outerjoin(Task, Task.assignee_id == User.id) \
+            .filter(User.firm_id == firm_id) \
+            .group_by(User.id, User.name, User.role, User.firm_id, User.created_at)
+        
+        if after is not None:
+            name, user_id = after
+            query = query.filter(or_(User.name > name, and_(User.name == name, User.id > user_id)))
+        
+        query = query.order_by(User.name.asc(), User.id.asc())
+        if limit:
+            query = query.limit(limit)
+        return query.all()
+    
     def search_by_name(self, firm_id: int, search_term: str) -> List[User]:
         """Search users by name"""
         return User.query.filter(
@@ -4,8 +4,11 @@ Authentication and session management blueprint
 
 from flask import Blueprint, render_template, redirect, url_for, request, session, flash, make_response, jsonify
 from datetime import datetime
-from core.db_import import db
-from services.auth_service import AuthService
+from src.shared.database.db_import import db
+from src.modules.auth.interface import IAuthService
+from src.modules.auth.session_service import SessionService
+from src.shared.di_container import get_service
+from src.shared.utils.access_codes import access_code_throttle
 
 auth_bp = Blueprint('auth', __name__)
 
@@ -42,9 +45,9 @@ def cch_axcess_integration():
 
 @auth_bp.route('/login')
 def login():
-    if AuthService.is_authenticated():
+    if SessionService.is_authenticated():
         return redirect(url_for('dashboard.main'))
-    elif AuthService.is_firm_authenticated():
+    elif SessionService.is_firm_authenticated():
         return redirect(url_for('auth.select_user'))
     return render_template('auth/login.html')
 
@@ -54,8 +57,13 @@ def authenticate():
     access_code = request.form.get('access_code', '').strip()
     email = request.form.get('email', '').strip()
     
+    client_ip = request.remote_addr
+    if not access_code_throttle.allow(client_ip):
+        flash('Too many failed attempts. Please try again later.', 'error')
+        return redirect(url_for('auth.login'))
+    
     # Use AuthService for authentication
-    auth_service = AuthService()
+    auth_service = get_service(IAuthService)
     result = auth_service.authenticate_firm(access_code, email)
     
     if result['success']:
@@ -63,32 +71,33 @@ def authenticate():
         auth_service.create_session(result['firm'], email)
         return redirect(url_for('auth.select_user'))
     else:
+        access_code_throttle.record_failure(client_ip)
         flash(result['message'], 'error')
         return redirect(url_for('auth.login'))
 
 
 @auth_bp.route('/select-user')
 def select_user():
-    if not AuthService.is_firm_authenticated():
+    if not SessionService.is_firm_authenticated():
         return redirect(url_for('auth.login'))
     
     firm_id = session['firm_id']
     # Use AuthService to get users
-    auth_service = AuthService()
+    auth_service = get_service(IAuthService)
     users = auth_service.get_users_for_firm(firm_id)
     return render_template('auth/select_user.html', users=users, firm_name=session.get('firm_name', 'Your Firm'))
 
 
 @auth_bp.route('/set-user', methods=['POST'])
 def set_user():
-    if not AuthService.is_firm_authenticated():
+    if not SessionService.is_firm_authenticated():
         return redirect(url_for('auth.login'))
     
     user_id = request.form.get('user_id')
     firm_id = session['firm_id']
     
     # Use AuthService to set user in session
-    auth_service = AuthService()
+    auth_service = get_service(IAuthService)
     result = auth_service.set_user_in_session(int(user_id), firm_id)
     
     if result['success']:
@@ -110,8 +119,8 @@ def switch_user():
 @auth_bp.route('/logout')
 def logout():
     """Logout user with proper cache control and session clearing"""
-    # Use AuthService for logout
-    AuthService.logout()
+    # Use SessionService for logout
+    SessionService.logout()
     
     # Create response with proper cache control headers
     response = make_response(redirect(url_for('auth.home')))
@@ -130,8 +139,8 @@ def logout():
 @auth_bp.route('/clear-session')
 def clear_session():
     """Clear session and redirect to landing page with proper cache control"""
-    # Use AuthService for session clearing
-    AuthService.logout()
+    # Use SessionService for session clearing
+    SessionService.logout()
     
     response = make_response(redirect(url_for('auth.home')))
     response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
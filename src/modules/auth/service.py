@@ -233,39 +233,75 @@ class AuthService(BaseService, IAuthService):
             firm_id: The firm's ID
             
         Returns:
-            List of user dictionaries with task count and formatted dates
+            List of user dictionaries with open, overdue and completed task
+            counts (one grouped query) and formatted dates
         """
         try:
-            users = self.user_repository.get_by_firm(firm_id)
-            user_dtos = []
-            
-            for user in users:
-                # Get task count for this user - use direct query to avoid circular imports
-                from src.shared.database.db_import import db
-                task_count = db.session.execute(
-                    db.text("SELECT COUNT(*) FROM task WHERE assignee_id = :user_id"),
-                    {'user_id': user.id}
-                ).scalar() or 0
-                
-                user_dto = {
-                    'id': user.id,
-                    'name': user.name,
-                    'email': user.email,
-                    'role': user.role,
-                    'firm_id': user.firm_id,
-                    'is_active': user.is_active,
-                    'created_at': user.created_at.strftime('%Y-%m-%d %H:%M') if user.created_at else None,
-                    'created_at_formatted': user.created_at.strftime('%m/%d/%Y') if user.created_at else 'N/A',
-                    'task_count': task_count,
-                    # Add tasks property for template compatibility
-                    'tasks': [{'id': i} for i in range(task_count)]  # Mock list for length calculation
-                }
-                user_dtos.append(user_dto)
-            
-            return user_dtos
+            return [self._directory_dto(row) for row in self.user_repository.get_directory(firm_id)]
         except Exception as e:
             raise ExternalServiceError(f"Failed to fetch users for firm {firm_id}: {str(e)}")
     
+    def get_user_directory_page(self, firm_id: int, cursor: Optional[str] = None,
+                                limit: int = 50) -> Dict[str, Any]:
+        """
+        One page of the firm's user directory, keyset-paginated by (name, id)
+        
+        Args:
+            firm_id: The firm's ID
+            cursor: ``next_cursor`` from the previous page (None for the first)
+            limit: Page size (1-200)
+            
+        Returns:
+            Dict with ``users`` (DTOs as in get_users_by_firm) and
+            ``next_cursor`` (None on the last page)
+            
+        Raises:
+            ValidationError: If the cursor is malformed
+        """
+        limit = max(1, min(int(limit), 200))
+        after = self._decode_cursor(cursor) if cursor else None
+        
+        # One extra row tells whether another page follows
+        rows = self.user_repository.get_directory(firm_id, after=after, limit=limit + 1)
+        users = [self._directory_dto(row) for row in rows[:limit]]
+        next_cursor = self._encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+        return {
+            'success': True,
+            'users': users,
+            'next_cursor': next_cursor
+        }
+    
+    @staticmethod
+    def _directory_dto(row) -> Dict[str, Any]:
+        return {
+            'id': row.id,
+            'name': row.name,
+            'role': row.role,
+            'firm_id': row.firm_id,
+            'created_at': row.created_at.strftime('%Y-%m-%d %H:%M') if row.created_at else None,
+            'created_at_formatted': row.created_at.strftime('%m/%d/%Y') if row.created_at else 'N/A',
+            'task_count': row.task_count,
+            'open_task_count': row.open_task_count,
+            'overdue_task_count': row.overdue_task_count,
+            'completed_task_count': row.completed_task_count
+        }
+    
+    @staticmethod
+    def _encode_cursor(row) -> str:
+        import base64
+        import json
+        return base64.urlsafe_b64encode(json.dumps([row.name, row.id]).encode()).decode()
+    
+    @staticmethod
+    def _decode_cursor(cursor: str):
+        import base64
+        import json
+        try:
+            name, user_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            return str(name), int(user_id)
+        except (ValueError, TypeError):
+            raise ValidationError("Invalid cursor")
+    
     def get_user_by_id_dto(self, user_id: int, firm_id: int = None) -> Dict[str, Any]:
         """
         Get user by ID as DTO with optional firm validation
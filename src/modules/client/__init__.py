@@ -3,12 +3,14 @@ Client module for CPA WorkflowPilot
 Handles clients, contacts, and client portal functionality
 """
 
-from .routes import clients_bp
-from .contacts_routes import contacts_bp  
-from .portal_routes import client_portal_bp
+# Imported when the app registers this module, not when the package is imported
+BLUEPRINTS = (
+    f'{__name__}.routes:clients_bp',
+    f'{__name__}.contacts_routes:contacts_bp',
+    f'{__name__}.portal_routes:client_portal_bp',
+)
 
 def register_module(app):
     """Register the client module with the Flask app"""
-    app.register_blueprint(clients_bp)
-    app.register_blueprint(contacts_bp)
-    app.register_blueprint(client_portal_bp)
\ No newline at end of file
+    from src.shared.bootstrap import register_blueprints
+    register_blueprints(app, BLUEPRINTS)
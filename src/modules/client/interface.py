@@ -109,4 +109,20 @@ class IClientService(ABC):
         Returns:
             Statistics dictionary
         """
-        pass
\ No newline at end of file
+        pass
+    
+    @abstractmethod
+    def iter_clients_for_export(self, firm_id: int, columns: Optional[List[str]] = None,
+                                batch_size: int = 1000) -> Dict[str, Any]:
+        """
+        Prepare a streaming client export without loading every row
+        
+        Args:
+            firm_id: Firm ID
+            columns: Column keys to export, in order (None for all)
+            batch_size: Rows fetched from the database per round trip
+            
+        Returns:
+            Dictionary with 'keys', 'labels', 'kinds' and a lazy 'rows' iterator of tuples
+        """
+        pass
@@ -4,6 +4,7 @@ Client portal blueprint
 
 from flask import Blueprint, render_template, request, redirect, url_for, session, flash, jsonify
 
+from src.shared.utils.access_codes import access_code_throttle
 from .portal_service import PortalService
 
 client_portal_bp = Blueprint('client_portal', __name__)
@@ -21,6 +22,11 @@ def client_authenticate():
     """Authenticate client user"""
     access_code = request.form.get('access_code', '').strip()
     
+    client_ip = request.remote_addr
+    if not access_code_throttle.allow(client_ip):
+        flash('Too many failed attempts. Please try again later.', 'error')
+        return redirect(url_for('client_portal.client_login'))
+    
     portal_service = PortalService()
     result = portal_service.authenticate_client(access_code)
     
@@ -30,6 +36,7 @@ def client_authenticate():
         session['client_email'] = result['client_email']
         return redirect(url_for('client_portal.client_dashboard'))
     else:
+        access_code_throttle.record_failure(client_ip)
         flash(result['message'], 'error')
         return redirect(url_for('client_portal.client_login'))
 
@@ -10,10 +10,14 @@ import os
 import uuid
 import mimetypes
 
+from sqlalchemy.orm import selectinload
+
 from src.shared.database.db_import import db
+from src.shared.utils.access_codes import access_code_cache, hash_access_code
 from src.models.auth import User, Firm, ActivityLog
 from ..auth.models import ClientUser
 from .models import Client
+from .portal_stats import portal_stats_cache
 from ..document.models import DocumentChecklist, ChecklistItem, ClientDocument
 
 
@@ -36,12 +40,14 @@ class PortalService:
         """
         try:
             access_code = access_code.strip()
-            client_user = ClientUser.query.filter_by(
-                access_code=access_code, 
-                is_active=True
-            ).first()
+            client_user_id = access_code_cache.resolve(
+                'client_user', access_code, self._get_client_user_id_by_code_hash
+            )
+            client_user = db.session.get(ClientUser, client_user_id) if client_user_id is not None else None
             
-            if not client_user:
+            # Another process may have changed the code since this one cached it
+            if (not client_user or not client_user.is_active
+                    or client_user.access_code_hash != hash_access_code(access_code)):
                 return {
                     'success': False,
                     'message': 'Invalid access code',
@@ -70,6 +76,10 @@ class PortalService:
             }
     
 
+    def _get_client_user_id_by_code_hash(self, code_hash: str) -> Optional[int]:
+        return db.session.query(ClientUser.id).filter(ClientUser.access_code_hash == code_hash).scalar()
+    
+
     def get_client_dashboard_data(self, client_id: int) -> Dict[str, Any]:
         """
         Get dashboard data for a client
@@ -90,12 +100,19 @@ class PortalService:
                     'checklists': []
                 }
             
-            # Get active checklists for this client
-            checklists = DocumentChecklist.query.filter_by(
+            # Get active checklists for this client, items in one extra query
+            checklists = DocumentChecklist.query.options(
+                selectinload(DocumentChecklist.items)
+            ).filter_by(
                 client_id=client_id,
                 is_active=True
             ).all()
             
+            # Counts come from the cached aggregate rather than per-item scans
+            stats = portal_stats_cache.get_or_build(client_id)
+            for checklist in checklists:
+                checklist.attach_stats(stats.get(checklist.id))
+            
             return {
                 'success': True,
                 'client': client,
@@ -276,6 +293,7 @@ class PortalService:
             item.updated_at = datetime.utcnow()
             
             db.session.commit()
+            portal_stats_cache.invalidate(client_id)
             
             return {
                 'success': True,
@@ -341,6 +359,7 @@ class PortalService:
             item.updated_at = datetime.utcnow()
             
             db.session.commit()
+            portal_stats_cache.invalidate(client_id)
             
             status_messages = {
                 'already_provided': 'Marked as already provided',
@@ -424,33 +443,17 @@ class PortalService:
             Dict containing statistics
         """
         try:
-            checklists = DocumentChecklist.query.filter_by(
-                client_id=client_id,
-                is_active=True
-            ).all()
+            stats = portal_stats_cache.get_or_build(client_id).values()
             
-            total_items = 0
-            completed_items = 0
-            pending_items = 0
-            uploaded_items = 0
-            
-            for checklist in checklists:
-                items = ChecklistItem.query.filter_by(checklist_id=checklist.id).all()
-                total_items += len(items)
-                
-                for item in items:
-                    if item.status == 'uploaded':
-                        uploaded_items += 1
-                        completed_items += 1
-                    elif item.status in ['already_provided', 'not_applicable']:
-                        completed_items += 1
-                    else:
-                        pending_items += 1
+            total_items = sum(checklist['total'] for checklist in stats)
+            completed_items = sum(checklist['completed'] for checklist in stats)
+            pending_items = sum(checklist['pending'] for checklist in stats)
+            uploaded_items = sum(checklist['uploaded'] for checklist in stats)
             
             return {
                 'success': True,
                 'statistics': {
-                    'total_checklists': len(checklists),
+                    'total_checklists': len(stats),
                     'total_items': total_items,
                     'completed_items': completed_items,
                     'pending_items': pending_items,
@@ -0,0 +1,89 @@
+"""
+Portal Statistics for CPA WorkflowPilot
+Caches a client's per-checklist item counts (DocumentChecklist.aggregate_stats,
+one grouped query) in Redis for a short TTL (``portal_stats:{client_id}``),
+so portal page loads near filing deadlines read them without touching the
+checklist tables.
+
+PortalService drops the entry when the client uploads a document or changes
+an item's status; the TTL bounds staleness from CPA-side checklist edits.
+"""
+
+import json
+import logging
+import os
+from typing import Dict, Any, Optional
+
+from src.shared.database.redis_client import RedisClientMixin
+
+logger = logging.getLogger(__name__)
+
+PORTAL_STATS_CACHE_TTL = int(os.environ.get('PORTAL_STATS_CACHE_TTL', 30))
+
+
+class PortalStatsCache(RedisClientMixin):
+    """Redis-backed per-client checklist statistics"""
+
+    KEY_PREFIX = 'portal_stats'
+
+    def __init__(self, redis_client_instance=None, ttl: int = PORTAL_STATS_CACHE_TTL):
+        """
+        Initialize portal statistics cache
+
+        Args:
+            redis_client_instance: RedisClient instance (optional, defaults to the global client)
+            ttl: Expiration in seconds for cached statistics
+        """
+        self._redis_client = redis_client_instance
+        self.ttl = ttl
+
+    def _key(self, client_id: int) -> str:
+        return f"{self.KEY_PREFIX}:{client_id}"
+
+    def get_or_build(self, client_id: int) -> Dict[int, Dict[str, Any]]:
+        """Checklist id -> counts for the client's active checklists"""
+        stats = self.get(client_id)
+        if stats is None:
+            from ..document.models import DocumentChecklist
+            stats = DocumentChecklist.aggregate_stats(client_id=client_id)
+            self.set(client_id, stats)
+        return stats
+
+    def get(self, client_id: int) -> Optional[Dict[int, Dict[str, Any]]]:
+        client = self._get_client()
+        if not client:
+            return None
+
+        try:
+            value = client.get(self._key(client_id))
+        except Exception as e:
+            logger.warning(f"Failed to read portal stats for client {client_id}: {e}")
+            return None
+        if value is None:
+            return None
+        # JSON object keys come back as strings
+        return {int(checklist_id): stats for checklist_id, stats in json.loads(value).items()}
+
+    def set(self, client_id: int, stats: Dict[int, Dict[str, Any]]):
+        client = self._get_client()
+        if not client:
+            return
+
+        try:
+            client.set(self._key(client_id), json.dumps(stats), ex=self.ttl)
+        except Exception as e:
+            logger.warning(f"Failed to write portal stats for client {client_id}: {e}")
+
+    def invalidate(self, client_id: int):
+        client = self._get_client()
+        if not client:
+            return
+
+        try:
+            client.delete(self._key(client_id))
+        except Exception as e:
+            logger.warning(f"Failed to invalidate portal stats for client {client_id}: {e}")
+
+
+# Global portal statistics cache (Redis client resolved per call)
+portal_stats_cache = PortalStatsCache()
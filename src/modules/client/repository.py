@@ -3,7 +3,7 @@ Client Repository for CPA WorkflowPilot
 Provides data access layer for client-related operations.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator
 from sqlalchemy import or_, and_
 
 from src.shared.database.db_import import db
@@ -58,7 +58,15 @@ class ClientRepository(CachedRepository[Client]):
         )
     
     def search_by_name(self, firm_id: int, search_term: str, limit: Optional[int] = 100) -> List[Client]:
-        """Search clients by name with optional limit"""
+        """Search active clients by name, ranked through the full-text index when installed"""
+        from src.shared.database.search_index import search_index, order_by_ids
+        
+        client_ids = search_index.search(firm_id, 'client', search_term, limit or 100)
+        if client_ids is not None:
+            if not client_ids:
+                return []
+            return order_by_ids(Client.query.filter(Client.id.in_(client_ids)).all(), client_ids)
+        
         query = Client.query.filter(
             Client.firm_id == firm_id,
             Client.name.ilike(f'%{search_term}%'),
@@ -128,3 +136,34 @@ class ClientRepository(CachedRepository[Client]):
         # Note: Transaction commit is handled by service layer
         
         return client
+    
+    def get_export_columns(self) -> List['ExportColumn']:
+        """Columns available to client exports"""
+        from sqlalchemy import case
+        from src.shared.utils.streaming_export import ExportColumn
+        
+        return [
+            ExportColumn('id', 'ID', Client.id),
+            ExportColumn('name', 'Name', Client.name),
+            ExportColumn('email', 'Email', Client.email),
+            ExportColumn('phone', 'Phone', Client.phone),
+            ExportColumn('address', 'Address', Client.address),
+            ExportColumn('status', 'Status', case((Client.is_active == True, 'Active'), else_='Inactive')),
+            ExportColumn('created_at', 'Created At', Client.created_at),
+        ]
+    
+    def iter_export_rows(self, firm_id: int, columns: List['ExportColumn'],
+                         include_inactive: bool = False, batch_size: int = 1000) -> Iterator[tuple]:
+        """Stream client rows for export as plain tuples through a server-side cursor"""
+        from src.shared.utils.streaming_export import stream_query
+        
+        query = db.session.query(*[column.expression.label(column.key) for column in columns]) \
+            .select_from(Client) \
+            .filter(Client.firm_id == firm_id)
+        
+        if not include_inactive:
+            query = query.filter(Client.is_active == True)
+        
+        query = query.order_by(Client.name.asc(), Client.id.asc())
+        
+        return stream_query(query, batch_size)
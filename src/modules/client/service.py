@@ -2,7 +2,7 @@
 ClientService: Handles all business logic for clients, including search and retrieval.
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List
 from src.shared.database.db_import import db
 from .models import Client
 # ActivityService import removed to break circular dependency
@@ -12,7 +12,7 @@ from .repository import ClientRepository
 
 
 class ClientService(BaseService, IClientService):
-    def __init__(self, client_repository=None):
+    def __init__(self, client_repository: Optional[ClientRepository] = None):
         super().__init__()
         # Use dependency injection - accept repository as constructor parameter
         if client_repository is None:
@@ -131,16 +131,16 @@ class ClientService(BaseService, IClientService):
         except ImportError:
             pass  # ActivityService not available
         
-        # Publish client creation event
+        # Publish client creation event once the client is committed
         from ...shared.events.schemas import ClientCreatedEvent
-        from ...shared.events.publisher import publish_event
+        from ...shared.events.publisher import publish_event_after_commit
         event = ClientCreatedEvent(
             client_id=client.id,
             firm_id=firm_id,
             name=client.name,
             is_active=client.is_active
         )
-        publish_event(event)
+        publish_event_after_commit(event)
         
         return {
             'success': True,
@@ -245,6 +245,28 @@ class ClientService(BaseService, IClientService):
                 'message': str(e)
             }
     
+    def iter_clients_for_export(self, firm_id: int, columns: Optional[List[str]] = None,
+                                batch_size: int = 1000) -> Dict[str, Any]:
+        """
+        Prepare a streaming client export
+        
+        Returns:
+            Dict with 'keys', 'labels', 'kinds' and a lazy 'rows' iterator of tuples
+        """
+        try:
+            from src.shared.utils.streaming_export import select_export_columns
+            
+            selected = select_export_columns(self.client_repository.get_export_columns(), columns)
+            return {
+                'success': True,
+                'keys': [column.key for column in selected],
+                'labels': [column.label for column in selected],
+                'kinds': [column.kind for column in selected],
+                'rows': self.client_repository.iter_export_rows(firm_id, selected, batch_size=batch_size)
+            }
+        except ValueError as e:
+            return {'success': False, 'message': str(e)}
+    
     def _get_client_model_by_id_and_firm(self, client_id, firm_id):
         """Get raw client model for internal operations (updates/deletes)"""
         return self.client_repository.get_by_id_and_firm(client_id, firm_id)
@@ -3,10 +3,13 @@ Dashboard module for CPA WorkflowPilot
 Handles dashboard, views, and reporting functionality
 """
 
-from .routes import dashboard_bp
-from .views_routes import views_bp
+# Imported when the app registers this module, not when the package is imported
+BLUEPRINTS = (
+    f'{__name__}.routes:dashboard_bp',
+    f'{__name__}.views_routes:views_bp',
+)
 
 def register_module(app):
     """Register the dashboard module with the Flask app"""
-    app.register_blueprint(dashboard_bp)
-    app.register_blueprint(views_bp)
\ No newline at end of file
+    from src.shared.bootstrap import register_blueprints
+    register_blueprints(app, BLUEPRINTS)
@@ -6,6 +6,7 @@ from other modules. It's the ONLY service that's allowed to coordinate between
 multiple modules, keeping the dashboard blueprint thin and focused.
 """
 
+import calendar
 from typing import Dict, Any, List
 import logging
 from src.shared.di_container import get_service
@@ -217,23 +218,29 @@ class DashboardAggregatorService(BaseService):
             if calendar_result.get('success'):
                 return {
                     'tasks_by_date': calendar_result.get('tasks_by_date', {}),
+                    'total_tasks': calendar_result.get('total_tasks', 0),
                     'current_date': calendar_result.get('current_date'),
                     'year': year,
-                    'month': month
+                    'month': month,
+                    'month_name': calendar.month_name[month]
                 }
             else:
                 return {
                     'tasks_by_date': {},
+                    'total_tasks': 0,
                     'current_date': None,
                     'year': year,
-                    'month': month
+                    'month': month,
+                    'month_name': calendar.month_name[month] if 1 <= month <= 12 else ''
                 }
                 
         except Exception as e:
             logger.error(f"Error getting calendar data for {year}-{month} in firm {firm_id}: {e}")
             return {
                 'tasks_by_date': {},
+                'total_tasks': 0,
                 'current_date': None,
                 'year': year,
-                'month': month
+                'month': month,
+                'month_name': ''
             }
\ No newline at end of file
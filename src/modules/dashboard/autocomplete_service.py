@@ -0,0 +1,193 @@
+"""
+Autocomplete Service for CPA WorkflowPilot
+Typeahead suggestions for the global search box from an in-process prefix
+index (see src/shared/utils/prefix_index.py) over client names, project
+names and task titles, so keystrokes do not run three database searches.
+
+Each process keeps its own index. A background reader on the
+``workflow_events`` channel applies ``ClientCreatedEvent``,
+``ProjectCreatedEvent`` and ``TaskCreatedEvent`` as they are published;
+renames and deletes are picked up when a firm's index is rebuilt.
+"""
+
+import json
+import logging
+import os
+import threading
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+from src.shared.utils.prefix_index import PrefixIndexCache, start_thread
+from src.shared.database.redis_client import RedisClientMixin
+
+logger = logging.getLogger(__name__)
+
+EVENTS_CHANNEL = 'workflow_events'
+AUTOCOMPLETE_TYPES = ('client', 'project', 'task')
+
+# Keys across all firms held per process (roughly 150 bytes each)
+AUTOCOMPLETE_MAX_ENTRIES = int(os.environ.get('AUTOCOMPLETE_MAX_ENTRIES', 500000))
+AUTOCOMPLETE_MAX_AGE = int(os.environ.get('AUTOCOMPLETE_MAX_AGE', 900))
+
+
+def load_firm_entries(firm_id: int) -> Iterator[Tuple[str, int, str]]:
+    """Read ``(type, id, label)`` for a firm's active clients, projects and tasks"""
+    from sqlalchemy import or_, and_
+    from src.shared.database.db_import import db
+    from src.modules.client.models import Client
+    from src.modules.project.models import Project, Task
+
+    clients = db.session.query(Client.id, Client.name).filter(
+        Client.firm_id == firm_id,
+        Client.is_active == True
+    )
+    for client_id, name in clients:
+        yield 'client', client_id, name
+
+    projects = db.session.query(Project.id, Project.name).filter(Project.firm_id == firm_id)
+    for project_id, name in projects:
+        yield 'project', project_id, name
+
+    tasks = db.session.query(Task.id, Task.title).outerjoin(Project, Task.project_id == Project.id).filter(
+        or_(
+            Project.firm_id == firm_id,
+            and_(Task.project_id.is_(None), Task.firm_id == firm_id)
+        )
+    )
+    for task_id, title in tasks:
+        yield 'task', task_id, title
+
+
+def run_in_app_context(target):
+    """Run a firm index rebuild on a thread inside the calling request's app context"""
+    from flask import current_app, has_app_context
+    if not has_app_context():
+        start_thread(target)
+        return
+
+    app = current_app._get_current_object()
+
+    def run():
+        with app.app_context():
+            target()
+
+    start_thread(run)
+
+
+class AutocompleteService(RedisClientMixin):
+    """
+    Per-process autocomplete index kept current from published events
+
+    Lookups only read memory; a firm's first lookup loads its names with
+    three column-only queries, and the first after ``max_age`` reloads them
+    on a background thread while the old index keeps answering.
+    """
+
+    POLL_TIMEOUT = 1.0
+
+    def __init__(self, loader=load_firm_entries, redis_client_instance=None,
+                 max_entries: int = AUTOCOMPLETE_MAX_ENTRIES, max_age: int = AUTOCOMPLETE_MAX_AGE):
+        """
+        Initialize autocomplete service
+
+        Args:
+            loader: Callable returning ``(type, id, label)`` items for a firm
+            redis_client_instance: RedisClient instance (optional, defaults to the global client)
+            max_entries: Index keys kept across firms before cold firms are evicted
+            max_age: Seconds before a firm's index is rebuilt from the database
+        """
+        self.index = PrefixIndexCache(loader, max_entries=max_entries, max_age=max_age,
+                                      run_in_background=run_in_app_context)
+        self._redis_client = redis_client_instance
+        self._listener: Optional[threading.Thread] = None
+        self._listener_lock = threading.Lock()
+
+    def suggest(self, firm_id: int, query: str, types: Optional[List[str]] = None,
+                limit: int = 10) -> Dict[str, Any]:
+        """
+        Get suggestions whose name has a word sequence starting with ``query``
+
+        Args:
+            firm_id: Firm ID for data filtering
+            query: Text typed so far
+            types: Restrict to these of 'client', 'project', 'task'
+            limit: Maximum suggestions
+
+        Returns:
+            dict: ``suggestions`` as ``{'type', 'id', 'label'}`` dicts
+        """
+        self._ensure_listener()
+
+        entities = {t for t in types if t in AUTOCOMPLETE_TYPES} if types else None
+        try:
+            suggestions = self.index.search(firm_id, query, limit, entities)
+            return {'success': True, 'suggestions': suggestions}
+        except Exception as e:
+            logger.error(f"Autocomplete failed for firm {firm_id}: {e}")
+            return {'success': False, 'message': 'Autocomplete not available', 'suggestions': []}
+
+    def apply_event(self, event_type: str, firm_id: Optional[int], payload: Dict[str, Any]):
+        """Apply a published creation event to the firm's index"""
+        if not firm_id:
+            return
+
+        if event_type == 'ClientCreatedEvent':
+            if payload.get('is_active', True):
+                self.index.add(firm_id, 'client', payload['client_id'], payload.get('name'))
+        elif event_type == 'ProjectCreatedEvent':
+            self.index.add(firm_id, 'project', payload['project_id'], payload.get('name'))
+        elif event_type == 'TaskCreatedEvent':
+            self.index.add(firm_id, 'task', payload['task_id'], payload.get('title'))
+
+    def _ensure_listener(self):
+        """Start the event reader for this process once Redis is available"""
+        if self._listener is not None and self._listener.is_alive():
+            return
+
+        with self._listener_lock:
+            if self._listener is not None and self._listener.is_alive():
+                return
+
+            client = self._get_client()
+            if client is None:
+                return
+
+            if self._listener is not None:
+                # Events were missed while the previous reader was down
+                self.index.invalidate()
+
+            self._listener = threading.Thread(
+                target=self._listen, args=(client,), name='autocomplete-events', daemon=True
+            )
+            self._listener.start()
+
+    def _listen(self, client):
+        pubsub = client.pubsub(ignore_subscribe_messages=True)
+        try:
+            pubsub.subscribe(EVENTS_CHANNEL)
+            while True:
+                message = pubsub.get_message(timeout=self.POLL_TIMEOUT)
+                if message and message.get('type') == 'message':
+                    self._dispatch(message.get('data'))
+        except Exception as e:
+            logger.warning(f"Autocomplete event reader stopped: {e}")
+        finally:
+            try:
+                pubsub.close()
+            except Exception:
+                pass
+
+    def _dispatch(self, data):
+        try:
+            event = json.loads(data)
+            self.apply_event(event.get('event_type'), event.get('firm_id'), event.get('payload') or {})
+        except Exception as e:
+            logger.debug(f"Ignoring unreadable event for autocomplete: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = self.index.get_stats()
+        stats['listening'] = self._listener is not None and self._listener.is_alive()
+        return stats
+
+
+# Global autocomplete service (one index per process)
+autocomplete_service = AutocompleteService()
@@ -3,6 +3,7 @@ Dashboard Event Handler for CPA WorkflowPilot
 Handles events that should trigger dashboard updates.
 """
 
+import json
 from datetime import datetime
 from typing import Dict, Any
 from src.shared.events.base import EventHandler, BaseEvent
@@ -110,12 +111,18 @@ class DashboardEventHandler(EventHandler):
         if not redis_client or not redis_client.is_available():
             return
 
-        # Store update in Redis list for dashboard history
+        client = redis_client.get_client()
         key = f"dashboard:updates:{firm_id}"
-        redis_client.rpush(key, update)
 
-        # Trim list to keep only recent updates
-        redis_client.ltrim(key, -100, -1)  # Keep last 100 updates
+        # Sequential ID per firm so reconnecting streams can resume (Last-Event-ID)
+        update['id'] = client.incr(f"dashboard:sequence:{firm_id}")
+
+        # Store update in Redis list for dashboard history and trim it to
+        # keep only recent updates
+        pipe = client.pipeline()
+        pipe.rpush(key, json.dumps(update, default=str))
+        pipe.ltrim(key, -100, -1)  # Keep last 100 updates
+        pipe.execute()
 
     def _notify_dashboard_clients(self, firm_id: int, update: Dict[str, Any]) -> None:
         """Notify connected dashboard clients of update"""
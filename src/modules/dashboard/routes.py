@@ -2,7 +2,7 @@
 Main dashboard blueprint
 """
 
-from flask import Blueprint, render_template, session
+from flask import Blueprint, render_template, session, request, jsonify, Response
 
 from .aggregator_service import DashboardAggregatorService
 from src.shared.utils.consolidated import get_session_firm_id, get_session_user_id
@@ -47,4 +47,41 @@ def main():
                          user_workload=dashboard_data['user_workload'],
                          upcoming_tasks=dashboard_data['upcoming_tasks'],
                          today_tasks=dashboard_data['today_tasks_count'],
-                         due_this_week=dashboard_data['tasks']['due_soon'])
\ No newline at end of file
+                         due_this_week=dashboard_data['tasks']['due_soon'])
+
+
+@dashboard_bp.route('/dashboard/stream')
+def stream():
+    """Server-sent events stream of live dashboard updates for the current firm"""
+    from .stream_service import dashboard_stream_broker
+    
+    firm_id = get_session_firm_id()
+    
+    if not dashboard_stream_broker.is_available():
+        return jsonify({'success': False, 'error': 'Live updates not available'}), 503
+    
+    # EventSource resends the last seen ID on reconnect; allow a query param for manual clients
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    
+    return Response(
+        dashboard_stream_broker.stream(firm_id, last_event_id),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'  # Disable proxy buffering (nginx)
+        }
+    )
+
+
+@dashboard_bp.route('/api/autocomplete')
+def autocomplete():
+    """Typeahead suggestions for the global search box (served from memory)"""
+    from .autocomplete_service import autocomplete_service
+    
+    firm_id = get_session_firm_id()
+    query = request.args.get('q', '')
+    types = [t for t in request.args.get('types', '').split(',') if t] or None
+    limit = min(max(request.args.get('limit', 10, type=int), 1), 50)
+    
+    result = autocomplete_service.suggest(firm_id, query, types, limit)
+    return jsonify(result), 200 if result.get('success') else 503
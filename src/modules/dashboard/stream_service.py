@@ -0,0 +1,318 @@
+"""
+Dashboard Stream Broker for CPA WorkflowPilot
+Fans dashboard notifications out to server-sent event connections. Every
+browser connection for a firm shares one Redis subscription per process, so
+1,000 open dashboards cost one pubsub connection per firm rather than 1,000.
+
+Streams block on queues and sockets, so they should be served by an
+async-capable worker (see gunicorn.conf.py) where idle connections are
+greenlets instead of OS threads.
+"""
+
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Dict, Any, Iterator, List, Optional, Set, Tuple
+
+from src.shared.database.redis_client import RedisClientMixin
+
+logger = logging.getLogger(__name__)
+
+UPDATES_KEY_TEMPLATE = 'dashboard:updates:{firm_id}'
+CHANNEL_TEMPLATE = 'dashboard:notifications:{firm_id}'
+
+
+class DashboardListener:
+    """A single browser connection waiting for dashboard updates"""
+
+    def __init__(self, firm_id: int, max_queue_size: int):
+        self.firm_id = firm_id
+        self.queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self.overflowed = False
+        self.disconnected = False
+
+    def offer(self, item: Tuple[Optional[int], str]) -> bool:
+        """
+        Queue an update without blocking the shared reader
+
+        A listener that cannot keep up is marked as overflowed instead of
+        slowing everyone else down; its stream then asks the browser to resync.
+        """
+        if self.overflowed:
+            return False
+
+        try:
+            self.queue.put_nowait(item)
+            return True
+        except queue.Full:
+            self.overflowed = True
+            return False
+
+    def disconnect(self):
+        """Wake the stream so it closes (the browser will reconnect)"""
+        self.disconnected = True
+        try:
+            self.queue.put_nowait(None)
+        except queue.Full:
+            pass
+
+
+class _FirmSubscription:
+    """One Redis pubsub and reader thread shared by every listener of a firm"""
+
+    POLL_TIMEOUT = 1.0
+
+    def __init__(self, broker: 'DashboardStreamBroker', firm_id: int):
+        self.broker = broker
+        self.firm_id = firm_id
+        self.listeners: Set[DashboardListener] = set()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, client):
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(client,),
+            name=f"dashboard-stream-{self.firm_id}",
+            daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+
+    def _run(self, client):
+        pubsub = client.pubsub(ignore_subscribe_messages=True)
+        try:
+            pubsub.subscribe(CHANNEL_TEMPLATE.format(firm_id=self.firm_id))
+            while not self._stopped.is_set():
+                message = pubsub.get_message(timeout=self.POLL_TIMEOUT)
+                if message and message.get('type') == 'message':
+                    self.broker._dispatch(self.firm_id, message.get('data'))
+        except Exception as e:
+            logger.warning(f"Dashboard stream subscription for firm {self.firm_id} failed: {e}")
+        finally:
+            try:
+                pubsub.close()
+            except Exception:
+                pass
+            self.broker._subscription_ended(self)
+
+
+class DashboardStreamBroker(RedisClientMixin):
+    """
+    Per-process registry of dashboard listeners multiplexed over Redis pubsub
+
+    Listeners get bounded queues; a slow connection is dropped with a
+    ``resync`` event rather than buffering without limit. Reconnecting
+    browsers send ``Last-Event-ID`` and are replayed from the
+    ``dashboard:updates:{firm_id}`` list.
+    """
+
+    MAX_QUEUE_SIZE = int(os.environ.get('DASHBOARD_STREAM_MAX_QUEUE', 100))
+    HEARTBEAT_SECONDS = int(os.environ.get('DASHBOARD_STREAM_HEARTBEAT', 15))
+    MAX_CONNECTION_SECONDS = int(os.environ.get('DASHBOARD_STREAM_MAX_SECONDS', 1800))
+    RETRY_MS = 5000
+
+    def __init__(self, redis_client_instance=None, max_queue_size: int = MAX_QUEUE_SIZE,
+                 heartbeat_seconds: int = HEARTBEAT_SECONDS,
+                 max_connection_seconds: int = MAX_CONNECTION_SECONDS):
+        """
+        Initialize stream broker
+
+        Args:
+            redis_client_instance: RedisClient instance (optional, defaults to the global client)
+            max_queue_size: Max undelivered updates per connection before it is dropped
+            heartbeat_seconds: Idle interval after which a comment heartbeat is sent
+            max_connection_seconds: Connections are recycled after this long
+        """
+        self._redis_client = redis_client_instance
+        self.max_queue_size = max_queue_size
+        self.heartbeat_seconds = heartbeat_seconds
+        self.max_connection_seconds = max_connection_seconds
+        self._subscriptions: Dict[int, _FirmSubscription] = {}
+        self._lock = threading.Lock()
+
+    def is_available(self) -> bool:
+        return self._get_client() is not None
+
+    def subscribe(self, firm_id: int) -> DashboardListener:
+        """Register a listener, starting the firm's shared subscription if needed"""
+        listener = DashboardListener(firm_id, self.max_queue_size)
+
+        with self._lock:
+            subscription = self._subscriptions.get(firm_id)
+            if subscription is None:
+                client = self._get_client()
+                if client is None:
+                    raise RuntimeError('Redis not available for dashboard streaming')
+                subscription = _FirmSubscription(self, firm_id)
+                self._subscriptions[firm_id] = subscription
+                subscription.start(client)
+            subscription.listeners.add(listener)
+
+        return listener
+
+    def unsubscribe(self, listener: DashboardListener):
+        """Remove a listener, stopping the firm's subscription when it was the last"""
+        with self._lock:
+            subscription = self._subscriptions.get(listener.firm_id)
+            if subscription is None:
+                return
+            subscription.listeners.discard(listener)
+            if not subscription.listeners:
+                subscription.stop()
+                del self._subscriptions[listener.firm_id]
+
+    def _subscription_ended(self, subscription: _FirmSubscription):
+        """Disconnect listeners of a subscription whose reader stopped unexpectedly"""
+        with self._lock:
+            if self._subscriptions.get(subscription.firm_id) is subscription:
+                del self._subscriptions[subscription.firm_id]
+            listeners = list(subscription.listeners)
+
+        for listener in listeners:
+            listener.disconnect()
+
+    def _dispatch(self, firm_id: int, data):
+        """Format an update once and offer it to every listener of the firm"""
+        update = self._parse_update(data)
+        if update is None:
+            return
+
+        item = (self._event_id(update), self.format_event(update))
+
+        with self._lock:
+            subscription = self._subscriptions.get(firm_id)
+            listeners = list(subscription.listeners) if subscription else []
+
+        for listener in listeners:
+            listener.offer(item)
+
+    def get_recent_updates(self, firm_id: int, after_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get stored updates for a firm, oldest first
+
+        Args:
+            firm_id: Firm ID
+            after_id: Only return updates newer than this event ID
+
+        Returns:
+            list: Update dictionaries
+        """
+        client = self._get_client()
+        if not client:
+            return []
+
+        try:
+            raw_updates = client.lrange(UPDATES_KEY_TEMPLATE.format(firm_id=firm_id), 0, -1)
+        except Exception as e:
+            logger.warning(f"Failed to read dashboard updates for firm {firm_id}: {e}")
+            return []
+
+        updates = [u for u in (self._parse_update(raw) for raw in raw_updates) if u is not None]
+        if after_id is not None:
+            updates = [u for u in updates if (self._event_id(u) or 0) > after_id]
+        return updates
+
+    def stream(self, firm_id: int, last_event_id: Optional[str] = None) -> Iterator[str]:
+        """
+        Generate the server-sent event stream for one connection
+
+        Args:
+            firm_id: Firm whose updates to stream
+            last_event_id: ``Last-Event-ID`` sent by a reconnecting browser
+
+        Yields:
+            str: SSE frames
+        """
+        after_id = self._coerce_id(last_event_id)
+        listener = self.subscribe(firm_id)
+
+        try:
+            yield f"retry: {self.RETRY_MS}\n\n"
+
+            # Subscribe before replaying so nothing published in between is lost;
+            # duplicates are skipped by event ID below
+            replay = self.get_recent_updates(firm_id, after_id)
+            if after_id is not None and replay and (self._event_id(replay[0]) or 0) > after_id + 1:
+                # Updates were trimmed from the list while the browser was away
+                yield self.format_event({'update_type': 'resync'}, event='resync')
+
+            for update in replay:
+                after_id = self._event_id(update) or after_id
+                yield self.format_event(update)
+
+            deadline = time.monotonic() + self.max_connection_seconds
+            while time.monotonic() < deadline:
+                if listener.overflowed:
+                    yield self.format_event({'update_type': 'resync'}, event='resync')
+                    break
+
+                try:
+                    item = listener.queue.get(timeout=self.heartbeat_seconds)
+                except queue.Empty:
+                    yield ": heartbeat\n\n"
+                    continue
+
+                if item is None or listener.disconnected:
+                    break
+
+                event_id, frame = item
+                if event_id is not None and after_id is not None and event_id <= after_id:
+                    continue
+                after_id = event_id if event_id is not None else after_id
+                yield frame
+
+        finally:
+            self.unsubscribe(listener)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get connection counts for this process"""
+        with self._lock:
+            return {
+                'subscriptions': len(self._subscriptions),
+                'listeners': sum(len(s.listeners) for s in self._subscriptions.values()),
+                'firms': {firm_id: len(s.listeners) for firm_id, s in self._subscriptions.items()}
+            }
+
+    @classmethod
+    def format_event(cls, update: Dict[str, Any], event: Optional[str] = None) -> str:
+        """Serialize an update as an SSE frame"""
+        lines = []
+        event_id = cls._event_id(update)
+        if event_id is not None:
+            lines.append(f"id: {event_id}")
+        if event:
+            lines.append(f"event: {event}")
+        lines.append(f"data: {json.dumps(update, default=str)}")
+        return "\n".join(lines) + "\n\n"
+
+    @staticmethod
+    def _parse_update(data) -> Optional[Dict[str, Any]]:
+        if isinstance(data, dict):
+            return data
+        try:
+            update = json.loads(data)
+            return update if isinstance(update, dict) else None
+        except (TypeError, ValueError):
+            logger.warning("Ignoring malformed dashboard update")
+            return None
+
+    @classmethod
+    def _event_id(cls, update: Dict[str, Any]) -> Optional[int]:
+        return cls._coerce_id(update.get('id'))
+
+    @staticmethod
+    def _coerce_id(value) -> Optional[int]:
+        try:
+            return int(value) if value not in (None, '') else None
+        except (TypeError, ValueError):
+            return None
+
+
+# Global broker shared by every request handled in this process
+dashboard_stream_broker = DashboardStreamBroker()
@@ -29,26 +29,9 @@ def calendar_view():
     from src.modules.project.task_repository import TaskRepository
     task_service = TaskService(TaskRepository())
     
+    # Tasks arrive as plain dicts (one joined query, cached per firm-month)
     calendar_result = task_service.get_tasks_for_calendar(firm_id, year, month)
-    tasks_by_date = calendar_result.get('tasks_by_date', {}) if calendar_result.get('success') else {}
-    
-    # Prepare task data for JSON serialization
-    serialized_calendar_data = {}
-    for date_str, tasks in tasks_by_date.items():
-        serialized_calendar_data[date_str] = []
-        for task in tasks:
-            task_data = {
-                'id': task.id,
-                'title': task.title,
-                'description': task.description,
-                'status': task.status,
-                'priority': task.priority,
-                'is_overdue': getattr(task, 'is_overdue', False),
-                'is_due_soon': getattr(task, 'is_due_soon', False),
-                'project_name': task.project.name if task.project else None,
-                'assignee_name': task.assignee.name if task.assignee else None
-            }
-            serialized_calendar_data[date_str].append(task_data)
+    serialized_calendar_data = calendar_result.get('tasks_by_date', {}) if calendar_result.get('success') else {}
     
     return render_template('admin/calendar.html', 
                          calendar_data=serialized_calendar_data,
@@ -187,14 +170,19 @@ def kanban_view():
     kanban_columns = []
     
     for column_key, column_data in kanban_columns_data.items():
-        projects_by_column[column_key] = column_data.get('projects', [])
-        project_counts[column_key] = len(column_data.get('projects', []))
+        # The template looks columns up by id (the status ID the move endpoint expects)
+        column_id = column_data.get('id', column_key)
+        projects_by_column[column_id] = column_data.get('projects', [])
+        project_counts[column_id] = len(column_data.get('projects', []))
+        
+        if column_id == 'completed':
+            continue  # Rendered separately by the template
         
         # Create column object for template
         from collections import namedtuple
         Column = namedtuple('Column', ['id', 'title', 'order'])
         kanban_columns.append(Column(
-            id=column_data.get('id', column_key),
+            id=column_id,
             title=column_data.get('title', column_key),
             order=column_data.get('position', 0)
         ))
@@ -3,10 +3,13 @@ Document module for CPA WorkflowPilot
 Handles documents, checklists, and AI analysis functionality
 """
 
-from .routes import documents_bp
-from .ai_routes import ai_bp
+# Imported when the app registers this module, not when the package is imported
+BLUEPRINTS = (
+    f'{__name__}.routes:documents_bp',
+    f'{__name__}.ai_routes:ai_bp',
+)
 
 def register_module(app):
     """Register the document module with the Flask app"""
-    app.register_blueprint(documents_bp)
-    app.register_blueprint(ai_bp)
\ No newline at end of file
+    from src.shared.bootstrap import register_blueprints
+    register_blueprints(app, BLUEPRINTS)
@@ -8,16 +8,10 @@ import time
 from typing import Dict, Any, Optional
 from io import BytesIO
 
-from .base_provider import AIProvider
+from .base_provider import AIProvider, sdk_installed
 
-# Azure imports - only if available
-try:
-    from azure.core.credentials import AzureKeyCredential
-    from azure.ai.documentintelligence import DocumentIntelligenceClient
-    from azure.core.exceptions import HttpResponseError
-    AZURE_AVAILABLE = True
-except ImportError:
-    AZURE_AVAILABLE = False
+# The SDK itself is imported on first use so worker start-up does not pay for it
+AZURE_AVAILABLE = sdk_installed('azure.ai.documentintelligence')
 
 
 class AzureProvider(AIProvider):
@@ -52,6 +46,9 @@ class AzureProvider(AIProvider):
             return False
         
         try:
+            from azure.core.credentials import AzureKeyCredential
+            from azure.ai.documentintelligence import DocumentIntelligenceClient
+            
             # Use latest API version that supports prebuilt-tax.us.1099 model
             self.client = DocumentIntelligenceClient(
                 endpoint=self.endpoint,
@@ -88,6 +85,8 @@ class AzureProvider(AIProvider):
         if not self.validate_document(document_path):
             raise Exception(f"Document validation failed: {document_path}")
         
+        from azure.core.exceptions import HttpResponseError
+        
         start_time = time.time()
         
         try:
@@ -3,10 +3,20 @@ Base AIProvider interface for implementing the Strategy Pattern.
 All AI providers must implement this interface.
 """
 
+import importlib.util
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional
 
 
+def sdk_installed(module_name: str) -> bool:
+    """Whether an optional SDK can be imported, without importing it"""
+    try:
+        return importlib.util.find_spec(module_name) is not None
+    except (ImportError, ValueError):
+        # A missing parent package raises rather than returning None
+        return False
+
+
 class AIProvider(ABC):
     """Abstract base class for AI providers"""
     
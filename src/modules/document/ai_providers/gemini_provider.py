@@ -9,15 +9,10 @@ import base64
 import re
 from typing import Dict, Any, Optional
 
-from .base_provider import AIProvider
+from .base_provider import AIProvider, sdk_installed
 
-# Gemini imports - only if available
-try:
-    from google import genai
-    from google.genai import types
-    GEMINI_AVAILABLE = True
-except (ImportError, Exception) as e:
-    GEMINI_AVAILABLE = False
+# The SDK itself is imported on first use so worker start-up does not pay for it
+GEMINI_AVAILABLE = sdk_installed('google.genai')
 
 
 class GeminiProvider(AIProvider):
@@ -49,6 +44,7 @@ class GeminiProvider(AIProvider):
             return False
         
         try:
+            from google import genai
             self.client = genai.Client(api_key=self.api_key)
             self.is_initialized = True
             logging.info("Google Gemini initialized successfully")
@@ -80,6 +76,8 @@ class GeminiProvider(AIProvider):
         if not self.validate_document(document_path):
             raise Exception(f"Document validation failed: {document_path}")
         
+        from google.genai import types
+        
         start_time = time.time()
         
         try:
@@ -14,18 +14,29 @@ from src.models import (
     IncomeWorksheet, User, Attachment
 )
 from src.shared.services import ActivityLoggingService as ActivityService
+from src.shared.di_container import get_service
 from .analysis_service import AIAnalysisService
+from .interface import IAIService
 from .service import DocumentService
 from src.shared.utils.consolidated import get_session_firm_id, get_session_user_id
 
 ai_bp = Blueprint('ai', __name__)
 
 
+def _get_ai_service():
+    """The container's process-wide AIAnalysisService, so providers are not rebuilt per request"""
+    try:
+        return get_service(IAIService)
+    except ValueError:
+        # Fallback to direct instantiation if DI not set up
+        return AIAnalysisService(current_app.config)
+
+
 @ai_bp.route('/api/ai-services/status', methods=['GET'])
 def ai_services_status():
     """Check the status of AI services"""
     try:
-        ai_service = AIAnalysisService(current_app.config)
+        ai_service = _get_ai_service()
         status = ai_service.get_ai_services_status()
         status_code = 500 if 'error' in status else 200
         return jsonify(status), status_code
@@ -46,7 +57,7 @@ def analyze_document(document_id):
         firm_id = get_session_firm_id()
         
         # Initialize AI service and perform analysis
-        ai_service = AIAnalysisService(current_app.config)
+        ai_service = _get_ai_service()
         results = ai_service.get_or_analyze_document(document_id, firm_id, force_reanalysis=True)
         
         return jsonify({
@@ -74,7 +85,7 @@ def get_document_analysis(document_id):
         force_reanalysis = request.args.get('force_reanalysis', 'false').lower() == 'true'
         
         # Use AI service for business logic
-        ai_service = AIAnalysisService(current_app.config)
+        ai_service = _get_ai_service()
         response_data = ai_service.get_or_analyze_document(document_id, firm_id, force_reanalysis)
         
         # Transform new data structure to old format for frontend compatibility
@@ -89,7 +100,7 @@ def get_document_analysis(document_id):
                     analysis_results = {}
             
             # Use AIService to transform data structure  
-            ai_service = AIAnalysisService(current_app.config)
+            ai_service = _get_ai_service()
             transformed_data = ai_service.transform_analysis_to_old_format(analysis_results)
             
             # Add metadata
@@ -131,7 +142,7 @@ def analyze_checklist(checklist_id):
         force_reanalysis = request_data.get('force_reanalysis', False)
         
         # Use AI service for business logic
-        ai_service = AIAnalysisService(current_app.config)
+        ai_service = _get_ai_service()
         
         # Check if AI services are available first
         if not ai_service.is_available():
@@ -159,6 +170,25 @@ def analyze_checklist(checklist_id):
         return jsonify({'success': False, 'error': f'Analysis failed: {str(e)}'}), 500
 
 
+@ai_bp.route('/api/checklists/<int:checklist_id>/analysis-progress', methods=['GET'])
+def checklist_analysis_progress(checklist_id):
+    """Get progress of the latest background analysis batch for a checklist"""
+    from src.shared.utils.batch_progress import BatchProgressTracker
+
+    try:
+        firm_id = get_session_firm_id()
+        progress = BatchProgressTracker().get_checklist_progress(checklist_id)
+
+        # Never expose another firm's batch (nor one that was stored without a firm)
+        if not progress or progress.get('firm_id') is None or progress['firm_id'] != firm_id:
+            return jsonify({'success': False, 'error': 'No analysis in progress for this checklist'}), 404
+
+        return jsonify({'success': True, 'progress': progress})
+
+    except Exception as e:
+        return jsonify({'success': False, 'error': f'Failed to get analysis progress: {str(e)}'}), 500
+
+
 @ai_bp.route('/api/export-checklist-analysis/<int:checklist_id>', methods=['GET'])
 def export_checklist_analysis(checklist_id):
     """Export checklist analysis results"""
@@ -169,7 +199,7 @@ def export_checklist_analysis(checklist_id):
         firm_id = get_session_firm_id()
         
         # Use AI service for business logic
-        ai_service = AIAnalysisService(current_app.config)
+        ai_service = _get_ai_service()
         result = ai_service.export_checklist_analysis(checklist_id, firm_id)
         
         if not result['success']:
@@ -203,7 +233,7 @@ def generate_income_worksheet(checklist_id):
         user_id = get_session_user_id()
         
         # Use AI service for business logic
-        ai_service = AIAnalysisService(current_app.config)
+        ai_service = _get_ai_service()
         results = ai_service.generate_income_worksheet(checklist_id, firm_id, user_id)
         
         return jsonify(results)
@@ -224,7 +254,7 @@ def download_income_worksheet(checklist_id):
         firm_id = get_session_firm_id()
         
         # Use AI service for business logic
-        ai_service = AIAnalysisService(current_app.config)
+        ai_service = _get_ai_service()
         result = ai_service.get_income_worksheet_for_download(checklist_id, firm_id)
         
         if not result['success']:
@@ -257,7 +287,7 @@ def get_saved_income_worksheet(checklist_id):
         firm_id = get_session_firm_id()
         
         # Use AI service for business logic
-        ai_service = AIAnalysisService(current_app.config)
+        ai_service = _get_ai_service()
         results = ai_service.get_saved_income_worksheet(checklist_id, firm_id)
         
         if not results['success']:
@@ -3,7 +3,13 @@ Document-related models for CPA WorkflowPilot
 """
 
 from datetime import datetime
+from sqlalchemy.orm import validates
+
 from src.shared.database.db_import import db
+from src.shared.utils.access_codes import access_code_cache, hash_access_code
+
+
+_EMPTY_STATS = {'total': 0, 'uploaded': 0, 'pending': 0, 'completed': 0, 'progress': 0, 'last_activity': None}
 
 
 class ClientChecklistAccess(db.Model):
@@ -78,6 +84,9 @@ class DocumentChecklist(db.Model):
     
     # Client access token for public URL sharing
     access_token = db.Column(db.String(255), unique=True)  # Secure URL token for client access
+    access_token_hash = db.Column(db.String(64), unique=True, index=True)  # Lookup key, see access_codes.py
+    public_access_token = db.synonym('access_token')  # Name used by the share-link flow
+    public_access_enabled = db.Column(db.Boolean, default=False, nullable=False)
     token_expires_at = db.Column(db.DateTime)  # Optional expiration
     client_email = db.Column(db.String(255))  # Client email for verification
     token_access_count = db.Column(db.Integer, default=0, nullable=False)  # Track access count
@@ -92,6 +101,87 @@ class DocumentChecklist(db.Model):
     # Relationships - using string references to avoid circular imports
     # client = db.relationship('Client', backref='document_checklists')
     # creator = db.relationship('User', backref='created_checklists')
+    
+    @validates('access_token')
+    def _hash_access_token(self, key, access_token):
+        """Keep access_token_hash in step and drop cached lookups of the old and new token"""
+        access_code_cache.discard('checklist', self.access_token_hash)
+        self.access_token_hash = hash_access_code(access_token)
+        access_code_cache.discard('checklist', self.access_token_hash)
+        return access_token
+    
+    @classmethod
+    def aggregate_stats(cls, checklist_ids=None, client_id=None):
+        """
+        Item counts per checklist from one LEFT JOIN ... GROUP BY
+        
+        Args:
+            checklist_ids: Limit to these checklists
+            client_id: Limit to this client's active checklists
+            
+        Returns:
+            dict: checklist id -> ``total``, ``uploaded``, ``pending``,
+            ``completed`` (any status but pending), ``progress`` (0-100)
+            and ``last_activity`` (ISO timestamp or None)
+        """
+        pending = ChecklistItem.status == 'pending'
+        query = db.session.query(
+            cls.id,
+            db.func.count(ChecklistItem.id).label('total'),
+            db.func.count(ChecklistItem.id).filter(ChecklistItem.status == 'uploaded').label('uploaded'),
+            db.func.count(ChecklistItem.id).filter(pending).label('pending'),
+            db.func.count(ChecklistItem.id).filter(~pending).label('completed'),
+            db.func.max(ChecklistItem.updated_at).label('last_activity')
+        ).outerjoin(ChecklistItem, ChecklistItem.checklist_id == cls.id).group_by(cls.id)
+        
+        if checklist_ids is not None:
+            query = query.filter(cls.id.in_(list(checklist_ids)))
+        if client_id is not None:
+            query = query.filter(cls.client_id == client_id, cls.is_active == True)
+        
+        return {row.id: {
+            'total': row.total,
+            'uploaded': row.uploaded,
+            'pending': row.pending,
+            'completed': row.completed,
+            'progress': round(row.completed / row.total * 100) if row.total else 0,
+            'last_activity': row.last_activity.isoformat() if row.last_activity else None
+        } for row in query.all()}
+    
+    @property
+    def stats(self):
+        """Item counts, from ``attach_stats`` or one aggregate query on first use"""
+        if '_stats' not in self.__dict__:
+            self.__dict__['_stats'] = DocumentChecklist.aggregate_stats([self.id]).get(self.id, _EMPTY_STATS)
+        return self.__dict__['_stats']
+    
+    def attach_stats(self, stats):
+        self.__dict__['_stats'] = stats or _EMPTY_STATS
+    
+    @property
+    def progress_percentage(self):
+        """Calculate progress percentage of checklist"""
+        return self.stats['progress']
+    
+    @property
+    def completion_percentage(self):
+        """Alias for progress_percentage"""
+        return self.progress_percentage
+    
+    @property
+    def pending_items_count(self):
+        """Count of pending items"""
+        return self.stats['pending']
+    
+    @property
+    def completed_items_count(self):
+        """Count of completed items (any status except pending)"""
+        return self.stats['completed']
+    
+    @property
+    def uploaded_items_count(self):
+        """Count of uploaded items"""
+        return self.stats['uploaded']
 
 
 class ChecklistItem(db.Model):
@@ -104,6 +194,12 @@ class ChecklistItem(db.Model):
     description = db.Column(db.Text)
     is_required = db.Column(db.Boolean, default=True, nullable=False)
     order_index = db.Column(db.Integer, default=0, nullable=False)
+    status = db.Column(db.String(20), default='pending', nullable=False)  # pending, uploaded, already_provided, not_applicable
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        db.Index('ix_checklist_item_checklist_status', 'checklist_id', 'status'),
+    )
     
     # Relationships
     checklist = db.relationship('DocumentChecklist', backref='items')
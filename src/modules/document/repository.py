@@ -13,6 +13,7 @@ from datetime import datetime
 from src.shared.database.db_import import db
 from src.models import ClientDocument, DocumentChecklist, Client, ChecklistItem
 from src.shared.repositories.base import BaseRepository
+from src.shared.utils.access_codes import access_code_cache, hash_access_code
 
 logger = logging.getLogger(__name__)
 
@@ -134,11 +135,21 @@ class DocumentRepository(BaseRepository):
         ).order_by(DocumentChecklist.created_at.desc()).all()
     
     def get_checklist_by_token(self, token: str) -> Optional[DocumentChecklist]:
-        """Get checklist by public access token"""
-        return DocumentChecklist.query.filter_by(
-            public_access_token=token,
-            public_access_enabled=True
-        ).first()
+        """Get checklist by public access token (hashed lookup behind the access code cache)"""
+        checklist_id = access_code_cache.resolve('checklist', token, self._get_checklist_id_by_token_hash)
+        checklist = db.session.get(DocumentChecklist, checklist_id) if checklist_id is not None else None
+        
+        # Another process may have regenerated the token since this one cached it
+        if not checklist or checklist.access_token_hash != hash_access_code(token):
+            return None
+        if not checklist.public_access_enabled:
+            return None
+        return checklist
+    
+    def _get_checklist_id_by_token_hash(self, token_hash: str) -> Optional[int]:
+        return db.session.query(DocumentChecklist.id).filter(
+            DocumentChecklist.access_token_hash == token_hash
+        ).scalar()
     
     def get_checklist_by_id_with_firm_access(self, checklist_id: int, firm_id: int) -> Optional[DocumentChecklist]:
         """Get checklist with firm access check"""
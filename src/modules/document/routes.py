@@ -10,6 +10,7 @@ import mimetypes
 from werkzeug.utils import secure_filename
 
 from src.shared.services import ActivityLoggingService as ActivityService
+from src.shared.utils.access_codes import access_code_throttle
 from src.shared.utils.consolidated import get_session_firm_id, get_session_user_id
 from .service import DocumentService
 
@@ -242,20 +243,19 @@ def checklist_stats_api(checklist_id):
         flash('Checklist not found or access denied', 'error')
         return redirect(url_for('documents.document_checklists'))
     
+    # One grouped query instead of loading every item
+    counts = checklist.stats
     stats = {
-        'total_items': len(checklist.items),
-        'pending': checklist.pending_items_count,
-        'uploaded': checklist.uploaded_items_count,
-        'completed': checklist.completed_items_count,
-        'progress': checklist.progress_percentage,
+        'total_items': counts['total'],
+        'pending': counts['pending'],
+        'uploaded': counts['uploaded'],
+        'completed': counts['completed'],
+        'progress': counts['progress'],
         'last_activity': None
     }
     
-    # Get last activity
-    if checklist.items:
-        latest_update = max([item.updated_at for item in checklist.items if item.updated_at])
-        if latest_update:
-            stats['last_activity'] = latest_update.strftime('%Y-%m-%d %H:%M:%S')
+    if counts['last_activity']:
+        stats['last_activity'] = datetime.fromisoformat(counts['last_activity']).strftime('%Y-%m-%d %H:%M:%S')
     
     return jsonify(stats)
 
@@ -296,15 +296,28 @@ def regenerate_checklist_share(checklist_id):
     return redirect(url_for('documents.share_checklist', checklist_id=checklist_id))
 
 
+def _get_shared_checklist(document_service, token):
+    """Look up a share-link checklist, refusing IPs that keep presenting bad tokens"""
+    client_ip = request.remote_addr
+    if not access_code_throttle.allow(client_ip):
+        flash('Too many invalid links. Please try again later.', 'error')
+        return None
+    
+    checklist = document_service.get_checklist_by_token(token)
+    if not checklist:
+        access_code_throttle.record_failure(client_ip)
+        flash('Checklist not found or access denied', 'error')
+    return checklist
+
+
 @documents_bp.route('/checklist/<token>')
 def public_checklist(token):
     """Public view of checklist for client access"""
     document_service = DocumentService()
     
     # Find checklist by token using service layer
-    checklist = document_service.get_checklist_by_token(token)
+    checklist = _get_shared_checklist(document_service, token)
     if not checklist:
-        flash('Checklist not found or access denied', 'error')
         return redirect(url_for('documents.document_checklists'))
     
     return render_template('documents/public_checklist.html', checklist=checklist)
@@ -316,9 +329,8 @@ def public_checklist_upload(token):
     document_service = DocumentService()
     
     # Find checklist by token using service layer
-    checklist = document_service.get_checklist_by_token(token)
+    checklist = _get_shared_checklist(document_service, token)
     if not checklist:
-        flash('Checklist not found or access denied', 'error')
         return redirect(url_for('documents.document_checklists'))
     
     item_id = request.form.get('item_id')
@@ -345,9 +357,8 @@ def public_checklist_status(token):
     document_service = DocumentService()
     
     # Find checklist by token using service layer
-    checklist = document_service.get_checklist_by_token(token)
+    checklist = _get_shared_checklist(document_service, token)
     if not checklist:
-        flash('Checklist not found or access denied', 'error')
         return redirect(url_for('documents.document_checklists'))
     
     item_id = request.form.get('item_id')
@@ -3,8 +3,12 @@ Export Module for CPA WorkflowPilot
 Handles data export functionality for various formats.
 """
 
-from .routes import export_bp
+# Imported when the app registers this module, not when the package is imported
+BLUEPRINTS = (
+    f'{__name__}.routes:export_bp',
+)
 
 def register_module(app):
     """Register the export module with the Flask app"""
-    app.register_blueprint(export_bp)
\ No newline at end of file
+    from src.shared.bootstrap import register_blueprints
+    register_blueprints(app, BLUEPRINTS)
@@ -6,86 +6,169 @@ Other modules MUST only interact with the export module through this interface.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 
 
 class IExportService(ABC):
     """Public interface for export operations"""
     
     @abstractmethod
-    def export_projects_csv(self, firm_id: int) -> Any:
+    def export_projects_csv(self, firm_id: int, columns: Optional[List[str]] = None) -> Any:
         """
         Export projects as CSV
         
         Args:
             firm_id: Firm ID
+            columns: Column keys to export, in order (None for the default CSV columns)
             
         Returns:
             Flask response with CSV file or error dictionary
+            
+        Raises:
+            ValidationError: If ``columns`` names an unknown column
         """
         pass
     
     @abstractmethod
-    def export_projects_json(self, firm_id: int) -> Any:
+    def export_projects_json(self, firm_id: int, columns: Optional[List[str]] = None) -> Any:
         """
         Export projects as JSON
         
         Args:
             firm_id: Firm ID
+            columns: Column keys to export, in order (None for all)
             
         Returns:
             Flask response with JSON file or error dictionary
+            
+        Raises:
+            ValidationError: If ``columns`` names an unknown column
         """
         pass
     
     @abstractmethod
-    def export_clients_csv(self, firm_id: int) -> Any:
+    def export_clients_csv(self, firm_id: int, columns: Optional[List[str]] = None) -> Any:
         """
         Export clients as CSV
         
         Args:
             firm_id: Firm ID
+            columns: Column keys to export, in order (None for the default CSV columns)
             
         Returns:
             Flask response with CSV file or error dictionary
+            
+        Raises:
+            ValidationError: If ``columns`` names an unknown column
         """
         pass
     
     @abstractmethod
-    def export_clients_json(self, firm_id: int) -> Any:
+    def export_clients_json(self, firm_id: int, columns: Optional[List[str]] = None) -> Any:
         """
         Export clients as JSON
         
         Args:
             firm_id: Firm ID
+            columns: Column keys to export, in order (None for all)
             
         Returns:
             Flask response with JSON file or error dictionary
+            
+        Raises:
+            ValidationError: If ``columns`` names an unknown column
         """
         pass
     
     @abstractmethod
-    def export_tasks_csv(self, firm_id: int) -> Any:
+    def export_tasks_csv(self, firm_id: int, columns: Optional[List[str]] = None) -> Any:
         """
         Export tasks as CSV
         
         Args:
             firm_id: Firm ID
+            columns: Column keys to export, in order (None for the default CSV columns)
             
         Returns:
             Flask response with CSV file or error dictionary
+            
+        Raises:
+            ValidationError: If ``columns`` names an unknown column
         """
         pass
     
     @abstractmethod
-    def export_tasks_json(self, firm_id: int) -> Any:
+    def export_tasks_json(self, firm_id: int, columns: Optional[List[str]] = None) -> Any:
         """
         Export tasks as JSON
         
         Args:
             firm_id: Firm ID
+            columns: Column keys to export, in order (None for all)
             
         Returns:
             Flask response with JSON file or error dictionary
+            
+        Raises:
+            ValidationError: If ``columns`` names an unknown column
         """
-        pass
\ No newline at end of file
+        pass
+    
+    @abstractmethod
+    def start_export_job(self, firm_id: int, user_id: Optional[int], entity: str, format: str,
+                         columns: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Queue a background export to a Parquet or XLSX file
+        
+        Args:
+            firm_id: Firm ID
+            user_id: User requesting the export
+            entity: 'projects', 'clients' or 'tasks'
+            format: 'parquet' or 'xlsx'
+            columns: Column keys to export, in order (None for all)
+            
+        Returns:
+            Dictionary with the job ID or an error
+        """
+        pass
+    
+    @abstractmethod
+    def run_export_job(self, job_id: str) -> Dict[str, Any]:
+        """
+        Build the file for a queued export job
+        
+        Args:
+            job_id: Export job ID
+            
+        Returns:
+            Dictionary with row count and file size or an error
+        """
+        pass
+    
+    @abstractmethod
+    def get_export_job(self, job_id: str, firm_id: int) -> Dict[str, Any]:
+        """
+        Get the status of an export job
+        
+        Args:
+            job_id: Export job ID
+            firm_id: Firm ID (jobs of other firms are not visible)
+            
+        Returns:
+            Dictionary with job status and, once complete, a signed download token
+        """
+        pass
+    
+    @abstractmethod
+    def resolve_download(self, token: str) -> Dict[str, Any]:
+        """
+        Verify a signed download token
+        
+        Args:
+            token: Token from get_export_job
+            
+        Returns:
+            Dictionary with the file path and download filename or an error
+        """
+        pass
+
@@ -0,0 +1,119 @@
+"""
+Export Job Store for CPA WorkflowPilot
+Tracks background Parquet/XLSX export jobs in Redis. The worker that builds
+the file and the web process that serves it share job state through here,
+and the finished file through ``EXPORT_FILE_DIR`` (a shared volume when the
+worker runs on another host).
+"""
+
+import json
+import logging
+import os
+import tempfile
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+from src.shared.database.redis_client import RedisClientMixin
+
+logger = logging.getLogger(__name__)
+
+EXPORT_JOB_FORMATS = ('parquet', 'xlsx')
+EXPORT_ENTITIES = ('projects', 'clients', 'tasks')
+
+EXPORT_FILE_DIR = os.environ.get('EXPORT_FILE_DIR', os.path.join(tempfile.gettempdir(), 'workflow_exports'))
+EXPORT_JOB_TTL = int(os.environ.get('EXPORT_JOB_TTL', 86400))  # Job records and files kept 24 hours
+EXPORT_LINK_MAX_AGE = int(os.environ.get('EXPORT_LINK_MAX_AGE', 3600))  # Download links valid 1 hour
+
+STATUS_QUEUED = 'queued'
+STATUS_RUNNING = 'running'
+STATUS_COMPLETED = 'completed'
+STATUS_FAILED = 'failed'
+
+
+class ExportJobStore(RedisClientMixin):
+    """
+    Redis-backed export job records
+
+    Each job is a hash (``export_job:{job_id}``) holding its firm, entity,
+    format, status and, once finished, its row count and file size.
+    """
+
+    KEY_PREFIX = 'export_job'
+
+    def __init__(self, redis_client_instance=None, ttl: int = EXPORT_JOB_TTL):
+        """
+        Initialize job store
+
+        Args:
+            redis_client_instance: RedisClient instance (optional, defaults to the global client)
+            ttl: Expiration in seconds for job records
+        """
+        self._redis_client = redis_client_instance
+        self.ttl = ttl
+
+    def is_available(self) -> bool:
+        return self._get_client() is not None
+
+    def _key(self, job_id: str) -> str:
+        return f"{self.KEY_PREFIX}:{job_id}"
+
+    def create(self, job_id: str, firm_id: int, user_id: Optional[int], entity: str, format: str,
+               columns: Optional[List[str]] = None) -> bool:
+        """Record a newly queued job"""
+        return self.update(job_id, {
+            'job_id': job_id,
+            'firm_id': firm_id,
+            'user_id': user_id if user_id is not None else '',
+            'entity': entity,
+            'format': format,
+            'columns': json.dumps(columns) if columns else '',
+            'status': STATUS_QUEUED,
+            'created_at': datetime.utcnow().isoformat()
+        })
+
+    def update(self, job_id: str, fields: Dict[str, Any]) -> bool:
+        """Merge fields into a job record and refresh its expiry"""
+        client = self._get_client()
+        if not client:
+            return False
+
+        try:
+            key = self._key(job_id)
+            pipe = client.pipeline()
+            pipe.hset(key, mapping={k: '' if v is None else v for k, v in fields.items()})
+            pipe.expire(key, self.ttl)
+            pipe.execute()
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to update export job {job_id}: {e}")
+            return False
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get a job record, or None if it does not exist or has expired"""
+        client = self._get_client()
+        if not client:
+            return None
+
+        try:
+            data = client.hgetall(self._key(job_id))
+        except Exception as e:
+            logger.warning(f"Failed to read export job {job_id}: {e}")
+            return None
+
+        if not data:
+            return None
+
+        job = dict(data)
+        for field in ('firm_id', 'user_id', 'row_count', 'file_size_bytes'):
+            if job.get(field):
+                job[field] = int(job[field])
+            else:
+                job[field] = None
+        job['duration_seconds'] = float(job['duration_seconds']) if job.get('duration_seconds') else None
+        job['columns'] = json.loads(job['columns']) if job.get('columns') else None
+        return job
+
+
+def export_file_path(job_id: str, format: str) -> str:
+    """Location of a job's finished file"""
+    return os.path.join(EXPORT_FILE_DIR, f"{job_id}.{format}")
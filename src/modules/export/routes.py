@@ -2,12 +2,15 @@
 Export routes for data export functionality
 """
 
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, request, send_file, url_for
 
-from src.shared.utils.consolidated import get_session_firm_id
+from src.shared.utils.consolidated import get_session_firm_id, get_session_user_id
+from src.shared.utils.streaming_export import parse_column_list
 from .interface import IExportService
 from src.shared.di_container import get_service
+from src.shared.exceptions import ValidationError
 from .service import ExportService  # Fallback import
+from .jobs import EXPORT_JOB_FORMATS
 
 export_bp = Blueprint('export', __name__, url_prefix='/export')
 
@@ -17,6 +20,7 @@ def export_projects(format):
     """Export projects in specified format"""
     try:
         firm_id = get_session_firm_id()
+        columns = parse_column_list(request.args.get('columns'))
         
         # Get service from DI container or fallback to direct instantiation
         try:
@@ -25,9 +29,11 @@ def export_projects(format):
             export_service = ExportService()
         
         if format.lower() == 'csv':
-            result = export_service.export_projects_csv(firm_id)
+            result = export_service.export_projects_csv(firm_id, columns)
         elif format.lower() == 'json':
-            result = export_service.export_projects_json(firm_id)
+            result = export_service.export_projects_json(firm_id, columns)
+        elif format.lower() in EXPORT_JOB_FORMATS:
+            return _start_export_job(export_service, firm_id, 'projects', format.lower(), columns)
         else:
             return jsonify({'error': 'Unsupported format'}), 400
         
@@ -37,6 +43,8 @@ def export_projects(format):
         
         return result
         
+    except ValidationError as e:
+        return jsonify({'error': e.message}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -46,6 +54,7 @@ def export_clients(format):
     """Export clients in specified format"""
     try:
         firm_id = get_session_firm_id()
+        columns = parse_column_list(request.args.get('columns'))
         
         # Get service from DI container or fallback to direct instantiation
         try:
@@ -54,9 +63,11 @@ def export_clients(format):
             export_service = ExportService()
         
         if format.lower() == 'csv':
-            result = export_service.export_clients_csv(firm_id)
+            result = export_service.export_clients_csv(firm_id, columns)
         elif format.lower() == 'json':
-            result = export_service.export_clients_json(firm_id)
+            result = export_service.export_clients_json(firm_id, columns)
+        elif format.lower() in EXPORT_JOB_FORMATS:
+            return _start_export_job(export_service, firm_id, 'clients', format.lower(), columns)
         else:
             return jsonify({'error': 'Unsupported format'}), 400
         
@@ -66,6 +77,8 @@ def export_clients(format):
         
         return result
         
+    except ValidationError as e:
+        return jsonify({'error': e.message}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -75,6 +88,7 @@ def export_tasks(format):
     """Export tasks in specified format"""
     try:
         firm_id = get_session_firm_id()
+        columns = parse_column_list(request.args.get('columns'))
         
         # Get service from DI container or fallback to direct instantiation
         try:
@@ -83,9 +97,11 @@ def export_tasks(format):
             export_service = ExportService()
         
         if format.lower() == 'csv':
-            result = export_service.export_tasks_csv(firm_id)
+            result = export_service.export_tasks_csv(firm_id, columns)
         elif format.lower() == 'json':
-            result = export_service.export_tasks_json(firm_id)
+            result = export_service.export_tasks_json(firm_id, columns)
+        elif format.lower() in EXPORT_JOB_FORMATS:
+            return _start_export_job(export_service, firm_id, 'tasks', format.lower(), columns)
         else:
             return jsonify({'error': 'Unsupported format'}), 400
         
@@ -95,6 +111,67 @@ def export_tasks(format):
         
         return result
         
+    except ValidationError as e:
+        return jsonify({'error': e.message}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+def _get_export_service():
+    """Get service from DI container or fallback to direct instantiation"""
+    try:
+        return get_service(IExportService)
+    except (ValueError, ImportError):
+        return ExportService()
+
+
+def _start_export_job(export_service, firm_id, entity, format, columns):
+    """Queue a Parquet/XLSX export and point the client at its status URL"""
+    result = export_service.start_export_job(firm_id, get_session_user_id(), entity, format, columns)
+    
+    if not result['success']:
+        return jsonify({'error': result.get('error', 'Export failed')}), 400
+    
+    return jsonify({
+        'success': True,
+        'job_id': result['job_id'],
+        'status': result['status'],
+        'status_url': url_for('export.export_job_status', job_id=result['job_id'])
+    }), 202
+
+
+@export_bp.route('/jobs/<job_id>')
+def export_job_status(job_id):
+    """Poll a background export; includes a signed download link once complete"""
+    try:
+        firm_id = get_session_firm_id()
+        result = _get_export_service().get_export_job(job_id, firm_id)
+        
+        if not result['success']:
+            return jsonify({'error': result['error']}), 404
+        
+        job = result['job']
+        token = job.pop('download_token', None)
+        if token:
+            job['download_url'] = url_for('export.download_export', token=token)
+        
+        return jsonify({'success': True, 'job': job})
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@export_bp.route('/download/<token>')
+def download_export(token):
+    """Download a finished export through a signed, expiring link"""
+    try:
+        result = _get_export_service().resolve_download(token)
+        
+        if not result['success']:
+            return jsonify({'error': result['error']}), 410
+        
+        return send_file(result['path'], as_attachment=True, download_name=result['filename'])
+        
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
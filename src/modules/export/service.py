@@ -1,17 +1,42 @@
 """
 Export Service for CPA WorkflowPilot
 Handles data export logic for various formats and entities.
+
+Exports are streamed: rows come from a server-side cursor in batches and are
+encoded into CSV or JSON chunks as the response is written, so memory stays
+flat no matter how many rows a firm has. Parquet and XLSX files are built by
+a background job instead and downloaded through a signed, expiring link.
 """
 
-import csv
-import io
-from typing import Dict, Any, List
+import logging
+import os
+import time
+import uuid
+from typing import Dict, Any, Iterator, List, Optional
 from datetime import datetime
-from flask import make_response, jsonify
+from flask import Response, stream_with_context
 
 from src.shared.base import BaseService
+from src.shared.exceptions import ValidationError
 from src.shared.interfaces.service_interfaces import IProjectService, ITaskService, IClientService
+from src.shared.utils.streaming_export import iter_csv, iter_json, DEFAULT_BATCH_SIZE
 from .interface import IExportService
+from .jobs import (
+    ExportJobStore, export_file_path, EXPORT_ENTITIES, EXPORT_FILE_DIR, EXPORT_JOB_FORMATS,
+    EXPORT_JOB_TTL, EXPORT_LINK_MAX_AGE, STATUS_COMPLETED, STATUS_FAILED, STATUS_RUNNING
+)
+
+logger = logging.getLogger(__name__)
+
+# Columns a CSV export carries when ``?columns=`` is not given: the layout
+# these exports had before they were streamed. JSON and background exports
+# default to every exportable column.
+DEFAULT_CSV_COLUMNS = {
+    'projects': ['id', 'name', 'description', 'status', 'start_date', 'end_date', 'client_name', 'created_at'],
+    'clients': ['id', 'name', 'email', 'phone', 'address', 'status', 'created_at'],
+    'tasks': ['id', 'title', 'description', 'status', 'priority', 'due_date', 'project_name',
+              'assignee_name', 'created_at'],
+}
 
 
 class ExportService(BaseService, IExportService):
@@ -20,8 +45,10 @@ class ExportService(BaseService, IExportService):
     def __init__(self, 
                  project_service: IProjectService = None, 
                  task_service: ITaskService = None, 
-                 client_service: IClientService = None):
+                 client_service: IClientService = None,
+                 job_store: ExportJobStore = None):
         super().__init__()
+        self.job_store = job_store or ExportJobStore()
         
         # Use dependency injection if provided, otherwise use DI container
         if project_service is None or task_service is None or client_service is None:
@@ -36,206 +63,243 @@ class ExportService(BaseService, IExportService):
             self.task_service = task_service
             self.client_service = client_service
     
-    def export_projects_csv(self, firm_id: int) -> Any:
+    def export_projects_csv(self, firm_id: int, columns: Optional[List[str]] = None) -> Any:
         """Export projects as CSV"""
-        try:
-            result = self.project_service.get_projects_by_firm(firm_id)
-            
-            if not result['success']:
-                return {'success': False, 'error': result['message']}
-            
-            projects = result['projects']
-            
-            # Create CSV content
-            csv_content = self._create_projects_csv(projects)
-            
-            # Create response
-            response = make_response(csv_content)
-            response.headers['Content-Type'] = 'text/csv'
-            response.headers['Content-Disposition'] = f'attachment; filename=projects_export_{datetime.now().strftime("%Y%m%d")}.csv'
-            
-            return response
-            
-        except Exception as e:
-            return {'success': False, 'error': str(e)}
+        return self._export(self.project_service.iter_projects_for_export, 'projects', 'csv', firm_id, columns)
     
-    def export_projects_json(self, firm_id: int) -> Any:
+    def export_projects_json(self, firm_id: int, columns: Optional[List[str]] = None) -> Any:
         """Export projects as JSON"""
-        try:
-            result = self.project_service.get_projects_by_firm(firm_id)
-            
-            if not result['success']:
-                return {'success': False, 'error': result['message']}
-            
-            response_data = {
-                'export_date': datetime.now().isoformat(),
-                'firm_id': firm_id,
-                'projects': result['projects']
-            }
-            
-            response = make_response(jsonify(response_data))
-            response.headers['Content-Disposition'] = f'attachment; filename=projects_export_{datetime.now().strftime("%Y%m%d")}.json'
-            
-            return response
-            
-        except Exception as e:
-            return {'success': False, 'error': str(e)}
+        return self._export(self.project_service.iter_projects_for_export, 'projects', 'json', firm_id, columns)
     
-    def export_clients_csv(self, firm_id: int) -> Any:
+    def export_clients_csv(self, firm_id: int, columns: Optional[List[str]] = None) -> Any:
         """Export clients as CSV"""
+        return self._export(self.client_service.iter_clients_for_export, 'clients', 'csv', firm_id, columns)
+    
+    def export_clients_json(self, firm_id: int, columns: Optional[List[str]] = None) -> Any:
+        """Export clients as JSON"""
+        return self._export(self.client_service.iter_clients_for_export, 'clients', 'json', firm_id, columns)
+    
+    def export_tasks_csv(self, firm_id: int, columns: Optional[List[str]] = None) -> Any:
+        """Export tasks as CSV"""
+        return self._export(self.task_service.iter_tasks_for_export, 'tasks', 'csv', firm_id, columns)
+    
+    def export_tasks_json(self, firm_id: int, columns: Optional[List[str]] = None) -> Any:
+        """Export tasks as JSON"""
+        return self._export(self.task_service.iter_tasks_for_export, 'tasks', 'json', firm_id, columns)
+    
+    def _export(self, iter_export, entity: str, format: str, firm_id: int,
+                columns: Optional[List[str]]) -> Any:
+        """
+        Build a chunked export response from a service's export iterator
+        
+        Raises:
+            ValidationError: If ``columns`` names a column the entity cannot export
+        """
+        if format == 'csv' and not columns:
+            columns = DEFAULT_CSV_COLUMNS[entity]
+        
+        # Only column selection can fail here (rows are lazy, nothing has run yet)
+        result = iter_export(firm_id, columns=columns, batch_size=DEFAULT_BATCH_SIZE)
+        if not result['success']:
+            raise ValidationError(result['message'])
+        
         try:
-            result = self.client_service.get_clients_for_api(firm_id)
-            
-            if not result['success']:
-                return {'success': False, 'error': result['message']}
+            if format == 'csv':
+                chunks = iter_csv(result['labels'], result['rows'])
+                mimetype = 'text/csv'
+            else:
+                envelope = {'export_date': datetime.now().isoformat(), 'firm_id': firm_id}
+                chunks = iter_json(envelope, entity, result['keys'], result['rows'])
+                mimetype = 'application/json'
             
-            clients = result['clients']
-            
-            # Create CSV content
-            csv_content = self._create_clients_csv(clients)
-            
-            # Create response
-            response = make_response(csv_content)
-            response.headers['Content-Type'] = 'text/csv'
-            response.headers['Content-Disposition'] = f'attachment; filename=clients_export_{datetime.now().strftime("%Y%m%d")}.csv'
-            
-            return response
+            filename = f'{entity}_export_{datetime.now().strftime("%Y%m%d")}.{format}'
+            return self._stream_response(chunks, mimetype, filename)
             
         except Exception as e:
             return {'success': False, 'error': str(e)}
     
-    def export_clients_json(self, firm_id: int) -> Any:
-        """Export clients as JSON"""
+    def _stream_response(self, chunks: Iterator[str], mimetype: str, filename: str) -> Response:
+        """
+        Wrap export chunks in a chunked HTTP response
+        
+        ``stream_with_context`` keeps the request (and its database session)
+        alive until the last chunk is written; the cursor is closed when the
+        generator finishes or the client disconnects.
+        """
+        response = Response(stream_with_context(self._log_stream_errors(chunks, filename)), mimetype=mimetype)
+        response.headers['Content-Disposition'] = f'attachment; filename={filename}'
+        response.headers['Cache-Control'] = 'no-store'
+        response.headers['X-Accel-Buffering'] = 'no'  # Let nginx pass chunks straight through
+        return response
+    
+    def _log_stream_errors(self, chunks: Iterator[str], filename: str) -> Iterator[str]:
+        """Headers are already sent once streaming starts, so failures can only be logged"""
         try:
-            result = self.client_service.get_clients_for_api(firm_id)
-            
-            if not result['success']:
-                return {'success': False, 'error': result['message']}
-            
-            response_data = {
-                'export_date': datetime.now().isoformat(),
-                'firm_id': firm_id,
-                'clients': result['clients']
-            }
-            
-            response = make_response(jsonify(response_data))
-            response.headers['Content-Disposition'] = f'attachment; filename=clients_export_{datetime.now().strftime("%Y%m%d")}.json'
-            
-            return response
-            
+            yield from chunks
         except Exception as e:
-            return {'success': False, 'error': str(e)}
+            logger.error(f"Export {filename} failed mid-stream: {e}")
+            raise
     
-    def export_tasks_csv(self, firm_id: int) -> Any:
-        """Export tasks as CSV"""
+    def _export_iterator(self, entity: str):
+        return {
+            'projects': self.project_service.iter_projects_for_export,
+            'clients': self.client_service.iter_clients_for_export,
+            'tasks': self.task_service.iter_tasks_for_export,
+        }[entity]
+    
+    def start_export_job(self, firm_id: int, user_id: Optional[int], entity: str, format: str,
+                         columns: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Queue a background Parquet/XLSX export"""
         try:
-            result = self.task_service.get_tasks_by_firm(firm_id)
-            
-            if not result['success']:
-                return {'success': False, 'error': result['message']}
-            
-            tasks = result['tasks']
-            
-            # Create CSV content
-            csv_content = self._create_tasks_csv(tasks)
-            
-            # Create response
-            response = make_response(csv_content)
-            response.headers['Content-Type'] = 'text/csv'
-            response.headers['Content-Disposition'] = f'attachment; filename=tasks_export_{datetime.now().strftime("%Y%m%d")}.csv'
-            
-            return response
+            if entity not in EXPORT_ENTITIES:
+                return {'success': False, 'error': f'Unsupported export entity: {entity}'}
+            if format not in EXPORT_JOB_FORMATS:
+                return {'success': False, 'error': f'Unsupported export format: {format}'}
+            if format == 'parquet':
+                from src.shared.utils.columnar_export import PARQUET_AVAILABLE
+                if not PARQUET_AVAILABLE:
+                    return {'success': False, 'error': 'Parquet export requires pyarrow to be installed'}
+            if not self.job_store.is_available():
+                return {'success': False, 'error': 'Background exports require Redis'}
+            
+            # Reject unknown columns now rather than in the worker (rows are lazy, nothing runs)
+            preview = self._export_iterator(entity)(firm_id, columns=columns)
+            if not preview['success']:
+                return {'success': False, 'error': preview['message']}
+            preview['rows'].close()
+            
+            job_id = uuid.uuid4().hex
+            self.job_store.create(job_id, firm_id, user_id, entity, format, columns)
+            
+            from src.celery_app import celery_app
+            celery_app.send_task('workers.export_worker.build_export_file', args=[job_id])
+            
+            return {'success': True, 'job_id': job_id, 'status': 'queued'}
             
         except Exception as e:
             return {'success': False, 'error': str(e)}
     
-    def export_tasks_json(self, firm_id: int) -> Any:
-        """Export tasks as JSON"""
+    def run_export_job(self, job_id: str) -> Dict[str, Any]:
+        """
+        Build a job's file (called by the export worker)
+        
+        Rows are streamed from the owning module in batches and written to a
+        temporary file that is renamed into place only once complete, so a
+        download can never see a partial file.
+        """
+        job = self.job_store.get(job_id)
+        if not job:
+            return {'success': False, 'error': f'Export job {job_id} not found or expired'}
+        
+        final_path = export_file_path(job_id, job['format'])
+        temp_path = f"{final_path}.tmp"
+        started = time.monotonic()
+        
         try:
-            result = self.task_service.get_tasks_by_firm(firm_id)
+            from src.shared.utils.columnar_export import write_parquet, write_xlsx
             
-            if not result['success']:
-                return {'success': False, 'error': result['message']}
+            self.job_store.update(job_id, {'status': STATUS_RUNNING, 'started_at': datetime.utcnow().isoformat()})
             
-            response_data = {
-                'export_date': datetime.now().isoformat(),
-                'firm_id': firm_id,
-                'tasks': result['tasks']
+            result = self._export_iterator(job['entity'])(job['firm_id'], columns=job['columns'],
+                                                           batch_size=DEFAULT_BATCH_SIZE)
+            if not result['success']:
+                raise ValueError(result['message'])
+            
+            os.makedirs(EXPORT_FILE_DIR, exist_ok=True)
+            if job['format'] == 'parquet':
+                row_count = write_parquet(temp_path, result['keys'], result['kinds'], result['rows'])
+            else:
+                row_count = write_xlsx(temp_path, result['labels'], result['kinds'], result['rows'],
+                                       sheet_name=job['entity'].title())
+            os.replace(temp_path, final_path)
+            
+            fields = {
+                'status': STATUS_COMPLETED,
+                'row_count': row_count,
+                'file_size_bytes': os.path.getsize(final_path),
+                'duration_seconds': round(time.monotonic() - started, 2),
+                'completed_at': datetime.utcnow().isoformat()
             }
+            self.job_store.update(job_id, fields)
             
-            response = make_response(jsonify(response_data))
-            response.headers['Content-Disposition'] = f'attachment; filename=tasks_export_{datetime.now().strftime("%Y%m%d")}.json'
-            
-            return response
+            logger.info(f"Export job {job_id} wrote {row_count} {job['entity']} rows to {final_path}")
+            return {'success': True, 'job_id': job_id, **fields}
             
         except Exception as e:
-            return {'success': False, 'error': str(e)}
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            self.job_store.update(job_id, {'status': STATUS_FAILED, 'error': str(e),
+                                           'completed_at': datetime.utcnow().isoformat()})
+            logger.error(f"Export job {job_id} failed: {e}")
+            return {'success': False, 'job_id': job_id, 'error': str(e)}
+    
+    def get_export_job(self, job_id: str, firm_id: int) -> Dict[str, Any]:
+        """Get a job's status, with a signed download token once it has completed"""
+        job = self.job_store.get(job_id)
+        
+        # Never expose another firm's export
+        if not job or job['firm_id'] != firm_id:
+            return {'success': False, 'error': 'Export job not found'}
+        
+        status = {key: job.get(key) for key in (
+            'job_id', 'entity', 'format', 'status', 'row_count', 'file_size_bytes',
+            'duration_seconds', 'error', 'created_at', 'completed_at'
+        )}
+        
+        if job['status'] == STATUS_COMPLETED:
+            status['download_token'] = self._download_serializer().dumps({'job_id': job_id, 'firm_id': firm_id})
+            status['download_expires_in'] = EXPORT_LINK_MAX_AGE
+        
+        return {'success': True, 'job': status}
+    
+    def resolve_download(self, token: str) -> Dict[str, Any]:
+        """Verify a signed download token and locate the file it grants"""
+        from itsdangerous import BadSignature, SignatureExpired
+        
+        try:
+            payload = self._download_serializer().loads(token, max_age=EXPORT_LINK_MAX_AGE)
+        except SignatureExpired:
+            return {'success': False, 'error': 'Download link has expired'}
+        except BadSignature:
+            return {'success': False, 'error': 'Invalid download link'}
+        
+        job = self.job_store.get(payload['job_id'])
+        if not job or job['firm_id'] != payload['firm_id'] or job['status'] != STATUS_COMPLETED:
+            return {'success': False, 'error': 'Export is no longer available'}
+        
+        path = export_file_path(job['job_id'], job['format'])
+        if not os.path.exists(path):
+            return {'success': False, 'error': 'Export is no longer available'}
+        
+        created = datetime.fromisoformat(job['created_at']).strftime('%Y%m%d')
+        return {
+            'success': True,
+            'path': path,
+            'filename': f"{job['entity']}_export_{created}.{job['format']}"
+        }
+    
+    def cleanup_export_files(self, max_age_seconds: int = EXPORT_JOB_TTL) -> Dict[str, Any]:
+        """Delete export files (and abandoned temp files) older than the job TTL"""
+        removed = 0
+        freed_bytes = 0
+        cutoff = time.time() - max_age_seconds
+        
+        if not os.path.isdir(EXPORT_FILE_DIR):
+            return {'success': True, 'removed': 0, 'freed_bytes': 0}
+        
+        for entry in os.scandir(EXPORT_FILE_DIR):
+            try:
+                if entry.is_file() and entry.stat().st_mtime < cutoff:
+                    freed_bytes += entry.stat().st_size
+                    os.remove(entry.path)
+                    removed += 1
+            except OSError as e:
+                logger.warning(f"Failed to remove export file {entry.path}: {e}")
+        
+        return {'success': True, 'removed': removed, 'freed_bytes': freed_bytes}
     
-    def _create_projects_csv(self, projects: List[Dict[str, Any]]) -> str:
-        """Create CSV content for projects"""
-        output = io.StringIO()
-        writer = csv.writer(output)
-        
-        # Write header
-        writer.writerow(['ID', 'Name', 'Description', 'Status', 'Start Date', 'End Date', 'Client', 'Created At'])
-        
-        # Write data
-        for project in projects:
-            writer.writerow([
-                project.get('id', ''),
-                project.get('name', ''),
-                project.get('description', ''),
-                project.get('status', ''),
-                project.get('start_date', ''),
-                project.get('end_date', ''),
-                project.get('client_name', ''),
-                project.get('created_at', '')
-            ])
-        
-        return output.getvalue()
-    
-    def _create_clients_csv(self, clients: List[Dict[str, Any]]) -> str:
-        """Create CSV content for clients"""
-        output = io.StringIO()
-        writer = csv.writer(output)
-        
-        # Write header
-        writer.writerow(['ID', 'Name', 'Email', 'Phone', 'Address', 'Status', 'Created At'])
-        
-        # Write data
-        for client in clients:
-            writer.writerow([
-                client.get('id', ''),
-                client.get('name', ''),
-                client.get('email', ''),
-                client.get('phone', ''),
-                client.get('address', ''),
-                client.get('status', ''),
-                client.get('created_at', '')
-            ])
-        
-        return output.getvalue()
-    
-    def _create_tasks_csv(self, tasks: List[Dict[str, Any]]) -> str:
-        """Create CSV content for tasks"""
-        output = io.StringIO()
-        writer = csv.writer(output)
-        
-        # Write header
-        writer.writerow(['ID', 'Title', 'Description', 'Status', 'Priority', 'Due Date', 'Project', 'Assignee', 'Created At'])
-        
-        # Write data
-        for task in tasks:
-            writer.writerow([
-                task.get('id', ''),
-                task.get('title', ''),
-                task.get('description', ''),
-                task.get('status', ''),
-                task.get('priority', ''),
-                task.get('due_date', ''),
-                task.get('project_name', ''),
-                task.get('assignee_name', ''),
-                task.get('created_at', '')
-            ])
-        
-        return output.getvalue()
\ No newline at end of file
+    @staticmethod
+    def _download_serializer():
+        from flask import current_app
+        from itsdangerous import URLSafeTimedSerializer
+        return URLSafeTimedSerializer(current_app.config['SECRET_KEY'], salt='export-download')
@@ -3,12 +3,14 @@ Project module for CPA WorkflowPilot
 Handles projects, tasks, and subtasks functionality
 """
 
-from .routes import projects_bp
-from .tasks_routes import tasks_bp
-from .subtasks_routes import subtasks_bp
+# Imported when the app registers this module, not when the package is imported
+BLUEPRINTS = (
+    f'{__name__}.routes:projects_bp',
+    f'{__name__}.tasks_routes:tasks_bp',
+    f'{__name__}.subtasks_routes:subtasks_bp',
+)
 
 def register_module(app):
     """Register the project module with the Flask app"""
-    app.register_blueprint(projects_bp)
-    app.register_blueprint(tasks_bp)
-    app.register_blueprint(subtasks_bp)
\ No newline at end of file
+    from src.shared.bootstrap import register_blueprints
+    register_blueprints(app, BLUEPRINTS)
@@ -0,0 +1,192 @@
+"""
+Calendar Provider for CPA WorkflowPilot
+Month views of tasks by due date, built from one column-only query and
+cached in Redis per firm and month (``calendar:{firm_id}:{YYYY-MM}``).
+
+A cache miss loads the requested month together with the months either
+side of it, so paging through the calendar is served from the cache.
+``is_overdue``/``is_due_soon`` depend on today's date and are worked out
+when a month is read, never cached. TaskService invalidates a month when a
+task due in it is created, edited, deleted or changes status, once the
+change has committed (view_invalidation.py); the TTL
+bounds staleness from changes made elsewhere (project renames, bulk SQL).
+"""
+
+import calendar
+import json
+import logging
+import os
+from datetime import date, timedelta
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+from src.shared.database.redis_client import RedisClientMixin
+
+logger = logging.getLogger(__name__)
+
+CALENDAR_CACHE_TTL = int(os.environ.get('CALENDAR_CACHE_TTL', 300))
+DUE_SOON_DAYS = 3
+
+Month = Tuple[int, int]
+
+
+def month_bounds(year: int, month: int) -> Tuple[date, date]:
+    """First and last day of a month"""
+    return date(year, month, 1), date(year, month, calendar.monthrange(year, month)[1])
+
+
+def adjacent_month(year: int, month: int, offset: int) -> Month:
+    """The month ``offset`` months away (offset is -1 or 1)"""
+    index = year * 12 + (month - 1) + offset
+    return index // 12, index % 12 + 1
+
+
+class CalendarCache(RedisClientMixin):
+    """Redis-backed month snapshots of calendar rows"""
+
+    KEY_PREFIX = 'calendar'
+
+    def __init__(self, redis_client_instance=None, ttl: int = CALENDAR_CACHE_TTL):
+        """
+        Initialize calendar cache
+
+        Args:
+            redis_client_instance: RedisClient instance (optional, defaults to the global client)
+            ttl: Expiration in seconds for cached months
+        """
+        self._redis_client = redis_client_instance
+        self.ttl = ttl
+
+    def is_available(self) -> bool:
+        return self._get_client() is not None
+
+    def _key(self, firm_id: int, year: int, month: int) -> str:
+        return f"{self.KEY_PREFIX}:{firm_id}:{year:04d}-{month:02d}"
+
+    def get_months(self, firm_id: int, months: List[Month]) -> Dict[Month, List[Dict[str, Any]]]:
+        """Cached rows for whichever of ``months`` are cached"""
+        client = self._get_client()
+        if not client or not months:
+            return {}
+
+        try:
+            values = client.mget([self._key(firm_id, year, month) for year, month in months])
+        except Exception as e:
+            logger.warning(f"Failed to read calendar cache for firm {firm_id}: {e}")
+            return {}
+
+        cached = {}
+        for month_key, value in zip(months, values):
+            if value is not None:
+                cached[month_key] = json.loads(value)
+        return cached
+
+    def set_months(self, firm_id: int, rows_by_month: Dict[Month, List[Dict[str, Any]]]):
+        client = self._get_client()
+        if not client or not rows_by_month:
+            return
+
+        try:
+            pipe = client.pipeline()
+            for (year, month), rows in rows_by_month.items():
+                pipe.set(self._key(firm_id, year, month), json.dumps(rows, default=str), ex=self.ttl)
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"Failed to write calendar cache for firm {firm_id}: {e}")
+
+    def invalidate_dates(self, firm_id: int, dates: Iterable[Optional[date]]):
+        """Drop the cached months containing any of ``dates`` (None is ignored)"""
+        months = set()
+        for value in dates:
+            if isinstance(value, str):
+                try:
+                    value = date.fromisoformat(value[:10])
+                except ValueError:
+                    continue
+            if value:
+                months.add((value.year, value.month))
+        client = self._get_client()
+        if not client or not months:
+            return
+
+        try:
+            client.delete(*[self._key(firm_id, year, month) for year, month in months])
+        except Exception as e:
+            logger.warning(f"Failed to invalidate calendar cache for firm {firm_id}: {e}")
+
+
+class CalendarProvider:
+    """Month views of a firm's tasks, grouped by due date"""
+
+    def __init__(self, task_repository, cache: Optional[CalendarCache] = None):
+        self.task_repository = task_repository
+        self.cache = cache or calendar_cache
+
+    def get_month(self, firm_id: int, year: int, month: int, prefetch: bool = True,
+                  today: Optional[date] = None) -> Dict[str, Any]:
+        """
+        Get a month's tasks grouped by ``YYYY-MM-DD`` due date
+
+        Args:
+            firm_id: Firm ID for data filtering
+            year: Calendar year
+            month: Calendar month (1-12)
+            prefetch: On a cache miss, also load and cache the adjacent months
+            today: Date used for overdue/due-soon flags (defaults to today)
+
+        Returns:
+            dict: ``tasks_by_date`` and ``total_tasks``
+        """
+        requested = (year, month)
+        month_bounds(year, month)  # Validate before touching cache or database
+
+        rows = self.cache.get_months(firm_id, [requested]).get(requested)
+        if rows is None:
+            rows = self._load(firm_id, requested, prefetch)
+
+        today = today or date.today()
+        tasks_by_date: Dict[str, List[Dict[str, Any]]] = {}
+        for row in rows:
+            tasks_by_date.setdefault(row['due_date'], []).append(self._with_due_flags(row, today))
+
+        return {'tasks_by_date': tasks_by_date, 'total_tasks': len(rows)}
+
+    def _load(self, firm_id: int, requested: Month, prefetch: bool) -> List[Dict[str, Any]]:
+        """Query the requested month (plus uncached neighbours) in one range and cache each month"""
+        months = [requested]
+        if prefetch and self.cache.is_available():
+            neighbours = [adjacent_month(*requested, -1), adjacent_month(*requested, 1)]
+            cached = self.cache.get_months(firm_id, neighbours)
+            months += [m for m in neighbours if m not in cached]
+
+        start = min(month_bounds(*m)[0] for m in months)
+        end = max(month_bounds(*m)[1] for m in months)
+
+        rows_by_month: Dict[Month, List[Dict[str, Any]]] = {m: [] for m in months}
+        for row in self.task_repository.get_calendar_rows(firm_id, start, end):
+            due = row['due_date']
+            month_rows = rows_by_month.get((due.year, due.month))
+            if month_rows is not None:
+                month_rows.append(dict(row, due_date=due.isoformat()))
+
+        self.cache.set_months(firm_id, rows_by_month)
+        return rows_by_month[requested]
+
+    @staticmethod
+    def _with_due_flags(row: Dict[str, Any], today: date) -> Dict[str, Any]:
+        due = date.fromisoformat(row['due_date'])
+        open_task = not row['is_completed'] and not row['project_completed']
+        return {
+            'id': row['id'],
+            'title': row['title'],
+            'description': row['description'],
+            'status': row['status'],
+            'priority': row['priority'],
+            'is_overdue': open_task and due < today,
+            'is_due_soon': open_task and today <= due <= today + timedelta(days=DUE_SOON_DAYS),
+            'project_name': row['project_name'],
+            'assignee_name': row['assignee_name']
+        }
+
+
+# Global calendar cache (Redis client resolved per call)
+calendar_cache = CalendarCache()
@@ -11,6 +11,20 @@ from src.shared.events.schemas import (
 from src.shared.database.db_import import db
 
 
+def _invalidate_views(firm_id, project_id):
+    """Drop the firm's Kanban board and the calendar months showing the project's tasks once the handler commits"""
+    if not firm_id:
+        return
+    from .models import Task
+    from .view_invalidation import invalidate_board_after_commit, invalidate_calendar_after_commit
+    
+    rows = db.session.query(Task.due_date).filter(
+        Task.project_id == project_id, Task.due_date.isnot(None)
+    ).distinct().all()
+    invalidate_calendar_after_commit(firm_id, [due_date for (due_date,) in rows])
+    invalidate_board_after_commit(firm_id)
+
+
 class LoggingHandler(EventHandler):
     """Handler for logging events to a file or external service"""
 
@@ -68,19 +82,9 @@ class ProjectWorkflowTaskUpdateHandler(EventHandler):
                 print(f"Skipping task update - insufficient status information")
                 return True
             
-            # Get all tasks for this project
-            from .models import Task
-            project_tasks = Task.query.filter_by(project_id=event.project_id).order_by(Task.id).all()
-            
-            if not project_tasks:
-                print(f"No tasks found for project {event.project_id}")
-                return True
-            
             # Get workflow statuses to determine task update logic
-            from src.models import TaskStatus
-            workflow_statuses = TaskStatus.query.filter_by(
-                work_type_id=event.work_type_id
-            ).order_by(TaskStatus.position.asc()).all()
+            from .status_cache import workflow_statuses as status_cache
+            workflow_statuses = status_cache.for_work_type(event.work_type_id)
             
             if not workflow_statuses:
                 print(f"No workflow statuses found for work type {event.work_type_id}")
@@ -97,31 +101,14 @@ class ProjectWorkflowTaskUpdateHandler(EventHandler):
                 print(f"Invalid status ID {event.new_status_id} for work type {event.work_type_id}")
                 return True
             
-            # Update task statuses based on workflow position
-            # This is the same logic as before, but now properly contained within the project domain
-            updated_count = 0
-            for i, task in enumerate(project_tasks):
-                old_status = task.status
-                
-                if i < new_position:
-                    # Tasks before current position should be "Completed"
-                    task.status = 'Completed'
-                elif i == new_position:
-                    # Current position task should be "In Progress"
-                    task.status = 'In Progress'
-                else:
-                    # Tasks after current position should be "Not Started"
-                    task.status = 'Not Started'
-                
-                if old_status != task.status:
-                    updated_count += 1
+            # Tasks before the new position are Completed, the one at it In Progress,
+            # the rest Not Started: one UPDATE, no task rows loaded
+            from .task_repository import TaskRepository
+            updated_count = TaskRepository().set_statuses_by_workflow_position(event.project_id, new_position)
+            if updated_count:
+                _invalidate_views(event.firm_id, event.project_id)
             
-            # Commit the changes
-            db.session.commit()
-            
-            print(f"Updated {updated_count} task statuses for project {event.project_id} workflow advancement")
-            
-            # Log the activity
+            # Log the activity (written by the commit below)
             if event.user_id:
                 try:
                     from src.shared.services.activity_service import ActivityService
@@ -137,6 +124,11 @@ class ProjectWorkflowTaskUpdateHandler(EventHandler):
                 except Exception as activity_error:
                     print(f"Failed to log activity: {activity_error}")
             
+            # Commit the changes
+            db.session.commit()
+            
+            print(f"Updated {updated_count} task statuses for project {event.project_id} workflow advancement")
+            
             return True
             
         except Exception as e:
@@ -163,27 +155,13 @@ class ProjectCompletionTaskUpdateHandler(EventHandler):
         try:
             print(f"[ProjectCompletionTaskUpdateHandler] Handling completion for project {event.project_id}")
             
-            # Get all tasks for this project
-            from .models import Task
-            project_tasks = Task.query.filter_by(project_id=event.project_id).all()
-            
-            if not project_tasks:
-                print(f"No tasks found for project {event.project_id}")
-                return True
-            
-            # Mark all incomplete tasks as completed
-            updated_count = 0
-            for task in project_tasks:
-                if task.status != 'Completed':
-                    task.status = 'Completed'
-                    updated_count += 1
-            
-            # Commit the changes
-            db.session.commit()
-            
-            print(f"Marked {updated_count} tasks as completed for project {event.project_id}")
+            # Mark all incomplete tasks as completed (one UPDATE)
+            from .task_repository import TaskRepository
+            updated_count = TaskRepository().complete_project_tasks(event.project_id)
+            if updated_count:
+                _invalidate_views(event.firm_id, event.project_id)
             
-            # Log the activity
+            # Log the activity (written by the commit below)
             if event.user_id:
                 try:
                     from src.shared.services.activity_service import ActivityService
@@ -199,6 +177,11 @@ class ProjectCompletionTaskUpdateHandler(EventHandler):
                 except Exception as activity_error:
                     print(f"Failed to log activity: {activity_error}")
             
+            # Commit the changes
+            db.session.commit()
+            
+            print(f"Marked {updated_count} tasks as completed for project {event.project_id}")
+            
             return True
             
         except Exception as e:
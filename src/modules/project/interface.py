@@ -111,6 +111,22 @@ class IProjectService(ABC):
             Search results dictionary
         """
         pass
+    
+    @abstractmethod
+    def iter_projects_for_export(self, firm_id: int, columns: Optional[List[str]] = None,
+                                 batch_size: int = 1000) -> Dict[str, Any]:
+        """
+        Prepare a streaming project export without loading every row
+        
+        Args:
+            firm_id: Firm ID
+            columns: Column keys to export, in order (None for all)
+            batch_size: Rows fetched from the database per round trip
+            
+        Returns:
+            Dictionary with 'keys', 'labels', 'kinds' and a lazy 'rows' iterator of tuples
+        """
+        pass
 
 
 class ITaskService(ABC):
@@ -196,7 +212,8 @@ class ITaskService(ABC):
             month: Calendar month
             
         Returns:
-            Calendar tasks dictionary
+            Calendar tasks dictionary: ``tasks_by_date`` maps 'YYYY-MM-DD' to
+            lists of plain task dicts, plus ``total_tasks``
         """
         pass
     
@@ -213,4 +230,20 @@ class ITaskService(ABC):
         Returns:
             Search results dictionary
         """
-        pass
\ No newline at end of file
+        pass
+    
+    @abstractmethod
+    def iter_tasks_for_export(self, firm_id: int, columns: Optional[List[str]] = None,
+                              batch_size: int = 1000) -> Dict[str, Any]:
+        """
+        Prepare a streaming task export without loading every row
+        
+        Args:
+            firm_id: Firm ID
+            columns: Column keys to export, in order (None for all)
+            batch_size: Rows fetched from the database per round trip
+            
+        Returns:
+            Dictionary with 'keys', 'labels', 'kinds' and a lazy 'rows' iterator of tuples
+        """
+        pass
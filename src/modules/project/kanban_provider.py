@@ -0,0 +1,142 @@
+"""
+Kanban Provider for CPA WorkflowPilot
+Builds a firm's project board from its workflow columns (the in-process
+status cache, see status_cache.py) and one set-based query for project
+cards with their denormalized task totals, and caches the built board in
+Redis per firm (``kanban:{firm_id}``).
+
+ProjectService drops the cached board when a project is created, edited,
+deleted or moved, and TaskService does the same when tasks change, once
+the change has committed (view_invalidation.py); the TTL bounds staleness from changes made elsewhere (renamed clients or work
+types, bulk SQL).
+"""
+
+import json
+import logging
+import os
+from datetime import date
+from typing import Dict, Any, List, Optional
+
+from src.shared.database.redis_client import RedisClientMixin
+
+logger = logging.getLogger(__name__)
+
+KANBAN_CACHE_TTL = int(os.environ.get('KANBAN_CACHE_TTL', 120))
+COMPLETED_COLUMN = 'completed'
+
+
+class KanbanCache(RedisClientMixin):
+    """Redis-backed snapshots of built Kanban boards"""
+
+    KEY_PREFIX = 'kanban'
+
+    def __init__(self, redis_client_instance=None, ttl: int = KANBAN_CACHE_TTL):
+        """
+        Initialize Kanban cache
+
+        Args:
+            redis_client_instance: RedisClient instance (optional, defaults to the global client)
+            ttl: Expiration in seconds for cached boards
+        """
+        self._redis_client = redis_client_instance
+        self.ttl = ttl
+
+    def _key(self, firm_id: int) -> str:
+        return f"{self.KEY_PREFIX}:{firm_id}"
+
+    def get(self, firm_id: int) -> Optional[Dict[str, Any]]:
+        client = self._get_client()
+        if not client:
+            return None
+
+        try:
+            value = client.get(self._key(firm_id))
+        except Exception as e:
+            logger.warning(f"Failed to read Kanban cache for firm {firm_id}: {e}")
+            return None
+        return json.loads(value) if value is not None else None
+
+    def set(self, firm_id: int, board: Dict[str, Any]):
+        client = self._get_client()
+        if not client:
+            return
+
+        try:
+            client.set(self._key(firm_id), json.dumps(board, default=str), ex=self.ttl)
+        except Exception as e:
+            logger.warning(f"Failed to write Kanban cache for firm {firm_id}: {e}")
+
+    def invalidate(self, firm_id: int):
+        client = self._get_client()
+        if not client:
+            return
+
+        try:
+            client.delete(self._key(firm_id))
+        except Exception as e:
+            logger.warning(f"Failed to invalidate Kanban cache for firm {firm_id}: {e}")
+
+
+class KanbanBoardBuilder:
+    """A firm's projects grouped into workflow status columns"""
+
+    def __init__(self, project_repository, cache: Optional[KanbanCache] = None):
+        self.project_repository = project_repository
+        self.cache = cache or kanban_cache
+
+    def get_board(self, firm_id: int) -> Dict[str, Any]:
+        """
+        Get the firm's board, from the cache when present
+
+        Returns:
+            dict: ``columns`` keyed ``status_{id}`` (plus ``completed``) in
+            position order, each with its ``projects`` cards, and ``total_projects``
+        """
+        board = self.cache.get(firm_id)
+        if board is None:
+            board = self.build(firm_id)
+            self.cache.set(firm_id, board)
+
+        # Templates compare due dates against today; JSON round-trips them as strings
+        for column in board['columns'].values():
+            for card in column['projects']:
+                if isinstance(card.get('due_date'), str):
+                    card['due_date'] = date.fromisoformat(card['due_date'])
+        return board
+
+    def build(self, firm_id: int) -> Dict[str, Any]:
+        """Build the board from the database (one query once statuses are cached, whatever the project count)"""
+        columns: Dict[str, Dict[str, Any]] = {}
+        for status in self.project_repository.get_kanban_columns(firm_id):
+            columns[f"status_{status['id']}"] = dict(status, projects=[])
+
+        columns[COMPLETED_COLUMN] = {
+            'id': COMPLETED_COLUMN,
+            'title': 'Completed',
+            'work_type': 'All',
+            'projects': [],
+            'color': 'green',
+            'position': 999
+        }
+
+        # Projects without a (known) status go in the first column
+        first_column = min(columns.values(), key=lambda column: column['position'])
+
+        cards = self.project_repository.get_kanban_cards(firm_id)
+        for card in cards:
+            if card['is_completed']:
+                column = columns[COMPLETED_COLUMN]
+            elif card['current_status_id']:
+                column = columns.get(f"status_{card['current_status_id']}")
+                if column is None:
+                    continue
+            else:
+                column = first_column
+            column['projects'].append(card)
+
+        sorted_columns = dict(sorted(columns.items(), key=lambda item: item[1]['position']))
+        return {'columns': sorted_columns, 'total_projects': len(cards)}
+
+
+# Global Kanban cache (Redis client resolved per call)
+kanban_cache = KanbanCache()
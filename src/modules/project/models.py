@@ -132,6 +132,9 @@ class Project(db.Model):
     priority = db.Column(db.String(10), default='Medium', nullable=False)  # High, Medium, Low
     task_dependency_mode = db.Column(db.Boolean, default=True)  # If True, completing a task auto-completes all previous tasks
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Denormalized task totals, kept current by src/modules/project/progress.py
+    task_count = db.Column(db.Integer, default=0, nullable=False)
+    completed_task_count = db.Column(db.Integer, default=0, nullable=False)
     
     tasks = db.relationship('Task', backref='project', lazy=True, cascade="all, delete-orphan")
     activity_logs = db.relationship('ActivityLog', backref='project', lazy=True)
@@ -139,10 +142,9 @@ class Project(db.Model):
     
     @property
     def progress_percentage(self):
-        if not self.tasks:
+        if not self.task_count:
             return 0
-        completed_tasks = len([t for t in self.tasks if t.status == 'Completed'])
-        return round((completed_tasks / len(self.tasks)) * 100)
+        return round((self.completed_task_count / self.task_count) * 100)
     
     @property
     def client_name(self):
@@ -155,39 +157,39 @@ class Project(db.Model):
     @property
     def current_workflow_status_name(self):
         """Get the current workflow status name"""
-        if self.current_status:
+        from .status_cache import workflow_statuses
+        current_status = workflow_statuses.get(self.current_status_id)
+        if current_status:
+            return current_status.name
+        elif self.current_status_id and self.current_status:
             return self.current_status.name
         elif self.work_type_id:
             # Get default status for work type
-            default_status = TaskStatus.query.filter_by(
-                work_type_id=self.work_type_id,
-                is_default=True
-            ).first()
+            default_status = next(
+                (status for status in workflow_statuses.for_work_type(self.work_type_id) if status.is_default), None
+            )
             return default_status.name if default_status else 'Not Started'
         return 'Not Started'
     
     @property
     def workflow_statuses(self):
-        """Get all available workflow statuses for this project"""
-        if self.work_type_id:
-            return TaskStatus.query.filter_by(
-                work_type_id=self.work_type_id
-            ).order_by(TaskStatus.position.asc()).all()
-        return []
+        """Get all available workflow statuses for this project (cached, read-only)"""
+        from .status_cache import workflow_statuses
+        return list(workflow_statuses.for_work_type(self.work_type_id))
     
     def advance_workflow(self):
         """Advance project to the next workflow status"""
         if not self.work_type_id:
             return False
         
+        from .status_cache import workflow_statuses
         current_position = 0
-        if self.current_status:
-            current_position = self.current_status.position
+        current_status = workflow_statuses.get(self.current_status_id)
+        if current_status:
+            current_position = current_status.position
         
         # Find next status
-        next_status = TaskStatus.query.filter_by(
-            work_type_id=self.work_type_id
-        ).filter(TaskStatus.position > current_position).order_by(TaskStatus.position.asc()).first()
+        next_status = workflow_statuses.next_after(self.work_type_id, current_position)
         
         if next_status:
             self.current_status_id = next_status.id
@@ -197,12 +199,10 @@ class Project(db.Model):
     
     def move_to_status(self, status_id):
         """Move project to a specific workflow status"""
-        status = TaskStatus.query.filter_by(
-            id=status_id,
-            work_type_id=self.work_type_id
-        ).first()
+        from .status_cache import workflow_statuses
+        status = workflow_statuses.get(status_id) or db.session.get(TaskStatus, status_id)
         
-        if status:
+        if status and status.work_type_id == self.work_type_id:
             self.current_status_id = status_id
             return True
         
@@ -259,11 +259,20 @@ class Task(db.Model):
                               lazy=True, cascade="all, delete-orphan", 
                               order_by='Task.subtask_order, Task.created_at')
     
+    @property
+    def workflow_status(self):
+        """This task's TaskStatus from the status cache (the relationship only on a miss)"""
+        if not self.status_id:
+            return None
+        from .status_cache import workflow_statuses
+        return workflow_statuses.get(self.status_id) or self.task_status_ref
+    
     @property
     def current_status(self):
         """Get current status name, preferring new status system over legacy"""
-        if self.status_id and self.task_status_ref:
-            return self.task_status_ref.name
+        status = self.workflow_status
+        if status:
+            return status.name
         # Fallback to legacy status (will be removed after migration)
         return getattr(self, 'status', 'Not Started')
     
@@ -271,8 +280,9 @@ class Task(db.Model):
     def is_completed(self):
         """Check if task is completed using new or legacy status"""
         # Prefer new status system
-        if self.status_id and self.task_status_ref:
-            return self.task_status_ref.is_terminal
+        status = self.workflow_status
+        if status:
+            return status.is_terminal
         
         # Fallback to legacy status (will be removed after migration)
         legacy_status = getattr(self, 'status', None)
@@ -315,8 +325,9 @@ class Task(db.Model):
     @property
     def status_color(self):
         """Get status color from new system or default colors"""
-        if self.status_id and self.task_status_ref:
-            return self.task_status_ref.color
+        status = self.workflow_status
+        if status:
+            return status.color
         # Default colors for legacy statuses
         colors = {
             'Not Started': '#6b7280',
@@ -377,29 +388,28 @@ class Task(db.Model):
     
     @property
     def root_task(self):
-        """Get the root parent task (for nested subtasks)"""
-        current = self
-        while current.parent_task:
-            current = current.parent_task
-        return current
+        """Get the root parent task (for nested subtasks), in one closure-table query"""
+        if not self.parent_task_id:
+            return self
+        root = Task.query.join(TaskClosure, TaskClosure.ancestor_id == Task.id).filter(
+            TaskClosure.descendant_id == self.id
+        ).order_by(TaskClosure.depth.desc()).first()
+        return root or self
     
     @property
     def task_hierarchy_level(self):
         """Get the nesting level of this task (0 = root, 1 = subtask, 2 = sub-subtask, etc.)"""
-        level = 0
-        current = self
-        while current.parent_task:
-            level += 1
-            current = current.parent_task
-        return level
+        if not self.parent_task_id:
+            return 0
+        return db.session.query(db.func.max(TaskClosure.depth)).filter(
+            TaskClosure.descendant_id == self.id
+        ).scalar() or 0
     
     def get_all_subtasks_recursive(self):
-        """Get all subtasks recursively (including sub-subtasks)"""
-        all_subtasks = []
-        for subtask in self.subtasks:
-            all_subtasks.append(subtask)
-            all_subtasks.extend(subtask.get_all_subtasks_recursive())
-        return all_subtasks
+        """Get all subtasks recursively (including sub-subtasks), shallowest first, in one query"""
+        return Task.query.join(TaskClosure, TaskClosure.descendant_id == Task.id).filter(
+            TaskClosure.ancestor_id == self.id
+        ).order_by(TaskClosure.depth, Task.subtask_order, Task.created_at).all()
     
     def update_parent_progress(self):
         """Update parent task progress when subtask status changes"""
@@ -408,12 +418,11 @@ class Task(db.Model):
             all_completed = all(st.is_completed for st in self.parent_task.subtasks)
             if all_completed and not self.parent_task.is_completed:
                 # Auto-complete parent task if all subtasks are done
-                if self.parent_task.status_id and self.parent_task.task_status_ref:
+                parent_status = self.parent_task.workflow_status
+                if parent_status:
                     # Find a terminal status for the parent's work type
-                    terminal_status = TaskStatus.query.filter_by(
-                        work_type_id=self.parent_task.task_status_ref.work_type_id,
-                        is_terminal=True
-                    ).first()
+                    from .status_cache import workflow_statuses
+                    terminal_status = workflow_statuses.terminal_for(parent_status.work_type_id)
                     if terminal_status:
                         self.parent_task.status_id = terminal_status.id
                 else:
@@ -533,15 +542,12 @@ class Task(db.Model):
         Update task status using the new system
         This method should be used instead of directly setting status fields
         """
-        from src.modules.project.models import TaskStatus
+        from .status_cache import workflow_statuses
         
         # Validate the new status exists and belongs to the right firm
-        new_status = TaskStatus.query.filter_by(
-            id=new_status_id,
-            firm_id=self.firm_id
-        ).first()
+        new_status = workflow_statuses.get(new_status_id) or db.session.get(TaskStatus, new_status_id)
         
-        if not new_status:
+        if not new_status or new_status.firm_id != self.firm_id:
             raise ValueError(f"Invalid status_id {new_status_id} for firm {self.firm_id}")
         
         old_status_name = self.current_status
@@ -581,6 +587,18 @@ class Task(db.Model):
         else:
             return 'no_status'
 
+class TaskClosure(db.Model):
+    """Ancestor/descendant pairs of the subtask tree (depth 1 = direct parent); see task_closure.py"""
+    __tablename__ = 'task_closure'
+
+    ancestor_id = db.Column(db.Integer, db.ForeignKey('task.id', ondelete='CASCADE'), primary_key=True)
+    descendant_id = db.Column(db.Integer, db.ForeignKey('task.id', ondelete='CASCADE'), primary_key=True)
+    depth = db.Column(db.Integer, nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_task_closure_descendant_depth', 'descendant_id', 'depth'),
+    )
+
 class TaskComment(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     comment = db.Column(db.Text, nullable=False)
@@ -589,3 +607,12 @@ class TaskComment(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     user = db.relationship('User', backref='task_comments')
+
+
+# Keep Project.task_count / completed_task_count in step with task writes
+from .progress import install_progress_tracking
+install_progress_tracking(Task)
+
+# Drop cached workflow status lists when work types or statuses change
+from .status_cache import install_status_cache_invalidation
+install_status_cache_invalidation(WorkType, TaskStatus)
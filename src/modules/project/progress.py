@@ -0,0 +1,214 @@
+"""
+Project Progress for CPA WorkflowPilot
+Keeps ``Project.task_count`` and ``Project.completed_task_count`` in step
+with the project's tasks, so progress reads two columns instead of loading
+every task.
+
+ORM task inserts, status/project changes and deletes adjust the counters
+with one ``UPDATE project SET ... = ... + n`` in the same flush (so the
+same transaction). Set-based writes that bypass the ORM (TaskRepository
+bulk edits and deletes) call ``recount`` for the projects they touched.
+
+``repair`` recomputes every counter from the task table and reports the
+projects that had drifted; it runs daily as
+``workers.system_worker.repair_project_progress``.
+"""
+
+import logging
+from typing import Dict, Any, Iterable, List, Optional
+
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session, attributes, object_session
+from sqlalchemy.orm.util import identity_key
+
+from src.shared.database.db_import import db
+
+logger = logging.getLogger(__name__)
+
+COMPLETED_STATUS = 'Completed'
+COUNTER_FIELDS = ['task_count', 'completed_task_count']
+TRACKED_FIELDS = ('project_id', 'status')
+RECOUNT_CHUNK_SIZE = 500
+
+_TOUCHED = 'project_progress_touched'
+_installed = False
+
+
+def _stored(connection, target):
+    """(project_id, status) as the task row currently holds them"""
+    from .models import Task
+    return connection.execute(
+        select(Task.project_id, Task.status).where(Task.id == target.id)
+    ).first()
+
+
+def _adjust(connection, target, project_id: Optional[int], tasks: int, completed: int):
+    if not project_id or not (tasks or completed):
+        return
+    from .models import Project
+
+    table = Project.__table__
+    connection.execute(table.update().where(table.c.id == project_id).values(
+        task_count=table.c.task_count + tasks,
+        completed_task_count=table.c.completed_task_count + completed
+    ))
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_TOUCHED, set()).add(project_id)
+
+
+def _after_insert(mapper, connection, target):
+    _adjust(connection, target, target.project_id, 1, int(target.status == COMPLETED_STATUS))
+
+
+def _before_update(mapper, connection, target):
+    histories = [attributes.get_history(target, key, passive=attributes.PASSIVE_NO_INITIALIZE)
+                 for key in TRACKED_FIELDS]
+    if not any(history.added for history in histories):
+        return
+
+    if all(history.deleted or not history.added for history in histories):
+        stored = [history.deleted[0] if history.deleted else getattr(target, key)
+                  for key, history in zip(TRACKED_FIELDS, histories)]
+    else:
+        # Set on an expired instance: the old value was never loaded
+        stored = _stored(connection, target)
+        if stored is None:
+            return
+    old_project, old_status = stored
+    new_project, new_status = target.project_id, target.status
+    if (old_project, old_status) == (new_project, new_status):
+        return
+
+    old_completed = int(old_status == COMPLETED_STATUS)
+    new_completed = int(new_status == COMPLETED_STATUS)
+    if old_project == new_project:
+        _adjust(connection, target, new_project, 0, new_completed - old_completed)
+    else:
+        _adjust(connection, target, old_project, -1, -old_completed)
+        _adjust(connection, target, new_project, 1, new_completed)
+
+
+def _before_delete(mapper, connection, target):
+    histories = [attributes.get_history(target, key, passive=attributes.PASSIVE_NO_INITIALIZE)
+                 for key in TRACKED_FIELDS]
+    if all(history.deleted or history.unchanged for history in histories):
+        project_id, status = [(history.deleted or history.unchanged)[0] for history in histories]
+    else:
+        stored = _stored(connection, target)
+        if stored is None:
+            return
+        project_id, status = stored
+    _adjust(connection, target, project_id, -1, -int(status == COMPLETED_STATUS))
+
+
+def _expire_touched(session, flush_context):
+    """Make loaded Project instances re-read counters the flush changed"""
+    project_ids = session.info.pop(_TOUCHED, None)
+    if project_ids:
+        _expire(session, project_ids)
+
+
+def _expire(session, project_ids: Iterable[int]):
+    from .models import Project
+
+    for project_id in project_ids:
+        project = session.identity_map.get(identity_key(Project, project_id))
+        if project is not None:
+            session.expire(project, COUNTER_FIELDS)
+
+
+def install_progress_tracking(task_model):
+    """Register the Task mapper and session hooks (once per process)"""
+    global _installed
+    if _installed:
+        return
+    event.listen(task_model, 'after_insert', _after_insert)
+    event.listen(task_model, 'before_update', _before_update)
+    event.listen(task_model, 'before_delete', _before_delete)
+    event.listen(Session, 'after_flush_postexec', _expire_touched)
+    _installed = True
+
+
+def _actual_counts():
+    from .models import Task
+
+    return select(
+        Task.project_id.label('project_id'),
+        func.count(Task.id).label('total'),
+        func.count(Task.id).filter(Task.status == COMPLETED_STATUS).label('completed')
+    ).where(Task.project_id.isnot(None)).group_by(Task.project_id).subquery()
+
+
+def recount(project_ids: Iterable[int]) -> int:
+    """
+    Recompute counters for ``project_ids`` from the task table (set-based)
+
+    Returns:
+        int: Number of projects updated
+    """
+    from .models import Project, Task
+
+    project_ids = [project_id for project_id in dict.fromkeys(project_ids) if project_id]
+    table = Project.__table__
+    total = select(func.count(Task.id)).where(Task.project_id == table.c.id).scalar_subquery()
+    completed = select(func.count(Task.id)).where(
+        Task.project_id == table.c.id, Task.status == COMPLETED_STATUS
+    ).scalar_subquery()
+
+    updated = 0
+    for start in range(0, len(project_ids), RECOUNT_CHUNK_SIZE):
+        chunk = project_ids[start:start + RECOUNT_CHUNK_SIZE]
+        result = db.session.execute(
+            table.update().where(table.c.id.in_(chunk)).values(task_count=total, completed_task_count=completed)
+        )
+        updated += result.rowcount
+    _expire(db.session(), project_ids)
+    return updated
+
+
+def find_drift(firm_id: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Projects whose stored counters differ from their tasks, in one grouped query"""
+    from .models import Project
+
+    actual = _actual_counts()
+    actual_total = func.coalesce(actual.c.total, 0)
+    actual_completed = func.coalesce(actual.c.completed, 0)
+    query = db.session.query(
+        Project.id, Project.firm_id, Project.task_count, Project.completed_task_count,
+        actual_total.label('actual_total'), actual_completed.label('actual_completed')
+    ).outerjoin(actual, actual.c.project_id == Project.id).filter(
+        (Project.task_count != actual_total) | (Project.completed_task_count != actual_completed)
+    )
+    if firm_id is not None:
+        query = query.filter(Project.firm_id == firm_id)
+
+    return [{
+        'project_id': row.id,
+        'firm_id': row.firm_id,
+        'stored': {'task_count': row.task_count, 'completed_task_count': row.completed_task_count},
+        'actual': {'task_count': int(row.actual_total), 'completed_task_count': int(row.actual_completed)}
+    } for row in query.all()]
+
+
+def repair(firm_id: Optional[int] = None, fix: bool = True) -> Dict[str, Any]:
+    """
+    Recompute project counters from scratch and report drift
+
+    Args:
+        firm_id: Limit the check to one firm (optional)
+        fix: Write corrected counters (False only reports)
+
+    Returns:
+        dict: ``drifted`` projects (stored vs actual counts) and ``repaired`` count
+    """
+    drifted = find_drift(firm_id)
+    repaired = 0
+    if drifted and fix:
+        repaired = recount(item['project_id'] for item in drifted)
+        db.session.commit()
+        for item in drifted:
+            logger.warning(
+                f"Project {item['project_id']} progress drifted: stored {item['stored']}, actual {item['actual']}"
+            )
+    return {'drifted': drifted, 'repaired': repaired}
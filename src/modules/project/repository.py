@@ -3,7 +3,7 @@ Project Repository for CPA WorkflowPilot
 Provides data access layer for project-related operations.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator
 from datetime import datetime
 from sqlalchemy import or_, and_
 
@@ -104,6 +104,58 @@ class ProjectRepository(CachedRepository[Project]):
         
         return kanban_data
     
+    def get_kanban_columns(self, firm_id: int) -> List[Dict[str, Any]]:
+        """Workflow statuses of every work type in the firm, from the status cache"""
+        from .status_cache import workflow_statuses
+
+        return workflow_statuses.columns_for_firm(firm_id)
+
+    def get_kanban_cards(self, firm_id: int) -> List[Dict[str, Any]]:
+        """
+        Get the fields a Kanban card shows for a firm's active projects
+
+        Task totals are the project's denormalized counters, so progress
+        needs no task reads; client and work type are joined in.
+        """
+        from src.modules.client.models import Client
+        from .models import WorkType
+
+        rows = db.session.query(
+            Project.id, Project.name, Project.status, Project.priority, Project.due_date,
+            Project.client_id, Project.work_type_id, Project.current_status_id,
+            Project.task_dependency_mode, Project.created_at,
+            Project.task_count.label('total_tasks'), Project.completed_task_count.label('completed_tasks'),
+            Client.name.label('client_name'),
+            WorkType.name.label('work_type_name')
+        ).select_from(Project) \
+            .outerjoin(Client, Project.client_id == Client.id) \
+            .outerjoin(WorkType, Project.work_type_id == WorkType.id) \
+            .filter(Project.firm_id == firm_id, Project.status != 'Completed') \
+            .order_by(Project.created_at.desc()).all()
+
+        cards = []
+        for row in rows:
+            total, completed = int(row.total_tasks), int(row.completed_tasks)
+            cards.append({
+                'id': row.id,
+                'name': row.name,
+                'status': row.status,
+                'priority': row.priority,
+                'due_date': row.due_date,
+                'client_id': row.client_id,
+                'client_name': row.client_name or 'No Client',
+                'work_type_id': row.work_type_id,
+                'work_type_name': row.work_type_name,
+                'current_status_id': row.current_status_id,
+                'task_dependency_mode': bool(row.task_dependency_mode),
+                'created_at': row.created_at.strftime('%Y-%m-%d') if row.created_at else None,
+                'is_completed': row.status == 'Completed',
+                'total_tasks': total,
+                'completed_tasks': completed,
+                'progress_percentage': round(completed / total * 100) if total else 0
+            })
+        return cards
+
     def get_project_statistics(self, firm_id: int) -> Dict[str, int]:
         """Get project statistics"""
         total = self.count(firm_id=firm_id)
@@ -207,18 +259,62 @@ class ProjectRepository(CachedRepository[Project]):
         return project
     
     def search_projects(self, firm_id: int, query_text: str, limit: int = 20):
-        """Search projects by name and description"""
+        """Search projects by name, ranked through the full-text index when installed"""
+        from sqlalchemy.orm import joinedload
+        from src.shared.database.search_index import search_index, order_by_ids
+        
+        project_ids = search_index.search(firm_id, 'project', query_text, limit)
+        if project_ids is not None:
+            if not project_ids:
+                return []
+            projects = Project.query.options(joinedload(Project.client)) \
+                .filter(Project.id.in_(project_ids)).all()
+            return order_by_ids(projects, project_ids)
+        
+        # Projects have no description column; name is the only searchable text
         search_pattern = f'%{query_text}%'
         
         query = db.session.query(Project).filter(
             Project.firm_id == firm_id,
-            or_(
-                Project.name.ilike(search_pattern),
-                Project.description.ilike(search_pattern)
-            )
+            Project.name.ilike(search_pattern)
         ).order_by(Project.created_at.desc())
         
         if limit:
             query = query.limit(limit)
         
         return query.all()
+    
+    def get_export_columns(self) -> List['ExportColumn']:
+        """Columns available to project exports, with the client name pre-joined"""
+        from sqlalchemy import func, literal, String
+        from src.modules.client.models import Client
+        from src.shared.utils.streaming_export import ExportColumn
+        
+        return [
+            ExportColumn('id', 'ID', Project.id),
+            ExportColumn('name', 'Name', Project.name),
+            # Projects have no description; kept (always empty) for the CSV's original layout
+            ExportColumn('description', 'Description', literal(None, String)),
+            ExportColumn('status', 'Status', Project.status),
+            ExportColumn('priority', 'Priority', Project.priority),
+            ExportColumn('start_date', 'Start Date', Project.start_date),
+            ExportColumn('due_date', 'Due Date', Project.due_date),
+            ExportColumn('end_date', 'End Date', Project.completion_date),
+            ExportColumn('client_id', 'Client ID', Project.client_id),
+            ExportColumn('client_name', 'Client', func.coalesce(Client.name, 'No Client')),
+            ExportColumn('created_at', 'Created At', Project.created_at),
+        ]
+    
+    def iter_export_rows(self, firm_id: int, columns: List['ExportColumn'],
+                         batch_size: int = 1000) -> Iterator[tuple]:
+        """Stream project rows for export as plain tuples through a server-side cursor"""
+        from src.modules.client.models import Client
+        from src.shared.utils.streaming_export import stream_query
+        
+        query = db.session.query(*[column.expression.label(column.key) for column in columns]) \
+            .select_from(Project) \
+            .outerjoin(Client, Project.client_id == Client.id) \
+            .filter(Project.firm_id == firm_id) \
+            .order_by(Project.created_at.desc(), Project.id.desc())
+        
+        return stream_query(query, batch_size)
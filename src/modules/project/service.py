@@ -4,7 +4,7 @@ ProjectService: Handles all business logic for project operations.
 
 from typing import Dict, Any, Optional, List
 from src.shared.database.db_import import db
-from .models import Project, Task, WorkType
+from .models import Project, Task, WorkType, Template
 from ..client.models import Client
 from src.models.auth import User
 # ActivityService import removed to break circular dependency
@@ -72,18 +72,16 @@ class ProjectService(BaseService):
     
     def get_project_progress(self, project_id, firm_id):
         """Get project progress with access check"""
-        project = self.get_project_by_id_and_firm(project_id, firm_id)
+        project = self.project_repository.get_by_id_and_firm(project_id, firm_id)
         if not project:
             return {
                 'success': False,
                 'message': 'Project not found or access denied'
             }
         
-        from .task_repository import TaskRepository
-        task_repo = TaskRepository()
-        project_tasks = task_repo.get_project_tasks(project_id, firm_id, include_completed=True)
-        total_tasks = len(project_tasks)
-        completed_tasks = len([t for t in project_tasks if t.status == 'Completed'])
+        # Denormalized counters (see progress.py); no task rows are loaded
+        total_tasks = project.task_count
+        completed_tasks = project.completed_task_count
         progress_percentage = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
         
         return {
@@ -140,23 +138,14 @@ class ProjectService(BaseService):
         
         # Set initial workflow status if work type exists
         if work_type_id:
-            # Find the default status for this work type
-            from .models import TaskStatus
-            default_status = TaskStatus.query.filter_by(
-                work_type_id=work_type_id,
-                is_default=True
-            ).first()
+            # The default status for this work type, else the first by position
+            from .status_cache import workflow_statuses
+            default_status = workflow_statuses.default_for(work_type_id)
             if default_status:
                 project.current_status_id = default_status.id
-            else:
-                # Fallback to first status if no default
-                first_status = TaskStatus.query.filter_by(
-                    work_type_id=work_type_id
-                ).order_by(TaskStatus.position.asc()).first()
-                if first_status:
-                    project.current_status_id = first_status.id
         
         db.session.add(project)
+        self._invalidate_board(firm_id)
         
         # Log activity - direct import to avoid circular dependency
         try:
@@ -173,10 +162,10 @@ class ProjectService(BaseService):
         except (ImportError, Exception):
             pass  # ActivityService not available or failed
         
-        # Publish project creation event
+        # Publish project creation event once the project is committed
         try:
             from src.shared.events.schemas import ProjectCreatedEvent
-            from src.shared.events.publisher import publish_event
+            from src.shared.events.publisher import publish_event_after_commit
             event = ProjectCreatedEvent(
                 project_id=project.id,
                 firm_id=firm_id,
@@ -184,7 +173,7 @@ class ProjectService(BaseService):
                 client_id=client_id,
                 status=project.status
             )
-            publish_event(event)
+            publish_event_after_commit(event)
         except Exception:
             pass  # Event publishing is optional
         
@@ -202,20 +191,97 @@ class ProjectService(BaseService):
     
     @transactional
     def create_project_from_template(self, template_id, client_name, project_name, start_date, due_date=None, priority='Medium', task_dependency_mode=False, firm_id=None, user_id=None):
-        """Create a project from a template"""
+        """Create a project (with its tasks and dependencies) from a template"""
         try:
-            # For now, this can just call the regular create_project method
-            # In the future, this could be enhanced to use template-specific logic
-            return self.create_project(
-                name=project_name,
-                client_id=None,  # Would need client lookup logic
-                work_type_id=None,  # Would need template work type lookup
+            client = Client.query.filter_by(name=client_name, firm_id=firm_id).first()
+            if not client:
+                return {'success': False, 'message': f'Client "{client_name}" not found'}
+            
+            created = self.create_projects_from_template(
+                template_id,
+                [{'name': project_name, 'client_id': client.id, 'start_date': start_date,
+                  'due_date': due_date, 'priority': priority}],
                 firm_id=firm_id,
-                user_id=user_id
+                user_id=user_id,
+                task_dependency_mode=task_dependency_mode
             )
+            return {'success': True, 'project': created[0]}
         except Exception as e:
             return {'success': False, 'message': str(e)}
     
+    @transactional
+    def create_projects_from_template(self, template_id: int, projects: List[Dict[str, Any]], firm_id: int,
+                                      user_id: Optional[int] = None,
+                                      task_dependency_mode: Optional[bool] = None) -> List[Dict[str, Any]]:
+        """Create many projects from one template in a single transaction
+        
+        Args:
+            template_id: Template to expand
+            projects: Specs with ``name``, ``client_id``, ``start_date`` and optional
+                ``due_date`` and ``priority``
+            firm_id: Firm ID
+            user_id: User ID for activity logging
+            task_dependency_mode: Override the template's setting; None keeps it
+            
+        Returns:
+            List of created project data, in input order
+            
+        Raises:
+            ValidationError: If a project spec is incomplete
+            NotFoundError: If the template or a client doesn't belong to the firm
+        """
+        client_ids = {spec.get('client_id') for spec in projects if spec.get('client_id')}
+        clients = dict(db.session.query(Client.id, Client.name).filter(
+            Client.id.in_(client_ids), Client.firm_id == firm_id
+        ).all()) if client_ids else {}
+        missing = client_ids - set(clients)
+        if missing:
+            raise NotFoundError(f"Client {min(missing)} not found or doesn't belong to firm {firm_id}")
+        
+        from .template_instantiation import TemplateInstantiator
+        instantiator = TemplateInstantiator()
+        created = instantiator.instantiate(template_id, firm_id, projects, task_dependency_mode)
+        if not created:
+            return created
+        template_name = db.session.query(Template.name).filter_by(id=template_id).scalar()
+        
+        rows = db.session.query(Task.due_date).filter(
+            Task.project_id.in_([project['id'] for project in created]), Task.due_date.isnot(None)
+        ).distinct().all()
+        from .view_invalidation import invalidate_calendar_after_commit
+        invalidate_calendar_after_commit(firm_id, [due_date for (due_date,) in rows])
+        self._invalidate_board(firm_id)
+        
+        from src.shared.services.activity_service import ActivityService
+        from src.shared.events.schemas import ProjectCreatedEvent
+        from src.shared.events.publisher import publish_event_after_commit
+        for project in created:
+            client_name = clients.get(project['client_id'])
+            ActivityService.log_entity_operation(
+                entity_type='PROJECT',
+                operation='CREATE',
+                entity_id=project['id'],
+                entity_name=project['name'],
+                details=f'Project created from template "{template_name}" for client: {client_name}',
+                user_id=user_id
+            )
+            try:
+                publish_event_after_commit(ProjectCreatedEvent(
+                    project_id=project['id'],
+                    name=project['name'],
+                    client_id=project['client_id'],
+                    client_name=client_name,
+                    status='Active',
+                    template_name=template_name,
+                    priority=project['priority'],
+                    firm_id=firm_id,
+                    user_id=user_id
+                ))
+            except Exception:
+                pass  # Event publishing is optional
+        
+        return created
+    
     @transactional
     def update_project(self, project_id, firm_id, **update_data):
         """Update a project with new data"""
@@ -235,6 +301,7 @@ class ProjectService(BaseService):
             if 'status' in update_data:
                 project.status = update_data['status']
             
+            self._invalidate_board(firm_id)
             return {'success': True, 'message': 'Project updated successfully'}
         except Exception as e:
             return {'success': False, 'message': str(e)}
@@ -257,6 +324,7 @@ class ProjectService(BaseService):
                 return {'success': False, 'message': f'Cannot delete project with {task_count} tasks. Please remove tasks first.'}
             
             db.session.delete(project)
+            self._invalidate_board(firm_id)
             
             return {'success': True, 'message': 'Project deleted successfully'}
         except Exception as e:
@@ -275,6 +343,7 @@ class ProjectService(BaseService):
             project.status = new_status
             
             db.session.commit()
+            self._invalidate_board(firm_id)
             
             # Log activity - direct import to avoid circular dependency
             try:
@@ -355,11 +424,8 @@ class ProjectService(BaseService):
                 
                 # Find terminal status for this work type
                 if project.work_type_id:
-                    from .models import TaskStatus
-                    terminal_status = TaskStatus.query.filter_by(
-                        work_type_id=project.work_type_id,
-                        is_terminal=True
-                    ).first()
+                    from .status_cache import workflow_statuses
+                    terminal_status = workflow_statuses.terminal_for(project.work_type_id)
                     if terminal_status:
                         project.current_status_id = terminal_status.id
                 
@@ -384,17 +450,14 @@ class ProjectService(BaseService):
                 # status_id should be a TaskStatus ID
                 try:
                     status_id = int(status_id)
-                    from .models import TaskStatus
-                    task_status = TaskStatus.query.filter_by(
-                        id=status_id,
-                        work_type_id=project.work_type_id
-                    ).first()
+                    from .status_cache import workflow_statuses
+                    task_status = workflow_statuses.get(status_id)
                     
-                    if not task_status:
+                    if not task_status or task_status.work_type_id != project.work_type_id:
                         return {'success': False, 'message': 'Invalid status for this project type'}
                     
                     old_status_id = project.current_status_id
-                    old_status = TaskStatus.query.get(old_status_id) if old_status_id else None
+                    old_status = workflow_statuses.get(old_status_id)
                     
                     project.current_status_id = status_id
                     project.status = 'Active'  # Keep as active unless completed
@@ -425,6 +488,7 @@ class ProjectService(BaseService):
                     return {'success': False, 'message': 'Invalid status ID format'}
             
             db.session.commit()
+            self._invalidate_board(firm_id)
             
             # Log activity if user_id provided
             if user_id:
@@ -441,12 +505,9 @@ class ProjectService(BaseService):
                 except ImportError:
                     pass  # ActivityService not available
             
-            # Calculate updated progress for response  
-            from .task_repository import TaskRepository
-            task_repo = TaskRepository()
-            project_tasks = task_repo.get_project_tasks(project_id, firm_id, include_completed=True)
-            total_tasks = len(project_tasks)
-            completed_tasks = len([t for t in project_tasks if t.status == 'Completed'])
+            # Updated progress for response (denormalized counters)
+            total_tasks = project.task_count
+            completed_tasks = project.completed_task_count
             progress_percentage = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
             
             return {
@@ -474,81 +535,25 @@ class ProjectService(BaseService):
             ExternalServiceError: If data retrieval fails
         """
         try:
-            from .task_service import TaskService
-            from src.shared.exceptions import ExternalServiceError
-            
-            task_service = TaskService()
-            
-            # Get all projects for kanban display (as DTOs)
-            projects = self.get_active_projects(firm_id)
-            
-            # Get all tasks grouped by project and status
-            all_tasks = task_service.get_tasks_for_kanban(firm_id)
+            from .kanban_provider import KanbanBoardBuilder
             
-            # Organize projects by their current workflow status
-            from .models import TaskStatus, WorkType
-            
-            # Get all work types for this firm to build columns
-            work_types = WorkType.query.filter_by(firm_id=firm_id).all()
-            kanban_columns = {}
-            
-            for work_type in work_types:
-                statuses = TaskStatus.query.filter_by(
-                    work_type_id=work_type.id
-                ).order_by(TaskStatus.position.asc()).all()
-                
-                for status in statuses:
-                    column_key = f"status_{status.id}"
-                    kanban_columns[column_key] = {
-                        'id': status.id,
-                        'title': status.name,
-                        'work_type': work_type.name,
-                        'projects': [],
-                        'color': status.color or 'blue',
-                        'position': status.position
-                    }
-            
-            # Add completed column
-            kanban_columns['completed'] = {
-                'id': 'completed',
-                'title': 'Completed',
-                'work_type': 'All',
-                'projects': [],
-                'color': 'green',
-                'position': 999
-            }
-            
-            # Categorize projects by their current status
-            for project in projects:
-                if project['is_completed']:
-                    kanban_columns['completed']['projects'].append(project)
-                elif project.get('current_status_id'):
-                    column_key = f"status_{project['current_status_id']}"
-                    if column_key in kanban_columns:
-                        kanban_columns[column_key]['projects'].append(project)
-                else:
-                    # Project without status - put in first available column
-                    if kanban_columns:
-                        first_column = min(kanban_columns.keys(), 
-                                          key=lambda k: kanban_columns[k]['position'])
-                        kanban_columns[first_column]['projects'].append(project)
-            
-            # Sort columns by position
-            sorted_columns = dict(sorted(
-                kanban_columns.items(),
-                key=lambda x: x[1]['position']
-            ))
+            board = KanbanBoardBuilder(self.project_repository).get_board(firm_id)
             
             return {
                 'success': True,
-                'columns': sorted_columns,
-                'total_projects': len(projects),
+                'columns': board['columns'],
+                'total_projects': board['total_projects'],
                 'view_type': 'kanban'
             }
             
         except Exception as e:
             raise ExternalServiceError(f"Failed to get kanban view data: {str(e)}")
     
+    def _invalidate_board(self, firm_id):
+        """Drop the firm's cached Kanban board once the current transaction commits"""
+        from .view_invalidation import invalidate_board_after_commit
+        invalidate_board_after_commit(firm_id)
+    
     # REMOVED: _update_project_tasks_for_workflow_change
     # This method violated domain boundaries by directly manipulating Task models.
     # It has been replaced by the event-driven ProjectWorkflowTaskUpdateHandler
@@ -566,12 +571,9 @@ class ProjectService(BaseService):
             if not project:
                 return
             
-            # Count total tasks and completed tasks
-            from .task_repository import TaskRepository
-            task_repo = TaskRepository()
-            project_tasks = task_repo.get_project_tasks(project_id, project.firm_id, include_completed=True)
-            total_tasks = len(project_tasks)
-            completed_tasks = len([t for t in project_tasks if t.status == 'Completed'])
+            # Task totals are kept on the project row (see progress.py)
+            total_tasks = project.task_count
+            completed_tasks = project.completed_task_count
             
             # If all tasks are completed, mark project as completed
             if total_tasks > 0 and completed_tasks == total_tasks and project.status != 'Completed':
@@ -586,6 +588,7 @@ class ProjectService(BaseService):
                 except ImportError:
                     pass  # ActivityService not available
                 db.session.commit()
+                self._invalidate_board(project.firm_id)
             # If project was marked completed but has incomplete tasks, reactivate it
             elif project.status == 'Completed' and completed_tasks < total_tasks:
                 project.status = 'Active'
@@ -599,6 +602,7 @@ class ProjectService(BaseService):
                 except ImportError:
                     pass  # ActivityService not available
                 db.session.commit()
+                self._invalidate_board(project.firm_id)
                 
         except Exception as e:
             db.session.rollback()
@@ -664,6 +668,28 @@ class ProjectService(BaseService):
                 'message': str(e)
             }
     
+    def iter_projects_for_export(self, firm_id: int, columns: Optional[List[str]] = None,
+                                 batch_size: int = 1000) -> Dict[str, Any]:
+        """
+        Prepare a streaming project export
+        
+        Returns:
+            Dict with 'keys', 'labels', 'kinds' and a lazy 'rows' iterator of tuples
+        """
+        try:
+            from src.shared.utils.streaming_export import select_export_columns
+            
+            selected = select_export_columns(self.project_repository.get_export_columns(), columns)
+            return {
+                'success': True,
+                'keys': [column.key for column in selected],
+                'labels': [column.label for column in selected],
+                'kinds': [column.kind for column in selected],
+                'rows': self.project_repository.iter_export_rows(firm_id, selected, batch_size)
+            }
+        except ValueError as e:
+            return {'success': False, 'message': str(e)}
+    
     def get_recent_projects(self, firm_id: int, limit: int = 5) -> dict:
         """Get recent projects for dashboard"""
         try:
@@ -706,10 +732,8 @@ class ProjectService(BaseService):
     
     def get_activity_logs_for_project(self, project_id: int, limit: int = 10) -> List['ActivityLog']:
         """Get recent activity logs for a project"""
-        from src.models.auth import ActivityLog
-        return ActivityLog.query.filter_by(project_id=project_id).order_by(
-            ActivityLog.timestamp.desc()
-        ).limit(limit).all()
+        from src.shared.database.activity_storage import activity_storage
+        return activity_storage.recent(limit=limit, project_id=project_id)
     
     def get_project_tasks_for_dependency(self, project_id: int) -> List[Task]:
         """Get tasks for dependency calculations"""
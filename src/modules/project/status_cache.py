@@ -0,0 +1,226 @@
+"""
+Workflow Status Cache for CPA WorkflowPilot
+Keeps every work type's TaskStatus list in process memory as an immutable
+snapshot, loaded with one joined query, so status names, colors, default and
+terminal lookups and Kanban columns need no database round trip once warm.
+
+Writes to WorkType or TaskStatus (AdminRepository, AdminService, template
+work-type creation, bulk ``Query.update``) are noticed by session hooks and,
+once the transaction ends, bump a version stamp: in Redis
+(``workflow_statuses:version``) so every process reloads, and locally so this
+one does at once. Other processes compare their snapshot against the stamp at
+most every ``WORKFLOW_STATUS_VERSION_CHECK_SECONDS``.
+"""
+
+import logging
+import os
+import threading
+import time
+from types import MappingProxyType
+from typing import Dict, Any, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from src.shared.database.db_import import db
+from src.shared.database.redis_client import RedisClientMixin
+
+logger = logging.getLogger(__name__)
+
+VERSION_CHECK_SECONDS = float(os.environ.get('WORKFLOW_STATUS_VERSION_CHECK_SECONDS', 5))
+
+_CHANGED = 'workflow_statuses_changed'
+_installed = False
+
+
+class WorkflowStatus(NamedTuple):
+    """Read-only copy of a TaskStatus row (same attribute names as the model)"""
+    id: int
+    firm_id: int
+    work_type_id: int
+    name: str
+    color: str
+    position: int
+    is_terminal: bool
+    is_default: bool
+    work_type_name: str
+    work_type_position: int
+
+
+class StatusSnapshot(NamedTuple):
+    version: int
+    bind: Any
+    by_work_type: MappingProxyType
+    by_id: MappingProxyType
+    by_firm: MappingProxyType
+
+
+class WorkflowStatusCache(RedisClientMixin):
+    """Versioned in-process snapshot of TaskStatus lists keyed by work type"""
+
+    VERSION_KEY = 'workflow_statuses:version'
+
+    def __init__(self, redis_client_instance=None, check_interval: float = VERSION_CHECK_SECONDS):
+        """
+        Initialize the status cache
+
+        Args:
+            redis_client_instance: RedisClient instance (optional, defaults to the global client)
+            check_interval: Seconds between comparisons with the shared version stamp
+        """
+        self._redis_client = redis_client_instance
+        self.check_interval = check_interval
+        self._snapshot: Optional[StatusSnapshot] = None
+        self._version = 0
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def _shared_version(self) -> int:
+        """The stamp in Redis, read at most every ``check_interval`` seconds"""
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return self._version
+        self._checked_at = now
+
+        client = self._get_client()
+        if not client:
+            return self._version
+        try:
+            value = client.get(self.VERSION_KEY)
+        except Exception as e:
+            logger.warning(f"Failed to read workflow status version: {e}")
+            return self._version
+        if value is not None:
+            self._version = max(self._version, int(value))
+        return self._version
+
+    def snapshot(self) -> StatusSnapshot:
+        """The current snapshot, reloaded if the version moved or the database changed"""
+        snapshot = self._snapshot
+        version = self._shared_version()
+        if snapshot is not None and snapshot.version == version and snapshot.bind is db.engine:
+            return snapshot
+
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is None or snapshot.version != version or snapshot.bind is not db.engine:
+                snapshot = self._load(version)
+                self._snapshot = snapshot
+        return snapshot
+
+    def _load(self, version: int) -> StatusSnapshot:
+        """Every status with its work type, one query"""
+        from .models import TaskStatus, WorkType
+
+        rows = db.session.query(
+            TaskStatus.id, TaskStatus.firm_id, TaskStatus.work_type_id, TaskStatus.name, TaskStatus.color,
+            TaskStatus.position, TaskStatus.is_terminal, TaskStatus.is_default,
+            WorkType.name.label('work_type_name'), WorkType.position.label('work_type_position'),
+            WorkType.firm_id.label('work_type_firm_id')
+        ).join(WorkType, TaskStatus.work_type_id == WorkType.id) \
+            .order_by(TaskStatus.work_type_id, TaskStatus.position, TaskStatus.id).all()
+
+        by_work_type: Dict[int, List[WorkflowStatus]] = {}
+        by_firm: Dict[int, List[WorkflowStatus]] = {}
+        for row in rows:
+            status = WorkflowStatus(row.id, row.firm_id, row.work_type_id, row.name, row.color, row.position,
+                                    row.is_terminal, row.is_default, row.work_type_name, row.work_type_position or 0)
+            by_work_type.setdefault(row.work_type_id, []).append(status)
+            by_firm.setdefault(row.work_type_firm_id, []).append(status)
+
+        for statuses in by_firm.values():
+            statuses.sort(key=lambda status: (status.work_type_position, status.work_type_id, status.position))
+
+        return StatusSnapshot(
+            version=version,
+            bind=db.engine,
+            by_work_type=MappingProxyType({key: tuple(value) for key, value in by_work_type.items()}),
+            by_id=MappingProxyType({status.id: status for statuses in by_work_type.values() for status in statuses}),
+            by_firm=MappingProxyType({key: tuple(value) for key, value in by_firm.items()})
+        )
+
+    def get(self, status_id: Optional[int]) -> Optional[WorkflowStatus]:
+        if not status_id:
+            return None
+        return self.snapshot().by_id.get(status_id)
+
+    def for_work_type(self, work_type_id: Optional[int]) -> Tuple[WorkflowStatus, ...]:
+        """The work type's statuses in position order"""
+        if not work_type_id:
+            return ()
+        return self.snapshot().by_work_type.get(work_type_id, ())
+
+    def default_for(self, work_type_id: Optional[int]) -> Optional[WorkflowStatus]:
+        """The status flagged default, else the first by position"""
+        statuses = self.for_work_type(work_type_id)
+        return next((status for status in statuses if status.is_default), statuses[0] if statuses else None)
+
+    def terminal_for(self, work_type_id: Optional[int]) -> Optional[WorkflowStatus]:
+        return next((status for status in self.for_work_type(work_type_id) if status.is_terminal), None)
+
+    def next_after(self, work_type_id: Optional[int], position: int) -> Optional[WorkflowStatus]:
+        return next((status for status in self.for_work_type(work_type_id) if status.position > position), None)
+
+    def columns_for_firm(self, firm_id: int) -> List[Dict[str, Any]]:
+        """Kanban columns: every status of the firm's work types, in work type then status order"""
+        return [{
+            'id': status.id,
+            'title': status.name,
+            'work_type': status.work_type_name,
+            'color': status.color or 'blue',
+            'position': status.position
+        } for status in self.snapshot().by_firm.get(firm_id, ())]
+
+    def invalidate(self):
+        """Bump the version stamp (shared when Redis is up) and drop this process's snapshot"""
+        version = self._version + 1
+        client = self._get_client()
+        if client:
+            try:
+                version = max(version, int(client.incr(self.VERSION_KEY)))
+            except Exception as e:
+                logger.warning(f"Failed to bump workflow status version: {e}")
+
+        with self._lock:
+            self._version = version
+            self._snapshot = None
+
+
+def _mark_changed(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        session.info[_CHANGED] = True
+
+
+def _mark_bulk_changed(orm_execute_state):
+    """``Query.update``/``delete`` and ORM-enabled DML skip the mapper events"""
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert):
+        return
+    from .models import TaskStatus, WorkType
+
+    if any(mapper.class_ in (TaskStatus, WorkType) for mapper in orm_execute_state.all_mappers):
+        orm_execute_state.session.info[_CHANGED] = True
+
+
+def _invalidate_if_changed(session):
+    if session.info.pop(_CHANGED, False):
+        workflow_statuses.invalidate()
+
+
+def install_status_cache_invalidation(*models):
+    """Register the WorkType/TaskStatus mapper and session hooks (once per process)"""
+    global _installed
+    if _installed:
+        return
+    for model in models:
+        for name in ('after_insert', 'after_update', 'after_delete'):
+            event.listen(model, name, _mark_changed)
+    event.listen(Session, 'do_orm_execute', _mark_bulk_changed)
+    # A rolled-back snapshot may hold rows that never committed
+    event.listen(Session, 'after_commit', _invalidate_if_changed)
+    event.listen(Session, 'after_rollback', _invalidate_if_changed)
+    _installed = True
+
+
+# Global status cache (Redis client resolved per call)
+workflow_statuses = WorkflowStatusCache()
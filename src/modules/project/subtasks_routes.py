@@ -13,6 +13,7 @@ subtasks_bp = Blueprint('subtasks', __name__, url_prefix='/tasks')
 
 
 from .task_service import TaskService
+from .task_repository import TaskRepository
 
 @subtasks_bp.route('/<int:task_id>/subtasks/create', methods=['POST'])
 def create_subtask(task_id):
@@ -21,7 +22,7 @@ def create_subtask(task_id):
     description = request.json.get('description', '').strip()
     if not title:
         return jsonify({'success': False, 'message': 'Title is required'}), 400
-    result = TaskService().create_subtask(task_id, title, description, user_id)
+    result = TaskService(TaskRepository()).create_subtask(task_id, title, description, user_id)
     return jsonify(result)
 
 
@@ -29,7 +30,7 @@ def create_subtask(task_id):
 def reorder_subtasks(task_id):
     user_id = get_session_user_id()
     subtask_ids = request.json.get('subtask_ids', [])
-    result = TaskService().reorder_subtasks(task_id, subtask_ids, user_id)
+    result = TaskService(TaskRepository()).reorder_subtasks(task_id, subtask_ids, user_id, get_session_firm_id())
     return jsonify(result)
 
 
@@ -39,7 +40,7 @@ def convert_to_subtask(task_id):
     parent_task_id = request.json.get('parent_task_id')
     if not parent_task_id:
         return jsonify({'success': False, 'message': 'Parent task ID is required'}), 400
-    result = TaskService().convert_to_subtask(task_id, parent_task_id, user_id)
+    result = TaskService(TaskRepository()).convert_to_subtask(task_id, parent_task_id, user_id)
     if isinstance(result, tuple):
         return jsonify(result[0]), result[1]
     return jsonify(result)
\ No newline at end of file
@@ -0,0 +1,158 @@
+"""
+Task Closure for CPA WorkflowPilot
+Maintains ``task_closure``, one row per (ancestor, descendant) pair of the
+subtask tree with the distance between them (1 = direct parent). Root
+tasks have no rows. Any subtree, root or depth lookup is then one indexed
+query instead of a walk up or down ``parent_task`` one lazy load at a time.
+
+TaskService updates the table in the same transaction as the subtask
+create, convert and delete paths (and TaskRepository.bulk_delete). Fill or
+repair it from ``task.parent_task_id`` with
+``python -m src.modules.project.task_closure rebuild``.
+"""
+
+from typing import Iterable, List
+
+from sqlalchemy import literal, select, true, union_all
+
+from src.shared.database.db_import import db
+
+# Guards the rebuild against parent_task_id cycles in existing data
+MAX_DEPTH = 100
+
+
+def _closure():
+    from .models import TaskClosure
+    return TaskClosure.__table__
+
+
+def _subtree_ids(task_id: int):
+    """``task_id`` and every task below it"""
+    closure = _closure()
+    return union_all(
+        select(literal(task_id).label('task_id'), literal(0).label('depth')),
+        select(closure.c.descendant_id, closure.c.depth).where(closure.c.ancestor_id == task_id)
+    ).subquery()
+
+
+def _ancestor_ids(task_id: int):
+    """``task_id`` and every task above it"""
+    closure = _closure()
+    return union_all(
+        select(literal(task_id).label('task_id'), literal(0).label('depth')),
+        select(closure.c.ancestor_id, closure.c.depth).where(closure.c.descendant_id == task_id)
+    ).subquery()
+
+
+def link_subtask(task_id: int, parent_task_id: int):
+    """
+    Attach ``task_id`` (and anything already below it) under ``parent_task_id``
+
+    Removes the subtree's links to its previous ancestors, then links every
+    task in the subtree to the new parent and its ancestors, two statements
+    whatever the tree size.
+    """
+    closure = _closure()
+    subtree = select(closure.c.descendant_id).where(closure.c.ancestor_id == task_id)
+    db.session.execute(closure.delete().where(
+        (closure.c.descendant_id == task_id) | closure.c.descendant_id.in_(subtree),
+        closure.c.ancestor_id != task_id,
+        closure.c.ancestor_id.notin_(subtree)
+    ))
+
+    above = _ancestor_ids(parent_task_id)
+    below = _subtree_ids(task_id)
+    db.session.execute(closure.insert().from_select(
+        ['ancestor_id', 'descendant_id', 'depth'],
+        select(above.c.task_id, below.c.task_id, above.c.depth + below.c.depth + 1)
+        .select_from(above.join(below, true()))
+    ))
+
+
+def unlink_subtrees(task_ids: Iterable[int]):
+    """Drop every row touching the subtrees of ``task_ids`` (run before deleting them)"""
+    closure = _closure()
+    task_ids = list(task_ids)
+    if not task_ids:
+        return
+    subtree = select(closure.c.descendant_id).where(closure.c.ancestor_id.in_(task_ids))
+    db.session.execute(closure.delete().where(
+        closure.c.descendant_id.in_(task_ids) | closure.c.descendant_id.in_(subtree)
+    ))
+
+
+def is_in_subtree(task_id: int, ancestor_id: int) -> bool:
+    """True if ``task_id`` is ``ancestor_id`` or below it"""
+    if task_id == ancestor_id:
+        return True
+    closure = _closure()
+    return db.session.execute(select(closure.c.depth).where(
+        closure.c.ancestor_id == ancestor_id, closure.c.descendant_id == task_id
+    )).first() is not None
+
+
+def subtree_ids(task_id: int) -> List[int]:
+    """Every task below ``task_id``, shallowest first"""
+    closure = _closure()
+    return list(db.session.execute(
+        select(closure.c.descendant_id).where(closure.c.ancestor_id == task_id).order_by(closure.c.depth)
+    ).scalars())
+
+
+def root_id(task_id: int) -> int:
+    closure = _closure()
+    root = db.session.execute(
+        select(closure.c.ancestor_id).where(closure.c.descendant_id == task_id)
+        .order_by(closure.c.depth.desc()).limit(1)
+    ).scalar()
+    return root or task_id
+
+
+def depth(task_id: int) -> int:
+    closure = _closure()
+    return db.session.execute(
+        select(db.func.max(closure.c.depth)).where(closure.c.descendant_id == task_id)
+    ).scalar() or 0
+
+
+def rebuild(connection=None) -> int:
+    """
+    Recompute the whole table from ``task.parent_task_id`` with one recursive query
+
+    Returns:
+        int: Number of closure rows written
+    """
+    if connection is None:
+        count = rebuild(db.session.connection())
+        db.session.commit()
+        return count
+
+    connection.exec_driver_sql("DELETE FROM task_closure")
+    connection.exec_driver_sql(f"""
+        INSERT INTO task_closure (ancestor_id, descendant_id, depth)
+        WITH RECURSIVE tree (ancestor_id, descendant_id, depth) AS (
+            SELECT parent_task_id, id, 1 FROM task WHERE parent_task_id IS NOT NULL
+            UNION ALL
+            SELECT task.parent_task_id, tree.descendant_id, tree.depth + 1
+            FROM tree JOIN task ON task.id = tree.ancestor_id
+            WHERE task.parent_task_id IS NOT NULL AND tree.depth < {MAX_DEPTH}
+        )
+        SELECT ancestor_id, descendant_id, MIN(depth) FROM tree GROUP BY ancestor_id, descendant_id
+    """)
+    return connection.exec_driver_sql("SELECT COUNT(*) FROM task_closure").scalar()
+
+
+if __name__ == '__main__':
+    import sys
+
+    from src.app import create_app
+
+    command = sys.argv[1] if len(sys.argv) > 1 else 'rebuild'
+    app = create_app()
+    with app.app_context():
+        if command == 'rebuild':
+            from .models import TaskClosure
+            TaskClosure.__table__.create(db.engine, checkfirst=True)
+            print(f"Task closure rebuilt: {rebuild()} rows")
+        else:
+            print("Usage: python -m src.modules.project.task_closure rebuild")
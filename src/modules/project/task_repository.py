@@ -3,7 +3,7 @@ Task Repository for CPA WorkflowPilot
 Provides data access layer for task-related operations.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator
 from datetime import datetime
 from sqlalchemy import or_, and_
 
@@ -227,7 +227,7 @@ class TaskRepository(CachedRepository[Task]):
         ranked_subquery = ranked_subquery.subquery()
         
         # Create aliases for the subquery
-        TaskAlias = aliased(Task, ranked_subquery.c)
+        TaskAlias = aliased(Task, ranked_subquery)
         
         # Final query that only selects rank=1 tasks for interdependent projects
         # or all tasks for non-interdependent projects
@@ -295,34 +295,62 @@ class TaskRepository(CachedRepository[Task]):
         # Note: Transaction commit is handled by service layer
         return task
     
+    # Fields bulk edits may set; anything else in ``updates`` is ignored
+    BULK_UPDATE_FIELDS = ('status', 'status_id', 'priority', 'assignee_id', 'due_date')
+    # Keeps ``IN (...)`` lists well under database parameter limits
+    BULK_CHUNK_SIZE = 500
+
+    def _firm_scope(self, firm_id: int):
+        """Task rows belonging to a firm, usable in UPDATE/DELETE without a join"""
+        firm_projects = db.session.query(Project.id).filter(Project.firm_id == firm_id)
+        return or_(
+            Task.project_id.in_(firm_projects),
+            and_(Task.project_id.is_(None), Task.firm_id == firm_id)
+        )
+
+    def _chunks(self, ids: List[int]) -> Iterator[List[int]]:
+        ids = list(dict.fromkeys(ids))
+        for start in range(0, len(ids), self.BULK_CHUNK_SIZE):
+            yield ids[start:start + self.BULK_CHUNK_SIZE]
+
     def bulk_update(self, task_ids: List[int], updates: Dict[str, Any], 
                    firm_id: int) -> Dict[str, Any]:
-        """Bulk update multiple tasks"""
-        tasks = Task.query.outerjoin(Project).filter(
-            Task.id.in_(task_ids),
-            or_(
-                Project.firm_id == firm_id,
-                and_(Task.project_id.is_(None), Task.firm_id == firm_id)
-            )
-        ).all()
-        
-        if not tasks:
+        """
+        Bulk update multiple tasks
+
+        One ``UPDATE ... WHERE id IN (...)`` per chunk of ids, scoped to the
+        firm; no Task objects are loaded.
+        """
+        values = {field: value for field, value in updates.items() if field in self.BULK_UPDATE_FIELDS}
+        if not values:
             return {
                 'success': False,
-                'message': 'No valid tasks found'
+                'message': 'No valid fields to update'
             }
         
-        valid_fields = self._filter_valid_fields(updates)
+        from .progress import recount
+        
         updated_count = 0
+        touched_projects = set()
+        for chunk in self._chunks(task_ids):
+            if 'status' in values:
+                touched_projects.update(project_id for (project_id,) in db.session.query(Task.project_id).filter(
+                    Task.id.in_(chunk), self._firm_scope(firm_id)
+                ).distinct())
+            result = db.session.execute(
+                Task.__table__.update()
+                .where(Task.id.in_(chunk), self._firm_scope(firm_id))
+                .values(**values)
+            )
+            updated_count += result.rowcount
+        # Core statements skip the ORM hooks that maintain project progress
+        recount(touched_projects)
         
-        for task in tasks:
-            task_updated = False
-            for field, value in valid_fields.items():
-                if hasattr(task, field):
-                    setattr(task, field, value)
-                    task_updated = True
-            if task_updated:
-                updated_count += 1
+        if not updated_count:
+            return {
+                'success': False,
+                'message': 'No valid tasks found'
+            }
         
         # Note: Transaction commit is handled by service layer
         
@@ -333,26 +361,60 @@ class TaskRepository(CachedRepository[Task]):
         }
     
     def bulk_delete(self, task_ids: List[int], firm_id: int) -> Dict[str, Any]:
-        """Bulk delete multiple tasks"""
-        tasks = Task.query.outerjoin(Project).filter(
-            Task.id.in_(task_ids),
-            or_(
-                Project.firm_id == firm_id,
-                and_(Task.project_id.is_(None), Task.firm_id == firm_id)
-            )
-        ).all()
+        """
+        Bulk delete multiple tasks with their subtasks, comments and attachments
+
+        Set-based per chunk: one query per subtask level, then one statement
+        per dependent table and one ``DELETE`` for the tasks. Dependent rows
+        are cleared explicitly (comments and attachments deleted, activity
+        and recurring-master references nulled) rather than left to ON DELETE
+        rules the schema does not declare.
+        """
+        from src.models.auth import ActivityLog
+        from src.modules.document.models import Attachment
+        from .models import TaskComment
+        from .progress import recount
+        from .task_closure import unlink_subtrees
         
-        if not tasks:
+        deleted_count = 0
+        touched_projects = set()
+        for chunk in self._chunks(task_ids):
+            ids = [task_id for (task_id,) in db.session.query(Task.id).filter(
+                Task.id.in_(chunk), self._firm_scope(firm_id)
+            )]
+            
+            level = ids
+            while level:
+                level = [task_id for (task_id,) in db.session.query(Task.id).filter(
+                    Task.parent_task_id.in_(level)
+                )]
+                ids.extend(level)
+            if not ids:
+                continue
+            
+            for id_chunk in self._chunks(ids):
+                unlink_subtrees(id_chunk)
+                touched_projects.update(project_id for (project_id,) in db.session.query(Task.project_id).filter(
+                    Task.id.in_(id_chunk)
+                ).distinct())
+                db.session.execute(TaskComment.__table__.delete().where(TaskComment.task_id.in_(id_chunk)))
+                db.session.execute(Attachment.__table__.delete().where(Attachment.task_id.in_(id_chunk)))
+                db.session.execute(ActivityLog.__table__.update()
+                                   .where(ActivityLog.task_id.in_(id_chunk)).values(task_id=None))
+                db.session.execute(Task.__table__.update()
+                                   .where(Task.master_task_id.in_(id_chunk)).values(master_task_id=None))
+            # Subtasks first so no statement breaks the parent_task_id constraint
+            for id_chunk in self._chunks(list(reversed(ids))):
+                result = db.session.execute(Task.__table__.delete().where(Task.id.in_(id_chunk)))
+                deleted_count += result.rowcount
+        recount(touched_projects)
+        
+        if not deleted_count:
             return {
                 'success': False,
                 'message': 'No valid tasks found'
             }
         
-        deleted_count = 0
-        for task in tasks:
-            db.session.delete(task)
-            deleted_count += 1
-        
         # Note: Transaction commit is handled by service layer
         
         return {
@@ -361,6 +423,71 @@ class TaskRepository(CachedRepository[Task]):
             'deleted_count': deleted_count
         }
     
+    def reorder_subtasks(self, parent_task_id: int, subtask_ids: List[int]) -> int:
+        """Set ``subtask_order`` to each subtask's 1-based position with one ``CASE`` update"""
+        from sqlalchemy import case
+        
+        positions = {subtask_id: index + 1 for index, subtask_id in enumerate(dict.fromkeys(subtask_ids))}
+        if not positions:
+            return 0
+        
+        result = db.session.execute(
+            Task.__table__.update()
+            .where(Task.id.in_(list(positions)), Task.parent_task_id == parent_task_id)
+            .values(subtask_order=case(positions, value=Task.id))
+        )
+        return result.rowcount
+
+    def set_statuses_by_workflow_position(self, project_id: int, position: int) -> int:
+        """
+        Mirror a project's workflow position onto its tasks with one ``UPDATE``
+
+        In task id order, tasks before ``position`` become Completed, the one
+        at it In Progress and the rest Not Started. The pivot is the id at that
+        offset, found by a scalar subquery; only rows whose status changes are
+        written.
+
+        Returns:
+            int: Number of tasks whose status changed
+        """
+        from sqlalchemy import case, select
+
+        pivot = select(Task.id).where(Task.project_id == project_id) \
+            .order_by(Task.id).limit(1).offset(position).scalar_subquery()
+        new_status = case(
+            (or_(pivot.is_(None), Task.id < pivot), 'Completed'),
+            (Task.id == pivot, 'In Progress'),
+            else_='Not Started'
+        )
+        result = db.session.execute(
+            Task.__table__.update()
+            .where(Task.project_id == project_id, Task.status != new_status)
+            .values(status=new_status)
+        )
+        self._after_project_status_write(project_id, result.rowcount)
+        return result.rowcount
+
+    def complete_project_tasks(self, project_id: int) -> int:
+        """Mark every task of the project Completed with one ``UPDATE``; returns the number changed"""
+        result = db.session.execute(
+            Task.__table__.update()
+            .where(Task.project_id == project_id, Task.status != 'Completed')
+            .values(status='Completed')
+        )
+        self._after_project_status_write(project_id, result.rowcount)
+        return result.rowcount
+
+    def _after_project_status_write(self, project_id: int, changed: int):
+        """Core updates skip the progress hooks and leave loaded tasks stale"""
+        if not changed:
+            return
+        from .progress import recount
+
+        recount([project_id])
+        for instance in list(db.session.identity_map.values()):
+            if isinstance(instance, Task) and instance.project_id == project_id:
+                db.session.expire(instance, ['status', 'updated_at'])
+
     def get_tasks_by_firm(self, firm_id: int, limit: Optional[int] = None) -> List[Task]:
         """
         Get all tasks for a firm with proper ordering and optional limit
@@ -453,8 +580,70 @@ class TaskRepository(CachedRepository[Task]):
         
         return query.all()
     
+    def get_calendar_rows(self, firm_id: int, start_date, end_date) -> List[Dict[str, Any]]:
+        """
+        Get the fields the calendar shows for tasks due in a date range
+
+        One joined, column-only query: no Task objects and no lazy loads of
+        project, assignee or status per task.
+        """
+        from src.models.auth import User
+        from .models import TaskStatus
+
+        rows = db.session.query(
+            Task.id, Task.title, Task.description, Task.due_date, Task.priority,
+            Task.status.label('legacy_status'),
+            TaskStatus.name.label('status_name'),
+            TaskStatus.is_terminal,
+            Project.name.label('project_name'),
+            Project.status.label('project_status'),
+            User.name.label('assignee_name')
+        ).select_from(Task) \
+            .outerjoin(Project, Task.project_id == Project.id) \
+            .outerjoin(User, Task.assignee_id == User.id) \
+            .outerjoin(TaskStatus, Task.status_id == TaskStatus.id) \
+            .filter(
+                or_(
+                    Project.firm_id == firm_id,
+                    and_(Task.project_id.is_(None), Task.firm_id == firm_id)
+                ),
+                Task.due_date.between(start_date, end_date)
+            ).order_by(Task.due_date.asc(), Task.id.asc()).all()
+
+        calendar_rows = []
+        for row in rows:
+            if row.status_name is not None:
+                is_completed = bool(row.is_terminal)
+            else:
+                is_completed = row.legacy_status in ['Completed', 'Done', 'Cancelled']
+
+            calendar_rows.append({
+                'id': row.id,
+                'title': row.title,
+                'description': row.description,
+                'due_date': row.due_date,
+                'status': row.status_name or row.legacy_status,
+                'priority': row.priority,
+                'is_completed': is_completed,
+                'project_completed': row.project_status == 'Completed',
+                'project_name': row.project_name,
+                'assignee_name': row.assignee_name
+            })
+        return calendar_rows
+
     def search_tasks(self, firm_id: int, query_text: str, limit: int = 20) -> List[Task]:
-        """Search tasks by title and description"""
+        """Search tasks by title and description, ranked through the full-text index when installed"""
+        from sqlalchemy.orm import joinedload
+        from src.shared.database.search_index import search_index, order_by_ids
+        
+        task_ids = search_index.search(firm_id, 'task', query_text, limit)
+        if task_ids is not None:
+            if not task_ids:
+                return []
+            tasks = Task.query.options(joinedload(Task.project), joinedload(Task.assignee)) \
+                .filter(Task.id.in_(task_ids)).all()
+            return order_by_ids(tasks, task_ids)
+        
         search_pattern = f'%{query_text}%'
         
         query = db.session.query(Task).outerjoin(Project).filter(
@@ -472,3 +661,54 @@ class TaskRepository(CachedRepository[Task]):
             query = query.limit(limit)
         
         return query.all()
+    
+    def get_export_columns(self) -> List['ExportColumn']:
+        """Columns available to task exports, with related names pre-joined"""
+        from sqlalchemy import func
+        from src.models.auth import User
+        from src.shared.utils.streaming_export import ExportColumn
+        from .models import TaskStatus
+        
+        return [
+            ExportColumn('id', 'ID', Task.id),
+            ExportColumn('title', 'Title', Task.title),
+            ExportColumn('description', 'Description', Task.description),
+            ExportColumn('status', 'Status', func.coalesce(TaskStatus.name, Task.status)),
+            ExportColumn('priority', 'Priority', Task.priority),
+            ExportColumn('due_date', 'Due Date', Task.due_date),
+            ExportColumn('project_id', 'Project ID', Task.project_id),
+            ExportColumn('project_name', 'Project', func.coalesce(Project.name, '')),
+            ExportColumn('assignee_id', 'Assignee ID', Task.assignee_id),
+            ExportColumn('assignee_name', 'Assignee', func.coalesce(User.name, 'Unassigned')),
+            ExportColumn('created_at', 'Created At', Task.created_at),
+            ExportColumn('estimated_hours', 'Estimated Hours', Task.estimated_hours),
+            ExportColumn('actual_hours', 'Actual Hours', Task.actual_hours),
+            ExportColumn('hourly_rate', 'Hourly Rate', Task.hourly_rate),
+            ExportColumn('is_billable', 'Billable', Task.is_billable),
+        ]
+    
+    def iter_export_rows(self, firm_id: int, columns: List['ExportColumn'],
+                         batch_size: int = 1000) -> Iterator[tuple]:
+        """
+        Stream task rows for export as plain tuples
+        
+        Selects only the requested columns (no ORM objects, no lazy loads)
+        and reads them through a server-side cursor ``batch_size`` rows at a time.
+        """
+        from src.models.auth import User
+        from src.shared.utils.streaming_export import stream_query
+        from .models import TaskStatus
+        
+        query = db.session.query(*[column.expression.label(column.key) for column in columns]) \
+            .select_from(Task) \
+            .outerjoin(Project, Task.project_id == Project.id) \
+            .outerjoin(User, Task.assignee_id == User.id) \
+            .outerjoin(TaskStatus, Task.status_id == TaskStatus.id) \
+            .filter(
+                or_(
+                    Project.firm_id == firm_id,
+                    and_(Task.project_id.is_(None), Task.firm_id == firm_id)
+                )
+            ).order_by(Task.due_date.asc().nullslast(), Task.priority.asc(), Task.id.asc())
+        
+        return stream_query(query, batch_size)
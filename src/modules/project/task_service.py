@@ -44,7 +44,8 @@ class TaskService(BaseService):
             estimated_hours=estimated_hours
         )
         db.session.add(task)
-        
+        db.session.flush()  # Assign task.id for the activity log and event
+
         # Log activity (will be committed by @transactional decorator)
         try:
             from src.shared.services.activity_service import ActivityService
@@ -58,7 +59,28 @@ class TaskService(BaseService):
             )
         except ImportError:
             pass  # ActivityService not available
-        
+
+        # Publish task creation event once the task is committed
+        try:
+            from src.shared.events.schemas import TaskCreatedEvent
+            from src.shared.events.publisher import publish_event_after_commit
+            event = TaskCreatedEvent(
+                task_id=task.id,
+                title=task.title,
+                project_id=project_id,
+                assignee_id=task.assignee_id,
+                priority=priority,
+                due_date=due_date,
+                estimated_hours=estimated_hours,
+                firm_id=firm_id,
+                user_id=user_id
+            )
+            publish_event_after_commit(event)
+        except Exception:
+            pass  # Event publishing is optional
+
+        self._invalidate_views(firm_id, due_date)
+
         return {
             'success': True,
             'task_id': task.id,
@@ -90,6 +112,10 @@ class TaskService(BaseService):
             status=parent_task.status if not parent_task.status_id else 'Not Started'
         )
         db.session.add(subtask)
+        db.session.flush()  # Assign subtask.id for the closure rows and activity log
+        
+        from .task_closure import link_subtask
+        link_subtask(subtask.id, parent_task_id)
         try:
             from src.shared.services.activity_service import ActivityService
             ActivityService.log_task_operation(
@@ -115,12 +141,15 @@ class TaskService(BaseService):
         }
 
     @transactional
-    def reorder_subtasks(self, task_id, subtask_ids, user_id):
-        for index, subtask_id in enumerate(subtask_ids):
-            subtask = Task.query.get(subtask_id)
-            if subtask and subtask.parent_task_id == task_id:
-                subtask.subtask_order = index + 1
-        return {'success': True, 'message': 'Subtasks reordered successfully'}
+    def reorder_subtasks(self, task_id, subtask_ids, user_id, firm_id=None):
+        if firm_id is not None and not self.get_task_by_id_with_access_check(task_id, firm_id):
+            return {'success': False, 'message': 'Task not found or access denied'}
+        reordered_count = self.task_repository.reorder_subtasks(task_id, subtask_ids)
+        return {
+            'success': True,
+            'message': 'Subtasks reordered successfully',
+            'reordered_count': reordered_count
+        }
 
     @transactional
     def convert_to_subtask(self, task_id, parent_task_id, user_id):
@@ -128,17 +157,17 @@ class TaskService(BaseService):
         parent_task = Task.query.get(parent_task_id)
         if not parent_task:
             return {'success': False, 'message': 'Parent task not found'}, 404
-        # Prevent circular relationships
+        from .task_closure import is_in_subtree, link_subtask
+        
+        # Prevent circular relationships (one closure-table lookup)
         if parent_task_id == task_id:
             return {'success': False, 'message': 'Cannot make task a subtask of itself'}, 400
-        current = parent_task
-        while current.parent_task:
-            if current.parent_task.id == task_id:
-                return {'success': False, 'message': 'Cannot create circular subtask relationship'}, 400
-            current = current.parent_task
+        if is_in_subtree(parent_task_id, task_id):
+            return {'success': False, 'message': 'Cannot create circular subtask relationship'}, 400
         max_order = db.session.query(db.func.max(Task.subtask_order)).filter_by(parent_task_id=parent_task_id).scalar() or 0
         task.parent_task_id = parent_task_id
         task.subtask_order = max_order + 1
+        link_subtask(task.id, parent_task_id)
         try:
             from src.shared.services.activity_service import ActivityService
             ActivityService.log_task_operation(
@@ -227,6 +256,8 @@ class TaskService(BaseService):
             if not task:
                 return {'success': False, 'message': 'Task not found or access denied'}
             
+            previous_due_date = task.due_date
+            
             # Update fields
             task.title = form_data.get('title', task.title)
             task.description = form_data.get('description', task.description)
@@ -258,6 +289,8 @@ class TaskService(BaseService):
             except ImportError:
                 pass  # ActivityService not available
             
+            self._invalidate_views(firm_id, previous_due_date, task.due_date)
+            
             return {'success': True, 'message': 'Task updated successfully'}
         except Exception as e:
             return {'success': False, 'message': str(e)}
@@ -271,6 +304,9 @@ class TaskService(BaseService):
                 return {'success': False, 'message': 'Task not found or access denied'}
             
             task_title = task.title
+            # Closure rows go first so nothing references the deleted subtree
+            from .task_closure import unlink_subtrees
+            unlink_subtrees([task.id])
             db.session.delete(task)
             
             try:
@@ -291,13 +327,16 @@ class TaskService(BaseService):
             from src.shared.events.publisher import publish_event
             event = TaskDeletedEvent(
                 task_id=task_id,
-                task_title=task_title,
-                assigned_to=task.assignee_id,
+                title=task_title,
+                project_id=task.project_id,
+                assignee_id=task.assignee_id,
                 firm_id=firm_id,
                 user_id=user_id
             )
             publish_event(event)
             
+            self._invalidate_views(firm_id, task.due_date)
+            
             return {'success': True, 'message': 'Task deleted successfully'}
         except Exception as e:
             return {'success': False, 'message': str(e)}
@@ -335,25 +374,26 @@ class TaskService(BaseService):
     
     @transactional
     def bulk_update_tasks(self, task_ids, updates, firm_id, user_id):
-        """Bulk update multiple tasks"""
+        """Bulk update multiple tasks with one aggregated activity entry and event"""
         try:
-            from .task_repository import TaskRepository
-            task_repo = TaskRepository()
-            result = task_repo.bulk_update(task_ids, updates, firm_id)
+            due_dates = self._due_dates_of(task_ids)
+            result = self.task_repository.bulk_update(task_ids, updates, firm_id)
             
             if result['success']:
+                self._invalidate_views(firm_id, *due_dates, updates.get('due_date'))
+                self._log_bulk_operation('UPDATE', result['updated_count'], f'Bulk updated: {updates}', user_id)
                 try:
-                    from src.shared.services.activity_service import ActivityService
-                    ActivityService.log_entity_operation(
-                        entity_type='TASK',
-                        operation='UPDATE',
-                        entity_id=0,  # Bulk operation
-                        entity_name=f'{len(task_ids)} tasks',
-                        details=f'Bulk updated: {updates}',
+                    from src.shared.events.schemas import TasksBulkUpdatedEvent
+                    from src.shared.events.publisher import publish_event
+                    publish_event(TasksBulkUpdatedEvent(
+                        task_ids=list(task_ids),
+                        changes=updates,
+                        updated_count=result['updated_count'],
+                        firm_id=firm_id,
                         user_id=user_id
-                    )
-                except ImportError:
-                    pass  # ActivityService not available
+                    ))
+                except Exception:
+                    pass  # Event publishing is optional
             
             return result
         except Exception as e:
@@ -361,27 +401,42 @@ class TaskService(BaseService):
     
     @transactional
     def bulk_delete_tasks(self, task_ids, firm_id, user_id):
-        """Bulk delete multiple tasks"""
-        from .task_repository import TaskRepository
-        task_repo = TaskRepository()
-        result = task_repo.bulk_delete(task_ids, firm_id)
+        """Bulk delete multiple tasks with one aggregated activity entry and event"""
+        due_dates = self._due_dates_of(task_ids)
+        result = self.task_repository.bulk_delete(task_ids, firm_id)
         
         if result['success']:
+            self._invalidate_views(firm_id, *due_dates)
+            self._log_bulk_operation('DELETE', result['deleted_count'], 'Bulk deleted tasks', user_id)
             try:
-                from src.shared.services.activity_service import ActivityService
-                ActivityService.log_entity_operation(
-                    entity_type='TASK',
-                    operation='DELETE',
-                    entity_id=0,  # Bulk operation
-                    entity_name=f'{result["deleted_count"]} tasks',
-                    details='Bulk deleted tasks',
+                from src.shared.events.schemas import TasksBulkDeletedEvent
+                from src.shared.events.publisher import publish_event
+                publish_event(TasksBulkDeletedEvent(
+                    task_ids=list(task_ids),
+                    deleted_count=result['deleted_count'],
+                    firm_id=firm_id,
                     user_id=user_id
-                )
-            except ImportError:
-                pass  # ActivityService not available
+                ))
+            except Exception:
+                pass  # Event publishing is optional
         
         return result
     
+    def _log_bulk_operation(self, operation, affected_count, details, user_id):
+        """One activity entry for a whole bulk operation (not tied to a single task)"""
+        try:
+            from src.shared.services.activity_service import ActivityService
+            ActivityService().log_entity_operation(
+                entity_type='TASK',
+                operation=operation,
+                entity_id=None,
+                entity_name=f'{affected_count} tasks',
+                details=details,
+                user_id=user_id
+            )
+        except Exception:
+            pass  # ActivityService not available
+    
     @transactional
     def update_task_status(self, task_id, new_status, firm_id, user_id):
         """Update task status"""
@@ -422,6 +477,8 @@ class TaskService(BaseService):
             )
             publish_event(event)
             
+            self._invalidate_views(firm_id, task.due_date)
+            
             return {'success': True, 'message': 'Task status updated successfully'}
         except Exception as e:
             return {'success': False, 'message': str(e)}
@@ -625,12 +682,37 @@ class TaskService(BaseService):
                 'message': str(e)
             }
 
+    def iter_tasks_for_export(self, firm_id: int, columns: Optional[List[str]] = None,
+                              batch_size: int = 1000) -> Dict[str, Any]:
+        """
+        Prepare a streaming task export
+        
+        Args:
+            firm_id: Firm ID
+            columns: Column keys to export, in order (None for all)
+            batch_size: Rows fetched per round trip
+            
+        Returns:
+            Dict with 'keys', 'labels', 'kinds' and a lazy 'rows' iterator of tuples
+        """
+        try:
+            from src.shared.utils.streaming_export import select_export_columns
+            
+            selected = select_export_columns(self.task_repository.get_export_columns(), columns)
+            return {
+                'success': True,
+                'keys': [column.key for column in selected],
+                'labels': [column.label for column in selected],
+                'kinds': [column.kind for column in selected],
+                'rows': self.task_repository.iter_export_rows(firm_id, selected, batch_size)
+            }
+        except ValueError as e:
+            return {'success': False, 'message': str(e)}
+
     def get_activity_logs_for_task(self, task_id: int, limit: int = 10) -> List['ActivityLog']:
         """Get recent activity logs for a task"""
-        from src.models.auth import ActivityLog
-        return ActivityLog.query.filter_by(task_id=task_id).order_by(
-            ActivityLog.timestamp.desc()
-        ).limit(limit).all()
+        from src.shared.database.activity_storage import activity_storage
+        return activity_storage.recent(limit=limit, task_id=task_id)
     
     @transactional
     def log_time_to_task(self, task_id: int, hours: float, user_id: int) -> Dict[str, Any]:
@@ -717,39 +799,39 @@ class TaskService(BaseService):
         ).all()
     
     def get_tasks_for_calendar(self, firm_id, year, month):
-        """Get tasks grouped by date for calendar view"""
+        """Get lightweight task dicts grouped by due date for calendar view (cached per month)"""
         try:
-            from datetime import datetime
-            from calendar import monthrange
-            
-            # Get first and last day of the month
-            _, last_day = monthrange(year, month)
-            start_date = datetime(year, month, 1)
-            end_date = datetime(year, month, last_day, 23, 59, 59)
-            
-            # Get tasks with due dates in this month
-            tasks = self.task_repository.get_tasks_by_date_range(firm_id, start_date, end_date)
-            
-            # Group tasks by date
-            tasks_by_date = {}
-            for task in tasks:
-                if task.due_date:
-                    date_str = task.due_date.strftime('%Y-%m-%d')
-                    if date_str not in tasks_by_date:
-                        tasks_by_date[date_str] = []
-                    tasks_by_date[date_str].append(task)
+            from .calendar_provider import CalendarProvider
             
+            calendar_month = CalendarProvider(self.task_repository).get_month(firm_id, year, month)
             return {
                 'success': True,
-                'tasks_by_date': tasks_by_date
+                'tasks_by_date': calendar_month['tasks_by_date'],
+                'total_tasks': calendar_month['total_tasks']
             }
         except Exception as e:
             return {
                 'success': False,
                 'message': str(e),
-                'tasks_by_date': {}
+                'tasks_by_date': {},
+                'total_tasks': 0
             }
     
+    def _due_dates_of(self, task_ids):
+        """Distinct due dates of the given tasks (for cache invalidation)"""
+        if not task_ids:
+            return []
+        rows = db.session.query(Task.due_date).filter(
+            Task.id.in_(task_ids), Task.due_date.isnot(None)
+        ).distinct().all()
+        return [due_date for (due_date,) in rows]
+    
+    def _invalidate_views(self, firm_id, *due_dates):
+        """Drop cached calendar months showing any of these due dates, and the firm's Kanban board (once committed)"""
+        from .view_invalidation import invalidate_board_after_commit, invalidate_calendar_after_commit
+        invalidate_calendar_after_commit(firm_id, due_dates)
+        invalidate_board_after_commit(firm_id)
+    
     def search_tasks(self, firm_id, query, limit=20):
         """Search tasks by title and description"""
         try:
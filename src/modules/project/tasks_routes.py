@@ -19,6 +19,9 @@ from src.modules.auth.repository import UserRepository
 # Removed ProjectHelperService - methods moved to appropriate domain services
 from src.shared.services import ActivityLoggingService as ActivityService
 from src.shared.utils.consolidated import get_session_firm_id, get_session_user_id
+from src.shared.di_container import get_service
+from src.modules.auth.interface import IAuthService
+from .interface import IProjectService, ITaskService
 
 tasks_bp = Blueprint('tasks', __name__, url_prefix='/tasks')
 
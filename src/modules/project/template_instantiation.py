@@ -0,0 +1,185 @@
+"""
+Template Instantiation for CPA WorkflowPilot
+Expands a Template and its TemplateTasks into Projects, Tasks and task
+dependency links with set-based statements: one multi-row INSERT for the
+projects, one for all of their tasks, and one executemany UPDATE for the
+dependency lists, however many projects are created at once.
+
+Due dates come from each TemplateTask's ``days_from_start`` offset,
+computed once per template and applied to every project's start date.
+Inserts are Core statements, so project task counters are written with the
+project rows instead of through the ORM hooks in progress.py.
+"""
+
+from datetime import date, timedelta
+from typing import Dict, Any, List, Optional
+
+from sqlalchemy import bindparam
+
+from src.shared.database.db_import import db
+from src.shared.exceptions import NotFoundError, ValidationError
+
+
+class TemplateInstantiator:
+    """Creates projects (with their tasks) from one template in a single pass"""
+
+    def __init__(self, session=None):
+        self.session = session or db.session
+
+    def load_blueprint(self, template_id: int, firm_id: int) -> Dict[str, Any]:
+        """
+        Read the template and its tasks (one query), and its work type's default status from the cache
+
+        Raises:
+            NotFoundError: If the template does not belong to the firm
+        """
+        from .models import Template, TemplateTask
+        from .status_cache import workflow_statuses
+
+        template = self.session.query(Template).filter_by(id=template_id, firm_id=firm_id).first()
+        if not template:
+            raise NotFoundError(f"Template {template_id} not found or doesn't belong to firm {firm_id}")
+
+        template_tasks = self.session.query(
+            TemplateTask.id, TemplateTask.title, TemplateTask.description, TemplateTask.estimated_hours,
+            TemplateTask.default_priority, TemplateTask.days_from_start, TemplateTask.default_assignee_id,
+            TemplateTask.default_status_id, TemplateTask.recurrence_rule, TemplateTask.dependencies
+        ).filter(TemplateTask.template_id == template_id).order_by(TemplateTask.order, TemplateTask.id).all()
+
+        default_status = workflow_statuses.default_for(template.work_type_id)
+
+        return {
+            'template': template,
+            'tasks': template_tasks,
+            'offsets': [timedelta(days=task.days_from_start) if task.days_from_start is not None else None
+                        for task in template_tasks],
+            'default_status_id': default_status.id if default_status else None
+        }
+
+    def instantiate(self, template_id: int, firm_id: int, projects: List[Dict[str, Any]],
+                    task_dependency_mode: Optional[bool] = None) -> List[Dict[str, Any]]:
+        """
+        Create one project per spec in ``projects``, each with the template's tasks
+
+        Args:
+            template_id: Template to expand
+            firm_id: Firm the projects belong to
+            projects: Specs with ``name``, ``client_id`` and ``start_date``, and
+                optionally ``due_date`` and ``priority``
+            task_dependency_mode: Override the template's sequential-completion setting
+
+        Returns:
+            list: ``id``, ``name``, ``client_id``, ``priority``, ``start_date``, ``due_date`` and
+            ``task_count`` of each created project, in input order
+
+        Raises:
+            ValidationError: If a spec is missing a name or client
+            NotFoundError: If the template does not belong to the firm
+        """
+        from .models import Project, Task
+
+        if not projects:
+            return []
+        for spec in projects:
+            if not (spec.get('name') or '').strip():
+                raise ValidationError("Project name is required")
+            if not spec.get('client_id'):
+                raise ValidationError("Client is required")
+
+        blueprint = self.load_blueprint(template_id, firm_id)
+        template, template_tasks, offsets = blueprint['template'], blueprint['tasks'], blueprint['offsets']
+        sequential = template.task_dependency_mode if task_dependency_mode is None else task_dependency_mode
+        # Latest offset sets the project due date when the caller gives none
+        last_offset = max((offset for offset in offsets if offset is not None), default=None)
+
+        project_rows = []
+        for spec in projects:
+            start_date = spec.get('start_date') or date.today()
+            due_date = spec.get('due_date')
+            if due_date is None and last_offset is not None:
+                due_date = start_date + last_offset
+            project_rows.append({
+                'name': spec['name'].strip(),
+                'client_id': spec['client_id'],
+                'work_type_id': template.work_type_id,
+                'status': 'Active',
+                'start_date': start_date,
+                'due_date': due_date,
+                'firm_id': firm_id,
+                'template_origin_id': template.id,
+                'current_status_id': blueprint['default_status_id'],
+                'priority': spec.get('priority') or 'Medium',
+                'task_dependency_mode': sequential,
+                'task_count': len(template_tasks),
+                'completed_task_count': 0
+            })
+
+        project_table = Project.__table__
+        project_ids = self.session.execute(
+            project_table.insert().returning(project_table.c.id, sort_by_parameter_order=True), project_rows
+        ).scalars().all()
+
+        created = [dict(id=project_id, name=row['name'], client_id=row['client_id'], priority=row['priority'],
+                        start_date=row['start_date'], due_date=row['due_date'], task_count=row['task_count'])
+                   for project_id, row in zip(project_ids, project_rows)]
+        if not template_tasks:
+            return created
+
+        task_rows = []
+        for project_id, row in zip(project_ids, project_rows):
+            start_date = row['start_date']
+            due_dates = [start_date + offset if offset is not None else None for offset in offsets]
+            for template_task, due_date in zip(template_tasks, due_dates):
+                task_rows.append({
+                    'title': template_task.title,
+                    'description': template_task.description,
+                    'due_date': due_date,
+                    'estimated_hours': template_task.estimated_hours,
+                    'status': 'Not Started',
+                    'status_id': template_task.default_status_id or blueprint['default_status_id'],
+                    'priority': template_task.default_priority or 'Medium',
+                    'project_id': project_id,
+                    'firm_id': firm_id,
+                    'assignee_id': template_task.default_assignee_id,
+                    'template_task_origin_id': template_task.id,
+                    'is_recurring': bool(template_task.recurrence_rule),
+                    'recurrence_rule': template_task.recurrence_rule
+                })
+
+        task_table = Task.__table__
+        task_ids = self.session.execute(
+            task_table.insert().returning(task_table.c.id, sort_by_parameter_order=True), task_rows
+        ).scalars().all()
+
+        self._link_dependencies(template_tasks, task_ids)
+        return created
+
+    def _link_dependencies(self, template_tasks, task_ids: List[int]):
+        """Rewrite template-task dependency ids to the new task ids, project by project"""
+        from .models import Task
+
+        dependents = [
+            (position, [int(value) for value in template_task.dependencies.split(',') if value.strip().isdigit()])
+            for position, template_task in enumerate(template_tasks) if template_task.dependencies
+        ]
+        if not dependents:
+            return
+
+        positions = {template_task.id: position for position, template_task in enumerate(template_tasks)}
+        per_project = len(template_tasks)
+        links = []
+        for first in range(0, len(task_ids), per_project):
+            project_task_ids = task_ids[first:first + per_project]
+            for position, dependency_ids in dependents:
+                mapped = [str(project_task_ids[positions[dependency_id]])
+                          for dependency_id in dependency_ids if dependency_id in positions]
+                if mapped:
+                    links.append({'task_id': project_task_ids[position], 'task_dependencies': ','.join(mapped)})
+
+        if links:
+            task_table = Task.__table__
+            self.session.execute(
+                task_table.update().where(task_table.c.id == bindparam('task_id'))
+                .values(dependencies=bindparam('task_dependencies')),
+                links
+            )
@@ -0,0 +1,73 @@
+"""
+Commit-time invalidation of the cached project views
+Services drop the Redis-cached calendar months (calendar_provider.py) and
+Kanban boards (kanban_provider.py) when they change tasks or projects, but
+their transactions commit afterwards (``@transactional`` commits once the
+method returns). Deleting the keys before the commit leaves a window in
+which a concurrent request reads the old rows and caches them again for
+the whole TTL, so the keys to drop are collected in the session's ``info``
+and deleted from its ``after_commit`` hook, as the workflow status cache
+does (status_cache.py). A rollback drops them too: reads made inside
+the rolled-back transaction may have cached its rows. Called with no
+transaction open (the change was already committed) the keys go at once.
+"""
+
+from typing import Iterable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, scoped_session
+
+_CALENDAR = 'calendar_invalidations'
+_BOARDS = 'kanban_invalidations'
+
+
+def _open_session(session) -> Optional[Session]:
+    """The session whose commit should trigger the invalidation (None: act now)"""
+    if session is None:
+        from src.shared.database.db_import import db
+        session = db.session
+    if isinstance(session, scoped_session):
+        session = session()
+    install()
+    return session if session.in_transaction() else None
+
+
+def invalidate_calendar_after_commit(firm_id: int, dates: Iterable, session: Optional[Session] = None):
+    """Drop the firm's cached months containing any of ``dates`` when ``session`` commits"""
+    dates = [value for value in dates if value]
+    session = _open_session(session)
+    if session is None:
+        from .calendar_provider import calendar_cache
+        calendar_cache.invalidate_dates(firm_id, dates)
+        return
+    session.info.setdefault(_CALENDAR, {}).setdefault(firm_id, set()).update(dates)
+
+
+def invalidate_board_after_commit(firm_id: int, session: Optional[Session] = None):
+    """Drop the firm's cached Kanban board when ``session`` commits"""
+    session = _open_session(session)
+    if session is None:
+        from .kanban_provider import kanban_cache
+        kanban_cache.invalidate(firm_id)
+        return
+    session.info.setdefault(_BOARDS, set()).add(firm_id)
+
+
+def _invalidate_pending(session):
+    calendar = session.info.pop(_CALENDAR, None)
+    if calendar:
+        from .calendar_provider import calendar_cache
+        for firm_id, dates in calendar.items():
+            calendar_cache.invalidate_dates(firm_id, dates)
+    boards = session.info.pop(_BOARDS, None)
+    if boards:
+        from .kanban_provider import kanban_cache
+        for firm_id in boards:
+            kanban_cache.invalidate(firm_id)
+
+
+def install():
+    """Register the session hooks (safe to call repeatedly)"""
+    if not event.contains(Session, 'after_commit', _invalidate_pending):
+        event.listen(Session, 'after_commit', _invalidate_pending)
+        event.listen(Session, 'after_rollback', _invalidate_pending)
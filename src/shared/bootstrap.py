@@ -0,0 +1,28 @@
+"""
+Application Bootstrap for CPA WorkflowPilot
+Modules list their blueprints as import strings ("package.module:attribute")
+and the app factory registers them by module name, so importing a module
+package for its models or services never pulls in its routes, and the route
+modules (with their service graphs) are imported only by ``create_app``.
+
+Heavy optional SDKs (Azure Document Intelligence, Google Gemini) are imported
+by the AI providers on first use rather than at startup; see
+scripts/profile_startup.py for measuring what a cold start imports.
+"""
+
+from importlib import import_module
+from typing import Iterable
+
+from werkzeug.utils import import_string
+
+
+def register_blueprints(app, import_names: Iterable[str]):
+    """Import and register each blueprint named as 'package.module:attribute'"""
+    for import_name in import_names:
+        app.register_blueprint(import_string(import_name))
+
+
+def register_modules(app, module_names: Iterable[str]):
+    """Call ``register_module(app)`` on each named module package"""
+    for module_name in module_names:
+        import_module(module_name).register_module(app)
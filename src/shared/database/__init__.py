@@ -3,10 +3,10 @@ Core infrastructure module for CPA WorkflowPilot
 """
 
 import os
-from .redis_client import RedisClient, init_redis, redis_client
+from .redis_client import RedisClient, RedisClientMixin, init_redis, raw_client, redis_client
 from .db_import import db
 
 __all__ = [
-    'RedisClient', 'init_redis', 'redis_client',
+    'RedisClient', 'RedisClientMixin', 'init_redis', 'raw_client', 'redis_client',
     'db', 'migrate', 'create_directories', 'allowed_file'
 ]
\ No newline at end of file
@@ -0,0 +1,584 @@
+"""
+Activity Log Storage for CPA WorkflowPilot
+Time-partitioned storage for ``activity_log``, with retention, archival and
+daily rollups. The layout is chosen by dialect:
+
+- PostgreSQL: ``activity_log`` is natively range-partitioned by month on
+  ``timestamp`` (``activity_log_y2024m03`` ...), plus a default partition.
+  Queries against the parent are pruned to the months they touch.
+- SQLite: ``activity_log`` holds the hot months only; older months are
+  moved into monthly shard tables (``activity_log_y2024m03``) that reads
+  fall back to when the hot table has too few rows.
+
+Months older than ``ACTIVITY_RETENTION_MONTHS`` are written to gzipped
+JSON-lines files in ``ACTIVITY_ARCHIVE_DIR`` and their partition/shard is
+dropped. ``activity_daily_rollup`` keeps per-day counts by firm, user and
+project (0 = no project). ActivityBuffer adds to it as rows are written,
+so activity summaries read the rollup and never scan raw rows, including
+rows that have been archived.
+
+Install with ``python -m src.shared.database.activity_storage install``.
+Monthly upkeep runs as ``workers.system_worker.maintain_activity_log``.
+"""
+
+import gzip
+import json
+import logging
+import os
+from collections import namedtuple
+from datetime import date, datetime
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+ACTIVITY_TABLE = 'activity_log'
+ROLLUP_TABLE = 'activity_daily_rollup'
+ACTIVITY_RETENTION_MONTHS = int(os.environ.get('ACTIVITY_RETENTION_MONTHS', 24))
+ACTIVITY_HOT_MONTHS = int(os.environ.get('ACTIVITY_HOT_MONTHS', 2))
+ACTIVITY_ARCHIVE_DIR = os.environ.get('ACTIVITY_ARCHIVE_DIR', os.path.join('instance', 'activity_archive'))
+PARTITIONS_AHEAD = 2
+
+ACTIVITY_COLUMNS = ('id', 'action', 'timestamp', 'user_id', 'project_id', 'task_id', 'details')
+# Indexes every activity table (hot table, partitions, shards) carries
+ACTIVITY_INDEXES = {
+    'user_time': ('user_id', 'timestamp'),
+    'project_time': ('project_id', 'timestamp'),
+    'task_time': ('task_id', 'timestamp'),
+    'time': ('timestamp',),
+}
+
+Month = Tuple[int, int]
+
+# Shard rows handed to templates: same fields as ActivityLog, with the user pre-loaded
+ArchivedActivity = namedtuple('ArchivedActivity', ACTIVITY_COLUMNS + ('user',))
+
+
+def month_of(value) -> Month:
+    return value.year, value.month
+
+
+def add_months(month: Month, offset: int) -> Month:
+    index = month[0] * 12 + (month[1] - 1) + offset
+    return index // 12, index % 12 + 1
+
+
+def month_start(month: Month) -> datetime:
+    return datetime(month[0], month[1], 1)
+
+
+def month_table(month: Month) -> str:
+    return f"{ACTIVITY_TABLE}_y{month[0]:04d}m{month[1]:02d}"
+
+
+def parse_month_table(name: str) -> Optional[Month]:
+    prefix = f"{ACTIVITY_TABLE}_y"
+    if not name.startswith(prefix) or len(name) != len(prefix) + 7 or name[-3] != 'm':
+        return None
+    try:
+        return int(name[-7:-3]), int(name[-2:])
+    except ValueError:
+        return None
+
+
+def rollup_groups(rows: Iterable[Dict[str, Any]], firm_of) -> List[Dict[str, Any]]:
+    """Collapse activity rows into rollup increments keyed by day, firm, user and project"""
+    groups: Dict[tuple, Dict[str, Any]] = {}
+    for row in rows:
+        firm_id = firm_of(row['user_id'])
+        if firm_id is None:
+            continue
+        timestamp = row['timestamp']
+        key = (timestamp.date(), firm_id, row['user_id'], row.get('project_id') or 0)
+        group = groups.get(key)
+        if group is None:
+            groups[key] = {
+                'day': key[0], 'firm_id': firm_id, 'user_id': key[2], 'project_id': key[3],
+                'activity_count': 1, 'last_activity_at': timestamp
+            }
+        else:
+            group['activity_count'] += 1
+            group['last_activity_at'] = max(group['last_activity_at'], timestamp)
+    return list(groups.values())
+
+
+class ActivityStorageBackend:
+    """Dialect-specific partition DDL and rollup upserts"""
+
+    dialect = ''
+    greatest = ''
+
+    def install(self, connection, now: datetime):
+        raise NotImplementedError
+
+    def uninstall(self, connection):
+        """Fold every month back into a single plain ``activity_log``"""
+        raise NotImplementedError
+
+    def ensure_partitions(self, connection, now: datetime) -> int:
+        """Create upcoming month partitions; returns how many were created"""
+        return 0
+
+    def rotate(self, connection, now: datetime) -> int:
+        """Move rows out of the hot table into month shards; returns rows moved"""
+        return 0
+
+    def month_tables(self, connection) -> Dict[Month, str]:
+        raise NotImplementedError
+
+    def drop_month(self, connection, month: Month):
+        raise NotImplementedError
+
+    def history_tables(self, connection) -> List[str]:
+        """Tables to read, newest first, after the hot table runs out"""
+        return []
+
+    def _index_statements(self, table: str) -> List[str]:
+        return [
+            f"CREATE INDEX IF NOT EXISTS ix_{table}_{suffix} ON {table} ({', '.join(columns)})"
+            for suffix, columns in ACTIVITY_INDEXES.items()
+        ]
+
+    def upsert_rollup_sql(self, select_sql: str) -> str:
+        """INSERT ... SELECT into the rollup, adding to any existing counts"""
+        return (
+            f"INSERT INTO {ROLLUP_TABLE} (day, firm_id, user_id, project_id, activity_count, last_activity_at) "
+            f"{select_sql} "
+            f"ON CONFLICT (day, firm_id, user_id, project_id) DO UPDATE SET "
+            f"activity_count = {ROLLUP_TABLE}.activity_count + excluded.activity_count, "
+            f"last_activity_at = {self.greatest}({ROLLUP_TABLE}.last_activity_at, excluded.last_activity_at)"
+        )
+
+    def rollup_select_sql(self, table: str) -> str:
+        # "WHERE true" keeps SQLite from reading ON CONFLICT as part of a join
+        return (
+            f"SELECT date(a.timestamp), u.firm_id, a.user_id, COALESCE(a.project_id, 0), COUNT(*), MAX(a.timestamp) "
+            f"FROM {table} a JOIN \"user\" u ON u.id = a.user_id "
+            f"WHERE true AND a.timestamp >= :start AND a.timestamp < :end "
+            f"GROUP BY date(a.timestamp), u.firm_id, a.user_id, COALESCE(a.project_id, 0)"
+        )
+
+
+class SQLiteActivityStorage(ActivityStorageBackend):
+    """Hot ``activity_log`` table plus monthly shard tables"""
+
+    dialect = 'sqlite'
+    greatest = 'MAX'
+
+    def install(self, connection, now: datetime):
+        for statement in self._index_statements(ACTIVITY_TABLE):
+            connection.exec_driver_sql(statement)
+        self.rotate(connection, now)
+
+    def uninstall(self, connection):
+        columns = ', '.join(ACTIVITY_COLUMNS)
+        for table in self.history_tables(connection):
+            connection.exec_driver_sql(
+                f"INSERT OR IGNORE INTO {ACTIVITY_TABLE} ({columns}) SELECT {columns} FROM {table}"
+            )
+            connection.exec_driver_sql(f"DROP TABLE {table}")
+
+    def _create_shard(self, connection, month: Month) -> str:
+        table = month_table(month)
+        connection.exec_driver_sql(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            f"id INTEGER PRIMARY KEY, action VARCHAR(255) NOT NULL, timestamp DATETIME NOT NULL, "
+            f"user_id INTEGER NOT NULL, project_id INTEGER, task_id INTEGER, details TEXT)"
+        )
+        for statement in self._index_statements(table):
+            connection.exec_driver_sql(statement)
+        return table
+
+    def rotate(self, connection, now: datetime) -> int:
+        cutoff = month_start(add_months(month_of(now), 1 - ACTIVITY_HOT_MONTHS))
+        months = connection.execute(text(
+            f"SELECT DISTINCT strftime('%Y-%m', timestamp) FROM {ACTIVITY_TABLE} WHERE timestamp < :cutoff"
+        ), {'cutoff': cutoff}).scalars().all()
+
+        moved = 0
+        columns = ', '.join(ACTIVITY_COLUMNS)
+        for value in months:
+            month = (int(value[:4]), int(value[5:7]))
+            table = self._create_shard(connection, month)
+            bounds = {'start': month_start(month), 'end': month_start(add_months(month, 1))}
+            where = "timestamp >= :start AND timestamp < :end"
+            moved += connection.execute(text(
+                f"INSERT OR IGNORE INTO {table} ({columns}) SELECT {columns} FROM {ACTIVITY_TABLE} WHERE {where}"
+            ), bounds).rowcount
+            connection.execute(text(f"DELETE FROM {ACTIVITY_TABLE} WHERE {where}"), bounds)
+        return moved
+
+    def month_tables(self, connection) -> Dict[Month, str]:
+        names = connection.execute(text(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE :prefix"
+        ), {'prefix': f"{ACTIVITY_TABLE}_y%"}).scalars().all()
+        return {month: name for name, month in ((name, parse_month_table(name)) for name in names) if month}
+
+    def drop_month(self, connection, month: Month):
+        connection.exec_driver_sql(f"DROP TABLE IF EXISTS {month_table(month)}")
+
+    def history_tables(self, connection) -> List[str]:
+        tables = self.month_tables(connection)
+        return [tables[month] for month in sorted(tables, reverse=True)]
+
+
+class PostgresActivityStorage(ActivityStorageBackend):
+    """Natively range-partitioned ``activity_log``"""
+
+    dialect = 'postgresql'
+    greatest = 'GREATEST'
+
+    def is_partitioned(self, connection) -> bool:
+        return connection.execute(text(
+            "SELECT relkind = 'p' FROM pg_class WHERE oid = to_regclass(:table)"
+        ), {'table': ACTIVITY_TABLE}).scalar() is True
+
+    def install(self, connection, now: datetime):
+        """Convert a plain ``activity_log`` into a partitioned one, keeping its rows and ids"""
+        if self.is_partitioned(connection):
+            self.ensure_partitions(connection, now)
+            return
+
+        legacy = f"{ACTIVITY_TABLE}_unpartitioned"
+        sequence = f"{ACTIVITY_TABLE}_id_seq"
+        connection.exec_driver_sql(f"ALTER TABLE {ACTIVITY_TABLE} RENAME TO {legacy}")
+        connection.exec_driver_sql(f"ALTER TABLE {legacy} RENAME CONSTRAINT {ACTIVITY_TABLE}_pkey TO {legacy}_pkey")
+        for suffix in ACTIVITY_INDEXES:
+            connection.exec_driver_sql(f"DROP INDEX IF EXISTS ix_{ACTIVITY_TABLE}_{suffix}")
+        connection.exec_driver_sql(f"ALTER SEQUENCE {sequence} OWNED BY NONE")
+
+        # The partition key has to be part of the primary key
+        connection.exec_driver_sql(
+            f"CREATE TABLE {ACTIVITY_TABLE} ("
+            f"id INTEGER NOT NULL DEFAULT nextval('{sequence}'), "
+            f"action VARCHAR(255) NOT NULL, timestamp TIMESTAMP NOT NULL, "
+            f"user_id INTEGER NOT NULL REFERENCES \"user\" (id), "
+            f"project_id INTEGER REFERENCES project (id), "
+            f"task_id INTEGER REFERENCES task (id) ON DELETE SET NULL, "
+            f"details TEXT, PRIMARY KEY (id, timestamp)"
+            f") PARTITION BY RANGE (timestamp)"
+        )
+        connection.exec_driver_sql(f"ALTER SEQUENCE {sequence} OWNED BY {ACTIVITY_TABLE}.id")
+        for statement in self._index_statements(ACTIVITY_TABLE):
+            connection.exec_driver_sql(statement)
+        connection.exec_driver_sql(f"CREATE TABLE {ACTIVITY_TABLE}_default PARTITION OF {ACTIVITY_TABLE} DEFAULT")
+
+        oldest = connection.execute(text(f"SELECT MIN(timestamp) FROM {legacy}")).scalar()
+        month = month_of(oldest or now)
+        while month <= add_months(month_of(now), PARTITIONS_AHEAD):
+            self._create_partition(connection, month)
+            month = add_months(month, 1)
+
+        columns = ', '.join(ACTIVITY_COLUMNS)
+        connection.exec_driver_sql(f"INSERT INTO {ACTIVITY_TABLE} ({columns}) SELECT {columns} FROM {legacy}")
+        connection.exec_driver_sql(f"DROP TABLE {legacy}")
+
+    def uninstall(self, connection):
+        if not self.is_partitioned(connection):
+            return
+
+        partitioned = f"{ACTIVITY_TABLE}_partitioned"
+        sequence = f"{ACTIVITY_TABLE}_id_seq"
+        connection.exec_driver_sql(f"ALTER TABLE {ACTIVITY_TABLE} RENAME TO {partitioned}")
+        for suffix in ACTIVITY_INDEXES:
+            connection.exec_driver_sql(f"DROP INDEX IF EXISTS ix_{ACTIVITY_TABLE}_{suffix}")
+        connection.exec_driver_sql(f"ALTER SEQUENCE {sequence} OWNED BY NONE")
+        connection.exec_driver_sql(
+            f"CREATE TABLE {ACTIVITY_TABLE} ("
+            f"id INTEGER NOT NULL DEFAULT nextval('{sequence}') PRIMARY KEY, "
+            f"action VARCHAR(255) NOT NULL, timestamp TIMESTAMP NOT NULL, "
+            f"user_id INTEGER NOT NULL REFERENCES \"user\" (id), "
+            f"project_id INTEGER REFERENCES project (id), "
+            f"task_id INTEGER REFERENCES task (id) ON DELETE SET NULL, details TEXT)"
+        )
+        connection.exec_driver_sql(f"ALTER SEQUENCE {sequence} OWNED BY {ACTIVITY_TABLE}.id")
+        for statement in self._index_statements(ACTIVITY_TABLE):
+            connection.exec_driver_sql(statement)
+        columns = ', '.join(ACTIVITY_COLUMNS)
+        connection.exec_driver_sql(f"INSERT INTO {ACTIVITY_TABLE} ({columns}) SELECT {columns} FROM {partitioned}")
+        connection.exec_driver_sql(f"DROP TABLE {partitioned}")
+
+    def _create_partition(self, connection, month: Month) -> bool:
+        table = month_table(month)
+        if connection.execute(text("SELECT to_regclass(:table) IS NOT NULL"), {'table': table}).scalar():
+            return False
+        connection.exec_driver_sql(
+            f"CREATE TABLE {table} PARTITION OF {ACTIVITY_TABLE} "
+            f"FOR VALUES FROM ('{month_start(month).isoformat()}') TO ('{month_start(add_months(month, 1)).isoformat()}')"
+        )
+        return True
+
+    def ensure_partitions(self, connection, now: datetime) -> int:
+        created = 0
+        for offset in range(PARTITIONS_AHEAD + 1):
+            created += self._create_partition(connection, add_months(month_of(now), offset))
+        return created
+
+    def month_tables(self, connection) -> Dict[Month, str]:
+        names = connection.execute(text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass(:table)"
+        ), {'table': ACTIVITY_TABLE}).scalars().all()
+        return {month: name for name, month in ((name, parse_month_table(name)) for name in names) if month}
+
+    def drop_month(self, connection, month: Month):
+        table = month_table(month)
+        connection.exec_driver_sql(f"ALTER TABLE {ACTIVITY_TABLE} DETACH PARTITION {table}")
+        connection.exec_driver_sql(f"DROP TABLE {table}")
+
+
+BACKENDS = {
+    'sqlite': SQLiteActivityStorage,
+    'postgresql': PostgresActivityStorage,
+}
+
+
+class ActivityStorage:
+    """Entry point for activity reads, rollups and upkeep"""
+
+    def __init__(self, db_instance=None, archive_dir: str = ACTIVITY_ARCHIVE_DIR,
+                 retention_months: int = ACTIVITY_RETENTION_MONTHS):
+        self._db = db_instance
+        self.archive_dir = archive_dir
+        self.retention_months = retention_months
+
+    @property
+    def db(self):
+        if self._db is None:
+            from src.shared.database.db_import import db
+            self._db = db
+        return self._db
+
+    def get_backend(self, bind=None) -> Optional[ActivityStorageBackend]:
+        bind = bind or self.db.engine
+        backend_class = BACKENDS.get(bind.dialect.name)
+        return backend_class() if backend_class else None
+
+    # Writes
+
+    def record_rollups(self, session, rows: List[Dict[str, Any]], firm_of):
+        """Add freshly written activity rows to the daily rollup (same transaction)"""
+        groups = rollup_groups(rows, firm_of)
+        backend = self.get_backend(session.get_bind())
+        if not groups or backend is None:
+            return
+
+        from src.models.auth import ActivityDailyRollup
+        if backend.dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        from sqlalchemy import func
+
+        table = ActivityDailyRollup.__table__
+        statement = insert(table)
+        greatest = func.greatest if backend.dialect == 'postgresql' else func.max
+        session.execute(statement.on_conflict_do_update(
+            index_elements=['day', 'firm_id', 'user_id', 'project_id'],
+            set_={
+                'activity_count': table.c.activity_count + statement.excluded.activity_count,
+                'last_activity_at': greatest(table.c.last_activity_at, statement.excluded.last_activity_at)
+            }
+        ), groups)
+
+    def rebuild_rollups(self, connection=None, start: Optional[date] = None, end: Optional[date] = None) -> int:
+        """
+        Recompute rollups for ``[start, end)`` from the raw rows still stored
+
+        Days before the oldest stored row are never touched: their raw rows
+        were archived or dropped, so the rollup is the only count left. An
+        earlier ``start`` is moved up to that day, and nothing is rebuilt
+        when no raw rows are stored.
+        """
+        if connection is None:
+            with self.db.engine.begin() as connection:
+                return self.rebuild_rollups(connection, start, end)
+
+        backend = self.get_backend(connection.engine)
+        tables = [ACTIVITY_TABLE] + backend.history_tables(connection)
+        oldest = self.oldest_stored_day(connection, tables)
+        if oldest is None:
+            logger.warning("No raw activity rows stored; rollups left unchanged")
+            return connection.execute(text(f"SELECT COUNT(*) FROM {ROLLUP_TABLE}")).scalar()
+        if start is not None and start < oldest:
+            logger.warning(f"Raw activity before {oldest} is no longer stored; rebuilding rollups from {oldest}")
+        start = max(start or oldest, oldest)
+
+        bounds = {'start': datetime.combine(start, datetime.min.time()),
+                  'end': datetime.combine(end or date(9999, 1, 1), datetime.min.time())}
+        connection.execute(text(f"DELETE FROM {ROLLUP_TABLE} WHERE day >= :start_day AND day < :end_day"),
+                           {'start_day': bounds['start'].date(), 'end_day': bounds['end'].date()})
+        for table in tables:
+            connection.execute(text(backend.upsert_rollup_sql(backend.rollup_select_sql(table))), bounds)
+        return connection.execute(text(f"SELECT COUNT(*) FROM {ROLLUP_TABLE}")).scalar()
+
+    @staticmethod
+    def oldest_stored_day(connection, tables: List[str]) -> Optional[date]:
+        """Day of the oldest raw activity row across ``tables`` (None when all are empty)"""
+        oldest = None
+        for table in tables:
+            value = connection.execute(text(f"SELECT MIN(timestamp) FROM {table}")).scalar()
+            if value is None:
+                continue
+            if not isinstance(value, datetime):
+                value = datetime.fromisoformat(str(value))
+            oldest = min(oldest or value.date(), value.date())
+        return oldest
+
+    # Reads
+
+    def recent(self, limit: int = 10, firm_id: Optional[int] = None, **filters) -> List[Any]:
+        """
+        Most recent activity matching ``filters`` (user_id, project_id, task_id)
+
+        Reads the hot table through the ORM (indexed on the filter column and
+        timestamp); on SQLite, older shards are read only if it comes up short.
+        """
+        from sqlalchemy.orm import contains_eager, joinedload
+        from src.models.auth import ActivityLog, User
+
+        # Users are loaded with the rows: callers render ``activity.user.name``
+        query = self.db.session.query(ActivityLog)
+        if firm_id is not None:
+            query = query.join(ActivityLog.user).filter(User.firm_id == firm_id).options(
+                contains_eager(ActivityLog.user)
+            )
+        else:
+            query = query.options(joinedload(ActivityLog.user))
+        for column, value in filters.items():
+            query = query.filter(getattr(ActivityLog, column) == value)
+        activities = query.order_by(ActivityLog.timestamp.desc()).limit(limit).all()
+        if len(activities) >= limit:
+            return activities
+
+        connection = self.db.session.connection()
+        backend = self.get_backend(connection.engine)
+        column_types = {column: ActivityLog.__table__.c[column].type for column in ACTIVITY_COLUMNS}
+        for table in backend.history_tables(connection) if backend else []:
+            clauses = [f"a.{column} = :{column}" for column in filters]
+            join = ''
+            if firm_id is not None:
+                join = 'JOIN "user" u ON u.id = a.user_id'
+                clauses.append('u.firm_id = :firm_id')
+            where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+            rows = connection.execute(text(
+                f"SELECT {', '.join('a.' + column for column in ACTIVITY_COLUMNS)} FROM {table} a {join} "
+                f"{where} ORDER BY a.timestamp DESC LIMIT :limit"
+            ).columns(**column_types), dict(filters, firm_id=firm_id, limit=limit - len(activities))).all()
+            activities.extend(self._archived(rows))
+            if len(activities) >= limit:
+                break
+        return activities
+
+    def _archived(self, rows) -> List[ArchivedActivity]:
+        from src.models.auth import User
+
+        user_ids = {row.user_id for row in rows}
+        users = {user.id: user for user in User.query.filter(User.id.in_(user_ids))} if user_ids else {}
+        return [ArchivedActivity(*row, user=users.get(row.user_id)) for row in rows]
+
+    def summary(self, user_id: Optional[int] = None, firm_id: Optional[int] = None,
+                project_id: Optional[int] = None, since: Optional[date] = None) -> Dict[str, Any]:
+        """Activity count and latest activity time from the daily rollup"""
+        from sqlalchemy import func
+        from src.models.auth import ActivityDailyRollup as Rollup
+
+        query = self.db.session.query(func.coalesce(func.sum(Rollup.activity_count), 0),
+                                      func.max(Rollup.last_activity_at))
+        if user_id is not None:
+            query = query.filter(Rollup.user_id == user_id)
+        if firm_id is not None:
+            query = query.filter(Rollup.firm_id == firm_id)
+        if project_id is not None:
+            query = query.filter(Rollup.project_id == project_id)
+        if since is not None:
+            query = query.filter(Rollup.day >= since)
+        count, last_activity_at = query.one()
+        return {'count': int(count), 'last_activity_at': last_activity_at}
+
+    # Upkeep
+
+    def install(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """Partition (or shard) ``activity_log`` and backfill the daily rollup"""
+        engine = self.db.engine
+        backend = self.get_backend(engine)
+        if backend is None:
+            raise RuntimeError(f"Partitioned activity storage is not supported on {engine.dialect.name}")
+
+        from src.models.auth import ActivityDailyRollup
+        ActivityDailyRollup.__table__.create(engine, checkfirst=True)
+        with engine.begin() as connection:
+            backend.install(connection, now or datetime.utcnow())
+            rollups = self.rebuild_rollups(connection)
+            months = len(backend.month_tables(connection))
+        return {'month_tables': months, 'rollup_rows': rollups}
+
+    def maintain(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Create upcoming partitions, rotate hot rows (SQLite) and archive expired months"""
+        now = now or datetime.utcnow()
+        engine = self.db.engine
+        backend = self.get_backend(engine)
+        if backend is None:
+            return {'partitions_created': 0, 'rows_rotated': 0, 'archived': []}
+
+        with engine.begin() as connection:
+            created = backend.ensure_partitions(connection, now)
+            rotated = backend.rotate(connection, now)
+
+        oldest_kept = add_months(month_of(now), -self.retention_months)
+        archived = []
+        with engine.connect() as connection:
+            expired = sorted(month for month in backend.month_tables(connection) if month < oldest_kept)
+        for month in expired:
+            archived.append(self.archive_month(month, backend))
+        return {'partitions_created': created, 'rows_rotated': rotated, 'archived': archived}
+
+    def archive_month(self, month: Month, backend: Optional[ActivityStorageBackend] = None) -> Dict[str, Any]:
+        """Write a month's rows to ``<archive_dir>/activity_log_y2024m03.jsonl.gz`` and drop its table"""
+        engine = self.db.engine
+        backend = backend or self.get_backend(engine)
+        table = month_table(month)
+        os.makedirs(self.archive_dir, exist_ok=True)
+        path = os.path.join(self.archive_dir, f"{table}.jsonl.gz")
+        partial = f"{path}.partial"
+
+        rows = 0
+        with engine.begin() as connection:
+            result = connection.execution_options(stream_results=True).execute(
+                text(f"SELECT {', '.join(ACTIVITY_COLUMNS)} FROM {table} ORDER BY timestamp, id")
+            )
+            with gzip.open(partial, 'wt', encoding='utf-8') as archive:
+                for row in result:
+                    archive.write(json.dumps(dict(row._mapping), default=str) + '\n')
+                    rows += 1
+            os.replace(partial, path)
+            backend.drop_month(connection, month)
+
+        logger.info(f"Archived {rows} activity rows for {month[0]}-{month[1]:02d} to {path}")
+        return {'month': f"{month[0]}-{month[1]:02d}", 'rows': rows, 'path': path}
+
+
+# Global storage used by ActivityService and the activity buffer
+activity_storage = ActivityStorage()
+
+
+if __name__ == '__main__':
+    import sys
+
+    from src.app import create_app
+
+    command = sys.argv[1] if len(sys.argv) > 1 else 'install'
+    app = create_app()
+    with app.app_context():
+        if command == 'install':
+            print(f"Activity storage ready: {activity_storage.install()}")
+        elif command == 'maintain':
+            print(f"Activity storage maintained: {activity_storage.maintain()}")
+        elif command == 'rebuild-rollups':
+            # Optional START [END] days; by default every day raw rows are still stored for
+            days = [date.fromisoformat(value) for value in sys.argv[2:4]]
+            print(f"Rollup rows: {activity_storage.rebuild_rollups(None, *days)}")
+        else:
+            print("Usage: python -m src.shared.database.activity_storage "
+                  "[install|maintain|rebuild-rollups [START [END]]]")
@@ -0,0 +1,607 @@
+"""
+Database Backup for CPA WorkflowPilot
+Consistent online backups stored as deduplicated, compressed snapshots.
+
+SQLite databases are copied with the online backup API a few pages per step,
+so writers never wait for the whole copy. Postgres databases are streamed from
+``pg_dump``. Either way the backup stream is split with content-defined
+chunking into a content-addressed chunk store, so each snapshot only writes
+the chunks that changed since the previous one.
+
+Layout under the backup directory::
+
+    chunks/ab/abcdef...   zlib-compressed chunk named by its SHA-256
+    manifests/<id>.json   ordered chunk list plus metrics for one snapshot
+"""
+
+import hashlib
+import json
+import logging
+import os
+import random
+import shlex
+import sqlite3
+import subprocess
+import tempfile
+import time
+import zlib
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Any, BinaryIO, Iterator, List, Optional
+from urllib.parse import urlparse, unquote
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BACKUP_DIR = os.environ.get('BACKUP_DIR', 'instance/backups')
+DEFAULT_SQLITE_PATH = 'instance/workflow.db'
+
+# SQLite online backup: pages copied per step and pause between steps
+SQLITE_PAGES_PER_STEP = int(os.environ.get('BACKUP_SQLITE_PAGES_PER_STEP', 256))
+SQLITE_STEP_SLEEP = float(os.environ.get('BACKUP_SQLITE_STEP_SLEEP', 0.005))
+SQLITE_MAX_RESTARTS = int(os.environ.get('BACKUP_SQLITE_MAX_RESTARTS', 5))
+
+# Content-defined chunking sizes (bytes)
+CHUNK_MIN_SIZE = 16 * 1024
+CHUNK_AVG_SIZE = 64 * 1024
+CHUNK_MAX_SIZE = 256 * 1024
+COMPRESSION_LEVEL = int(os.environ.get('BACKUP_COMPRESSION_LEVEL', 6))
+
+# Retention: always keep the newest N, plus one per day / week going back
+RETENTION_KEEP_LAST = int(os.environ.get('BACKUP_KEEP_LAST', 7))
+RETENTION_KEEP_DAILY = int(os.environ.get('BACKUP_KEEP_DAILY', 14))
+RETENTION_KEEP_WEEKLY = int(os.environ.get('BACKUP_KEEP_WEEKLY', 8))
+
+READ_BLOCK_SIZE = 1024 * 1024
+
+# Gear table for the rolling hash (fixed seed so chunk boundaries are stable across runs)
+_GEAR = [random.Random(0x5EED + i).getrandbits(64) for i in range(256)]
+_MASK_64 = (1 << 64) - 1
+
+
+class BackupError(Exception):
+    """Raised when a backup cannot be created or restored"""
+    pass
+
+
+class BackupMetrics:
+    """Throughput and writer-impact measurements for one backup run"""
+
+    def __init__(self):
+        self._started = time.perf_counter()
+        self.duration_seconds = 0.0
+        self.bytes_read = 0
+        self.bytes_stored = 0
+        self.chunks_total = 0
+        self.chunks_new = 0
+        self.source_steps = 0
+        self.source_restarts = 0
+        self.writer_blocked_seconds = 0.0
+        self.max_step_seconds = 0.0
+        self.journal_mode = None
+
+    def record_step(self, blocked_seconds: float = 0.0):
+        """Record one source step and how long writers may have been blocked by it"""
+        self.source_steps += 1
+        self.writer_blocked_seconds += blocked_seconds
+        self.max_step_seconds = max(self.max_step_seconds, blocked_seconds)
+
+    def record_chunk(self, size: int, stored_size: int, is_new: bool):
+        self.chunks_total += 1
+        self.bytes_read += size
+        if is_new:
+            self.chunks_new += 1
+            self.bytes_stored += stored_size
+
+    def finish(self):
+        self.duration_seconds = time.perf_counter() - self._started
+
+    def to_dict(self) -> Dict[str, Any]:
+        duration = self.duration_seconds or (time.perf_counter() - self._started)
+        return {
+            'duration_seconds': round(duration, 3),
+            'bytes_read': self.bytes_read,
+            'bytes_stored': self.bytes_stored,
+            'throughput_mb_per_sec': round(self.bytes_read / duration / (1024 * 1024), 2) if duration else None,
+            'chunks_total': self.chunks_total,
+            'chunks_new': self.chunks_new,
+            'dedup_ratio': round(1 - (self.chunks_new / self.chunks_total), 3) if self.chunks_total else 0.0,
+            'storage_ratio': round(self.bytes_stored / self.bytes_read, 3) if self.bytes_read else 0.0,
+            'source_steps': self.source_steps,
+            'source_restarts': self.source_restarts,
+            'writer_blocked_ms': round(self.writer_blocked_seconds * 1000, 2),
+            'max_writer_blocked_ms': round(self.max_step_seconds * 1000, 2),
+            'journal_mode': self.journal_mode
+        }
+
+
+class BackupSource:
+    """Base class for pluggable backup sources"""
+
+    source_type = 'base'
+
+    # Fixed chunk size for sources that rewrite data in place (None = content-defined)
+    fixed_chunk_size: Optional[int] = None
+
+    @contextmanager
+    def open_stream(self, metrics: BackupMetrics) -> Iterator[BinaryIO]:
+        """Yield a binary stream with a consistent copy of the database"""
+        raise NotImplementedError
+
+    def describe(self) -> str:
+        raise NotImplementedError
+
+
+class SQLiteBackupSource(BackupSource):
+    """
+    SQLite source using the online backup API
+
+    In WAL mode a read transaction pins the snapshot (writers keep appending
+    to the WAL unaffected) and pages are copied in steps. In rollback-journal
+    mode nothing is pinned - writers get the lock back between steps - and the
+    copy restarts if the database changes; after ``max_restarts`` the last
+    attempt pins the database so the backup always completes.
+    """
+
+    source_type = 'sqlite'
+
+    # SQLite rewrites pages in place, so page-aligned chunks dedup as well as
+    # content-defined ones at a fraction of the cost (64 KiB is a multiple of
+    # every valid page size)
+    fixed_chunk_size = 64 * 1024
+
+    def __init__(self, db_path: str = DEFAULT_SQLITE_PATH, pages_per_step: int = SQLITE_PAGES_PER_STEP,
+                 step_sleep: float = SQLITE_STEP_SLEEP, max_restarts: int = SQLITE_MAX_RESTARTS):
+        self.db_path = db_path
+        self.pages_per_step = pages_per_step
+        self.step_sleep = step_sleep
+        self.max_restarts = max_restarts
+
+    def describe(self) -> str:
+        return str(Path(self.db_path).absolute())
+
+    @contextmanager
+    def open_stream(self, metrics: BackupMetrics) -> Iterator[BinaryIO]:
+        if not Path(self.db_path).exists():
+            raise BackupError(f"Database file not found: {self.db_path}")
+
+        fd, snapshot_path = tempfile.mkstemp(suffix='.db', prefix='workflow_snapshot_')
+        os.close(fd)
+        try:
+            self.snapshot(snapshot_path, metrics)
+            with open(snapshot_path, 'rb') as snapshot:
+                yield snapshot
+        finally:
+            os.remove(snapshot_path)
+
+    def snapshot(self, target_path: str, metrics: BackupMetrics):
+        """Copy the live database into ``target_path`` without blocking writers for long"""
+        source = sqlite3.connect(self.db_path, isolation_level=None, timeout=30)
+        try:
+            metrics.journal_mode = source.execute('PRAGMA journal_mode').fetchone()[0].lower()
+
+            if metrics.journal_mode == 'wal':
+                self._copy(source, target_path, metrics, pin_snapshot=True)
+                return
+
+            for attempt in range(self.max_restarts + 1):
+                if self._copy(source, target_path, metrics, pin_snapshot=False,
+                              abort_on_restart=attempt < self.max_restarts):
+                    return
+                metrics.source_restarts += 1
+
+            self._copy(source, target_path, metrics, pin_snapshot=True)
+        finally:
+            source.close()
+
+    def _copy(self, source: sqlite3.Connection, target_path: str, metrics: BackupMetrics,
+              pin_snapshot: bool, abort_on_restart: bool = False) -> bool:
+        """
+        Run one stepped backup pass
+
+        Returns:
+            bool: False if the pass was abandoned because the source changed
+        """
+        target = sqlite3.connect(target_path)
+        state = {'step_started': time.perf_counter(), 'remaining': None, 'pinned_at': None}
+
+        class _Restarted(Exception):
+            pass
+
+        def progress(status, remaining, total):
+            now = time.perf_counter()
+            # Unpinned, each step holds the source lock; pinned, blocking is accounted below
+            metrics.record_step(0.0 if pin_snapshot else max(now - state['step_started'], 0.0))
+            if abort_on_restart and state['remaining'] is not None and remaining > state['remaining']:
+                raise _Restarted()
+            state['remaining'] = remaining
+            state['step_started'] = now + self.step_sleep
+
+        try:
+            if pin_snapshot:
+                # Holding a read transaction keeps one consistent snapshot for the whole copy
+                source.execute('BEGIN')
+                source.execute('SELECT COUNT(*) FROM sqlite_master').fetchone()
+                state['pinned_at'] = time.perf_counter()
+
+            source.backup(target, pages=self.pages_per_step, progress=progress, sleep=self.step_sleep)
+            return True
+        except _Restarted:
+            return False
+        finally:
+            if pin_snapshot:
+                source.execute('COMMIT')
+                if metrics.journal_mode != 'wal':
+                    # A pinned rollback-journal database blocks writers for the whole copy
+                    blocked = time.perf_counter() - state['pinned_at']
+                    metrics.writer_blocked_seconds += blocked
+                    metrics.max_step_seconds = max(metrics.max_step_seconds, blocked)
+            target.close()
+
+
+class PostgresBackupSource(BackupSource):
+    """Postgres source streaming ``pg_dump`` output straight into the chunker"""
+
+    source_type = 'postgres'
+
+    def __init__(self, database_uri: str, pg_dump_command: Optional[str] = None):
+        self.database_uri = database_uri
+        self.pg_dump_command = pg_dump_command or os.environ.get('BACKUP_PG_DUMP_COMMAND', 'pg_dump')
+
+    def describe(self) -> str:
+        parsed = urlparse(self.database_uri)
+        return f"{parsed.hostname}:{parsed.port or 5432}{parsed.path}"
+
+    def _command(self) -> List[str]:
+        parsed = urlparse(self.database_uri)
+        command = shlex.split(self.pg_dump_command) + [
+            '--format=custom',
+            '--compress=0',  # Compression happens per chunk so unchanged data still dedups
+            '--no-owner',
+            '--dbname', parsed.path.lstrip('/')
+        ]
+        if parsed.hostname:
+            command += ['--host', parsed.hostname]
+        if parsed.port:
+            command += ['--port', str(parsed.port)]
+        if parsed.username:
+            command += ['--username', unquote(parsed.username)]
+        return command
+
+    @contextmanager
+    def open_stream(self, metrics: BackupMetrics) -> Iterator[BinaryIO]:
+        env = dict(os.environ)
+        password = urlparse(self.database_uri).password
+        if password:
+            env['PGPASSWORD'] = unquote(password)
+
+        # pg_dump reads from an MVCC snapshot, so writers are never blocked
+        process = subprocess.Popen(self._command(), stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=env)
+        try:
+            yield process.stdout
+        finally:
+            process.stdout.close()
+            stderr = process.stderr.read().decode(errors='replace')
+            if process.wait() != 0:
+                raise BackupError(f"pg_dump failed: {stderr.strip()}")
+
+
+def get_backup_source(database_uri: Optional[str] = None) -> BackupSource:
+    """
+    Pick a backup source for a SQLAlchemy database URI
+
+    Args:
+        database_uri: Database URI (defaults to DATABASE_URL or the local SQLite file)
+
+    Returns:
+        BackupSource: Source matching the URI scheme
+    """
+    database_uri = database_uri or os.environ.get('DATABASE_URL')
+    if not database_uri:
+        return SQLiteBackupSource(DEFAULT_SQLITE_PATH)
+
+    scheme = urlparse(database_uri).scheme.split('+')[0]
+    if scheme == 'sqlite':
+        path = database_uri.split(':///', 1)[1] if ':///' in database_uri else ''
+        if not path or path == ':memory:':
+            raise BackupError('In-memory SQLite databases cannot be backed up')
+        return SQLiteBackupSource(path)
+    if scheme in ('postgres', 'postgresql'):
+        return PostgresBackupSource(database_uri)
+
+    raise BackupError(f"No backup source for database scheme '{scheme}'")
+
+
+def iter_fixed_chunks(stream: BinaryIO, chunk_size: int) -> Iterator[bytes]:
+    """Split a stream into fixed-size chunks"""
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_chunks(stream: BinaryIO, min_size: int = CHUNK_MIN_SIZE, avg_size: int = CHUNK_AVG_SIZE,
+                max_size: int = CHUNK_MAX_SIZE) -> Iterator[bytes]:
+    """
+    Split a stream into content-defined chunks (gear rolling hash)
+
+    Boundaries depend only on nearby content, so an insert early in the file
+    shifts bytes without changing the chunks after it - which is what makes
+    unchanged regions dedup between snapshots.
+    """
+    mask = (1 << max(avg_size.bit_length() - 1, 1)) - 1
+    mask <<= 64 - mask.bit_length()  # Use the high bits, which mix best in a gear hash
+    gear = _GEAR
+
+    buffer = b''
+    while True:
+        data = stream.read(READ_BLOCK_SIZE)
+        if data:
+            buffer += data
+        if not buffer:
+            return
+
+        position = 0
+        while len(buffer) - position >= max_size or (not data and position < len(buffer)):
+            end = min(position + max_size, len(buffer))
+            cut = end
+            rolling = 0
+            # Skip the first min_size bytes - no boundary can be there
+            for index in range(position + min_size, end):
+                rolling = ((rolling << 1) + gear[buffer[index]]) & _MASK_64
+                if not rolling & mask:
+                    cut = index + 1
+                    break
+            yield buffer[position:cut]
+            position = cut
+
+        buffer = buffer[position:]
+        if not data:
+            return
+
+
+class BackupManager:
+    """
+    Creates, restores and prunes deduplicated database snapshots
+
+    Usage:
+        manager = BackupManager()
+        result = manager.create_backup()
+        manager.apply_retention()
+    """
+
+    def __init__(self, backup_dir: str = DEFAULT_BACKUP_DIR, source: Optional[BackupSource] = None,
+                 compression_level: int = COMPRESSION_LEVEL):
+        """
+        Initialize backup manager
+
+        Args:
+            backup_dir: Root directory for chunks and manifests
+            source: Backup source (defaults to one matching DATABASE_URL)
+            compression_level: zlib level for stored chunks
+        """
+        self.backup_dir = Path(backup_dir)
+        self.chunk_dir = self.backup_dir / 'chunks'
+        self.manifest_dir = self.backup_dir / 'manifests'
+        self._source = source
+        self.compression_level = compression_level
+
+    @property
+    def source(self) -> BackupSource:
+        if self._source is None:
+            self._source = get_backup_source()
+        return self._source
+
+    def _chunk_path(self, digest: str) -> Path:
+        return self.chunk_dir / digest[:2] / digest
+
+    def _store_chunk(self, chunk: bytes, metrics: BackupMetrics) -> str:
+        """Store a chunk unless an identical one already exists"""
+        digest = hashlib.sha256(chunk).hexdigest()
+        path = self._chunk_path(digest)
+
+        try:
+            # Reused chunks count as freshly written, so a concurrent collect_garbage
+            # keeps them until this backup's manifest references them
+            os.utime(path)
+            metrics.record_chunk(len(chunk), 0, is_new=False)
+            return digest
+        except FileNotFoundError:
+            pass
+
+        compressed = zlib.compress(chunk, self.compression_level)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_suffix('.tmp')
+        with open(temp_path, 'wb') as f:
+            f.write(compressed)
+        os.replace(temp_path, path)  # Atomic, so a crash never leaves a truncated chunk
+
+        metrics.record_chunk(len(chunk), len(compressed), is_new=True)
+        return digest
+
+    def create_backup(self) -> Dict[str, Any]:
+        """
+        Create a snapshot of the database
+
+        Returns:
+            dict: Backup ID, manifest path and metrics
+        """
+        metrics = BackupMetrics()
+        created_at = datetime.utcnow()
+        backup_id = f"workflow_backup_{created_at.strftime('%Y%m%d_%H%M%S_%f')}"
+
+        self.manifest_dir.mkdir(parents=True, exist_ok=True)
+
+        chunks = []
+        total_hash = hashlib.sha256()
+        with self.source.open_stream(metrics) as stream:
+            if self.source.fixed_chunk_size:
+                chunk_iter = iter_fixed_chunks(stream, self.source.fixed_chunk_size)
+            else:
+                chunk_iter = iter_chunks(stream)
+
+            for chunk in chunk_iter:
+                total_hash.update(chunk)
+                chunks.append([self._store_chunk(chunk, metrics), len(chunk)])
+
+        metrics.finish()
+
+        manifest = {
+            'backup_id': backup_id,
+            'created_at': created_at.isoformat(),
+            'source_type': self.source.source_type,
+            'source': self.source.describe(),
+            'size_bytes': metrics.bytes_read,
+            'sha256': total_hash.hexdigest(),
+            'chunking': 'fixed' if self.source.fixed_chunk_size else 'content-defined',
+            'compression': 'zlib',
+            'chunks': chunks,
+            'metrics': metrics.to_dict()
+        }
+
+        manifest_path = self.manifest_dir / f"{backup_id}.json"
+        temp_path = manifest_path.with_suffix('.tmp')
+        with open(temp_path, 'w') as f:
+            json.dump(manifest, f)
+        os.replace(temp_path, manifest_path)
+
+        logger.info(f"Backup {backup_id} created: {manifest['metrics']}")
+
+        return {
+            'success': True,
+            'backup_id': backup_id,
+            'manifest': str(manifest_path),
+            'size_bytes': metrics.bytes_read,
+            'metrics': manifest['metrics']
+        }
+
+    def list_backups(self) -> List[Dict[str, Any]]:
+        """List snapshots, newest first"""
+        if not self.manifest_dir.exists():
+            return []
+
+        backups = []
+        for manifest_path in self.manifest_dir.glob('*.json'):
+            try:
+                with open(manifest_path) as f:
+                    manifest = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping unreadable backup manifest {manifest_path}: {e}")
+                continue
+            backups.append({
+                'backup_id': manifest['backup_id'],
+                'created_at': manifest['created_at'],
+                'source_type': manifest.get('source_type'),
+                'size_bytes': manifest.get('size_bytes', 0),
+                'stored_bytes': manifest.get('metrics', {}).get('bytes_stored', 0),
+                'manifest': str(manifest_path)
+            })
+
+        backups.sort(key=lambda b: b['created_at'], reverse=True)
+        return backups
+
+    def _load_manifest(self, backup_id: str) -> Dict[str, Any]:
+        manifest_path = self.manifest_dir / f"{backup_id}.json"
+        if not manifest_path.exists():
+            raise BackupError(f"Backup not found: {backup_id}")
+        with open(manifest_path) as f:
+            return json.load(f)
+
+    def restore_backup(self, backup_id: str, target_path: str) -> Dict[str, Any]:
+        """
+        Reassemble a snapshot into ``target_path`` and verify its checksum
+
+        For Postgres snapshots the output is a ``pg_dump`` custom-format
+        archive to be loaded with ``pg_restore``.
+        """
+        manifest = self._load_manifest(backup_id)
+        total_hash = hashlib.sha256()
+
+        temp_path = f"{target_path}.restore"
+        with open(temp_path, 'wb') as output:
+            for digest, size in manifest['chunks']:
+                with open(self._chunk_path(digest), 'rb') as f:
+                    chunk = zlib.decompress(f.read())
+                if len(chunk) != size:
+                    os.remove(temp_path)
+                    raise BackupError(f"Chunk {digest} is corrupt")
+                total_hash.update(chunk)
+                output.write(chunk)
+
+        if total_hash.hexdigest() != manifest['sha256']:
+            os.remove(temp_path)
+            raise BackupError(f"Checksum mismatch restoring {backup_id}")
+
+        os.replace(temp_path, target_path)
+
+        return {
+            'success': True,
+            'backup_id': backup_id,
+            'target': target_path,
+            'size_bytes': manifest['size_bytes']
+        }
+
+    def apply_retention(self, keep_last: int = RETENTION_KEEP_LAST, keep_daily: int = RETENTION_KEEP_DAILY,
+                        keep_weekly: int = RETENTION_KEEP_WEEKLY, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Delete snapshots outside the retention policy and unreferenced chunks
+
+        Keeps the newest ``keep_last`` snapshots, the newest snapshot of each
+        of the last ``keep_daily`` days and of each of the last ``keep_weekly``
+        weeks.
+        """
+        now = now or datetime.utcnow()
+        backups = self.list_backups()
+
+        keep = set(b['backup_id'] for b in backups[:keep_last])
+        seen_days, seen_weeks = set(), set()
+        for backup in backups:
+            created_at = datetime.fromisoformat(backup['created_at'])
+            day = created_at.date()
+            week = tuple(created_at.isocalendar()[:2])
+            if day not in seen_days and created_at >= now - timedelta(days=keep_daily):
+                seen_days.add(day)
+                keep.add(backup['backup_id'])
+            if week not in seen_weeks and created_at >= now - timedelta(weeks=keep_weekly):
+                seen_weeks.add(week)
+                keep.add(backup['backup_id'])
+
+        deleted = []
+        for backup in backups:
+            if backup['backup_id'] not in keep:
+                os.remove(backup['manifest'])
+                deleted.append(backup['backup_id'])
+
+        freed_bytes = self.collect_garbage() if deleted else 0
+
+        return {
+            'success': True,
+            'kept': len(keep),
+            'deleted': deleted,
+            'freed_bytes': freed_bytes
+        }
+
+    def collect_garbage(self) -> int:
+        """
+        Remove chunks no manifest references
+
+        Returns:
+            int: Bytes freed
+        """
+        referenced = set()
+        for manifest_path in self.manifest_dir.glob('*.json'):
+            with open(manifest_path) as f:
+                referenced.update(digest for digest, _ in json.load(f)['chunks'])
+
+        freed = 0
+        if not self.chunk_dir.exists():
+            return freed
+
+        # Chunks written or reused in the last hour may belong to a backup still in progress
+        cutoff = time.time() - 3600
+        for chunk_path in self.chunk_dir.glob('*/*'):
+            if chunk_path.name not in referenced and chunk_path.stat().st_mtime < cutoff:
+                freed += chunk_path.stat().st_size
+                chunk_path.unlink()
+        return freed
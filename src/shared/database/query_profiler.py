@@ -0,0 +1,211 @@
+"""
+Per-Request SQL Profiler for CPA WorkflowPilot
+Counts the statements a request (or any ``profile_queries()`` block) sends
+to the database, their total time, and how often each statement shape ran.
+Statements are reduced to fingerprints (literals and ``IN`` lists replaced
+by ``?``), so the lazy loads behind an N+1 pattern collapse into one
+fingerprint that repeats once per parent row; a fingerprint that runs
+``SQL_PROFILER_N_PLUS_ONE_THRESHOLD`` times or more is flagged.
+
+With ``SQL_PROFILER_ENABLED`` set, each response carries ``X-Query-Count``,
+``X-Query-Time-Ms`` and ``X-Query-N-Plus-One`` headers and one JSON log
+line (``sql_profile {...}``) is written per request, at WARNING level when
+an N+1 pattern was flagged.
+
+The cursor events are registered on the Engine class, so every engine
+(including ones created after ``init_query_profiler``) is covered;
+statements only cost a context variable lookup when nothing is profiling.
+"""
+
+import json
+import logging
+import os
+import re
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Any, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+SQL_PROFILER_N_PLUS_ONE_THRESHOLD = int(os.environ.get('SQL_PROFILER_N_PLUS_ONE_THRESHOLD', 5))
+
+_START_TIMES = 'query_profiler_start'
+
+# Profiles collecting statements in the current thread/task, outermost first
+_active_profiles: ContextVar[Tuple['QueryProfile', ...]] = ContextVar('query_profiles', default=())
+
+_COMMENTS = re.compile(r'--[^\n]*|/\*.*?\*/', re.DOTALL)
+_STRINGS = re.compile(r"'(?:[^']|'')*'")
+_NUMBERS = re.compile(r'(?<![\w.])-?\d+(?:\.\d+)?(?![\w.])')
+_IN_LISTS = re.compile(r'\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)', re.IGNORECASE)
+_VALUES_ROWS = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)(?:\s*,\s*\(\s*\?(?:\s*,\s*\?)*\s*\))+')
+_PLACEHOLDERS = re.compile(r'%\(\w+\)s|%s|(?<!:):\w+|\$\d+')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def fingerprint(statement: str) -> str:
+    """
+    Reduce a SQL statement to its shape
+
+    Comments are dropped; string and number literals and every driver's
+    placeholder style become ``?``; ``IN (?, ?, ...)`` lists and multi-row
+    ``VALUES`` become one entry; whitespace is collapsed.
+    """
+    sql = _COMMENTS.sub(' ', statement)
+    sql = _STRINGS.sub('?', sql)
+    sql = _PLACEHOLDERS.sub('?', sql)
+    sql = _NUMBERS.sub('?', sql)
+    sql = _IN_LISTS.sub('IN (?)', sql)
+    sql = _VALUES_ROWS.sub('(?)', sql)
+    return _WHITESPACE.sub(' ', sql).strip()
+
+
+class QueryProfile:
+    """Statements recorded while a profile was active"""
+
+    def __init__(self, label: str = '', threshold: int = SQL_PROFILER_N_PLUS_ONE_THRESHOLD):
+        self.label = label
+        self.threshold = threshold
+        self.count = 0
+        self.db_time = 0.0
+        self.fingerprints: Counter = Counter()
+        self._fingerprint_time: Dict[str, float] = defaultdict(float)
+
+    def record(self, statement: str, duration: float):
+        shape = fingerprint(statement)
+        self.count += 1
+        self.db_time += duration
+        self.fingerprints[shape] += 1
+        self._fingerprint_time[shape] += duration
+
+    @property
+    def db_time_ms(self) -> float:
+        return self.db_time * 1000
+
+    def n_plus_one(self) -> List[Tuple[str, int]]:
+        """Fingerprints run at least ``threshold`` times, most repeated first"""
+        return [(shape, count) for shape, count in self.fingerprints.most_common()
+                if count >= self.threshold]
+
+    def to_dict(self, top: int = 5) -> Dict[str, Any]:
+        """Summary for logs and test failures"""
+        return {
+            'label': self.label,
+            'queries': self.count,
+            'db_time_ms': round(self.db_time_ms, 2),
+            'distinct': len(self.fingerprints),
+            'n_plus_one': [
+                {'fingerprint': shape, 'count': count,
+                 'time_ms': round(self._fingerprint_time[shape] * 1000, 2)}
+                for shape, count in self.n_plus_one()[:top]
+            ],
+            'top': [
+                {'fingerprint': shape, 'count': count}
+                for shape, count in self.fingerprints.most_common(top)
+            ]
+        }
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _active_profiles.get():
+        conn.info.setdefault(_START_TIMES, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profiles = _active_profiles.get()
+    started = conn.info.get(_START_TIMES)
+    if not profiles or not started:
+        return
+    duration = time.perf_counter() - started.pop()
+    for profile in profiles:
+        profile.record(statement, duration)
+
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute
+    connection = exception_context.connection
+    if connection is not None and connection.info.get(_START_TIMES):
+        connection.info[_START_TIMES].pop()
+
+
+def install():
+    """Register the cursor events on every engine; safe to call repeatedly"""
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+        event.listen(Engine, 'handle_error', _handle_error)
+
+
+def start_profile(label: str = '', threshold: Optional[int] = None) -> QueryProfile:
+    """Begin recording statements in the current context (end with ``stop_profile``)"""
+    install()
+    profile = QueryProfile(label, SQL_PROFILER_N_PLUS_ONE_THRESHOLD if threshold is None else threshold)
+    _active_profiles.set(_active_profiles.get() + (profile,))
+    return profile
+
+
+def stop_profile(profile: QueryProfile) -> QueryProfile:
+    _active_profiles.set(tuple(active for active in _active_profiles.get() if active is not profile))
+    return profile
+
+
+@contextmanager
+def profile_queries(label: str = '', threshold: Optional[int] = None):
+    """
+    Record the statements run inside the block
+
+        with profile_queries('kanban') as profile:
+            provider.build_board(firm_id)
+        assert not profile.n_plus_one(), profile.to_dict()
+
+    Blocks may nest; statements are counted in every enclosing profile.
+    """
+    profile = start_profile(label, threshold)
+    try:
+        yield profile
+    finally:
+        stop_profile(profile)
+
+
+def init_query_profiler(app):
+    """Profile each request when ``SQL_PROFILER_ENABLED`` is set (read per request)"""
+    from flask import g, request
+
+    install()
+
+    @app.before_request
+    def start_request_profile():
+        if app.config.get('SQL_PROFILER_ENABLED'):
+            g._query_profile = start_profile(
+                f'{request.method} {request.path}',
+                app.config.get('SQL_PROFILER_N_PLUS_ONE_THRESHOLD'))
+
+    @app.after_request
+    def report_request_profile(response):
+        profile = g.pop('_query_profile', None)
+        if profile is None:
+            return response
+        stop_profile(profile)
+
+        flagged = profile.n_plus_one()
+        response.headers['X-Query-Count'] = str(profile.count)
+        response.headers['X-Query-Time-Ms'] = f'{profile.db_time_ms:.1f}'
+        response.headers['X-Query-N-Plus-One'] = str(len(flagged))
+
+        summary = profile.to_dict()
+        summary.update(endpoint=request.endpoint, status=response.status_code)
+        level = logging.WARNING if flagged else logging.INFO
+        logger.log(level, 'sql_profile %s', json.dumps(summary))
+        return response
+
+    @app.teardown_request
+    def discard_request_profile(exception=None):
+        # after_request is skipped when a view raises; stop recording anyway
+        profile = g.pop('_query_profile', None)
+        if profile is not None:
+            stop_profile(profile)
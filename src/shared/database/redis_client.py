@@ -261,6 +261,29 @@ def with_redis(fallback_return=None):
 redis_client: Optional[RedisClient] = None
 
 
+def raw_client(client_wrapper: Optional[RedisClient] = None) -> Optional[redis.Redis]:
+    """
+    The raw client behind ``client_wrapper``, or None when Redis is unavailable
+
+    Without a wrapper the global ``redis_client`` is used, looked up at call
+    time because init_redis replaces it after modules have been imported.
+    """
+    if client_wrapper is None:
+        client_wrapper = redis_client
+    if not client_wrapper or not client_wrapper.is_available():
+        return None
+    return client_wrapper.get_client()
+
+
+class RedisClientMixin:
+    """Resolves ``self._redis_client`` (or the global client) for classes that store state in Redis"""
+
+    _redis_client: Optional[RedisClient] = None
+
+    def _get_client(self) -> Optional[redis.Redis]:
+        return raw_client(self._redis_client)
+
+
 def init_redis(app):
     """
     Initialize Redis client with Flask app configuration
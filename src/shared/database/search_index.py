@@ -0,0 +1,402 @@
+"""
+Full-Text Search Index for CPA WorkflowPilot
+One firm-partitioned index over task titles/descriptions, project names and
+client names, replacing ``ILIKE '%term%'`` scans. The backend is chosen by
+dialect:
+
+- SQLite: an FTS5 table. Every row carries a scope token (``f12task``) and
+  each query ANDs that token with the search terms, so FTS5 intersects
+  posting lists instead of filtering another firm's matches afterwards.
+  Row IDs encode the entity (``id * 4 + kind``) so triggers can update a row
+  without scanning.
+- PostgreSQL: a table with a generated, weighted ``tsvector`` in a GIN
+  index led by ``firm_id`` and ``entity`` (btree_gin). A ``pg_trgm`` index
+  on titles covers substrings inside words.
+
+Database triggers keep the index in sync, so bulk SQL updates that bypass
+the ORM and its events are indexed too. Terms are prefix-matched, so every
+keystroke of a typeahead search can use the index. Results are ranked by
+bm25 (SQLite) or ts_rank (PostgreSQL), with title matches weighted above
+description matches.
+
+Install with ``python -m src.shared.database.search_index install`` (creates
+the index, the triggers and backfills existing rows).
+"""
+
+import logging
+import re
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+SEARCH_TABLE = 'search_index'
+ENTITY_KINDS = {'task': 1, 'project': 2, 'client': 3}
+
+_TERM_PATTERN = re.compile(r'\w+', re.UNICODE)
+MAX_TERMS = 8
+
+
+def query_terms(query: str) -> List[str]:
+    """Split user input into lower-cased word terms (punctuation is dropped)"""
+    return [term.lower() for term in _TERM_PATTERN.findall(query or '')][:MAX_TERMS]
+
+
+class SearchBackend:
+    """Dialect-specific DDL and queries for the search index"""
+
+    dialect = ''
+
+    def install_statements(self) -> List[str]:
+        raise NotImplementedError
+
+    def drop_statements(self) -> List[str]:
+        raise NotImplementedError
+
+    def backfill_statements(self) -> List[str]:
+        raise NotImplementedError
+
+    def is_installed(self, connection) -> bool:
+        raise NotImplementedError
+
+    def search(self, connection, firm_id: int, entity: str, terms: List[str], limit: int) -> List[int]:
+        raise NotImplementedError
+
+
+class SQLiteSearchBackend(SearchBackend):
+    """FTS5 virtual table with prefix indexes and trigger sync"""
+
+    dialect = 'sqlite'
+
+    # Column weights for bm25(): scope, title, body
+    BM25_WEIGHTS = '0.0, 10.0, 1.0'
+
+    # (entity, table, firm expression, title expression, body expression, insert condition)
+    SOURCES = [
+        ('task', 'task',
+         "COALESCE((SELECT firm_id FROM project WHERE id = {row}.project_id), {row}.firm_id)",
+         "COALESCE({row}.title, '')", "COALESCE({row}.description, '')", "1"),
+        ('project', 'project', "{row}.firm_id", "COALESCE({row}.name, '')", "''", "1"),
+        ('client', 'client', "{row}.firm_id", "COALESCE({row}.name, '')",
+         "COALESCE({row}.email, '') || ' ' || COALESCE({row}.contact_person, '')",
+         "COALESCE({row}.is_active, 1)"),
+    ]
+
+    # Only these columns can change what a row's index entry looks like
+    WATCHED_COLUMNS = {
+        'task': 'title, description, project_id, firm_id',
+        'project': 'name, firm_id',
+        'client': 'name, email, contact_person, firm_id, is_active',
+    }
+
+    def _row_values(self, entity: str, firm: str, title: str, body: str, row: str) -> str:
+        kind = ENTITY_KINDS[entity]
+        return (f"{row}.id * 4 + {kind}, 'f' || ({firm.format(row=row)}) || '{entity}', "
+                f"{title.format(row=row)}, {body.format(row=row)}")
+
+    def install_statements(self) -> List[str]:
+        statements = [
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+            f"scope, title, body, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3 4')"
+        ]
+
+        for entity, table, firm, title, body, condition in self.SOURCES:
+            kind = ENTITY_KINDS[entity]
+            values = self._row_values(entity, firm, title, body, 'new')
+            insert = (f"INSERT INTO {SEARCH_TABLE}(rowid, scope, title, body) "
+                      f"SELECT {values} WHERE {condition.format(row='new')};")
+            delete = f"DELETE FROM {SEARCH_TABLE} WHERE rowid = old.id * 4 + {kind};"
+
+            statements += [
+                f"CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_{entity}_ai AFTER INSERT ON {table} "
+                f"BEGIN {insert} END",
+                f"CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_{entity}_au "
+                f"AFTER UPDATE OF {self.WATCHED_COLUMNS[entity]} ON {table} BEGIN {delete} {insert} END",
+                f"CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_{entity}_ad AFTER DELETE ON {table} "
+                f"BEGIN {delete} END",
+            ]
+        return statements
+
+    def drop_statements(self) -> List[str]:
+        statements = []
+        for entity, *_ in self.SOURCES:
+            for suffix in ('ai', 'au', 'ad'):
+                statements.append(f"DROP TRIGGER IF EXISTS {SEARCH_TABLE}_{entity}_{suffix}")
+        statements.append(f"DROP TABLE IF EXISTS {SEARCH_TABLE}")
+        return statements
+
+    def backfill_statements(self) -> List[str]:
+        statements = [f"DELETE FROM {SEARCH_TABLE}"]
+        for entity, table, firm, title, body, condition in self.SOURCES:
+            values = self._row_values(entity, firm, title, body, 'src')
+            statements.append(
+                f"INSERT INTO {SEARCH_TABLE}(rowid, scope, title, body) "
+                f"SELECT {values} FROM {table} AS src WHERE {condition.format(row='src')}"
+            )
+        statements.append(f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('optimize')")
+        return statements
+
+    def is_installed(self, connection) -> bool:
+        return connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {'name': SEARCH_TABLE}
+        ).first() is not None
+
+    def search(self, connection, firm_id: int, entity: str, terms: List[str], limit: int) -> List[int]:
+        match = f'scope : "f{int(firm_id)}{entity}" AND {{title body}} : (' + \
+            ' AND '.join(f'"{term}"*' for term in terms) + ')'
+
+        rows = connection.execute(text(
+            f"SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH :match "
+            f"ORDER BY bm25({SEARCH_TABLE}, {self.BM25_WEIGHTS}) LIMIT :limit"
+        ), {'match': match, 'limit': limit})
+        return [rowid // 4 for (rowid,) in rows]
+
+
+class PostgresSearchBackend(SearchBackend):
+    """Weighted tsvector with a firm-leading GIN index, plus trigram titles"""
+
+    dialect = 'postgresql'
+
+    SOURCES = [
+        ('task', 'task',
+         "COALESCE((SELECT firm_id FROM project WHERE id = {row}.project_id), {row}.firm_id)",
+         "COALESCE({row}.title, '')", "COALESCE({row}.description, '')", "TRUE"),
+        ('project', 'project', "{row}.firm_id", "COALESCE({row}.name, '')", "''", "TRUE"),
+        ('client', 'client', "{row}.firm_id", "COALESCE({row}.name, '')",
+         "COALESCE({row}.email, '') || ' ' || COALESCE({row}.contact_person, '')",
+         "COALESCE({row}.is_active, TRUE)"),
+    ]
+
+    WATCHED_COLUMNS = SQLiteSearchBackend.WATCHED_COLUMNS
+
+    def install_statements(self) -> List[str]:
+        statements = [
+            "CREATE EXTENSION IF NOT EXISTS btree_gin",
+            "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+            f"""CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} (
+                entity VARCHAR(16) NOT NULL,
+                entity_id INTEGER NOT NULL,
+                firm_id INTEGER NOT NULL,
+                title TEXT NOT NULL,
+                body TEXT NOT NULL DEFAULT '',
+                document tsvector GENERATED ALWAYS AS (
+                    setweight(to_tsvector('simple', title), 'A') ||
+                    setweight(to_tsvector('simple', body), 'B')
+                ) STORED,
+                PRIMARY KEY (entity, entity_id)
+            )""",
+            f"CREATE INDEX IF NOT EXISTS ix_{SEARCH_TABLE}_document "
+            f"ON {SEARCH_TABLE} USING gin (firm_id, entity, document)",
+            f"CREATE INDEX IF NOT EXISTS ix_{SEARCH_TABLE}_title_trgm "
+            f"ON {SEARCH_TABLE} USING gin (title gin_trgm_ops)",
+        ]
+
+        for entity, table, firm, title, body, condition in self.SOURCES:
+            statements += [
+                f"""CREATE OR REPLACE FUNCTION {SEARCH_TABLE}_sync_{entity}() RETURNS trigger AS $$
+                BEGIN
+                    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                        DELETE FROM {SEARCH_TABLE} WHERE entity = '{entity}' AND entity_id = OLD.id;
+                    END IF;
+                    IF TG_OP IN ('INSERT', 'UPDATE') AND {condition.format(row='NEW')} THEN
+                        INSERT INTO {SEARCH_TABLE} (entity, entity_id, firm_id, title, body)
+                        VALUES ('{entity}', NEW.id, {firm.format(row='NEW')},
+                                {title.format(row='NEW')}, {body.format(row='NEW')});
+                    END IF;
+                    RETURN NULL;
+                END;
+                $$ LANGUAGE plpgsql""",
+                f"DROP TRIGGER IF EXISTS {SEARCH_TABLE}_{entity} ON {table}",
+                f"CREATE TRIGGER {SEARCH_TABLE}_{entity} "
+                f"AFTER INSERT OR UPDATE OF {self.WATCHED_COLUMNS[entity]} OR DELETE ON {table} "
+                f"FOR EACH ROW EXECUTE FUNCTION {SEARCH_TABLE}_sync_{entity}()",
+            ]
+        return statements
+
+    def drop_statements(self) -> List[str]:
+        statements = []
+        for entity, table, *_ in self.SOURCES:
+            statements += [
+                f"DROP TRIGGER IF EXISTS {SEARCH_TABLE}_{entity} ON {table}",
+                f"DROP FUNCTION IF EXISTS {SEARCH_TABLE}_sync_{entity}()",
+            ]
+        statements.append(f"DROP TABLE IF EXISTS {SEARCH_TABLE}")
+        return statements
+
+    def backfill_statements(self) -> List[str]:
+        statements = [f"TRUNCATE {SEARCH_TABLE}"]
+        for entity, table, firm, title, body, condition in self.SOURCES:
+            statements.append(
+                f"INSERT INTO {SEARCH_TABLE} (entity, entity_id, firm_id, title, body) "
+                f"SELECT '{entity}', src.id, {firm.format(row='src')}, {title.format(row='src')}, "
+                f"{body.format(row='src')} FROM {table} AS src WHERE {condition.format(row='src')}"
+            )
+        statements.append(f"ANALYZE {SEARCH_TABLE}")
+        return statements
+
+    def is_installed(self, connection) -> bool:
+        return connection.execute(
+            text("SELECT to_regclass(:name) IS NOT NULL"), {'name': SEARCH_TABLE}
+        ).scalar()
+
+    def search(self, connection, firm_id: int, entity: str, terms: List[str], limit: int) -> List[int]:
+        tsquery = ' & '.join(f'{term}:*' for term in terms)
+        ids = [entity_id for (entity_id,) in connection.execute(text(
+            f"SELECT entity_id FROM {SEARCH_TABLE} "
+            f"WHERE firm_id = :firm_id AND entity = :entity AND document @@ to_tsquery('simple', :tsquery) "
+            f"ORDER BY ts_rank(document, to_tsquery('simple', :tsquery)) DESC, entity_id "
+            f"LIMIT :limit"
+        ), {'firm_id': firm_id, 'entity': entity, 'tsquery': tsquery, 'limit': limit})]
+
+        # Word prefixes miss matches inside words ("smith" in "Goldsmith"); fill
+        # the remaining slots from the trigram index on titles
+        phrase = ' '.join(terms)
+        if len(ids) < limit and len(phrase) >= 3:
+            pattern = '%' + phrase.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+            for (entity_id,) in connection.execute(text(
+                f"SELECT entity_id FROM {SEARCH_TABLE} "
+                f"WHERE firm_id = :firm_id AND entity = :entity AND title ILIKE :pattern "
+                f"ORDER BY similarity(title, :phrase) DESC, entity_id LIMIT :limit"
+            ), {'firm_id': firm_id, 'entity': entity, 'pattern': pattern, 'phrase': phrase, 'limit': limit}):
+                if entity_id not in ids:
+                    ids.append(entity_id)
+                    if len(ids) >= limit:
+                        break
+        return ids
+
+
+BACKENDS = {
+    'sqlite': SQLiteSearchBackend,
+    'postgresql': PostgresSearchBackend,
+}
+
+
+class SearchIndex:
+    """
+    Entry point used by repositories
+
+    ``search`` returns ranked IDs, or None when the index is not installed on
+    this database (or the dialect is unsupported) so callers can fall back to
+    their ILIKE query.
+    """
+
+    def __init__(self, db_instance=None):
+        self._db = db_instance
+        self._installed: Dict[str, bool] = {}
+
+    @property
+    def db(self):
+        if self._db is None:
+            from src.shared.database.db_import import db
+            self._db = db
+        return self._db
+
+    def get_backend(self, bind=None) -> Optional[SearchBackend]:
+        bind = bind or self.db.engine
+        backend_class = BACKENDS.get(bind.dialect.name)
+        return backend_class() if backend_class else None
+
+    def is_available(self) -> bool:
+        engine = self.db.engine
+        key = str(engine.url)
+        if key not in self._installed:
+            backend = self.get_backend(engine)
+            try:
+                with engine.connect() as connection:
+                    self._installed[key] = bool(backend and backend.is_installed(connection))
+            except Exception as e:
+                logger.warning(f"Could not check for search index: {e}")
+                return False
+        return self._installed[key]
+
+    def search(self, firm_id: int, entity: str, query: str, limit: int = 20) -> Optional[List[int]]:
+        """
+        Find entity IDs matching every term of ``query`` as a word prefix
+
+        Args:
+            firm_id: Firm whose rows to search
+            entity: 'task', 'project' or 'client'
+            query: User input
+            limit: Maximum number of IDs
+
+        Returns:
+            list: IDs ordered by relevance, or None if the index is unavailable
+        """
+        if entity not in ENTITY_KINDS or not self.is_available():
+            return None
+
+        terms = query_terms(query)
+        if not terms:
+            return []
+
+        try:
+            # Run on the session's connection so rows written earlier in this
+            # transaction (and indexed by triggers) are visible
+            connection = self.db.session.connection()
+            return self.get_backend(connection.engine).search(connection, firm_id, entity, terms, limit or 20)
+        except Exception as e:
+            logger.warning(f"Search index query failed, falling back to LIKE: {e}")
+            return None
+
+    def install(self, rebuild: bool = True) -> Dict[str, int]:
+        """Create the index and triggers, then backfill existing rows"""
+        engine = self.db.engine
+        backend = self.get_backend(engine)
+        if backend is None:
+            raise RuntimeError(f"Search index is not supported on {engine.dialect.name}")
+
+        with engine.begin() as connection:
+            for statement in backend.install_statements():
+                connection.exec_driver_sql(statement)
+            if rebuild:
+                for statement in backend.backfill_statements():
+                    connection.exec_driver_sql(statement)
+
+        self._installed[str(engine.url)] = True
+        return self.stats()
+
+    def rebuild(self) -> Dict[str, int]:
+        """Re-index every row from the source tables"""
+        return self.install(rebuild=True)
+
+    def drop(self):
+        engine = self.db.engine
+        backend = self.get_backend(engine)
+        with engine.begin() as connection:
+            for statement in backend.drop_statements():
+                connection.exec_driver_sql(statement)
+        self._installed[str(engine.url)] = False
+
+    def stats(self) -> Dict[str, int]:
+        """Indexed row count"""
+        with self.db.engine.connect() as connection:
+            return {'rows': connection.execute(text(f"SELECT COUNT(*) FROM {SEARCH_TABLE}")).scalar()}
+
+
+def order_by_ids(items, ids: List[int]):
+    """Return ORM objects in the order of ``ids`` (the ranking order)"""
+    position = {item_id: index for index, item_id in enumerate(ids)}
+    return sorted(items, key=lambda item: position.get(item.id, len(position)))
+
+
+# Global index shared by the repositories
+search_index = SearchIndex()
+
+
+if __name__ == '__main__':
+    import sys
+
+    from src.app import create_app
+
+    command = sys.argv[1] if len(sys.argv) > 1 else 'install'
+    app = create_app()
+    with app.app_context():
+        if command in ('install', 'rebuild'):
+            print(f"Search index ready: {search_index.install()}")
+        elif command == 'drop':
+            search_index.drop()
+            print("Search index dropped")
+        else:
+            print("Usage: python -m src.shared.database.search_index [install|rebuild|drop]")
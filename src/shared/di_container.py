@@ -3,181 +3,370 @@ Dependency Injection Container
 
 This container manages service instances and their dependencies to enable
 proper module decoupling following the interface-based architecture.
+
+Every registration has a lifetime:
+
+- singleton: one instance per process, created on first use under a lock
+- scoped: one instance per Flask app context (per request), kept on
+  ``flask.g`` and disposed when the app context tears down; outside an app
+  context, ``container.scope()`` opens an explicit scope (Celery tasks,
+  scripts), and with no scope at all a scoped service resolves like a
+  transient one
+- transient: a new instance on every resolve
+
+Constructors are injected from their type hints: a parameter annotated with
+a registered type is resolved from the container, and a required parameter
+annotated with an unregistered concrete class is built for it.
 """
 
-from typing import Dict, Type, Any, TypeVar
-from abc import ABC
+import inspect
+import logging
+import threading
+import typing
+from contextlib import contextmanager
+from typing import Callable, Dict, Type, Any, List, NamedTuple, Optional, Tuple, TypeVar, Union
+
+from werkzeug.utils import import_string
+
+logger = logging.getLogger(__name__)
 
 T = TypeVar('T')
 
+SINGLETON = 'singleton'
+SCOPED = 'scoped'
+TRANSIENT = 'transient'
+LIFETIMES = (SINGLETON, SCOPED, TRANSIENT)
+
+# flask.g attribute holding the current request's scope
+_G_SCOPE_ATTR = '_service_scope'
+
+
+class Registration(NamedTuple):
+    implementation: Type
+    lifetime: str
+    factory: Optional[Callable[[], Any]]
+    dispose: Optional[Callable[[Any], None]]
+
+
+class ServiceScope:
+    """Instances resolved within one scope, disposed together in reverse creation order"""
+
+    def __init__(self):
+        self.instances: Dict[Type, Any] = {}
+        self._created: List[Tuple[Type, Any]] = []
+
+    def add(self, interface: Type, instance: Any):
+        self.instances[interface] = instance
+        self._created.append((interface, instance))
+
+    def dispose(self, registrations: Dict[Type, Registration]):
+        while self._created:
+            interface, instance = self._created.pop()
+            registration = registrations.get(interface)
+            _dispose_instance(instance, registration.dispose if registration else None)
+        self.instances.clear()
+
+
+def _dispose_instance(instance: Any, hook: Optional[Callable[[Any], None]]):
+    """Run the registration's dispose hook, or the instance's own dispose()"""
+    try:
+        if hook is not None:
+            hook(instance)
+        elif callable(getattr(instance, 'dispose', None)):
+            instance.dispose()
+    except Exception as e:
+        logger.warning(f"Error disposing {type(instance).__name__}: {e}")
+
 
 class ServiceContainer:
     """Dependency injection container for managing service instances"""
-    
+
     def __init__(self):
-        self._interfaces: Dict[Type, Type] = {}
-        self._instances: Dict[Type, Any] = {}
+        self._registrations: Dict[Type, Registration] = {}
         self._singletons: Dict[Type, Any] = {}
-    
-    def register(self, interface: Type[T], implementation: Type[T], singleton: bool = False) -> None:
+        self._lock = threading.RLock()
+        # Per-thread explicit scopes and in-progress resolutions (cycle detection)
+        self._local = threading.local()
+
+    def register(self, interface: Type[T], implementation: Optional[Type[T]] = None, singleton: bool = False,
+                 lifetime: Optional[str] = None, factory: Optional[Callable[[], T]] = None,
+                 dispose: Optional[Callable[[T], None]] = None) -> None:
         """
         Register a service implementation for an interface
-        
+
         Args:
-            interface: The interface/abstract class
-            implementation: The concrete implementation class
-            singleton: Whether to reuse the same instance (default: False)
+            interface: The interface/abstract class (or a concrete class registered as itself)
+            implementation: The concrete implementation class (default: ``interface``)
+            singleton: Shorthand for ``lifetime=SINGLETON``
+            lifetime: SINGLETON, SCOPED or TRANSIENT (default: TRANSIENT)
+            factory: Zero-argument callable building the instance instead of the constructor
+            dispose: Called with the instance when its scope ends (default: its dispose() method)
         """
-        self._interfaces[interface] = implementation
-        if singleton:
-            self._singletons[interface] = None
-    
+        lifetime = lifetime or (SINGLETON if singleton else TRANSIENT)
+        if lifetime not in LIFETIMES:
+            raise ValueError(f"Unknown lifetime {lifetime!r}")
+
+        with self._lock:
+            self._registrations[interface] = Registration(implementation or interface, lifetime, factory, dispose)
+            previous = self._singletons.pop(interface, None)
+        if previous is not None:
+            _dispose_instance(previous, None)
+
     def get(self, interface: Type[T]) -> T:
         """
         Get an instance of a service by its interface
-        
+
         Args:
             interface: The interface/abstract class
-            
+
         Returns:
             Instance of the registered implementation
-            
+
         Raises:
-            ValueError: If interface is not registered
+            ValueError: If interface is not registered, or its dependencies form a cycle
         """
-        if interface not in self._interfaces:
+        registration = self._registrations.get(interface)
+        if registration is None:
             raise ValueError(f"Interface {interface.__name__} is not registered")
-        
-        # Check if it's registered as singleton and already instantiated
-        if interface in self._singletons:
-            if self._singletons[interface] is None:
-                self._singletons[interface] = self._create_instance(interface)
-            return self._singletons[interface]
-        
-        # Create new instance each time
-        return self._create_instance(interface)
-    
-    def _create_instance(self, interface: Type[T]) -> T:
+
+        if registration.lifetime == SINGLETON:
+            instance = self._singletons.get(interface)
+            if instance is None:
+                with self._lock:
+                    instance = self._singletons.get(interface)
+                    if instance is None:
+                        instance = self._build(interface, registration)
+                        self._singletons[interface] = instance
+            return instance
+
+        if registration.lifetime == SCOPED:
+            scope = self._current_scope()
+            if scope is not None:
+                instance = scope.instances.get(interface)
+                if instance is None:
+                    instance = self._build(interface, registration)
+                    scope.add(interface, instance)
+                return instance
+
+        # Transient, or scoped with no scope open
+        return self._build(interface, registration)
+
+    def _build(self, interface: Type, registration: Registration) -> Any:
+        resolving = self._resolving()
+        if interface in resolving:
+            chain = ' -> '.join(getattr(t, '__name__', str(t)) for t in resolving + [interface])
+            raise ValueError(f"Circular dependency: {chain}")
+
+        resolving.append(interface)
+        try:
+            if registration.factory is not None:
+                return registration.factory()
+            return self._create_instance(registration.implementation)
+        finally:
+            resolving.pop()
+
+    def _create_instance(self, implementation_class: Type[T]) -> T:
         """
-        Create an instance of a service with proper dependency injection
-        
+        Create an instance of a service, injecting constructor arguments from type hints
+
         Args:
-            interface: The interface to create an instance for
-            
+            implementation_class: The concrete class to instantiate
+
         Returns:
             Instance with dependencies injected
         """
-        implementation_class = self._interfaces[interface]
-        
-        # Special handling for services that need repository injection
-        if hasattr(implementation_class, '__name__'):
-            class_name = implementation_class.__name__
-            
-            # Inject repositories for services that need them
-            if class_name == 'ProjectService':
-                from src.modules.project.repository import ProjectRepository
-                return implementation_class(project_repository=ProjectRepository())
-            elif class_name == 'TaskService':
-                from src.modules.project.task_repository import TaskRepository
-                return implementation_class(task_repository=TaskRepository())
-            elif class_name == 'AuthService':
-                from src.modules.auth.firm_repository import FirmRepository
-                from src.modules.auth.repository import UserRepository
-                return implementation_class(
-                    firm_repository=FirmRepository(),
-                    user_repository=UserRepository()
-                )
-            elif class_name == 'ClientService':
-                from src.modules.client.repository import ClientRepository
-                return implementation_class(client_repository=ClientRepository())
-            elif class_name == 'AdminService':
-                from src.modules.admin.repository import AdminRepository
-                return implementation_class(admin_repository=AdminRepository())
-        
-        # Default: create instance without special injection
-        return implementation_class()
-    
+        kwargs = {}
+        hints = _constructor_hints(implementation_class)
+        for name, parameter in inspect.signature(implementation_class.__init__).parameters.items():
+            if name == 'self' or parameter.kind in (parameter.VAR_POSITIONAL, parameter.VAR_KEYWORD):
+                continue
+
+            dependency = _injectable_type(hints.get(name))
+            if dependency is None:
+                continue
+            if dependency in self._registrations:
+                kwargs[name] = self.get(dependency)
+            elif parameter.default is parameter.empty and inspect.isclass(dependency) \
+                    and not inspect.isabstract(dependency):
+                kwargs[name] = self._build(dependency, Registration(dependency, TRANSIENT, None, None))
+
+        return implementation_class(**kwargs)
+
+    def _resolving(self) -> List[Type]:
+        if not hasattr(self._local, 'resolving'):
+            self._local.resolving = []
+        return self._local.resolving
+
+    def _current_scope(self) -> Optional[ServiceScope]:
+        """The innermost explicit scope on this thread, else the current app context's"""
+        scopes = getattr(self._local, 'scopes', None)
+        if scopes:
+            return scopes[-1]
+
+        from flask import g, has_app_context
+        if not has_app_context():
+            return None
+        scope = g.get(_G_SCOPE_ATTR)
+        if scope is None:
+            scope = ServiceScope()
+            setattr(g, _G_SCOPE_ATTR, scope)
+        return scope
+
+    @contextmanager
+    def scope(self):
+        """Open a scope for code running outside a request (workers, scripts)"""
+        if not hasattr(self._local, 'scopes'):
+            self._local.scopes = []
+        scope = ServiceScope()
+        self._local.scopes.append(scope)
+        try:
+            yield scope
+        finally:
+            self._local.scopes.pop()
+            scope.dispose(self._registrations)
+
+    def init_app(self, app) -> None:
+        """Dispose each request's scoped instances when its app context tears down"""
+        app.teardown_appcontext(self._teardown_scope)
+
+    def _teardown_scope(self, exception=None):
+        from flask import g
+        scope = g.pop(_G_SCOPE_ATTR, None)
+        if scope is not None:
+            scope.dispose(self._registrations)
+
     def is_registered(self, interface: Type) -> bool:
         """
         Check if an interface is registered
-        
+
         Args:
             interface: The interface to check
-            
+
         Returns:
             True if registered, False otherwise
         """
-        return interface in self._interfaces
-    
+        return interface in self._registrations
+
+    def lifetime_of(self, interface: Type) -> Optional[str]:
+        registration = self._registrations.get(interface)
+        return registration.lifetime if registration else None
+
     def clear(self) -> None:
-        """Clear all registrations and instances"""
-        self._interfaces.clear()
-        self._instances.clear()
-        self._singletons.clear()
+        """Clear all registrations, disposing singletons"""
+        with self._lock:
+            singletons = list(self._singletons.items())
+            registrations = dict(self._registrations)
+            self._registrations.clear()
+            self._singletons.clear()
+        for interface, instance in reversed(singletons):
+            registration = registrations.get(interface)
+            _dispose_instance(instance, registration.dispose if registration else None)
+
+
+def _constructor_hints(implementation_class: Type) -> Dict[str, Any]:
+    try:
+        return typing.get_type_hints(implementation_class.__init__)
+    except Exception:
+        # Unresolvable forward references: fall back to the raw (non-string) annotations
+        annotations = getattr(implementation_class.__init__, '__annotations__', {})
+        return {name: hint for name, hint in annotations.items() if not isinstance(hint, str)}
+
+
+def _injectable_type(hint: Any) -> Optional[Type]:
+    """The class a parameter asks for, unwrapping Optional[X]"""
+    if typing.get_origin(hint) is Union:
+        args = [arg for arg in typing.get_args(hint) if arg is not type(None)]
+        hint = args[0] if len(args) == 1 else None
+    return hint if inspect.isclass(hint) else None
 
 
 # Global container instance
 container = ServiceContainer()
 
 
-def register_service(interface: Type[T], implementation: Type[T], singleton: bool = False) -> None:
+def register_service(interface: Type[T], implementation: Optional[Type[T]] = None, singleton: bool = False,
+                     lifetime: Optional[str] = None, factory: Optional[Callable[[], T]] = None,
+                     dispose: Optional[Callable[[T], None]] = None) -> None:
     """
     Convenience function to register a service with the global container
-    
+
     Args:
         interface: The interface/abstract class
         implementation: The concrete implementation class
-        singleton: Whether to reuse the same instance (default: False)
+        singleton: Shorthand for ``lifetime=SINGLETON``
+        lifetime: SINGLETON, SCOPED or TRANSIENT
+        factory: Zero-argument callable building the instance
+        dispose: Called with the instance when its scope ends
     """
-    container.register(interface, implementation, singleton)
+    container.register(interface, implementation, singleton, lifetime, factory, dispose)
 
 
 def get_service(interface: Type[T]) -> T:
     """
     Convenience function to get a service from the global container
-    
+
     Args:
         interface: The interface/abstract class
-        
+
     Returns:
         Instance of the registered implementation
     """
     return container.get(interface)
 
 
+def _create_ai_service():
+    # Providers (SDK clients) are built once per process from the app's config
+    from flask import current_app, has_app_context
+    from src.modules.document.analysis_service import AIAnalysisService
+    return AIAnalysisService(current_app.config if has_app_context() else None)
+
+
+# (interface, implementation, lifetime); import strings are resolved by
+# setup_service_registry, so importing this module stays cheap. Repositories
+# are scoped rather than singletons: CachedRepository holds ORM instances,
+# which must not outlive the request's session or cross threads.
+SERVICE_REGISTRY = [
+    # Repositories (registered as themselves)
+    ('src.modules.auth.firm_repository:FirmRepository', None, SCOPED),
+    ('src.modules.auth.repository:UserRepository', None, SCOPED),
+    ('src.modules.project.repository:ProjectRepository', None, SCOPED),
+    ('src.modules.project.task_repository:TaskRepository', None, SCOPED),
+    ('src.modules.client.repository:ClientRepository', None, SCOPED),
+    ('src.modules.admin.repository:AdminRepository', None, SCOPED),
+
+    # Services
+    ('src.modules.client.interface:IClientService', 'src.modules.client.service:ClientService', SCOPED),
+    ('src.modules.auth.interface:IAuthService', 'src.modules.auth.service:AuthService', SCOPED),
+    ('src.modules.auth.interface:IFirmService', 'src.modules.auth.firm_service:FirmService', SCOPED),
+    ('src.modules.project.interface:IProjectService', 'src.modules.project.service:ProjectService', SCOPED),
+    ('src.modules.project.interface:ITaskService', 'src.modules.project.task_service:TaskService', SCOPED),
+    ('src.modules.export.interface:IExportService', 'src.modules.export.service:ExportService', SCOPED),
+    ('src.modules.admin.interface:IAdminService', 'src.modules.admin.service:AdminService', SCOPED),
+    ('src.modules.admin.interface:ITemplateService', 'src.modules.admin.template_service:TemplateService', SCOPED),
+    ('src.modules.admin.interface:IUserService', 'src.modules.admin.user_service:UserService', SCOPED),
+    ('src.modules.document.interface:IDocumentService', 'src.modules.document.service:DocumentService', SCOPED),
+    ('src.modules.document.interface:IAIService', 'src.modules.document.analysis_service:AIAnalysisService',
+     SINGLETON),
+]
+
+SERVICE_FACTORIES = {
+    'src.modules.document.interface:IAIService': _create_ai_service,
+}
+
+
 def setup_service_registry():
     """
     Set up the service registry with all module implementations
     This should be called during application initialization
     """
-    # Import here to avoid circular dependencies
-    from src.modules.client.interface import IClientService
-    from src.modules.client.service import ClientService
-    from src.modules.auth.interface import IAuthService, IFirmService
-    from src.modules.auth.service import AuthService
-    from src.modules.auth.firm_service import FirmService
-    from src.modules.project.interface import IProjectService, ITaskService
-    from src.modules.project.service import ProjectService
-    from src.modules.project.task_service import TaskService
-    from src.modules.export.interface import IExportService
-    from src.modules.export.service import ExportService
-    from src.modules.admin.interface import IAdminService, ITemplateService, IUserService
-    from src.modules.admin.service import AdminService
-    from src.modules.admin.template_service import TemplateService
-    from src.modules.admin.user_service import UserService
-    from src.modules.document.interface import IDocumentService, IAIService
-    from src.modules.document.service import DocumentService
-    from src.modules.document.analysis_service import AIAnalysisService
-    
-    # Register all service implementations
-    register_service(IClientService, ClientService)
-    register_service(IAuthService, AuthService)
-    register_service(IFirmService, FirmService)
-    register_service(IProjectService, ProjectService)
-    register_service(ITaskService, TaskService)
-    register_service(IExportService, ExportService)
-    register_service(IAdminService, AdminService)
-    register_service(ITemplateService, TemplateService)
-    register_service(IUserService, UserService)
-    register_service(IDocumentService, DocumentService)
-    register_service(IAIService, AIAnalysisService)
+    for interface_name, implementation_name, lifetime in SERVICE_REGISTRY:
+        interface = import_string(interface_name)
+        implementation = import_string(implementation_name) if implementation_name else None
+        register_service(interface, implementation, lifetime=lifetime,
+                         factory=SERVICE_FACTORIES.get(interface_name))
+
+
+def init_service_container(app):
+    """Register all services and dispose scoped instances at app-context teardown"""
+    setup_service_registry()
+    container.init_app(app)
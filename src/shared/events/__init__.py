@@ -3,7 +3,7 @@ Event system module for CPA WorkflowPilot
 """
 
 from .base import BaseEvent, EventHandler, EventRegistry, event_registry
-from .publisher import publish_event, EventPublisher
+from .publisher import publish_event, publish_event_after_commit, EventPublisher
 from .subscriber import EventSubscriber
 
 __all__ = [
@@ -12,6 +12,7 @@ __all__ = [
     'EventRegistry', 
     'event_registry',
     'publish_event', 
+    'publish_event_after_commit',
     'EventPublisher',
     'EventSubscriber'
 ]
\ No newline at end of file
@@ -5,14 +5,68 @@ Handles publishing events to Redis channels and message queues.
 
 import logging
 import time
-from typing import Optional, List, Dict, Any
-from datetime import datetime
+from typing import Optional, List, Dict, Any, Tuple
+from datetime import datetime, timedelta
 
 from ..database.redis_client import redis_client, with_redis
 from .base import BaseEvent, EventProcessingResult
 
 logger = logging.getLogger(__name__)
 
+# Event telemetry is stored in time buckets that expire on their own:
+#   event_counts:YYYY-MM-DD     hash of event_type -> count for that day
+#   event_log:YYYY-MM-DD:HH     stream of event metadata for that hour
+EVENT_COUNTS_KEY_PREFIX = 'event_counts'
+EVENT_LOG_KEY_PREFIX = 'event_log'
+EVENT_COUNTS_RETENTION_DAYS = 7
+EVENT_LOG_RETENTION_HOURS = 24
+EVENT_LOG_MAX_ENTRIES = 100000  # Per hourly bucket (approximate trim)
+
+
+def event_counts_key(moment: datetime) -> str:
+    """Redis hash holding per-type event counts for the day of ``moment``"""
+    return f"{EVENT_COUNTS_KEY_PREFIX}:{moment.strftime('%Y-%m-%d')}"
+
+
+def event_log_key(moment: datetime) -> str:
+    """Redis stream holding event metadata for the hour of ``moment``"""
+    return f"{EVENT_LOG_KEY_PREFIX}:{moment.strftime('%Y-%m-%d:%H')}"
+
+
+def expired_telemetry_keys(now: datetime, horizon_days: int = 30) -> List[str]:
+    """
+    List telemetry bucket keys past retention, going back ``horizon_days``
+    
+    Buckets normally expire natively; this only catches ones that lost their TTL.
+    """
+    keys = [
+        event_counts_key(now - timedelta(days=days_ago))
+        for days_ago in range(EVENT_COUNTS_RETENTION_DAYS + 1, horizon_days + 1)
+    ]
+    keys += [
+        event_log_key(now - timedelta(hours=hours_ago))
+        for hours_ago in range(EVENT_LOG_RETENTION_HOURS + 1, horizon_days * 24 + 1)
+    ]
+    return keys
+
+
+def delete_expired_telemetry(client, now: datetime) -> Tuple[int, int]:
+    """
+    Delete past-retention buckets by name (no keyspace scan)
+    
+    Returns:
+        tuple: (counter buckets deleted, event log buckets deleted)
+    """
+    stale_keys = expired_telemetry_keys(now)
+    counter_keys = [key for key in stale_keys if key.startswith(f"{EVENT_COUNTS_KEY_PREFIX}:")]
+    log_keys = [key for key in stale_keys if key not in counter_keys]
+    
+    pipe = client.pipeline(transaction=False)
+    pipe.delete(*counter_keys)
+    pipe.delete(*log_keys)
+    deleted_counters, deleted_logs = pipe.execute()
+    return deleted_counters, deleted_logs
+
 
 class EventPublisher:
     """
@@ -105,25 +159,29 @@ class EventPublisher:
     def _store_event_metadata(self, event: BaseEvent, channel: str, processing_time: float):
         """Store event metadata for monitoring and analytics"""
         try:
-            metadata_key = f"event_metadata:{event.event_id}"
-            metadata = {
-                'event_type': event.event_type,
-                'channel': channel,
-                'published_at': datetime.utcnow().isoformat(),
-                'processing_time_ms': processing_time * 1000,
-                'firm_id': getattr(event, 'firm_id', None),
-                'user_id': getattr(event, 'user_id', None)
-            }
+            client = self.redis_client.get_client()
+            if not client:
+                return
             
-            # Store with 24 hour expiration
-            self.redis_client.set(metadata_key, metadata, ex=86400)
+            now = datetime.utcnow()
+            counts_key = event_counts_key(now)
+            log_key = event_log_key(now)
             
-            # Update event type counters
-            counter_key = f"event_counter:{event.event_type}:{datetime.utcnow().strftime('%Y-%m-%d')}"
-            client = self.redis_client.get_client()
-            if client:
-                client.incr(counter_key)
-                client.expire(counter_key, 86400 * 7)  # Keep for 7 days
+            # One round trip: bump today's per-type counter and append the
+            # metadata to the current hour's stream; both buckets expire natively
+            pipe = client.pipeline(transaction=False)
+            pipe.hincrby(counts_key, event.event_type, 1)
+            pipe.expire(counts_key, EVENT_COUNTS_RETENTION_DAYS * 86400)
+            pipe.xadd(log_key, {
+                'event_id': event.event_id,
+                'event_type': event.event_type,
+                'channel': channel,
+                'processing_time_ms': round(processing_time * 1000, 3),
+                'firm_id': getattr(event, 'firm_id', None) or '',
+                'user_id': getattr(event, 'user_id', None) or ''
+            }, maxlen=EVENT_LOG_MAX_ENTRIES, approximate=True)
+            pipe.expire(log_key, EVENT_LOG_RETENTION_HOURS * 3600)
+            pipe.execute()
                 
         except Exception as e:
             logger.warning(f"Failed to store event metadata: {e}")
@@ -220,16 +278,9 @@ class EventPublisher:
             try:
                 client = self.redis_client.get_client()
                 if client:
-                    # Get event type counts for today
-                    today = datetime.utcnow().strftime('%Y-%m-%d')
-                    pattern = f"event_counter:*:{today}"
-                    
-                    for key in client.scan_iter(match=pattern):
-                        event_type = key.split(':')[1]
-                        count = client.get(key)
-                        if count:
-                            stats['daily_counts'][event_type] = int(count)
-                    
+                    # Today's counts for every event type live in one hash
+                    counts = client.hgetall(event_counts_key(datetime.utcnow()))
+                    stats['daily_counts'] = {event_type: int(count) for event_type, count in counts.items()}
                     stats['total_event_types'] = len(stats['daily_counts'])
                     
             except Exception as e:
@@ -237,6 +288,42 @@ class EventPublisher:
         
         return stats
     
+    def get_recent_events(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Get metadata of the most recently published events
+        
+        Args:
+            limit: Max number of events to return
+            
+        Returns:
+            list: Event metadata, newest first
+        """
+        if not self.redis_client or not self.redis_client.is_available():
+            return []
+        
+        try:
+            client = self.redis_client.get_client()
+            now = datetime.utcnow()
+            events = []
+            
+            # Walk hourly buckets backwards until enough events are collected
+            for hours_ago in range(EVENT_LOG_RETENTION_HOURS):
+                bucket = event_log_key(now - timedelta(hours=hours_ago))
+                for entry_id, fields in client.xrevrange(bucket, count=limit - len(events)):
+                    published_ms = int(entry_id.split('-')[0])
+                    events.append({
+                        **fields,
+                        'published_at': datetime.utcfromtimestamp(published_ms / 1000).isoformat()
+                    })
+                if len(events) >= limit:
+                    break
+            
+            return events
+            
+        except Exception as e:
+            logger.warning(f"Failed to get recent events: {e}")
+            return []
+    
     def health_check(self) -> Dict[str, Any]:
         """
         Health check for event publishing system
@@ -309,3 +396,53 @@ def publish_event(event: BaseEvent, channel: Optional[str] = None) -> bool:
         init_event_publisher()
     
     return event_publisher.publish(event, channel)
+
+
+_AFTER_COMMIT = 'events_after_commit'
+
+
+def publish_event_after_commit(event: BaseEvent, channel: Optional[str] = None, session=None) -> bool:
+    """
+    Publish an event once the session's transaction commits
+    
+    Events about rows a ``@transactional`` service method just flushed must
+    not reach subscribers before the commit (or at all, if it rolls back):
+    they are kept in the session's ``info`` and published from its
+    ``after_commit`` hook. With no transaction open the event goes out at once.
+    
+    Args:
+        event: Event to publish
+        channel: Redis channel (optional)
+        session: Session whose commit publishes the event (defaults to ``db.session``)
+        
+    Returns:
+        bool: True if published now or queued for the commit
+    """
+    from sqlalchemy import event as sa_event
+    from sqlalchemy.orm import Session, scoped_session
+    
+    if session is None:
+        from ..database.db_import import db
+        session = db.session
+    if isinstance(session, scoped_session):
+        session = session()
+    if not session.in_transaction():
+        return publish_event(event, channel)
+    
+    if not sa_event.contains(Session, 'after_commit', _publish_pending):
+        sa_event.listen(Session, 'after_commit', _publish_pending)
+        sa_event.listen(Session, 'after_rollback', _discard_pending)
+    session.info.setdefault(_AFTER_COMMIT, []).append((event, channel))
+    return True
+
+
+def _publish_pending(session):
+    for event, channel in session.info.pop(_AFTER_COMMIT, ()):
+        try:
+            publish_event(event, channel)
+        except Exception as e:
+            logger.error(f"Failed to publish {event.__class__.__name__} after commit: {e}")
+
+
+def _discard_pending(session):
+    session.info.pop(_AFTER_COMMIT, None)
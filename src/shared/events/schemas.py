@@ -10,12 +10,15 @@ from .base import BaseEvent, register_event
 
 
 @register_event
-@dataclass
 class ClientCreatedEvent(BaseEvent):
     """Event fired when a new client is created"""
-    client_id: int
-    name: str
-    is_active: bool
+
+    def __init__(self, client_id: int, name: str, is_active: bool = True,
+                 firm_id: Optional[int] = None, user_id: Optional[int] = None):
+        super().__init__(firm_id=firm_id, user_id=user_id)
+        self.client_id = client_id
+        self.name = name
+        self.is_active = is_active
     
     def get_payload(self) -> Dict[str, Any]:
         return {
@@ -44,16 +47,26 @@ class ClientUpdatedEvent(BaseEvent):
 
 
 @register_event
-@dataclass
 class TaskCreatedEvent(BaseEvent):
     """Event fired when a new task is created"""
-    task_id: int
-    title: str
-    project_id: Optional[int] = None
-    assignee_id: Optional[int] = None
-    priority: str = 'Medium'
-    due_date: Optional[datetime] = None
-    estimated_hours: Optional[float] = None
+
+    def __init__(self, task_id: int, title: Optional[str] = None, project_id: Optional[int] = None,
+                 assignee_id: Optional[int] = None, priority: str = 'Medium',
+                 due_date: Optional[datetime] = None, estimated_hours: Optional[float] = None,
+                 firm_id: Optional[int] = None, user_id: Optional[int] = None,
+                 task_title: Optional[str] = None):
+        super().__init__(firm_id=firm_id, user_id=user_id)
+        self.task_id = task_id
+        # task_title is the name dashboard handlers and older callers use
+        self.title = title if title is not None else task_title
+        self.task_title = self.title
+        self.project_id = project_id
+        self.assignee_id = assignee_id
+        self.priority = priority
+        if isinstance(due_date, str):
+            due_date = datetime.fromisoformat(due_date)
+        self.due_date = due_date
+        self.estimated_hours = estimated_hours
     
     def get_payload(self) -> Dict[str, Any]:
         return {
@@ -118,12 +131,19 @@ class TaskStatusChangedEvent(BaseEvent):
 
 
 @register_event
-@dataclass
 class TaskDeletedEvent(BaseEvent):
     """Event fired when a task is deleted"""
-    task_id: int
-    title: str
-    project_id: Optional[int] = None
+
+    def __init__(self, task_id: int, title: Optional[str] = None, project_id: Optional[int] = None,
+                 assignee_id: Optional[int] = None, firm_id: Optional[int] = None,
+                 user_id: Optional[int] = None, task_title: Optional[str] = None):
+        super().__init__(firm_id=firm_id, user_id=user_id)
+        self.task_id = task_id
+        # task_title is the name dashboard handlers use
+        self.title = title if title is not None else task_title
+        self.task_title = self.title
+        self.project_id = project_id
+        self.assignee_id = assignee_id
     
     def get_payload(self) -> Dict[str, Any]:
         return {
@@ -133,6 +153,43 @@ class TaskDeletedEvent(BaseEvent):
         }
 
 
+@register_event
+class TasksBulkUpdatedEvent(BaseEvent):
+    """Event fired once for a bulk edit, in place of one event per task"""
+
+    def __init__(self, task_ids: List[int], changes: Dict[str, Any], updated_count: int,
+                 firm_id: Optional[int] = None, user_id: Optional[int] = None):
+        super().__init__(firm_id=firm_id, user_id=user_id)
+        self.task_ids = task_ids
+        self.changes = changes
+        self.updated_count = updated_count
+
+    def get_payload(self) -> Dict[str, Any]:
+        return {
+            'task_ids': self.task_ids,
+            'changes': {field: str(value) if value is not None else None
+                        for field, value in self.changes.items()},
+            'updated_count': self.updated_count
+        }
+
+
+@register_event
+class TasksBulkDeletedEvent(BaseEvent):
+    """Event fired once for a bulk delete, in place of one event per task"""
+
+    def __init__(self, task_ids: List[int], deleted_count: int,
+                 firm_id: Optional[int] = None, user_id: Optional[int] = None):
+        super().__init__(firm_id=firm_id, user_id=user_id)
+        self.task_ids = task_ids
+        self.deleted_count = deleted_count
+
+    def get_payload(self) -> Dict[str, Any]:
+        return {
+            'task_ids': self.task_ids,
+            'deleted_count': self.deleted_count
+        }
+
+
 @register_event
 @dataclass
 class DocumentAnalysisStartedEvent(BaseEvent):
@@ -197,6 +254,37 @@ class DocumentAnalysisFailedEvent(BaseEvent):
         }
 
 
+@register_event
+class BatchAnalysisCompletedEvent(BaseEvent):
+    """Event fired once when every document in an analysis batch has finished
+
+    Published by the chord callback that fans in the per-document analysis
+    results, so consumers get one event per checklist/batch instead of one
+    per document.
+    """
+
+    def __init__(self, batch_id: str, total_documents: int, successful: int, failed: int,
+                 checklist_id: Optional[int] = None, firm_id: Optional[int] = None,
+                 failed_document_ids: Optional[List[int]] = None, user_id: Optional[int] = None):
+        super().__init__(firm_id=firm_id, user_id=user_id)
+        self.batch_id = batch_id
+        self.checklist_id = checklist_id
+        self.total_documents = total_documents
+        self.successful = successful
+        self.failed = failed
+        self.failed_document_ids = failed_document_ids or []
+
+    def get_payload(self) -> Dict[str, Any]:
+        return {
+            'batch_id': self.batch_id,
+            'checklist_id': self.checklist_id,
+            'total_documents': self.total_documents,
+            'successful': self.successful,
+            'failed': self.failed,
+            'failed_document_ids': self.failed_document_ids
+        }
+
+
 @register_event
 @dataclass
 class DocumentCreatedEvent(BaseEvent):
@@ -230,20 +318,29 @@ class DocumentUpdatedEvent(BaseEvent):
 
 
 @register_event
-@dataclass
 class ProjectCreatedEvent(BaseEvent):
     """Event fired when a new project is created"""
-    project_id: int
-    name: str
-    client_name: str
-    template_name: Optional[str] = None
-    priority: str = 'Medium'
+
+    def __init__(self, project_id: int, name: str, client_id: Optional[int] = None,
+                 client_name: Optional[str] = None, status: Optional[str] = None,
+                 template_name: Optional[str] = None, priority: str = 'Medium',
+                 firm_id: Optional[int] = None, user_id: Optional[int] = None):
+        super().__init__(firm_id=firm_id, user_id=user_id)
+        self.project_id = project_id
+        self.name = name
+        self.client_id = client_id
+        self.client_name = client_name
+        self.status = status
+        self.template_name = template_name
+        self.priority = priority
     
     def get_payload(self) -> Dict[str, Any]:
         return {
             'project_id': self.project_id,
             'name': self.name,
+            'client_id': self.client_id,
             'client_name': self.client_name,
+            'status': self.status,
             'template_name': self.template_name,
             'priority': self.priority
         }
@@ -328,6 +425,53 @@ class ProjectWorkflowAdvancedEvent(BaseEvent):
         }
 
 
+@register_event
+class BackupCreatedEvent(BaseEvent):
+    """Event fired when a database backup snapshot has been written"""
+
+    def __init__(self, backup_id: str, backup_type: str, file_size_bytes: int, backup_location: str,
+                 metrics: Optional[Dict[str, Any]] = None, firm_id: Optional[int] = None,
+                 user_id: Optional[int] = None):
+        super().__init__(firm_id=firm_id, user_id=user_id)
+        self.backup_id = backup_id
+        self.backup_type = backup_type
+        self.file_size_bytes = file_size_bytes
+        self.backup_location = backup_location
+        self.metrics = metrics or {}
+
+    def get_payload(self) -> Dict[str, Any]:
+        return {
+            'backup_id': self.backup_id,
+            'backup_type': self.backup_type,
+            'file_size_bytes': self.file_size_bytes,
+            'backup_location': self.backup_location,
+            'metrics': self.metrics
+        }
+
+
+@register_event
+class ExportCompletedEvent(BaseEvent):
+    """Event fired when a background export file is ready to download"""
+
+    def __init__(self, job_id: str, entity: str, export_format: str, row_count: int,
+                 file_size_bytes: int, firm_id: Optional[int] = None, user_id: Optional[int] = None):
+        super().__init__(firm_id=firm_id, user_id=user_id)
+        self.job_id = job_id
+        self.entity = entity
+        self.export_format = export_format
+        self.row_count = row_count
+        self.file_size_bytes = file_size_bytes
+
+    def get_payload(self) -> Dict[str, Any]:
+        return {
+            'job_id': self.job_id,
+            'entity': self.entity,
+            'export_format': self.export_format,
+            'row_count': self.row_count,
+            'file_size_bytes': self.file_size_bytes
+        }
+
+
 @register_event
 @dataclass
 class ErrorEvent(BaseEvent):
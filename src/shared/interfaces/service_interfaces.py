@@ -48,6 +48,12 @@ class IAuthService(ABC):
         """Get all users for a firm as DTOs"""
         pass
     
+    @abstractmethod
+    def get_user_directory_page(self, firm_id: int, cursor: Optional[str] = None,
+                                limit: int = 50) -> Dict[str, Any]:
+        """Get one cursor-paginated page of a firm's users with task counts"""
+        pass
+    
     @abstractmethod
     def get_user_by_id_dto(self, user_id: int, firm_id: int = None) -> Dict[str, Any]:
         """Get user by ID as DTO with optional firm validation"""
@@ -1,52 +1,52 @@
 """
 Service Factory Pattern
 Provides properly configured service instances with dependency injection
+
+Instances come from the DI container, so they follow its registered
+lifetimes (scoped services are shared within a request) instead of being
+rebuilt on every call.
 """
 
-from typing import TypeVar, Type, Dict, Any
-import inspect
+from typing import TypeVar, Type
 
 T = TypeVar('T')
 
+
+def _resolve(interface: Type[T]) -> T:
+    from src.shared.di_container import container, setup_service_registry
+
+    if not container.is_registered(interface):
+        setup_service_registry()
+    return container.get(interface)
+
+
 class ServiceFactory:
     """Factory for creating properly configured service instances"""
     
     @staticmethod
     def create_auth_service():
         """Create AuthService with proper dependency injection"""
-        from src.modules.auth.firm_repository import FirmRepository
-        from src.modules.auth.repository import UserRepository
-        from src.modules.auth.service import AuthService
-        
-        return AuthService(
-            firm_repository=FirmRepository(),
-            user_repository=UserRepository()
-        )
+        from src.modules.auth.interface import IAuthService
+        return _resolve(IAuthService)
     
     @staticmethod
     def create_project_service():
         """Create ProjectService with proper dependency injection"""
-        from src.modules.project.repository import ProjectRepository
-        from src.modules.project.service import ProjectService
-        
-        return ProjectService(project_repository=ProjectRepository())
+        from src.modules.project.interface import IProjectService
+        return _resolve(IProjectService)
     
     @staticmethod
     def create_task_service():
         """Create TaskService with proper dependency injection"""
-        from src.modules.project.task_repository import TaskRepository
-        from src.modules.project.task_service import TaskService
-        
-        return TaskService(task_repository=TaskRepository())
+        from src.modules.project.interface import ITaskService
+        return _resolve(ITaskService)
     
     @staticmethod
     def create_client_service():
         """Create ClientService with proper dependency injection"""
         try:
-            from src.modules.client.repository import ClientRepository
-            from src.modules.client.service import ClientService
-            
-            return ClientService(client_repository=ClientRepository())
+            from src.modules.client.interface import IClientService
+            return _resolve(IClientService)
         except ImportError:
             # Return None if client module not available
             return None
@@ -55,10 +55,8 @@ class ServiceFactory:
     def create_document_service():
         """Create DocumentService with proper dependency injection"""
         try:
-            from src.modules.document.repository import DocumentRepository
-            from src.modules.document.service import DocumentService
-            
-            return DocumentService(document_repository=DocumentRepository())
+            from src.modules.document.interface import IDocumentService
+            return _resolve(IDocumentService)
         except ImportError:
             # Return None if document module not available
             return None
\ No newline at end of file
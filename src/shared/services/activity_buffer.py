@@ -0,0 +1,309 @@
+"""
+Activity Buffer for CPA WorkflowPilot
+Collects ActivityLog rows on the current database session and writes them
+with one bulk INSERT when that session's outer transaction commits, so a
+mutation that logs activity costs no extra commit.
+
+Rows are dropped when the transaction rolls back. Rows logged after the last
+commit of a request are written in a transaction of their own when the
+request ends, leaving anything else the request did not commit unwritten;
+outside a request they are written when the app context ends (Celery tasks,
+CLI commands) or, for workers that keep one app context, after each task.
+
+With ``ACTIVITY_LOG_WRITER=background`` the committed rows are pushed to a
+Redis list instead and inserted in batches by
+``workers.system_worker.flush_activity_log``. Without Redis, rows are
+written inline.
+
+User→firm membership, which activity logging checks on every call, is
+cached per process (``ACTIVITY_MEMBERSHIP_TTL`` seconds). A user whose
+firm changes or who is deleted is dropped from this process's cache when
+the change commits; other processes catch up within the TTL. Written rows
+are also counted into ``activity_daily_rollup`` (see activity_storage).
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, object_session
+
+from src.shared.database.db_import import db
+from src.shared.database.redis_client import RedisClientMixin
+
+logger = logging.getLogger(__name__)
+
+ACTIVITY_LOG_WRITER = os.environ.get('ACTIVITY_LOG_WRITER', 'inline')  # 'inline' or 'background'
+ACTIVITY_QUEUE_KEY = 'activity_log:queue'
+ACTIVITY_QUEUE_BATCH = int(os.environ.get('ACTIVITY_QUEUE_BATCH', 1000))
+ACTIVITY_MEMBERSHIP_TTL = int(os.environ.get('ACTIVITY_MEMBERSHIP_TTL', 300))
+
+_PENDING = 'activity_log_pending'
+_COMMITTED = 'activity_log_committed'
+_USERS_CHANGED = 'activity_users_changed'
+
+
+class UserFirmCache:
+    """Per-process cache of each user's firm"""
+
+    MAX_ENTRIES = 10000
+
+    def __init__(self, ttl: int = ACTIVITY_MEMBERSHIP_TTL):
+        self.ttl = ttl
+        self._entries: Dict[int, tuple] = {}
+        self._lock = threading.Lock()
+
+    def get_firm_id(self, user_id: int, session=None) -> Optional[int]:
+        """Firm of ``user_id`` (None for unknown users), loaded on a miss with one column query on ``session``"""
+        now = time.monotonic()
+        entry = self._entries.get(user_id)
+        if entry and entry[1] > now:
+            return entry[0]
+
+        from src.models.auth import User
+        install_membership_invalidation(User)
+        session = session if session is not None else db.session
+        firm_id = session.query(User.firm_id).filter(User.id == user_id).scalar()
+
+        with self._lock:
+            if len(self._entries) >= self.MAX_ENTRIES:
+                self._entries.clear()
+            self._entries[user_id] = (firm_id, now + self.ttl)
+        return firm_id
+
+    def invalidate(self, user_id: Optional[int] = None):
+        """Forget one user's firm (or every user's when ``user_id`` is None)"""
+        with self._lock:
+            if user_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(user_id, None)
+
+
+def _mark_user(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_USERS_CHANGED, set()).add(target.id)
+
+
+def _mark_user_if_moved(mapper, connection, target):
+    if inspect(target).attrs.firm_id.history.has_changes():
+        _mark_user(mapper, connection, target)
+
+
+def _forget_changed_users(session):
+    for user_id in session.info.pop(_USERS_CHANGED, ()):
+        user_firm_cache.invalidate(user_id)
+
+
+def _discard_changed_users(session):
+    session.info.pop(_USERS_CHANGED, None)
+
+
+_membership_hooks_installed = False
+
+
+def install_membership_invalidation(user_model):
+    """Drop users from the membership cache when their firm changes or they are deleted (once per process)"""
+    global _membership_hooks_installed
+    if _membership_hooks_installed:
+        return
+    event.listen(user_model, 'after_update', _mark_user_if_moved)
+    event.listen(user_model, 'after_delete', _mark_user)
+    event.listen(Session, 'after_commit', _forget_changed_users)
+    event.listen(Session, 'after_rollback', _discard_changed_users)
+    _membership_hooks_installed = True
+
+
+class ActivityBuffer(RedisClientMixin):
+    """Per-session buffer of ActivityLog rows, written when the session commits"""
+
+    def __init__(self, writer: str = ACTIVITY_LOG_WRITER, redis_client_instance=None,
+                 batch_size: int = ACTIVITY_QUEUE_BATCH):
+        """
+        Initialize activity buffer
+
+        Args:
+            writer: 'inline' to insert on commit, 'background' to queue committed rows in Redis
+            redis_client_instance: RedisClient instance (optional, defaults to the global client)
+            batch_size: Queued rows inserted per statement by the background writer
+        """
+        self.writer = writer
+        self.batch_size = batch_size
+        self._redis_client = redis_client_instance
+        self._installed_on = None
+
+    def install(self, session=None):
+        """Hook the buffer into a (scoped) session's commit and rollback; safe to call repeatedly"""
+        session = session if session is not None else db.session
+        if self._installed_on is session:
+            return
+        event.listen(session, 'before_commit', self._before_commit)
+        event.listen(session, 'after_commit', self._after_commit)
+        event.listen(session, 'after_soft_rollback', self._after_soft_rollback)
+        self._installed_on = session
+
+    def uninstall(self):
+        if self._installed_on is None:
+            return
+        event.remove(self._installed_on, 'before_commit', self._before_commit)
+        event.remove(self._installed_on, 'after_commit', self._after_commit)
+        event.remove(self._installed_on, 'after_soft_rollback', self._after_soft_rollback)
+        self._installed_on = None
+
+    def append(self, action: str, user_id: int, project_id: Optional[int] = None,
+               task_id: Optional[int] = None, details: Optional[str] = None):
+        """Buffer one ActivityLog row on the current session"""
+        self.install()
+        session = db.session()
+        if not session.in_transaction():
+            # Rows belong to a transaction, so a rollback before any SQL still drops them
+            session.begin()
+        session.info.setdefault(_PENDING, []).append({
+            'action': action,
+            'user_id': user_id,
+            'project_id': project_id,
+            'task_id': task_id,
+            'details': details,
+            'timestamp': datetime.utcnow()
+        })
+
+    def pending(self) -> List[Dict[str, Any]]:
+        return list(db.session.info.get(_PENDING, []))
+
+    def flush(self):
+        """
+        Write rows logged since the session last committed (end of request)
+
+        The rows go out in their own transaction, so whatever else the
+        request left uncommitted on its session is not persisted with them.
+        """
+        rows = db.session.info.pop(_PENDING, None)
+        if not rows:
+            return
+        if self.writer == 'background' and self._get_client() is not None:
+            self._enqueue(rows)
+            return
+        try:
+            with Session(db.engine) as session, session.begin():
+                self._insert(session, rows)
+        except Exception as e:
+            logger.error(f"Failed to write {len(rows)} buffered activity log rows: {e}")
+
+    def _before_commit(self, session):
+        rows = session.info.pop(_PENDING, None)
+        if not rows:
+            return
+        if self.writer == 'background' and self._get_client() is not None:
+            # Queued only once the commit has gone through
+            session.info[_COMMITTED] = rows
+            return
+        self._insert(session, rows)
+
+    def _after_commit(self, session):
+        rows = session.info.pop(_COMMITTED, None)
+        if rows:
+            self._enqueue(rows)
+
+    def _after_soft_rollback(self, session, previous_transaction):
+        if previous_transaction.parent is None:
+            session.info.pop(_PENDING, None)
+            session.info.pop(_COMMITTED, None)
+
+    @staticmethod
+    def _insert(session, rows: List[Dict[str, Any]]):
+        """Insert rows and add them to the daily activity rollup, in the same transaction"""
+        from src.models.auth import ActivityLog
+        from src.shared.database.activity_storage import activity_storage
+        session.execute(ActivityLog.__table__.insert(), rows)
+        activity_storage.record_rollups(session, rows,
+                                        lambda user_id: user_firm_cache.get_firm_id(user_id, session))
+
+    def _enqueue(self, rows: List[Dict[str, Any]]):
+        client = self._get_client()
+        try:
+            queued = client.rpush(ACTIVITY_QUEUE_KEY, *[json.dumps(row, default=str) for row in rows])
+        except Exception as e:
+            logger.error(f"Failed to queue {len(rows)} activity log rows: {e}")
+            return
+
+        if queued >= self.batch_size:
+            try:
+                from src.celery_app import celery_app
+                celery_app.send_task('workers.system_worker.flush_activity_log')
+            except Exception as e:
+                logger.warning(f"Failed to schedule activity log writer: {e}")
+
+    def drain_queue(self, max_batches: int = 10) -> int:
+        """
+        Insert queued rows in batches (background writer)
+
+        Returns:
+            int: Number of rows written
+        """
+        client = self._get_client()
+        if client is None:
+            return 0
+
+        written = 0
+        for _ in range(max_batches):
+            pipe = client.pipeline()
+            pipe.lrange(ACTIVITY_QUEUE_KEY, 0, self.batch_size - 1)
+            pipe.ltrim(ACTIVITY_QUEUE_KEY, self.batch_size, -1)
+            values, _ = pipe.execute()
+            if not values:
+                break
+
+            rows = []
+            for value in values:
+                row = json.loads(value)
+                row['timestamp'] = datetime.fromisoformat(row['timestamp'])
+                rows.append(row)
+            try:
+                self._insert(db.session, rows)
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                # Put the batch back for the next run
+                client.lpush(ACTIVITY_QUEUE_KEY, *reversed(values))
+                raise
+            written += len(rows)
+        return written
+
+
+def _flush_after_task(**kwargs):
+    """Celery ``task_postrun``: write rows a task logged after its last commit"""
+    from flask import has_app_context
+    if has_app_context():
+        activity_buffer.flush()
+
+
+def init_activity_buffer(app):
+    """Write activity logged after the last commit when the request, app context or Celery task ends"""
+    from src.models.auth import User
+    from celery.signals import task_postrun
+
+    activity_buffer.install()
+    install_membership_invalidation(User)
+    task_postrun.connect(_flush_after_task, weak=False, dispatch_uid='activity_buffer_flush')
+
+    @app.teardown_request
+    def flush_activity_buffer(exception=None):
+        if exception is None:
+            activity_buffer.flush()
+
+    @app.teardown_appcontext
+    def flush_activity_buffer_on_teardown(exception=None):
+        # Runs before Flask-SQLAlchemy removes the session (teardowns run in reverse)
+        if exception is None:
+            activity_buffer.flush()
+
+
+# Global buffer and membership cache (one per process)
+activity_buffer = ActivityBuffer()
+user_firm_cache = UserFirmCache()
@@ -9,9 +9,10 @@ SERVICE PATTERN:
 
 from typing import Optional, Dict, Any, List
 from datetime import datetime
-from src.shared.database.db_import import db
-from src.models.auth import User, ActivityLog
+from src.models.auth import User
 from src.shared.base import BaseService, transactional
+from src.shared.database.activity_storage import activity_storage
+from .activity_buffer import activity_buffer, user_firm_cache
 
 
 class ActivityService(BaseService):
@@ -25,7 +26,6 @@ class ActivityService(BaseService):
             user_repository = UserRepository()
         self.user_repository = user_repository
     
-    @transactional
     def log_activity(self,
         action: str,
         user_id: int,
@@ -49,30 +49,25 @@ class ActivityService(BaseService):
             Dict with success status and activity log data
         """
         try:
-            # Validate user belongs to firm
-            user = User.query.filter_by(id=user_id, firm_id=firm_id).first()
-            if not user:
+            # Validate user belongs to firm (membership is cached per process)
+            if user_firm_cache.get_firm_id(user_id) != firm_id:
                 return {
                     'success': False,
                     'message': 'User not found or access denied'
                 }
             
-            # Create activity log
-            activity_log = ActivityLog(
+            # Written with the caller's commit (see activity_buffer)
+            activity_buffer.append(
                 action=action,
                 user_id=user_id,
                 project_id=project_id,
                 task_id=task_id,
-                details=details,
-                timestamp=datetime.utcnow()
+                details=details
             )
             
-            db.session.add(activity_log)
-            
             return {
                 'success': True,
-                'message': 'Activity logged successfully',
-                'activity_id': activity_log.id
+                'message': 'Activity logged successfully'
             }
             
         except Exception as e:
@@ -99,29 +94,23 @@ class ActivityService(BaseService):
         Returns:
             List of activity dictionaries
         """
-        # Base query with joins for user information
-        query = db.session.query(ActivityLog, User).join(
-            User, ActivityLog.user_id == User.id
-        ).filter(User.firm_id == firm_id)
-        
-        # Apply optional filters
+        # Hot rows through the indexes; older shards only if that comes up short
+        filters = {}
         if user_id:
-            query = query.filter(ActivityLog.user_id == user_id)
+            filters['user_id'] = user_id
         if project_id:
-            query = query.filter(ActivityLog.project_id == project_id)
-        
-        # Order by timestamp and limit
-        activities = query.order_by(ActivityLog.timestamp.desc()).limit(limit).all()
+            filters['project_id'] = project_id
+        activities = activity_storage.recent(limit=limit, firm_id=firm_id, **filters)
         
         # Format results
         result = []
-        for activity_log, user in activities:
+        for activity_log in activities:
             activity_dict = {
                 'id': activity_log.id,
                 'action': activity_log.action,
                 'timestamp': activity_log.timestamp,
-                'user_name': user.name,
-                'user_id': user.id,
+                'user_name': activity_log.user.name,
+                'user_id': activity_log.user_id,
                 'project_id': activity_log.project_id,
                 'task_id': activity_log.task_id,
                 'details': activity_log.details
@@ -130,17 +119,18 @@ class ActivityService(BaseService):
         
         return result
     
-    def log_entity_operation(self,
+    @staticmethod
+    def log_entity_operation(
         entity_type: str,
         operation: str,
-        entity_id: int,
+        entity_id: Optional[int],
         entity_name: str,
         details: str,
         user_id: int
     ) -> None:
         """
         Log entity operations
-        Instance method for proper service architecture
+        Buffered and written with the caller's commit; callable on the class or an instance
         
         Args:
             entity_type: Type of entity (e.g., 'USER', 'PROJECT', 'TASK')
@@ -151,35 +141,45 @@ class ActivityService(BaseService):
             user_id: ID of the user performing the operation
         """
         try:
-            from src.models import ActivityLog
-            
-            # Create a simple activity log entry
-            activity_log = ActivityLog(
+            activity_buffer.append(
                 action=f"{operation} {entity_type}",
                 user_id=user_id,
-                details=f"{entity_name}: {details}",
-                timestamp=datetime.utcnow()
+                project_id=entity_id if entity_type == 'PROJECT' else None,
+                task_id=entity_id if entity_type == 'TASK' else None,
+                details=f"{entity_name}: {details}"
             )
-            
-            # Set entity-specific fields if available
-            if entity_type in ['PROJECT']:
-                activity_log.project_id = entity_id
-            elif entity_type in ['TASK']:
-                activity_log.task_id = entity_id
-            
-            db.session.add(activity_log)
-            try:
-                db.session.commit()
-            except Exception as commit_error:
-                db.session.rollback()
-                raise commit_error
-            
         except Exception as e:
             # Log the error but don't fail the main operation
             import logging
             logger = logging.getLogger(__name__)
             logger.error(f"Failed to log entity operation: {e}")
     
+    @staticmethod
+    def log_task_operation(operation: str, task_id: Optional[int], task_title: str, details: str,
+                           user_id: int, project_id: Optional[int] = None) -> None:
+        """
+        Log a task operation (buffered like log_entity_operation)
+        
+        Args:
+            operation: Operation performed (e.g., 'CREATE', 'UPDATE', 'STATUS_CHANGE')
+            task_id: ID of the task
+            task_title: Title of the task
+            details: Additional details about the operation
+            user_id: ID of the user performing the operation
+            project_id: Optional project the task belongs to
+        """
+        try:
+            activity_buffer.append(
+                action=f"{operation} TASK",
+                user_id=user_id,
+                project_id=project_id,
+                task_id=task_id,
+                details=f"{task_title}: {details}"
+            )
+        except Exception as e:
+            import logging
+            logging.getLogger(__name__).error(f"Failed to log task operation: {e}")
+    
     @staticmethod
     def get_user_activity_summary(user_id: int, firm_id: int) -> Dict[str, Any]:
         """
@@ -197,21 +197,15 @@ class ActivityService(BaseService):
         if not user:
             return {'error': 'User not found or access denied'}
         
-        # Get activity counts
-        total_activities = ActivityLog.query.filter_by(user_id=user_id).count()
-        
-        # Get activities by type (simplified categories)
-        recent_count = ActivityLog.query.filter_by(user_id=user_id).filter(
-            ActivityLog.timestamp >= datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-        ).count()
+        # Counts come from the daily rollup, never the raw log
+        totals = activity_storage.summary(user_id=user_id, firm_id=firm_id)
+        today = activity_storage.summary(user_id=user_id, firm_id=firm_id, since=datetime.utcnow().date())
         
         return {
             'user_name': user.name,
-            'total_activities': total_activities,
-            'activities_today': recent_count,
-            'last_activity': ActivityLog.query.filter_by(user_id=user_id).order_by(
-                ActivityLog.timestamp.desc()
-            ).first()
+            'total_activities': totals['count'],
+            'activities_today': today['count'],
+            'last_activity_at': totals['last_activity_at']
         }
     
     @staticmethod
@@ -228,17 +222,13 @@ class ActivityService(BaseService):
             details: Optional additional details about the action
         """
         try:
-            # Get firm_id from user
-            user = User.query.get(user_id)
-            if not user:
-                return  # Silently fail if user not found
+            # Silently skip unknown users (membership is cached per process)
+            if user_firm_cache.get_firm_id(user_id) is None:
+                return
             
-            # Create activity log using instance method
-            activity_service = ActivityService()
-            activity_service.log_activity(
+            activity_buffer.append(
                 action=action,
                 user_id=user_id,
-                firm_id=user.firm_id,
                 project_id=project_id,
                 task_id=task_id,
                 details=details
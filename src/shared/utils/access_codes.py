@@ -0,0 +1,189 @@
+"""
+Access Code Lookup for CPA WorkflowPilot
+Firm access codes, client portal codes and checklist share tokens are looked
+up by an indexed HMAC-SHA256 of the code (``*_hash`` columns, kept in step by
+model validators) rather than by comparing the raw string.
+
+In front of the lookup sits a per-process LRU mapping recently presented code
+hashes to the matching row id, with a short TTL; misses are cached too (for
+less time) so repeated bad codes never reach the database. A per-IP token
+bucket of failed attempts lets callers reject brute-force scanning before any
+lookup happens.
+
+The HMAC key is ``ACCESS_CODE_HASH_KEY`` from app config or the environment,
+falling back to ``SECRET_KEY``. It must be stable across restarts: changing
+it means re-running the backfill in the add_access_code_hashes migration.
+"""
+
+import hashlib
+import hmac
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Any, Hashable, Optional, Tuple
+
+ACCESS_CODE_CACHE_SIZE = int(os.environ.get('ACCESS_CODE_CACHE_SIZE', 4096))
+ACCESS_CODE_CACHE_TTL = int(os.environ.get('ACCESS_CODE_CACHE_TTL', 60))
+ACCESS_CODE_NEGATIVE_TTL = int(os.environ.get('ACCESS_CODE_NEGATIVE_TTL', 10))
+
+# Failed attempts an IP may make in a burst, and seconds to earn one back
+ACCESS_CODE_FAILURE_BURST = int(os.environ.get('ACCESS_CODE_FAILURE_BURST', 10))
+ACCESS_CODE_FAILURE_REFILL_SECONDS = float(os.environ.get('ACCESS_CODE_FAILURE_REFILL_SECONDS', 30))
+
+_MISSING = object()
+
+
+def _hash_key() -> bytes:
+    key = None
+    try:
+        from flask import current_app
+        key = current_app.config.get('ACCESS_CODE_HASH_KEY')
+    except RuntimeError:
+        # Outside an app context (scripts, migrations run standalone)
+        pass
+    if not key:
+        key = os.environ.get('ACCESS_CODE_HASH_KEY') or os.environ.get('SECRET_KEY', '')
+    return key.encode('utf-8')
+
+
+def hash_access_code(code: Optional[str]) -> Optional[str]:
+    """Keyed hex digest stored in and matched against the ``*_hash`` columns"""
+    if not code:
+        return None
+    return hmac.new(_hash_key(), code.encode('utf-8'), hashlib.sha256).hexdigest()
+
+
+class AccessCodeCache:
+    """
+    Per-process LRU of code hash -> row id (or None for a known miss)
+
+    Args:
+        max_entries: Entries kept before the least recently used are evicted
+        ttl: Seconds a hit is trusted
+        negative_ttl: Seconds a miss is trusted
+    """
+
+    def __init__(self, max_entries: int = ACCESS_CODE_CACHE_SIZE, ttl: int = ACCESS_CODE_CACHE_TTL,
+                 negative_ttl: int = ACCESS_CODE_NEGATIVE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._entries: 'OrderedDict[Tuple[str, str], Tuple[Optional[int], float]]' = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    def resolve(self, kind: str, code: str, loader: Callable[[str], Optional[int]]) -> Optional[int]:
+        """
+        Row id for ``code``, calling ``loader(code_hash)`` on a cache miss
+
+        Args:
+            kind: Namespace of the code ('firm', 'client_user', 'checklist')
+            code: The code as presented by the user
+            loader: Returns the id of the row whose hash column matches, or None
+        """
+        code_hash = hash_access_code(code)
+        if code_hash is None:
+            return None
+
+        key = (kind, code_hash)
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is not _MISSING:
+                row_id, expires_at = entry
+                if time.monotonic() < expires_at:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return row_id
+                del self._entries[key]
+            self._misses += 1
+
+        row_id = loader(code_hash)
+
+        with self._lock:
+            ttl = self.ttl if row_id is not None else self.negative_ttl
+            self._entries[key] = (row_id, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return row_id
+
+    def discard(self, kind: str, code_hash: Optional[str]):
+        """Forget a hash, e.g. when a code is assigned or replaced"""
+        if code_hash is None:
+            return
+        with self._lock:
+            self._entries.pop((kind, code_hash), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self._hits,
+                'misses': self._misses
+            }
+
+
+class FailedAttemptThrottle:
+    """
+    Per-key token bucket charged only by failed attempts
+
+    Each key starts with ``burst`` tokens and earns one back every
+    ``refill_seconds``; a key with no whole token left is refused until it
+    earns one. Buckets are kept in an LRU bounded by ``max_keys``.
+    """
+
+    def __init__(self, burst: int = ACCESS_CODE_FAILURE_BURST,
+                 refill_seconds: float = ACCESS_CODE_FAILURE_REFILL_SECONDS, max_keys: int = 10000):
+        self.burst = burst
+        self.refill_seconds = refill_seconds
+        self.max_keys = max_keys
+        self._buckets: 'OrderedDict[Hashable, Tuple[float, float]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _tokens(self, key: Hashable, now: float) -> float:
+        entry = self._buckets.get(key)
+        if entry is None:
+            return float(self.burst)
+        tokens, updated_at = entry
+        return min(float(self.burst), tokens + (now - updated_at) / self.refill_seconds)
+
+    def allow(self, key: Hashable) -> bool:
+        """Whether ``key`` may make another attempt"""
+        with self._lock:
+            return self._tokens(key, time.monotonic()) >= 1
+
+    def record_failure(self, key: Hashable):
+        """Spend one token for a failed attempt"""
+        with self._lock:
+            now = time.monotonic()
+            self._buckets[key] = (max(0.0, self._tokens(key, now) - 1), now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+
+    def retry_after(self, key: Hashable) -> int:
+        """Seconds until ``key`` earns its next attempt (0 if it has one now)"""
+        with self._lock:
+            tokens = self._tokens(key, time.monotonic())
+        if tokens >= 1:
+            return 0
+        return int((1 - tokens) * self.refill_seconds) + 1
+
+    def reset(self, key: Optional[Hashable] = None):
+        with self._lock:
+            if key is None:
+                self._buckets.clear()
+            else:
+                self._buckets.pop(key, None)
+
+
+# Global per-process instances
+access_code_cache = AccessCodeCache()
+access_code_throttle = FailedAttemptThrottle()
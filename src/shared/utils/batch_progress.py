@@ -0,0 +1,225 @@
+"""
+Batch Progress Tracking for CPA WorkflowPilot
+Stores fan-out/fan-in progress for background batches in Redis so the UI
+can poll checklist-level progress without touching the database.
+"""
+
+import logging
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+from src.shared.database.redis_client import RedisClientMixin
+
+logger = logging.getLogger(__name__)
+
+
+class BatchProgressTracker(RedisClientMixin):
+    """
+    Redis-backed progress counters for Celery batch workflows
+
+    Each batch is a single hash (``batch_progress:{batch_id}``) holding the
+    total, completed and failed counters, updated with HINCRBY so concurrent
+    workers never race. Checklist batches are additionally indexed by
+    ``checklist_analysis:{checklist_id}`` pointing at the latest batch.
+    """
+
+    KEY_PREFIX = 'batch_progress'
+    CHECKLIST_KEY_PREFIX = 'checklist_analysis'
+    DEFAULT_TTL = 86400  # Keep progress for 24 hours
+
+    def __init__(self, redis_client_instance=None, ttl: int = DEFAULT_TTL):
+        """
+        Initialize progress tracker
+
+        Args:
+            redis_client_instance: RedisClient instance (optional, defaults to the global client)
+            ttl: Expiration in seconds for progress keys
+        """
+        self._redis_client = redis_client_instance
+        self.ttl = ttl
+
+    def _batch_key(self, batch_id: str) -> str:
+        return f"{self.KEY_PREFIX}:{batch_id}"
+
+    def _checklist_key(self, checklist_id: int) -> str:
+        return f"{self.CHECKLIST_KEY_PREFIX}:{checklist_id}"
+
+    def start(self, batch_id: str, total: int, checklist_id: Optional[int] = None,
+              firm_id: Optional[int] = None) -> bool:
+        """
+        Register a new batch
+
+        Args:
+            batch_id: Unique batch identifier
+            total: Number of items in the batch
+            checklist_id: Optional checklist the batch belongs to
+            firm_id: Optional firm ID for context
+
+        Returns:
+            bool: True if progress was stored
+        """
+        client = self._get_client()
+        if not client:
+            return False
+
+        try:
+            key = self._batch_key(batch_id)
+            pipe = client.pipeline()
+            pipe.hset(key, mapping={
+                'batch_id': batch_id,
+                'total': total,
+                'completed': 0,
+                'failed': 0,
+                'status': 'running' if total else 'completed',
+                'checklist_id': checklist_id if checklist_id is not None else '',
+                'firm_id': firm_id if firm_id is not None else '',
+                'started_at': datetime.utcnow().isoformat()
+            })
+            pipe.expire(key, self.ttl)
+            if checklist_id is not None:
+                pipe.set(self._checklist_key(checklist_id), batch_id, ex=self.ttl)
+            pipe.execute()
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to start batch progress for {batch_id}: {e}")
+            return False
+
+    def record_result(self, batch_id: Optional[str], success: bool) -> bool:
+        """
+        Record the final outcome of one item in a batch
+
+        Args:
+            batch_id: Batch identifier (no-op when None)
+            success: Whether the item succeeded
+
+        Returns:
+            bool: True if the counter was updated
+        """
+        if not batch_id:
+            return False
+
+        client = self._get_client()
+        if not client:
+            return False
+
+        try:
+            key = self._batch_key(batch_id)
+            pipe = client.pipeline()
+            pipe.hincrby(key, 'completed' if success else 'failed', 1)
+            pipe.expire(key, self.ttl)
+            pipe.execute()
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to record batch progress for {batch_id}: {e}")
+            return False
+
+    def finish(self, batch_id: str, successful: int, failed: int) -> bool:
+        """
+        Mark a batch as finished with the aggregated counts from the chord callback
+
+        Args:
+            batch_id: Batch identifier
+            successful: Number of successful items
+            failed: Number of failed items
+
+        Returns:
+            bool: True if progress was updated
+        """
+        client = self._get_client()
+        if not client:
+            return False
+
+        try:
+            key = self._batch_key(batch_id)
+            pipe = client.pipeline()
+            pipe.hset(key, mapping={
+                'completed': successful,
+                'failed': failed,
+                'status': 'completed',
+                'finished_at': datetime.utcnow().isoformat()
+            })
+            pipe.expire(key, self.ttl)
+            pipe.execute()
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to finish batch progress for {batch_id}: {e}")
+            return False
+
+    def get_progress(self, batch_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get progress for a batch
+
+        Args:
+            batch_id: Batch identifier
+
+        Returns:
+            dict: Progress data or None if unknown/unavailable
+        """
+        client = self._get_client()
+        if not client:
+            return None
+
+        try:
+            data = client.hgetall(self._batch_key(batch_id))
+        except Exception as e:
+            logger.warning(f"Failed to read batch progress for {batch_id}: {e}")
+            return None
+
+        if not data:
+            return None
+
+        return self._format_progress(data)
+
+    def get_checklist_progress(self, checklist_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Get progress of the most recent analysis batch for a checklist
+
+        Args:
+            checklist_id: Checklist ID
+
+        Returns:
+            dict: Progress data or None if no batch is known
+        """
+        client = self._get_client()
+        if not client:
+            return None
+
+        try:
+            batch_id = client.get(self._checklist_key(checklist_id))
+        except Exception as e:
+            logger.warning(f"Failed to read checklist progress for {checklist_id}: {e}")
+            return None
+
+        if not batch_id:
+            return None
+
+        return self.get_progress(batch_id)
+
+    @staticmethod
+    def _format_progress(data: Dict[Any, Any]) -> Dict[str, Any]:
+        """Convert raw hash values into typed progress information"""
+        def _value(field):
+            # RedisClient uses decode_responses=True, so keys and values are strings
+            value = data.get(field)
+            return value if value != '' else None
+
+        total = int(_value('total') or 0)
+        completed = int(_value('completed') or 0)
+        failed = int(_value('failed') or 0)
+        processed = completed + failed
+        checklist_id = _value('checklist_id')
+        firm_id = _value('firm_id')
+
+        return {
+            'batch_id': _value('batch_id'),
+            'status': _value('status') or 'running',
+            'total': total,
+            'completed': completed,
+            'failed': failed,
+            'processed': processed,
+            'percent_complete': round((processed / total) * 100, 1) if total else 100.0,
+            'checklist_id': int(checklist_id) if checklist_id else None,
+            'firm_id': int(firm_id) if firm_id else None,
+            'started_at': _value('started_at'),
+            'finished_at': _value('finished_at')
+        }
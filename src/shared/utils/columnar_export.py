@@ -0,0 +1,164 @@
+"""
+Columnar Export Writers for CPA WorkflowPilot
+Write streamed export rows to Parquet or XLSX files in fixed-size batches.
+Each batch is transposed into columns and converted once per column, so
+memory is bounded by the batch size rather than the export size.
+"""
+
+from decimal import Decimal
+from typing import Any, Iterable, Iterator, List, Sequence
+
+# Parquet support - only if pyarrow is installed
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+DEFAULT_BATCH_SIZE = 10000
+XLSX_MAX_ROWS = 1048576  # Excel's hard row limit per worksheet, header included
+
+DATE_FORMAT = 'yyyy-mm-dd'
+DATETIME_FORMAT = 'yyyy-mm-dd hh:mm'
+
+
+def iter_batches(rows: Iterable[Sequence[Any]], batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[List[Sequence[Any]]]:
+    """Group an iterator of rows into lists of at most ``batch_size`` rows"""
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _arrow_type(kind: str):
+    return {
+        'integer': pa.int64(),
+        'float': pa.float64(),
+        'boolean': pa.bool_(),
+        'date': pa.date32(),
+        'datetime': pa.timestamp('us'),
+    }.get(kind, pa.string())
+
+
+def _convert_column(values: Sequence[Any], kind: str) -> Sequence[Any]:
+    """Coerce one column of a batch to the kind declared for it"""
+    if kind == 'float':
+        return [float(v) if isinstance(v, Decimal) else v for v in values]
+    if kind == 'string':
+        return [v if v is None or isinstance(v, str) else str(v) for v in values]
+    return values
+
+
+def write_parquet(path: str, keys: Sequence[str], kinds: Sequence[str], rows: Iterable[Sequence[Any]],
+                  batch_size: int = DEFAULT_BATCH_SIZE, compression: str = 'snappy') -> int:
+    """
+    Write rows to a Parquet file, one row group per batch
+
+    The schema comes from the declared column kinds rather than the data,
+    so a batch that happens to be all nulls cannot change a column's type.
+
+    Returns:
+        int: Number of rows written
+    """
+    if not PARQUET_AVAILABLE:
+        raise RuntimeError('Parquet export requires pyarrow')
+
+    schema = pa.schema([pa.field(key, _arrow_type(kind)) for key, kind in zip(keys, kinds)])
+    row_count = 0
+
+    with pq.ParquetWriter(path, schema, compression=compression) as writer:
+        for batch in iter_batches(rows, batch_size):
+            columns = list(zip(*batch))
+            arrays = [
+                pa.array(_convert_column(values, kind), type=field.type)
+                for values, kind, field in zip(columns, kinds, schema)
+            ]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            row_count += len(batch)
+
+        if row_count == 0:
+            writer.write_table(schema.empty_table())
+
+    return row_count
+
+
+def write_xlsx(path: str, labels: Sequence[str], kinds: Sequence[str], rows: Iterable[Sequence[Any]],
+               sheet_name: str = 'Export', batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """
+    Write rows to an XLSX workbook using xlsxwriter's constant-memory mode
+
+    Constant-memory mode flushes each row to disk as soon as the next one
+    starts, so rows must be written strictly in order. Exports larger than
+    Excel's row limit continue on additional sheets.
+
+    Returns:
+        int: Number of rows written
+    """
+    import xlsxwriter
+
+    workbook = xlsxwriter.Workbook(path, {
+        'constant_memory': True,
+        # Never let exported text become formulas or links when opened in Excel
+        'strings_to_formulas': False,
+        'strings_to_urls': False,
+        'strings_to_numbers': False,
+    })
+
+    try:
+        header_format = workbook.add_format({'bold': True})
+        cell_formats = [
+            workbook.add_format({'num_format': DATE_FORMAT}) if kind == 'date' else
+            workbook.add_format({'num_format': DATETIME_FORMAT}) if kind == 'datetime' else
+            None
+            for kind in kinds
+        ]
+        write_methods = [
+            'write_datetime' if kind in ('date', 'datetime') else
+            'write_boolean' if kind == 'boolean' else
+            'write_number' if kind in ('integer', 'float') else
+            'write_string'
+            for kind in kinds
+        ]
+
+        def add_sheet(index: int):
+            name = sheet_name if index == 1 else f'{sheet_name} ({index})'
+            worksheet = workbook.add_worksheet(name[:31])
+            worksheet.write_row(0, 0, labels, header_format)
+            worksheet.freeze_panes(1, 0)
+            for col, (label, kind) in enumerate(zip(labels, kinds)):
+                worksheet.set_column(col, col, max(len(label) + 2, 18 if kind == 'datetime' else 12))
+            return worksheet
+
+        sheet_index = 1
+        worksheet = add_sheet(sheet_index)
+        writers = [getattr(worksheet, method) for method in write_methods]
+        row_index = 1
+        row_count = 0
+
+        for batch in iter_batches(rows, batch_size):
+            columns = [_convert_column(values, kind) for values, kind in zip(zip(*batch), kinds)]
+
+            for values in zip(*columns):
+                if row_index >= XLSX_MAX_ROWS:
+                    sheet_index += 1
+                    worksheet = add_sheet(sheet_index)
+                    writers = [getattr(worksheet, method) for method in write_methods]
+                    row_index = 1
+
+                for col, value in enumerate(values):
+                    if value is None:
+                        continue
+                    writers[col](row_index, col, value, cell_formats[col])
+
+                row_index += 1
+                row_count += 1
+
+    finally:
+        workbook.close()
+
+    return row_count
@@ -0,0 +1,82 @@
+"""
+Import Profiling for CPA WorkflowPilot
+Runs a statement in a fresh interpreter under ``python -X importtime`` and
+summarizes what it imported, so cold-start cost (new gunicorn and Celery
+workers) can be tracked and held to a budget in tests.
+"""
+
+import os
+import re
+import subprocess
+import sys
+import time
+from typing import Dict, Any, List, NamedTuple, Optional
+
+# "import time:       412 |       1203 |     flask.app"
+_IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$')
+
+
+class ImportTiming(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(stderr: str) -> List[ImportTiming]:
+    """Parse ``-X importtime`` output into one entry per imported module"""
+    timings = []
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            # Nested imports are indented two spaces per level under their importer
+            timings.append(ImportTiming(module, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return timings
+
+
+def profile_imports(statement: str, cwd: Optional[str] = None,
+                    env: Optional[Dict[str, str]] = None, timeout: int = 120) -> Dict[str, Any]:
+    """
+    Run ``statement`` in a new interpreter with import timing enabled
+
+    Returns:
+        dict: ``returncode``, ``wall_ms`` (whole subprocess), ``import_ms``
+        (sum of top-level cumulative import time), ``modules`` (set of module
+        names imported), ``timings`` (list of ImportTiming) and ``stderr``
+        with the importtime lines removed
+    """
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        cwd=cwd, env={**os.environ, **(env or {})},
+        capture_output=True, text=True, timeout=timeout
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+
+    timings = parse_importtime(result.stderr)
+    return {
+        'returncode': result.returncode,
+        'wall_ms': wall_ms,
+        'import_ms': sum(timing.cumulative_us for timing in timings if timing.depth == 0) / 1000,
+        'modules': {timing.module for timing in timings},
+        'timings': timings,
+        'stderr': '\n'.join(line for line in result.stderr.splitlines() if not line.startswith('import time:'))
+    }
+
+
+def summarize(profile: Dict[str, Any], top: int = 25) -> str:
+    """Plain-text report of the slowest imports, suitable for a CI artifact"""
+    lines = [
+        f"wall: {profile['wall_ms']:.1f} ms, imports: {profile['import_ms']:.1f} ms, "
+        f"modules: {len(profile['modules'])}, exit code: {profile['returncode']}",
+        '',
+        f"{'cumulative ms':>14} {'self ms':>9}  module"
+    ]
+    slowest = sorted(profile['timings'], key=lambda timing: timing.cumulative_us, reverse=True)[:top]
+    for timing in slowest:
+        lines.append(f"{timing.cumulative_us / 1000:>14.1f} {timing.self_us / 1000:>9.1f}  "
+                     f"{'  ' * timing.depth}{timing.module}")
+    if profile['returncode'] != 0 and profile['stderr']:
+        lines += ['', 'stderr:', profile['stderr']]
+    return '\n'.join(lines) + '\n'
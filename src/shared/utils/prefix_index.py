@@ -0,0 +1,297 @@
+"""
+Prefix Index for CPA WorkflowPilot
+In-memory, per-firm prefix lookup used by search-box autocomplete. Each
+firm's names live in one sorted array searched with bisect, so a lookup is
+O(log n + k) and never touches the database.
+
+Every word start of a name is indexed, so "ret" and "tax ret" both find
+"2024 Tax Return". Firm indexes are built lazily on first use, updated
+incrementally as entries are created, rebuilt in the background after
+``max_age`` seconds (which picks up renames and deletes; the old index keeps
+answering meanwhile) and evicted least-recently-used once the process holds
+more than ``max_entries`` keys.
+"""
+
+import bisect
+import logging
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Callable, Dict, Any, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+_WORD_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+# Words of a long name after this many are not indexed as starting points
+MAX_WORD_STARTS = 8
+
+
+def start_thread(target: Callable[[], Any]):
+    """Run ``target`` on a daemon thread (default background runner for rebuilds)"""
+    threading.Thread(target=target, name='prefix-index-rebuild', daemon=True).start()
+
+
+def normalize(text: str) -> str:
+    """Lower-case, strip accents and collapse punctuation/whitespace to single spaces"""
+    text = text or ''
+    if not text.isascii():
+        text = ''.join(ch for ch in unicodedata.normalize('NFKD', text) if not unicodedata.combining(ch))
+    return ' '.join(_WORD_PATTERN.findall(text.casefold()))
+
+
+def _word_keys(normalized: str) -> List[str]:
+    """The name from each word start onwards: 'tax return' -> ['tax return', 'return']"""
+    keys = []
+    start = 0
+    while normalized and len(keys) < MAX_WORD_STARTS:
+        keys.append(normalized[start:])
+        space = normalized.find(' ', start)
+        if space < 0:
+            break
+        start = space + 1
+    return keys
+
+
+class FirmPrefixIndex:
+    """
+    Sorted ``(key, entity, id, word position)`` array for one firm
+
+    Not thread-safe on its own; ``PrefixIndexCache`` serializes access.
+    """
+
+    # Matching keys examined per lookup before ranking (bounds very short prefixes)
+    SCAN_LIMIT = 200
+
+    def __init__(self):
+        self.entries: List[Tuple[str, str, int, int]] = []
+        self.labels: Dict[Tuple[str, int], str] = {}
+        self.built_at = time.monotonic()
+
+    @classmethod
+    def build(cls, items: Iterable[Tuple[str, int, str]]) -> 'FirmPrefixIndex':
+        """Bulk-load ``(entity, id, label)`` items with a single sort"""
+        index = cls()
+        for entity, item_id, label in items:
+            if not label:
+                continue
+            index.labels[(entity, item_id)] = label
+            index.entries.extend(
+                (key, entity, item_id, word) for word, key in enumerate(_word_keys(normalize(label)))
+            )
+        index.entries.sort()
+        return index
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def add(self, entity: str, item_id: int, label: str) -> int:
+        """Insert or replace an item; returns the change in key count"""
+        removed = self.remove(entity, item_id)
+        if not label:
+            return -removed
+
+        self.labels[(entity, item_id)] = label
+        keys = _word_keys(normalize(label))
+        for word, key in enumerate(keys):
+            bisect.insort(self.entries, (key, entity, item_id, word))
+        return len(keys) - removed
+
+    def remove(self, entity: str, item_id: int) -> int:
+        """Remove an item if present; returns the number of keys removed"""
+        label = self.labels.pop((entity, item_id), None)
+        if label is None:
+            return 0
+
+        removed = 0
+        for word, key in enumerate(_word_keys(normalize(label))):
+            entry = (key, entity, item_id, word)
+            position = bisect.bisect_left(self.entries, entry)
+            if position < len(self.entries) and self.entries[position] == entry:
+                del self.entries[position]
+                removed += 1
+        return removed
+
+    def search(self, query: str, limit: int = 10, entities: Optional[Set[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Find items with a word sequence starting with ``query``
+
+        Matches at the start of a name rank above matches on a later word,
+        then shorter names rank first.
+        """
+        prefix = normalize(query)
+        if not prefix:
+            return []
+
+        best: Dict[Tuple[str, int], int] = {}
+        position = bisect.bisect_left(self.entries, (prefix,))
+        end = min(len(self.entries), position + self.SCAN_LIMIT)
+
+        while position < end:
+            key, entity, item_id, word = self.entries[position]
+            if not key.startswith(prefix):
+                break
+            position += 1
+            if entities and entity not in entities:
+                continue
+
+            ref = (entity, item_id)
+            rank = 0 if word == 0 else 1
+            if rank < best.get(ref, 2):
+                best[ref] = rank
+
+        ranked = sorted(best.items(), key=lambda item: (item[1], len(self.labels[item[0]]), self.labels[item[0]]))
+        return [
+            {'type': entity, 'id': item_id, 'label': self.labels[(entity, item_id)]}
+            for (entity, item_id), _ in ranked[:limit]
+        ]
+
+
+class PrefixIndexCache:
+    """
+    Per-process LRU of ``FirmPrefixIndex`` objects
+
+    Args:
+        loader: Callable returning ``(entity, id, label)`` items for a firm
+        max_entries: Total keys kept across firms before cold firms are evicted
+        max_age: Seconds before a firm index is rebuilt from the loader
+        run_in_background: Callable that runs a stale firm's rebuild off the
+            request path (defaults to a daemon thread)
+    """
+
+    def __init__(self, loader: Callable[[int], Iterable[Tuple[str, int, str]]],
+                 max_entries: int = 500000, max_age: int = 900,
+                 run_in_background: Callable[[Callable[[], Any]], Any] = start_thread):
+        self.loader = loader
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.run_in_background = run_in_background
+        self._firms: 'OrderedDict[int, FirmPrefixIndex]' = OrderedDict()
+        self._pending: Dict[int, List[Tuple[str, int, Optional[str]]]] = {}
+        self._total_entries = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def get(self, firm_id: int) -> FirmPrefixIndex:
+        """
+        The firm's index, building it from the loader if missing
+
+        A stale index is returned as is while a replacement is built in the
+        background, so only a firm's first lookup waits for the loader.
+        """
+        rebuild = False
+        with self._lock:
+            index = self._firms.get(firm_id)
+            if index is not None:
+                self._firms.move_to_end(firm_id)
+                if time.monotonic() - index.built_at >= self.max_age and firm_id not in self._pending:
+                    # Changes that arrive while the loader runs are replayed onto the new index
+                    self._pending[firm_id] = []
+                    rebuild = True
+            else:
+                self._pending.setdefault(firm_id, [])
+
+        if index is None:
+            return self._build(firm_id)
+        if rebuild:
+            try:
+                self.run_in_background(lambda: self._rebuild(firm_id))
+            except Exception as e:
+                with self._lock:
+                    self._pending.pop(firm_id, None)
+                logger.warning(f"Could not start prefix index rebuild for firm {firm_id}: {e}")
+        return index
+
+    def _rebuild(self, firm_id: int):
+        try:
+            self._build(firm_id)
+        except Exception as e:
+            # The stale index keeps serving; the next lookup tries again
+            logger.warning(f"Failed to rebuild prefix index for firm {firm_id}: {e}")
+
+    def _build(self, firm_id: int) -> FirmPrefixIndex:
+        """Load and install a firm's index (the caller registered it in ``_pending``)"""
+        try:
+            index = FirmPrefixIndex.build(self.loader(firm_id))
+        except Exception:
+            with self._lock:
+                self._pending.pop(firm_id, None)
+            raise
+
+        with self._lock:
+            pending = self._pending.pop(firm_id, None)
+            if pending is None and firm_id in self._firms:
+                # A concurrent request built and installed this firm first
+                return self._firms[firm_id]
+
+            for entity, item_id, label in pending or []:
+                if label is None:
+                    index.remove(entity, item_id)
+                else:
+                    index.add(entity, item_id, label)
+
+            previous = self._firms.pop(firm_id, None)
+            if previous is not None:
+                self._total_entries -= len(previous)
+            self._firms[firm_id] = index
+            self._total_entries += len(index)
+            self._evict()
+            return index
+
+    def search(self, firm_id: int, query: str, limit: int = 10,
+               entities: Optional[Set[str]] = None) -> List[Dict[str, Any]]:
+        index = self.get(firm_id)
+        with self._lock:
+            return index.search(query, limit, entities)
+
+    def add(self, firm_id: int, entity: str, item_id: int, label: str):
+        """Apply a created/renamed item to the firm's index if it is loaded"""
+        self._apply(firm_id, entity, item_id, label)
+
+    def remove(self, firm_id: int, entity: str, item_id: int):
+        self._apply(firm_id, entity, item_id, None)
+
+    def _apply(self, firm_id: int, entity: str, item_id: int, label: Optional[str]):
+        with self._lock:
+            if firm_id in self._pending:
+                self._pending[firm_id].append((entity, item_id, label))
+
+            # Firms that are not loaded pick the change up when they are built
+            index = self._firms.get(firm_id)
+            if index is None:
+                return
+
+            if label is None:
+                self._total_entries -= index.remove(entity, item_id)
+            else:
+                self._total_entries += index.add(entity, item_id, label)
+            self._evict()
+
+    def _evict(self):
+        """Drop least recently used firms until under the entry budget (keeps at least one)"""
+        while self._total_entries > self.max_entries and len(self._firms) > 1:
+            _, index = self._firms.popitem(last=False)
+            self._total_entries -= len(index)
+            self._evictions += 1
+
+    def invalidate(self, firm_id: Optional[int] = None):
+        """Forget one firm's index, or every firm's"""
+        with self._lock:
+            if firm_id is None:
+                self._firms.clear()
+                self._total_entries = 0
+                return
+            index = self._firms.pop(firm_id, None)
+            if index is not None:
+                self._total_entries -= len(index)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'firms': len(self._firms),
+                'entries': self._total_entries,
+                'max_entries': self.max_entries,
+                'evictions': self._evictions
+            }
@@ -0,0 +1,241 @@
+"""
+Tenant Queue Accounting for CPA WorkflowPilot
+Per-firm, per-lane pending and in-flight counters used by the fair Celery
+routing layer, so one firm's bulk work cannot starve everyone else and queue
+depth is visible per firm and per lane.
+"""
+
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+from src.shared.database.redis_client import RedisClientMixin
+
+logger = logging.getLogger(__name__)
+
+# Priority lanes: interactive single-document work never waits behind batches
+INTERACTIVE_LANE = 'interactive'
+BATCH_LANE = 'batch'
+LANES = (INTERACTIVE_LANE, BATCH_LANE)
+
+# Max concurrently running tasks per firm in each lane (0 = unlimited)
+DEFAULT_TENANT_CONCURRENCY = {
+    INTERACTIVE_LANE: int(os.environ.get('CELERY_TENANT_INTERACTIVE_CONCURRENCY', 4)),
+    BATCH_LANE: int(os.environ.get('CELERY_TENANT_BATCH_CONCURRENCY', 2)),
+}
+
+
+def _load_concurrency_overrides(raw: Optional[str]) -> Dict[str, Dict[str, int]]:
+    """
+    Parse per-firm concurrency overrides
+
+    Format: JSON object keyed by firm ID, e.g. '{"12": {"batch": 6}}'
+    """
+    if not raw:
+        return {}
+
+    try:
+        overrides = json.loads(raw)
+        return {
+            str(firm_id): {lane: int(cap) for lane, cap in caps.items() if lane in LANES}
+            for firm_id, caps in overrides.items()
+        }
+    except (ValueError, AttributeError, TypeError) as e:
+        logger.warning(f"Ignoring invalid CELERY_TENANT_CONCURRENCY_OVERRIDES: {e}")
+        return {}
+
+
+TENANT_CONCURRENCY_OVERRIDES = _load_concurrency_overrides(
+    os.environ.get('CELERY_TENANT_CONCURRENCY_OVERRIDES')
+)
+
+
+class TenantQueueTracker(RedisClientMixin):
+    """
+    Redis-backed pending/in-flight counters per lane and firm
+
+    Each lane keeps two hashes keyed by firm ID
+    (``tenant_queue:pending:{lane}`` and ``tenant_queue:inflight:{lane}``),
+    updated with HINCRBY from Celery publish/prerun/postrun signals.
+    """
+
+    PENDING_KEY_PREFIX = 'tenant_queue:pending'
+    INFLIGHT_KEY_PREFIX = 'tenant_queue:inflight'
+    NO_FIRM = 'none'
+
+    def __init__(self, redis_client_instance=None, concurrency: Optional[Dict[str, int]] = None,
+                 overrides: Optional[Dict[str, Dict[str, int]]] = None):
+        """
+        Initialize tenant queue tracker
+
+        Args:
+            redis_client_instance: RedisClient instance (optional, defaults to the global client)
+            concurrency: Default per-firm concurrency cap for each lane
+            overrides: Per-firm cap overrides keyed by firm ID
+        """
+        self._redis_client = redis_client_instance
+        self.concurrency = concurrency if concurrency is not None else DEFAULT_TENANT_CONCURRENCY
+        self.overrides = overrides if overrides is not None else TENANT_CONCURRENCY_OVERRIDES
+
+    def _firm_field(self, firm_id: Optional[int]) -> str:
+        return str(firm_id) if firm_id is not None else self.NO_FIRM
+
+    def _pending_key(self, lane: str) -> str:
+        return f"{self.PENDING_KEY_PREFIX}:{lane}"
+
+    def _inflight_key(self, lane: str) -> str:
+        return f"{self.INFLIGHT_KEY_PREFIX}:{lane}"
+
+    def get_concurrency_cap(self, lane: str, firm_id: Optional[int]) -> int:
+        """
+        Get the concurrency cap for a firm in a lane
+
+        Returns:
+            int: Max concurrent tasks (0 means unlimited)
+        """
+        firm_overrides = self.overrides.get(self._firm_field(firm_id), {})
+        if lane in firm_overrides:
+            return firm_overrides[lane]
+        return self.concurrency.get(lane, 0)
+
+    def record_enqueued(self, lane: str, firm_id: Optional[int], count: int = 1) -> bool:
+        """Record tasks published to a lane for a firm"""
+        client = self._get_client()
+        if not client:
+            return False
+
+        try:
+            client.hincrby(self._pending_key(lane), self._firm_field(firm_id), count)
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to record enqueued tasks for {lane}/{firm_id}: {e}")
+            return False
+
+    def record_started(self, lane: str, firm_id: Optional[int], count: int = 1) -> Optional[int]:
+        """
+        Move tasks from pending to in-flight
+
+        Args:
+            lane: Lane name
+            firm_id: Firm ID
+            count: Number of queued items the started message carries (chunks carry several)
+
+        Returns:
+            int: In-flight count for the firm after starting, or None if unavailable
+        """
+        client = self._get_client()
+        if not client:
+            return None
+
+        try:
+            field = self._firm_field(firm_id)
+            pipe = client.pipeline()
+            pipe.hincrby(self._pending_key(lane), field, -count)
+            pipe.hincrby(self._inflight_key(lane), field, 1)
+            _, inflight = pipe.execute()
+            return int(inflight)
+        except Exception as e:
+            logger.warning(f"Failed to record started task for {lane}/{firm_id}: {e}")
+            return None
+
+    def record_finished(self, lane: str, firm_id: Optional[int]) -> bool:
+        """Release an in-flight slot for a firm"""
+        client = self._get_client()
+        if not client:
+            return False
+
+        try:
+            key = self._inflight_key(lane)
+            field = self._firm_field(firm_id)
+            if client.hincrby(key, field, -1) < 0:
+                # Counters were reset while tasks were running
+                client.hset(key, field, 0)
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to record finished task for {lane}/{firm_id}: {e}")
+            return False
+
+    def get_inflight(self, lane: str, firm_id: Optional[int]) -> int:
+        """Get the number of running tasks for a firm in a lane"""
+        client = self._get_client()
+        if not client:
+            return 0
+
+        try:
+            return int(client.hget(self._inflight_key(lane), self._firm_field(firm_id)) or 0)
+        except Exception as e:
+            logger.warning(f"Failed to read in-flight count for {lane}/{firm_id}: {e}")
+            return 0
+
+    def is_over_capacity(self, lane: str, firm_id: Optional[int], inflight: Optional[int] = None) -> bool:
+        """
+        Check whether a firm is running more tasks than its cap allows
+
+        Args:
+            lane: Lane name
+            firm_id: Firm ID
+            inflight: Current in-flight count (read from Redis when omitted)
+
+        Returns:
+            bool: True if the firm is over its concurrency cap
+        """
+        cap = self.get_concurrency_cap(lane, firm_id)
+        if cap <= 0:
+            return False
+
+        if inflight is None:
+            inflight = self.get_inflight(lane, firm_id)
+        return inflight > cap
+
+    def get_depths(self) -> Dict[str, Any]:
+        """
+        Get pending and in-flight counts per lane and per firm
+
+        Returns:
+            dict: Queue depth information
+        """
+        client = self._get_client()
+        if not client:
+            return {'success': False, 'error': 'Redis not available'}
+
+        try:
+            pipe = client.pipeline()
+            for lane in LANES:
+                pipe.hgetall(self._pending_key(lane))
+                pipe.hgetall(self._inflight_key(lane))
+            raw = pipe.execute()
+        except Exception as e:
+            logger.warning(f"Failed to read tenant queue depths: {e}")
+            return {'success': False, 'error': str(e)}
+
+        lanes = {}
+        for index, lane in enumerate(LANES):
+            pending = raw[index * 2] or {}
+            inflight = raw[index * 2 + 1] or {}
+
+            firms = {}
+            for field in set(pending) | set(inflight):
+                firm_pending = max(int(pending.get(field, 0)), 0)
+                firm_inflight = max(int(inflight.get(field, 0)), 0)
+                if not firm_pending and not firm_inflight:
+                    continue
+                firm_id = None if field == self.NO_FIRM else int(field)
+                firms[field] = {
+                    'pending': firm_pending,
+                    'inflight': firm_inflight,
+                    'concurrency_cap': self.get_concurrency_cap(lane, firm_id)
+                }
+
+            lanes[lane] = {
+                'pending': sum(f['pending'] for f in firms.values()),
+                'inflight': sum(f['inflight'] for f in firms.values()),
+                'firms': firms
+            }
+
+        return {
+            'success': True,
+            'lanes': lanes,
+            'timestamp': datetime.utcnow().isoformat()
+        }
@@ -8,10 +8,14 @@ from . import ai_worker
 from . import document_worker
 from . import notification_worker
 from . import system_worker
+from . import export_worker
+from . import fair_routing
 
 __all__ = [
     'ai_worker',
     'document_worker', 
     'notification_worker',
-    'system_worker'
+    'system_worker',
+    'export_worker',
+    'fair_routing'
 ]
@@ -5,18 +5,30 @@ Background tasks for AI document analysis and processing.
 
 import logging
 import time
+import uuid
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
-from celery import Task
+from celery import Task, chord
 from ..celery_app import celery_app
+from .batching import build_fanout_signatures, flatten_chord_results
+from .fair_routing import (
+    BATCH_LANE,
+    TENANT_DEFER_SECONDS,
+    fair_options,
+    get_deferrals,
+    retry_options,
+    should_defer
+)
 from src.shared.events.publisher import publish_event
 from src.shared.events.schemas import (
     DocumentAnalysisStartedEvent,
     DocumentAnalysisCompletedEvent,
     DocumentAnalysisFailedEvent,
+    BatchAnalysisCompletedEvent,
     ErrorEvent
 )
+from src.shared.utils.batch_progress import BatchProgressTracker
 
 logger = logging.getLogger(__name__)
 
@@ -44,7 +56,8 @@ class AIAnalysisTask(Task):
 
 @celery_app.task(bind=True, base=AIAnalysisTask, name='workers.ai_worker.analyze_document')
 def analyze_document(self, document_id: int, document_name: str, file_path: str, 
-                    checklist_id: Optional[int] = None, firm_id: Optional[int] = None) -> Dict[str, Any]:
+                    checklist_id: Optional[int] = None, firm_id: Optional[int] = None,
+                    batch_id: Optional[str] = None) -> Dict[str, Any]:
     """
     Analyze a document using AI services in the background
     
@@ -54,108 +67,153 @@ def analyze_document(self, document_id: int, document_name: str, file_path: str,
         file_path: Path to the document file
         checklist_id: Optional checklist ID this document belongs to
         firm_id: Firm ID for context
+        batch_id: Optional batch ID for progress tracking when part of a chord
         
     Returns:
         dict: Analysis results
     """
-    start_time = time.time()
+    # Give the worker slot back if this firm is already at its lane concurrency cap
+    if should_defer(self.request):
+        logger.info(f"Deferring AI analysis for document {document_id}: firm {firm_id} at concurrency cap")
+        raise self.retry(countdown=TENANT_DEFER_SECONDS, max_retries=None,
+                         **retry_options(self.request, deferred=True))
+    
+    # Deferrals re-publish through retry() too, so they don't count as failures
+    deferrals = get_deferrals(self.request)
+    error_retries = self.request.retries - deferrals
     
     try:
-        logger.info(f"Starting AI analysis for document {document_id}: {document_name}")
-        
-        # Publish analysis started event
-        started_event = DocumentAnalysisStartedEvent(
-            document_id=document_id,
-            document_name=document_name,
-            file_type=file_path.split('.')[-1] if '.' in file_path else 'unknown',
-            checklist_id=checklist_id,
-            analysis_service="ai_worker",
-            firm_id=firm_id
-        )
-        publish_event(started_event)
-        
-        # Import AI service (lazy import to avoid circular dependencies)
-        from src.modules.document.analysis_service import AIAnalysisService
-        from src.config import get_config
-        
-        # Initialize AI service
-        config = get_config()()
-        ai_service = AIAnalysisService(config.__dict__)
-        
-        if not ai_service.is_available():
-            raise RuntimeError("AI services not available - no API keys configured")
-        
-        # Perform the analysis
-        analysis_result = ai_service.analyze_document_file(file_path)
-        
-        if not analysis_result.get('success', False):
-            raise RuntimeError(f"AI analysis failed: {analysis_result.get('error', 'Unknown error')}")
-        
-        # Extract results
-        document_type = analysis_result.get('document_type', 'Unknown')
-        confidence_score = analysis_result.get('confidence_score', 0.0)
-        analysis_data = analysis_result.get('analysis_results', {})
-        
-        # Update database
-        _update_document_analysis_results(
-            document_id=document_id,
-            document_type=document_type,
-            confidence_score=confidence_score,
-            analysis_results=analysis_data
-        )
-        
-        # Calculate processing time
-        processing_time = (time.time() - start_time) * 1000
+        result = _run_document_analysis(document_id, document_name, file_path, checklist_id, firm_id)
+        BatchProgressTracker().record_result(batch_id, True)
+        return result
         
-        # Publish completion event
-        completed_event = DocumentAnalysisCompletedEvent(
-            document_id=document_id,
-            document_name=document_name,
-            analysis_results=analysis_data,
-            confidence_score=confidence_score,
-            document_type=document_type,
-            processing_time_ms=processing_time,
-            firm_id=firm_id
-        )
-        publish_event(completed_event)
-        
-        logger.info(f"Completed AI analysis for document {document_id} in {processing_time:.2f}ms")
+    except Exception as e:
+        logger.error(f"Error analyzing document {document_id}: {e}")
+        _publish_analysis_failure(document_id, document_name, e, error_retries, firm_id)
         
+        # Retry logic
+        if error_retries < self.max_retries:
+            logger.info(f"Retrying AI analysis for document {document_id} (retry {error_retries + 1})")
+            raise self.retry(countdown=60 * (error_retries + 1),  # Exponential backoff
+                             max_retries=self.max_retries + deferrals,
+                             **retry_options(self.request))
+        
+        # Max retries reached - only the final outcome counts towards batch progress
+        BatchProgressTracker().record_result(batch_id, False)
         return {
-            'success': True,
+            'success': False,
             'document_id': document_id,
-            'document_type': document_type,
-            'confidence_score': confidence_score,
-            'processing_time_ms': processing_time,
-            'analysis_results': analysis_data
+            'error': str(e),
+            'retry_count': error_retries
         }
+
+
+@celery_app.task(name='workers.ai_worker.analyze_document_item')
+def analyze_document_item(document_id: int, document_name: str, file_path: str,
+                          checklist_id: Optional[int] = None, firm_id: Optional[int] = None,
+                          batch_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Analyze a single document as part of a chunked batch
+    
+    Chunked items run inline inside the chunk task, so this variant never
+    retries - a failure is recorded and the rest of the chunk continues.
+    
+    Args:
+        document_id: Database ID of the document
+        document_name: Name of the document file
+        file_path: Path to the document file
+        checklist_id: Optional checklist ID this document belongs to
+        firm_id: Firm ID for context
+        batch_id: Optional batch ID for progress tracking
         
+    Returns:
+        dict: Analysis results
+    """
+    try:
+        result = _run_document_analysis(document_id, document_name, file_path, checklist_id, firm_id)
     except Exception as e:
-        logger.error(f"Error analyzing document {document_id}: {e}")
-        
-        # Publish failure event
-        failure_event = DocumentAnalysisFailedEvent(
-            document_id=document_id,
-            document_name=document_name,
-            error_message=str(e),
-            error_type=type(e).__name__,
-            retry_count=self.request.retries,
-            firm_id=firm_id
-        )
-        publish_event(failure_event)
-        
-        # Retry logic
-        if self.request.retries < self.max_retries:
-            logger.info(f"Retrying AI analysis for document {document_id} (retry {self.request.retries + 1})")
-            raise self.retry(countdown=60 * (self.request.retries + 1))  # Exponential backoff
-        
-        # Max retries reached
-        return {
+        logger.error(f"Error analyzing document {document_id} in batch {batch_id}: {e}")
+        _publish_analysis_failure(document_id, document_name, e, 0, firm_id)
+        result = {
             'success': False,
             'document_id': document_id,
             'error': str(e),
-            'retry_count': self.request.retries
+            'retry_count': 0
         }
+    
+    BatchProgressTracker().record_result(batch_id, result.get('success', False))
+    return result
+
+
+@celery_app.task(bind=True, name='workers.ai_worker.analyze_document_chunk')
+def analyze_document_chunk(self, items: List[tuple]) -> List[Dict[str, Any]]:
+    """
+    Analyze one chunk of a large batch, one document after another
+    
+    The chunk holds a single worker slot, so it is checked against the
+    firm's batch lane cap like ``analyze_document`` and deferred as a whole
+    when the firm is already at its cap.
+    
+    Args:
+        items: ``analyze_document_item`` argument tuples
+        
+    Returns:
+        list: One analysis result per document
+    """
+    if should_defer(self.request):
+        logger.info(f"Deferring chunk of {len(items)} documents: firm at concurrency cap")
+        raise self.retry(countdown=TENANT_DEFER_SECONDS, max_retries=None,
+                         **retry_options(self.request, deferred=True))
+    
+    return [analyze_document_item(*args) for args in items]
+
+
+@celery_app.task(name='workers.ai_worker.aggregate_analysis_results')
+def aggregate_analysis_results(results: list, batch_id: str, checklist_id: Optional[int] = None,
+                               firm_id: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Chord callback that fans in the per-document analysis results
+    
+    Args:
+        results: Header results (one dict per document, or one list per chunk)
+        batch_id: Batch ID used for progress tracking
+        checklist_id: Optional checklist ID the batch belongs to
+        firm_id: Firm ID for context
+        
+    Returns:
+        dict: Aggregated batch summary
+    """
+    document_results = [r for r in flatten_chord_results(results) if isinstance(r, dict)]
+    successful = sum(1 for r in document_results if r.get('success'))
+    failed_document_ids = [r.get('document_id') for r in document_results if not r.get('success')]
+    failed = len(failed_document_ids)
+    
+    BatchProgressTracker().finish(batch_id, successful, failed)
+    
+    # Publish a single completion event for the whole batch
+    completed_event = BatchAnalysisCompletedEvent(
+        batch_id=batch_id,
+        checklist_id=checklist_id,
+        total_documents=len(document_results),
+        successful=successful,
+        failed=failed,
+        failed_document_ids=failed_document_ids,
+        firm_id=firm_id
+    )
+    publish_event(completed_event)
+    
+    logger.info(f"Batch {batch_id} finished: {successful} successful, {failed} failed")
+    
+    return {
+        'success': True,
+        'batch_id': batch_id,
+        'checklist_id': checklist_id,
+        'total_documents': len(document_results),
+        'successful': successful,
+        'failed': failed,
+        'failed_document_ids': failed_document_ids,
+        'completed_at': datetime.utcnow().isoformat()
+    }
 
 
 @celery_app.task(name='workers.ai_worker.analyze_checklist')
@@ -174,7 +232,7 @@ def analyze_checklist(checklist_id: int, firm_id: Optional[int] = None) -> Dict[
         logger.info(f"Starting checklist analysis for checklist {checklist_id}")
         
         # Import models (lazy import)
-        from src.models import DocumentChecklist, ClientDocument
+        from src.models import DocumentChecklist, ClientDocument, Client
         from src.shared.database.db_import import db
         
         # Get checklist and documents
@@ -182,31 +240,35 @@ def analyze_checklist(checklist_id: int, firm_id: Optional[int] = None) -> Dict[
         if not checklist:
             raise ValueError(f"Checklist {checklist_id} not found")
         
-        # Queue analysis tasks for all documents
-        analysis_tasks = []
-        total_documents = 0
+        # The progress endpoint only shows a batch to its own firm, so always
+        # stamp the batch with the firm that owns the checklist
+        client = Client.query.get(checklist.client_id)
+        if not client:
+            raise ValueError(f"Client {checklist.client_id} for checklist {checklist_id} not found")
+        firm_id = client.firm_id
+        
+        # Collect every pending document for the batch
+        documents = [
+            (
+                document.id,
+                document.original_filename or f"document_{document.id}",
+                document.file_path,
+                checklist_id,
+                firm_id
+            )
+            for item in checklist.items
+            for document in item.client_documents
+            if not document.ai_analysis_completed and document.file_path
+        ]
         
-        for item in checklist.items:
-            for document in item.client_documents:
-                if not document.ai_analysis_completed and document.file_path:
-                    # Queue background analysis
-                    task = analyze_document.delay(
-                        document_id=document.id,
-                        document_name=document.original_filename or f"document_{document.id}",
-                        file_path=document.file_path,
-                        checklist_id=checklist_id,
-                        firm_id=firm_id
-                    )
-                    analysis_tasks.append(task.id)
-                    total_documents += 1
+        batch = _dispatch_analysis_batch(documents, checklist_id=checklist_id, firm_id=firm_id)
         
-        logger.info(f"Queued {total_documents} documents for analysis from checklist {checklist_id}")
+        logger.info(f"Queued {batch['queued_documents']} documents for analysis from checklist {checklist_id}")
         
         return {
             'success': True,
             'checklist_id': checklist_id,
-            'queued_documents': total_documents,
-            'task_ids': analysis_tasks
+            **batch
         }
         
     except Exception as e:
@@ -246,34 +308,29 @@ def batch_analyze_documents(document_ids: list, firm_id: Optional[int] = None) -
         # Import models (lazy import)
         from src.models import ClientDocument
         
-        analysis_tasks = []
-        successful_queued = 0
+        # Load all requested documents in one query instead of one get() per ID
+        documents = ClientDocument.query.filter(ClientDocument.id.in_(document_ids)).all() if document_ids else []
         
-        for doc_id in document_ids:
-            try:
-                document = ClientDocument.query.get(doc_id)
-                if document and not document.ai_analysis_completed and document.file_path:
-                    # Queue background analysis
-                    task = analyze_document.delay(
-                        document_id=document.id,
-                        document_name=document.original_filename or f"document_{document.id}",
-                        file_path=document.file_path,
-                        checklist_id=document.checklist_item.checklist_id if document.checklist_item else None,
-                        firm_id=firm_id
-                    )
-                    analysis_tasks.append(task.id)
-                    successful_queued += 1
-                    
-            except Exception as e:
-                logger.warning(f"Could not queue document {doc_id} for analysis: {e}")
+        pending_documents = [
+            (
+                document.id,
+                document.original_filename or f"document_{document.id}",
+                document.file_path,
+                document.checklist_item.checklist_id if document.checklist_item else None,
+                firm_id
+            )
+            for document in documents
+            if not document.ai_analysis_completed and document.file_path
+        ]
+        
+        batch = _dispatch_analysis_batch(pending_documents, firm_id=firm_id)
         
-        logger.info(f"Successfully queued {successful_queued} documents for batch analysis")
+        logger.info(f"Successfully queued {batch['queued_documents']} documents for batch analysis")
         
         return {
             'success': True,
             'requested_documents': len(document_ids),
-            'queued_documents': successful_queued,
-            'task_ids': analysis_tasks
+            **batch
         }
         
     except Exception as e:
@@ -286,6 +343,143 @@ def batch_analyze_documents(document_ids: list, firm_id: Optional[int] = None) -
         }
 
 
+def _dispatch_analysis_batch(documents: List[tuple], checklist_id: Optional[int] = None,
+                             firm_id: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Fan out document analysis as a chord with an aggregating callback
+    
+    Args:
+        documents: (document_id, document_name, file_path, checklist_id, firm_id) tuples
+        checklist_id: Optional checklist ID used for checklist-level progress
+        firm_id: Firm ID for context
+        
+    Returns:
+        dict: Batch dispatch information (batch ID, chord ID, queued count)
+    """
+    batch_id = str(uuid.uuid4())
+    tracker = BatchProgressTracker()
+    tracker.start(batch_id, len(documents), checklist_id=checklist_id, firm_id=firm_id)
+    
+    if not documents:
+        return {
+            'batch_id': batch_id,
+            'chord_id': None,
+            'queued_documents': 0,
+            'chunked': False
+        }
+    
+    arg_tuples = [tuple(document) + (batch_id,) for document in documents]
+    header = build_fanout_signatures(analyze_document, arg_tuples, chunk_runner=analyze_document_chunk)
+    
+    # Route every header message into the firm's batch lane shard
+    for signature in header:
+        items = len(signature.args[0]) if signature.task == analyze_document_chunk.name else 1
+        signature.set(**fair_options(BATCH_LANE, firm_id, items=items))
+    callback = aggregate_analysis_results.s(batch_id=batch_id, checklist_id=checklist_id, firm_id=firm_id)
+    chord_result = chord(header)(callback)
+    
+    return {
+        'batch_id': batch_id,
+        'chord_id': chord_result.id,
+        'queued_documents': len(documents),
+        'chunked': len(header) != len(documents)
+    }
+
+
+def _run_document_analysis(document_id: int, document_name: str, file_path: str,
+                           checklist_id: Optional[int] = None, firm_id: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Run AI analysis for one document and persist the results
+    
+    Raises:
+        Exception: Any analysis failure (callers decide whether to retry)
+    """
+    start_time = time.time()
+    
+    logger.info(f"Starting AI analysis for document {document_id}: {document_name}")
+    
+    # Publish analysis started event
+    started_event = DocumentAnalysisStartedEvent(
+        document_id=document_id,
+        document_name=document_name,
+        file_type=file_path.split('.')[-1] if '.' in file_path else 'unknown',
+        checklist_id=checklist_id,
+        analysis_service="ai_worker",
+        firm_id=firm_id
+    )
+    publish_event(started_event)
+    
+    # Import AI service (lazy import to avoid circular dependencies)
+    from src.modules.document.analysis_service import AIAnalysisService
+    from src.config import get_config
+    
+    # Initialize AI service
+    config = get_config()()
+    ai_service = AIAnalysisService(config.__dict__)
+    
+    if not ai_service.is_available():
+        raise RuntimeError("AI services not available - no API keys configured")
+    
+    # Perform the analysis
+    analysis_result = ai_service.analyze_document_file(file_path)
+    
+    if not analysis_result.get('success', False):
+        raise RuntimeError(f"AI analysis failed: {analysis_result.get('error', 'Unknown error')}")
+    
+    # Extract results
+    document_type = analysis_result.get('document_type', 'Unknown')
+    confidence_score = analysis_result.get('confidence_score', 0.0)
+    analysis_data = analysis_result.get('analysis_results', {})
+    
+    # Update database
+    _update_document_analysis_results(
+        document_id=document_id,
+        document_type=document_type,
+        confidence_score=confidence_score,
+        analysis_results=analysis_data
+    )
+    
+    # Calculate processing time
+    processing_time = (time.time() - start_time) * 1000
+    
+    # Publish completion event
+    completed_event = DocumentAnalysisCompletedEvent(
+        document_id=document_id,
+        document_name=document_name,
+        analysis_results=analysis_data,
+        confidence_score=confidence_score,
+        document_type=document_type,
+        processing_time_ms=processing_time,
+        firm_id=firm_id
+    )
+    publish_event(completed_event)
+    
+    logger.info(f"Completed AI analysis for document {document_id} in {processing_time:.2f}ms")
+    
+    return {
+        'success': True,
+        'document_id': document_id,
+        'document_type': document_type,
+        'confidence_score': confidence_score,
+        'processing_time_ms': processing_time,
+        'analysis_results': analysis_data
+    }
+
+
+def _publish_analysis_failure(document_id: int, document_name: str, error: Exception,
+                              retry_count: int, firm_id: Optional[int] = None):
+    """Publish a DocumentAnalysisFailedEvent for a document"""
+    failure_event = DocumentAnalysisFailedEvent(
+        document_id=document_id,
+        document_name=document_name,
+        error_message=str(error),
+        error_type=type(error).__name__,
+        retry_count=retry_count,
+        firm_id=firm_id
+    )
+    publish_event(failure_event)
+
+
 def _update_document_analysis_results(document_id: int, document_type: str, 
                                      confidence_score: float, analysis_results: Dict[str, Any]):
     """
@@ -0,0 +1,65 @@
+"""
+Fan-out/Fan-in Helpers for CPA WorkflowPilot Workers
+Builds Celery group/chord headers for batch work instead of blocking on
+per-item results inside a task.
+"""
+
+import os
+from typing import Any, List, Optional, Sequence
+
+# Batches larger than the threshold are dispatched with Celery ``chunks`` so the
+# broker sees len(items) / CHUNK_SIZE messages instead of one message per item
+BATCH_CHUNK_THRESHOLD = int(os.environ.get('CELERY_BATCH_CHUNK_THRESHOLD', 50))
+BATCH_CHUNK_SIZE = int(os.environ.get('CELERY_BATCH_CHUNK_SIZE', 10))
+
+
+def build_fanout_signatures(task, arg_tuples: Sequence[tuple], chunk_task=None,
+                            chunk_threshold: int = BATCH_CHUNK_THRESHOLD,
+                            chunk_size: int = BATCH_CHUNK_SIZE,
+                            chunk_runner=None) -> List[Any]:
+    """
+    Build the header signatures for a chord over a list of positional argument tuples
+
+    Args:
+        task: Celery task to run once per item for small batches
+        arg_tuples: Positional arguments for each item
+        chunk_task: Task to use inside chunks (defaults to ``task``). Chunked items
+            run inline inside the chunk task, so tasks relying on ``self.retry``
+            should pass a retry-free variant here.
+        chunk_threshold: Batch size above which chunking is used
+        chunk_size: Number of items per chunk
+        chunk_runner: Task called with one chunk (a list of argument tuples) per
+            message instead of Celery's built-in ``chunks``; use it when the
+            chunk itself has to run code first, e.g. to defer the whole chunk.
+            Must return one result per item.
+
+    Returns:
+        list: Signatures suitable for ``group(...)`` / ``chord(...)``
+    """
+    arg_tuples = [tuple(args) for args in arg_tuples]
+
+    if len(arg_tuples) > chunk_threshold and chunk_runner is not None:
+        return [chunk_runner.s(arg_tuples[start:start + chunk_size])
+                for start in range(0, len(arg_tuples), chunk_size)]
+
+    if len(arg_tuples) > chunk_threshold:
+        chunked = (chunk_task or task).chunks(arg_tuples, chunk_size).group()
+        return list(chunked.tasks)
+
+    return [task.s(*args) for args in arg_tuples]
+
+
+def flatten_chord_results(results: Optional[Sequence[Any]]) -> List[Any]:
+    """
+    Flatten chord header results
+
+    Chunked headers return one list per chunk, plain headers return one result
+    per item; callbacks always want a flat list of per-item results.
+    """
+    flattened = []
+    for result in results or []:
+        if isinstance(result, (list, tuple)):
+            flattened.extend(result)
+        else:
+            flattened.append(result)
+    return flattened
@@ -0,0 +1,81 @@
+"""
+Export Worker for CPA WorkflowPilot
+Background tasks that build Parquet/XLSX export files, so large-firm exports
+never run inside a web request.
+"""
+
+import logging
+from datetime import datetime
+from typing import Dict, Any
+
+from ..celery_app import celery_app
+from src.shared.events.publisher import publish_event
+from src.shared.events.schemas import ErrorEvent
+
+logger = logging.getLogger(__name__)
+
+
+def _get_export_service():
+    from src.shared.di_container import get_service
+    from src.modules.export.interface import IExportService
+
+    try:
+        return get_service(IExportService)
+    except (ValueError, ImportError):
+        from src.modules.export.service import ExportService
+        return ExportService()
+
+
+@celery_app.task(name='workers.export_worker.build_export_file')
+def build_export_file(job_id: str) -> Dict[str, Any]:
+    """
+    Build the file for a queued export job
+
+    Args:
+        job_id: Export job ID created by ExportService.start_export_job
+
+    Returns:
+        dict: Job result with row count and file size
+    """
+    export_service = _get_export_service()
+    result = export_service.run_export_job(job_id)
+    job = export_service.job_store.get(job_id) or {}
+
+    if result['success']:
+        from src.shared.events.schemas import ExportCompletedEvent
+        publish_event(ExportCompletedEvent(
+            job_id=job_id,
+            entity=job.get('entity'),
+            export_format=job.get('format'),
+            row_count=result['row_count'],
+            file_size_bytes=result['file_size_bytes'],
+            firm_id=job.get('firm_id'),
+            user_id=job.get('user_id')
+        ))
+    else:
+        publish_event(ErrorEvent(
+            error_type='ExportJobFailed',
+            error_message=result.get('error', 'Unknown error'),
+            context={'task_type': 'build_export_file', 'job_id': job_id},
+            firm_id=job.get('firm_id')
+        ))
+
+    return result
+
+
+@celery_app.task(name='workers.export_worker.cleanup_export_files')
+def cleanup_export_files() -> Dict[str, Any]:
+    """
+    Delete expired export files
+
+    Returns:
+        dict: Number of files removed and bytes freed
+    """
+    try:
+        result = _get_export_service().cleanup_export_files()
+        logger.info(f"Removed {result['removed']} expired export files ({result['freed_bytes']} bytes)")
+        return {**result, 'timestamp': datetime.utcnow().isoformat()}
+
+    except Exception as e:
+        logger.error(f"Error cleaning up export files: {e}")
+        return {'success': False, 'error': str(e), 'timestamp': datetime.utcnow().isoformat()}
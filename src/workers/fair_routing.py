@@ -0,0 +1,219 @@
+"""
+Fair Routing for CPA WorkflowPilot Workers
+Routes AI tasks into priority lanes and per-firm shard queues so a single
+firm's bulk analysis cannot starve interactive work from other firms.
+
+Each lane is split into ``CELERY_TENANT_SHARDS`` queues (``ai_interactive.N``
+and ``ai_batch.N``) and a firm always lands on the same shard. Workers consume
+all shards of a lane, and the Redis transport polls its queues round-robin,
+so firms with queued work take turns instead of draining FIFO. Run
+interactive and batch workers separately so batches never occupy interactive
+capacity, e.g.::
+
+    celery -A src.celery_app worker -Q ai_interactive.0,...,ai_interactive.15
+    celery -A src.celery_app worker -Q ai_batch.0,...,ai_batch.15
+
+(``lane_queue_names(lane)`` returns the exact list.)
+"""
+
+import logging
+import os
+from typing import Dict, Any, List, Optional
+
+from celery.signals import before_task_publish, task_prerun, task_postrun
+from src.shared.utils.tenant_queues import INTERACTIVE_LANE, BATCH_LANE, LANES, TenantQueueTracker
+
+logger = logging.getLogger(__name__)
+
+TENANT_SHARDS = int(os.environ.get('CELERY_TENANT_SHARDS', 16))
+TENANT_DEFER_SECONDS = int(os.environ.get('CELERY_TENANT_DEFER_SECONDS', 5))
+
+LANE_QUEUE_PREFIXES = {
+    INTERACTIVE_LANE: 'ai_interactive',
+    BATCH_LANE: 'ai_batch',
+}
+
+# AI tasks that always belong to the batch lane
+BATCH_TASKS = {
+    'workers.ai_worker.analyze_document_item',
+    'workers.ai_worker.analyze_document_chunk',
+    'workers.ai_worker.analyze_checklist',
+    'workers.ai_worker.batch_analyze_documents',
+    'workers.ai_worker.aggregate_analysis_results',
+}
+
+# Positional index of (firm_id, batch_id) for AI tasks called with args
+POSITIONAL_ARGS = {
+    'workers.ai_worker.analyze_document': (4, 5),
+    'workers.ai_worker.analyze_document_item': (4, 5),
+    'workers.ai_worker.analyze_checklist': (1, None),
+    'workers.ai_worker.batch_analyze_documents': (1, None),
+}
+
+# Message headers carrying lane accounting information
+LANE_HEADER = 'fair_lane'
+FIRM_HEADER = 'fair_firm_id'
+ITEMS_HEADER = 'fair_items'
+DEFERRALS_HEADER = 'fair_deferrals'
+
+# Request attribute holding the in-flight count this task's own start produced
+INFLIGHT_ATTR = 'fair_inflight'
+
+
+def lane_queue(lane: str, firm_id: Optional[int]) -> str:
+    """Get the shard queue for a firm in a lane"""
+    shard = (firm_id or 0) % TENANT_SHARDS
+    return f"{LANE_QUEUE_PREFIXES[lane]}.{shard}"
+
+
+def lane_queue_names(lane: Optional[str] = None) -> List[str]:
+    """Get every shard queue name for a lane (or for all lanes)"""
+    lanes = [lane] if lane else list(LANES)
+    return [f"{LANE_QUEUE_PREFIXES[name]}.{shard}" for name in lanes for shard in range(TENANT_SHARDS)]
+
+
+def fair_options(lane: str, firm_id: Optional[int], items: int = 1, deferrals: int = 0) -> Dict[str, Any]:
+    """
+    Build publish options routing a task into a lane
+
+    Args:
+        lane: Lane name
+        firm_id: Firm the task runs for
+        items: Number of work items the message carries (chunks carry several)
+        deferrals: Times the task was already deferred for being over its cap
+
+    Returns:
+        dict: Options for ``apply_async``/``Signature.set``
+    """
+    return {
+        'queue': lane_queue(lane, firm_id),
+        'headers': {
+            LANE_HEADER: lane,
+            FIRM_HEADER: firm_id,
+            ITEMS_HEADER: items,
+            DEFERRALS_HEADER: deferrals
+        }
+    }
+
+
+def _request_value(request, name: str, default=None):
+    """Read a custom message header from a task request"""
+    value = getattr(request, name, None)
+    if value is None:
+        value = (getattr(request, 'headers', None) or {}).get(name)
+    return default if value is None else value
+
+
+def get_deferrals(request) -> int:
+    """Get how many times the current task was deferred for tenant fairness"""
+    return int(_request_value(request, DEFERRALS_HEADER, 0))
+
+
+def retry_options(request, deferred: bool = False) -> Dict[str, Any]:
+    """
+    Build ``Task.retry`` options that keep the task in its lane
+
+    Custom headers are not carried over by ``retry`` automatically.
+    """
+    lane = _request_value(request, LANE_HEADER)
+    if not lane:
+        return {}
+
+    options = fair_options(
+        lane,
+        _request_value(request, FIRM_HEADER),
+        items=int(_request_value(request, ITEMS_HEADER, 1)),
+        deferrals=get_deferrals(request) + (1 if deferred else 0)
+    )
+    return {'headers': options['headers']}
+
+
+def should_defer(request) -> bool:
+    """
+    Check whether the current task's firm is over its lane concurrency cap
+
+    Decided from the count ``record_started`` returned when this task
+    started: the increment is atomic, so tasks starting together each see a
+    distinct count and only those past the cap defer (re-reading the
+    counter would show every one of them the combined total).
+    """
+    lane = _request_value(request, LANE_HEADER)
+    inflight = getattr(request, INFLIGHT_ATTR, None)
+    if not lane or inflight is None:
+        return False
+    return TenantQueueTracker().is_over_capacity(lane, _request_value(request, FIRM_HEADER), inflight=inflight)
+
+
+def route_ai_task(name, args, kwargs, options, task=None, **kw):
+    """
+    Celery router placing AI tasks into the interactive or batch lane
+
+    Batch orchestration tasks and anything carrying a ``batch_id`` go to the
+    batch lane; everything else (single-document analysis) is interactive.
+    """
+    if not name.startswith('workers.ai_worker.'):
+        return None
+
+    args = args or ()
+    kwargs = kwargs or {}
+    firm_index, batch_index = POSITIONAL_ARGS.get(name, (None, None))
+
+    firm_id = kwargs.get('firm_id')
+    if firm_id is None and firm_index is not None and len(args) > firm_index:
+        firm_id = args[firm_index]
+
+    batch_id = kwargs.get('batch_id')
+    if batch_id is None and batch_index is not None and len(args) > batch_index:
+        batch_id = args[batch_index]
+
+    lane = BATCH_LANE if name in BATCH_TASKS or batch_id else INTERACTIVE_LANE
+    return fair_options(lane, firm_id)
+
+
+def get_broker_queue_depths() -> Dict[str, int]:
+    """
+    Get the broker-side length of every lane shard queue
+
+    Only supported for the Redis transport (queues are Redis lists).
+    """
+    from ..celery_app import celery_app
+
+    depths = {}
+    try:
+        with celery_app.connection_for_read() as connection:
+            client = connection.default_channel.client
+            for queue_name in lane_queue_names():
+                depths[queue_name] = client.llen(queue_name)
+    except Exception as e:
+        logger.warning(f"Failed to read broker queue depths: {e}")
+    return depths
+
+
+@before_task_publish.connect
+def _track_published(sender=None, headers=None, **kwargs):
+    """Count messages published into a lane as pending for their firm"""
+    headers = headers or {}
+    lane = headers.get(LANE_HEADER)
+    if lane:
+        TenantQueueTracker().record_enqueued(lane, headers.get(FIRM_HEADER), int(headers.get(ITEMS_HEADER) or 1))
+
+
+@task_prerun.connect
+def _track_started(sender=None, task=None, **kwargs):
+    """Move a lane message from pending to in-flight"""
+    request = getattr(task, 'request', None)
+    lane = _request_value(request, LANE_HEADER)
+    if lane:
+        inflight = TenantQueueTracker().record_started(
+            lane, _request_value(request, FIRM_HEADER), int(_request_value(request, ITEMS_HEADER, 1))
+        )
+        setattr(request, INFLIGHT_ATTR, inflight)
+
+
+@task_postrun.connect
+def _track_finished(sender=None, task=None, **kwargs):
+    """Release the in-flight slot held by a lane message"""
+    request = getattr(task, 'request', None)
+    lane = _request_value(request, LANE_HEADER)
+    if lane:
+        TenantQueueTracker().record_finished(lane, _request_value(request, FIRM_HEADER))
@@ -7,7 +7,9 @@ import logging
 from datetime import datetime
 from typing import Dict, Any, Optional
 
+from celery import chord
 from ..celery_app import celery_app
+from .batching import build_fanout_signatures, flatten_chord_results
 from src.shared.events.publisher import publish_event
 from src.shared.events.schemas import ErrorEvent
 
@@ -251,64 +253,68 @@ def send_bulk_notifications(notification_list: list) -> Dict[str, Any]:
     try:
         logger.info(f"Sending {len(notification_list)} bulk notifications")
         
-        successful_sends = 0
-        failed_sends = 0
-        results = []
+        email_args = []
+        reminder_args = []
+        invalid_results = []
         
         for notification in notification_list:
             try:
                 notification_type = notification.get('type', 'email')
                 
                 if notification_type == 'email':
-                    result = send_email.apply_async(
-                        args=[
-                            notification['to_address'],
-                            notification['subject'],
-                            notification['body']
-                        ],
-                        kwargs={
-                            'html_body': notification.get('html_body'),
-                            'firm_id': notification.get('firm_id')
-                        }
-                    ).get()
+                    email_args.append((
+                        notification['to_address'],
+                        notification['subject'],
+                        notification['body'],
+                        notification.get('html_body'),
+                        notification.get('firm_id')
+                    ))
                     
                 elif notification_type == 'task_reminder':
-                    result = send_task_reminder.apply_async(
-                        args=[
-                            notification['task_id'],
-                            notification['user_id'],
-                            notification.get('reminder_type', 'due_soon')
-                        ]
-                    ).get()
+                    reminder_args.append((
+                        notification['task_id'],
+                        notification['user_id'],
+                        notification.get('reminder_type', 'due_soon')
+                    ))
                     
                 else:
-                    result = {'success': False, 'error': f'Unknown notification type: {notification_type}'}
-                
-                if result.get('success'):
-                    successful_sends += 1
-                else:
-                    failed_sends += 1
-                
-                results.append(result)
+                    invalid_results.append({'success': False, 'error': f'Unknown notification type: {notification_type}'})
                 
             except Exception as e:
-                logger.warning(f"Failed to send notification: {e}")
-                failed_sends += 1
-                results.append({
+                logger.warning(f"Invalid notification skipped: {e}")
+                invalid_results.append({
                     'success': False,
                     'error': str(e),
                     'notification': notification
                 })
         
-        logger.info(f"Bulk notification completed: {successful_sends} successful, {failed_sends} failed")
+        # Fan out the sends and fan in with a chord callback instead of
+        # blocking this worker on .get() for every notification
+        header = (
+            build_fanout_signatures(send_email, email_args) +
+            build_fanout_signatures(send_task_reminder, reminder_args)
+        )
+        callback = aggregate_notification_results.s(
+            total_notifications=len(notification_list),
+            invalid_results=invalid_results
+        )
+        
+        if header:
+            chord_id = chord(header)(callback).id
+        else:
+            chord_id = None
+            callback.apply_async(args=[[]])
+        
+        logger.info(f"Queued {len(header)} bulk notification messages, {len(invalid_results)} invalid")
         
         return {
             'success': True,
+            'status': 'queued',
             'total_notifications': len(notification_list),
-            'successful_sends': successful_sends,
-            'failed_sends': failed_sends,
-            'results': results,
-            'completed_at': datetime.utcnow().isoformat()
+            'queued_notifications': len(email_args) + len(reminder_args),
+            'invalid_notifications': len(invalid_results),
+            'chord_id': chord_id,
+            'queued_at': datetime.utcnow().isoformat()
         }
         
     except Exception as e:
@@ -331,3 +337,33 @@ def send_bulk_notifications(notification_list: list) -> Dict[str, Any]:
             'error': str(e),
             'timestamp': datetime.utcnow().isoformat()
         }
+
+
+@celery_app.task(name='workers.notification_worker.aggregate_notification_results')
+def aggregate_notification_results(results: list, total_notifications: int,
+                                   invalid_results: Optional[list] = None) -> Dict[str, Any]:
+    """
+    Chord callback that fans in bulk notification results
+    
+    Args:
+        results: Header results (one dict per notification, or one list per chunk)
+        total_notifications: Number of notifications originally requested
+        invalid_results: Results for notifications rejected before dispatch
+        
+    Returns:
+        dict: Bulk send results
+    """
+    all_results = flatten_chord_results(results) + list(invalid_results or [])
+    successful_sends = sum(1 for r in all_results if isinstance(r, dict) and r.get('success'))
+    failed_sends = len(all_results) - successful_sends
+    
+    logger.info(f"Bulk notification completed: {successful_sends} successful, {failed_sends} failed")
+    
+    return {
+        'success': True,
+        'total_notifications': total_notifications,
+        'successful_sends': successful_sends,
+        'failed_sends': failed_sends,
+        'results': all_results,
+        'completed_at': datetime.utcnow().isoformat()
+    }
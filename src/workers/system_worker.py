@@ -5,6 +5,7 @@ Background tasks for system maintenance and periodic operations.
 
 import logging
 from datetime import datetime, timedelta
+from pathlib import Path
 from typing import Dict, Any
 
 from ..celery_app import celery_app
@@ -123,45 +124,13 @@ def cleanup_old_events() -> Dict[str, Any]:
                 'timestamp': datetime.utcnow().isoformat()
             }
         
-        # Clean up old event metadata (older than 7 days)
-        cutoff_date = datetime.utcnow() - timedelta(days=7)
-        cutoff_str = cutoff_date.strftime('%Y-%m-%d')
-        
-        # Clean up old event counters
-        counter_pattern = f"event_counter:*"
-        deleted_counters = 0
-        
-        for key in client.scan_iter(match=counter_pattern):
-            key_str = key.decode('utf-8') if isinstance(key, bytes) else key
-            # Extract date from key (format: event_counter:EventType:YYYY-MM-DD)
-            parts = key_str.split(':')
-            if len(parts) >= 3:
-                key_date = parts[2]
-                if key_date < cutoff_str:
-                    client.delete(key)
-                    deleted_counters += 1
-        
-        # Clean up old event metadata
-        metadata_pattern = f"event_metadata:*"
-        deleted_metadata = 0
-        
-        for key in client.scan_iter(match=metadata_pattern):
-            # Check if key has expired naturally first
-            ttl = client.ttl(key)
-            if ttl == -1:  # No expiration set, manually check age
-                try:
-                    metadata = client.get(key)
-                    if metadata:
-                        import json
-                        data = json.loads(metadata)
-                        published_at = datetime.fromisoformat(data.get('published_at', ''))
-                        if published_at < cutoff_date:
-                            client.delete(key)
-                            deleted_metadata += 1
-                except (json.JSONDecodeError, ValueError, KeyError):
-                    # If we can't parse the metadata, delete it
-                    client.delete(key)
-                    deleted_metadata += 1
+        from src.shared.events.publisher import EVENT_COUNTS_RETENTION_DAYS, delete_expired_telemetry
+        
+        # Telemetry buckets expire natively; only delete stale buckets that lost
+        # their TTL - O(buckets) deletes by name instead of scanning the keyspace
+        now = datetime.utcnow()
+        cutoff_str = (now - timedelta(days=EVENT_COUNTS_RETENTION_DAYS)).strftime('%Y-%m-%d')
+        deleted_counters, deleted_metadata = delete_expired_telemetry(client, now)
         
         logger.info(f"Cleaned up {deleted_counters} old event counters and {deleted_metadata} old metadata entries")
         
@@ -191,6 +160,98 @@ def cleanup_old_events() -> Dict[str, Any]:
         }
 
 
+@celery_app.task(name='workers.system_worker.flush_activity_log')
+def flush_activity_log() -> Dict[str, Any]:
+    """
+    Write activity log rows queued by ACTIVITY_LOG_WRITER=background
+    
+    Returns:
+        dict: Number of rows written
+    """
+    try:
+        from src.shared.services.activity_buffer import activity_buffer
+        
+        written = activity_buffer.drain_queue()
+        if written:
+            logger.info(f"Wrote {written} queued activity log rows")
+        
+        return {
+            'success': True,
+            'written': written,
+            'timestamp': datetime.utcnow().isoformat()
+        }
+        
+    except Exception as e:
+        logger.error(f"Error writing queued activity log rows: {e}")
+        return {
+            'success': False,
+            'error': str(e),
+            'timestamp': datetime.utcnow().isoformat()
+        }
+
+
+@celery_app.task(name='workers.system_worker.maintain_activity_log')
+def maintain_activity_log() -> Dict[str, Any]:
+    """
+    Create upcoming activity log partitions, rotate hot rows into month
+    shards (SQLite) and archive months past the retention window
+    
+    Returns:
+        dict: Partitions created, rows rotated and months archived
+    """
+    try:
+        from src.shared.database.activity_storage import activity_storage
+        
+        result = activity_storage.maintain()
+        for archived in result['archived']:
+            logger.info(f"Archived {archived['rows']} activity log rows for {archived['month']}")
+        
+        return {
+            'success': True,
+            **result,
+            'timestamp': datetime.utcnow().isoformat()
+        }
+        
+    except Exception as e:
+        logger.error(f"Error maintaining activity log storage: {e}")
+        return {
+            'success': False,
+            'error': str(e),
+            'timestamp': datetime.utcnow().isoformat()
+        }
+
+
+@celery_app.task(name='workers.system_worker.repair_project_progress')
+def repair_project_progress() -> Dict[str, Any]:
+    """
+    Recompute project task counters from the task table and report drift
+    
+    Returns:
+        dict: Projects that had drifted and how many were repaired
+    """
+    try:
+        from src.modules.project.progress import repair
+        
+        result = repair()
+        if result['drifted']:
+            logger.warning(f"Repaired task counters on {result['repaired']} projects")
+        
+        return {
+            'success': True,
+            'drifted': result['drifted'],
+            'repaired': result['repaired'],
+            'timestamp': datetime.utcnow().isoformat()
+        }
+        
+    except Exception as e:
+        logger.error(f"Error repairing project progress: {e}")
+        return {
+            'success': False,
+            'error': str(e),
+            'timestamp': datetime.utcnow().isoformat()
+        }
+
+
 @celery_app.task(name='workers.system_worker.system_health_check')
 def system_health_check() -> Dict[str, Any]:
     """
@@ -211,11 +272,15 @@ def system_health_check() -> Dict[str, Any]:
         # Check event system health
         event_health = _check_event_system_health()
         
+        # Check lane/tenant queue depths
+        queue_health = _check_queue_health()
+        
         # Overall status
         overall_status = 'healthy'
-        if any(check['status'] == 'error' for check in [db_health, redis_health, event_health]):
+        checks = [db_health, redis_health, event_health, queue_health]
+        if any(check['status'] == 'error' for check in checks):
             overall_status = 'error'
-        elif any(check['status'] == 'warning' for check in [db_health, redis_health, event_health]):
+        elif any(check['status'] == 'warning' for check in checks):
             overall_status = 'warning'
         
         # Publish health check event
@@ -225,7 +290,8 @@ def system_health_check() -> Dict[str, Any]:
             metrics={
                 'database': db_health,
                 'redis': redis_health,
-                'events': event_health
+                'events': event_health,
+                'queues': queue_health
             },
             check_time=datetime.utcnow()
         )
@@ -239,7 +305,8 @@ def system_health_check() -> Dict[str, Any]:
             'components': {
                 'database': db_health,
                 'redis': redis_health,
-                'events': event_health
+                'events': event_health,
+                'queues': queue_health
             },
             'timestamp': datetime.utcnow().isoformat()
         }
@@ -314,6 +381,28 @@ def _check_redis_health() -> Dict[str, Any]:
         }
 
 
+def _check_queue_health() -> Dict[str, Any]:
+    """Check AI lane queue depths per shard and per firm"""
+    try:
+        from src.shared.utils.tenant_queues import TenantQueueTracker
+        from .fair_routing import get_broker_queue_depths
+        
+        tenant_depths = TenantQueueTracker().get_depths()
+        
+        return {
+            'status': 'healthy' if tenant_depths.get('success') else 'warning',
+            'broker_queues': get_broker_queue_depths(),
+            'lanes': tenant_depths.get('lanes', {})
+        }
+        
+    except Exception as e:
+        return {
+            'status': 'error',
+            'error': str(e),
+            'message': 'Queue depth check failed'
+        }
+
+
 def _check_event_system_health() -> Dict[str, Any]:
     """Check event system health"""
     try:
@@ -363,46 +452,33 @@ def backup_database() -> Dict[str, Any]:
     try:
         logger.info("Starting database backup")
         
-        import os
-        import shutil
-        from pathlib import Path
-        
-        # Source database path
-        db_path = Path('instance/workflow.db')
-        if not db_path.exists():
-            raise FileNotFoundError("Database file not found")
-        
-        # Create backup directory
-        backup_dir = Path('backups')
-        backup_dir.mkdir(exist_ok=True)
-        
-        # Create backup filename with timestamp
-        timestamp = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
-        backup_filename = f"workflow_backup_{timestamp}.db"
-        backup_path = backup_dir / backup_filename
-        
-        # Copy database file
-        shutil.copy2(db_path, backup_path)
+        from src.shared.database.backup import BackupManager
         
-        # Get file size
-        file_size = backup_path.stat().st_size
+        # Online, deduplicated snapshot (SQLite backup API or pg_dump stream)
+        manager = BackupManager()
+        result = manager.create_backup()
+        retention = manager.apply_retention()
         
         # Publish backup event
         from src.shared.events.schemas import BackupCreatedEvent
         backup_event = BackupCreatedEvent(
-            backup_id=backup_filename,
-            backup_type='database',
-            file_size_bytes=file_size,
-            backup_location=str(backup_path.absolute())
+            backup_id=result['backup_id'],
+            backup_type=manager.source.source_type,
+            file_size_bytes=result['size_bytes'],
+            backup_location=str(Path(result['manifest']).absolute()),
+            metrics=result['metrics']
         )
         publish_event(backup_event)
         
-        logger.info(f"Database backup created: {backup_path}")
+        logger.info(f"Database backup created: {result['backup_id']} ({result['metrics']})")
         
         return {
             'success': True,
-            'backup_file': str(backup_path),
-            'file_size_bytes': file_size,
+            'backup_id': result['backup_id'],
+            'backup_file': result['manifest'],
+            'file_size_bytes': result['size_bytes'],
+            'metrics': result['metrics'],
+            'retention': retention,
             'timestamp': datetime.utcnow().isoformat()
         }
         
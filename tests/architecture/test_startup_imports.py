@@ -0,0 +1,65 @@
+"""
+Test Startup Imports
+
+Verifies that cold start stays lazy: module packages do not import their
+routes, AI provider SDKs are not imported until a provider is created, and
+the app factory's imports stay within a time budget. Each check runs in a
+fresh interpreter under ``python -X importtime``; the app factory report is
+written to $TEST_ARTIFACTS_DIR (default: the temp directory).
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..')
+sys.path.insert(0, ROOT)
+
+from src.shared.utils.import_profile import profile_imports, summarize
+
+# Milliseconds of cumulative import time allowed for create_app()
+STARTUP_IMPORT_BUDGET_MS = float(os.environ.get('STARTUP_IMPORT_BUDGET_MS', 2500))
+
+MODULE_PACKAGES = ['auth', 'admin', 'dashboard', 'project', 'client', 'document', 'export']
+
+
+def _profile(statement):
+    pythonpath = os.pathsep.join([ROOT, os.path.join(ROOT, 'src')])
+    return profile_imports(statement, cwd=ROOT, env={'PYTHONPATH': pythonpath})
+
+
+class TestStartupImports(unittest.TestCase):
+    """Test that importing the app's building blocks stays cheap"""
+
+    def test_module_packages_do_not_import_routes(self):
+        profile = _profile('; '.join(f'import src.modules.{name}' for name in MODULE_PACKAGES))
+        self.assertEqual(profile['returncode'], 0, profile['stderr'])
+
+        routes = sorted(module for module in profile['modules']
+                        if module.startswith('src.modules.') and module.endswith('routes'))
+        self.assertEqual(routes, [])
+
+    def test_ai_provider_sdks_load_on_first_use(self):
+        profile = _profile('import src.modules.document.ai_providers')
+        self.assertEqual(profile['returncode'], 0, profile['stderr'])
+
+        # find_spec may import the empty 'azure'/'azure.ai' namespace packages, nothing below them
+        sdks = sorted(module for module in profile['modules']
+                      if module.startswith(('azure.ai.documentintelligence', 'azure.core', 'google.genai')))
+        self.assertEqual(sdks, [])
+
+    def test_app_factory_import_budget(self):
+        profile = _profile('from src.app import create_app; create_app("testing")')
+
+        artifact_dir = os.environ.get('TEST_ARTIFACTS_DIR', tempfile.gettempdir())
+        os.makedirs(artifact_dir, exist_ok=True)
+        with open(os.path.join(artifact_dir, 'startup_importtime.txt'), 'w') as f:
+            f.write(summarize(profile, top=40))
+
+        self.assertEqual(profile['returncode'], 0, profile['stderr'])
+        self.assertLess(profile['import_ms'], STARTUP_IMPORT_BUDGET_MS, summarize(profile, top=15))
+
+
+if __name__ == '__main__':
+    unittest.main()
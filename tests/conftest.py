@@ -4,6 +4,7 @@ Production-ready test infrastructure with comprehensive mocking and performance
 """
 
 import pytest
+import queue
 import tempfile
 import os
 import sys
@@ -37,10 +38,13 @@ def app():
     # Initialize database
     db.init_app(app)
     
+    # Tests push their own context (app_context fixture), so none is left open between them
     with app.app_context():
+        _enable_sqlite_savepoints(db.engine)
         db.create_all()
         _create_test_data()
-        yield app
+    yield app
+    with app.app_context():
         db.drop_all()
 
 
@@ -57,19 +61,37 @@ def client(app):
     return app.test_client()
 
 
+def _enable_sqlite_savepoints(engine):
+    """Let SQLAlchemy emit BEGIN itself, so SAVEPOINTs nest inside the test transaction"""
+    from sqlalchemy import event
+    
+    @event.listens_for(engine, "connect")
+    def disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+    
+    @event.listens_for(engine, "begin")
+    def begin_transaction(connection):
+        connection.exec_driver_sql("BEGIN")
+
+
 @pytest.fixture(scope="function")
 def db_session(app_context):
     """Provide database session with automatic rollback."""
     connection = db.engine.connect()
     transaction = connection.begin()
+    options = dict(db.session.session_factory.kw)
     
-    # Configure session to use this connection
-    db.session.configure(bind=connection)
+    # Commits and rollbacks in the test only release or roll back savepoints
+    db.session.configure(bind=connection, join_transaction_mode="create_savepoint")
     
-    yield db.session
+    # Flask-SQLAlchemy picks the app's engine over a configured bind
+    session_class = db.session.session_factory.class_
+    with patch.object(session_class, 'get_bind', lambda session, *args, **kwargs: connection):
+        yield db.session
+        db.session.remove()
     
     # Rollback transaction and close connection
-    db.session.remove()
+    db.session.session_factory.kw = options
     transaction.rollback()
     connection.close()
 
@@ -112,10 +134,177 @@ def mock_redis():
     mock_redis.delete.return_value = True
     mock_redis.publish.return_value = 1
     
-    with patch('core.redis_client.redis_client', mock_redis):
+    with patch('src.shared.database.redis_client.redis_client', mock_redis):
         yield mock_redis
 
 
+class FakePubSub:
+    """Subscription on a FakeRedis; published messages arrive through get_message()"""
+    
+    def __init__(self, redis):
+        self.redis = redis
+        self.messages = queue.Queue()
+    
+    def subscribe(self, *channels):
+        for channel in channels:
+            self.redis.subscribers.setdefault(channel, []).append(self)
+    
+    def get_message(self, timeout=None):
+        try:
+            return self.messages.get(timeout=min(timeout or 0, 0.01))
+        except queue.Empty:
+            return None
+    
+    def close(self):
+        for subscribers in self.redis.subscribers.values():
+            if self in subscribers:
+                subscribers.remove(self)
+
+
+class FakePipeline:
+    """Queues commands and applies them to the FakeRedis on execute()"""
+    
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+    
+    def __getattr__(self, name):
+        command = getattr(self.redis, name)
+        
+        def queue_command(*args, **kwargs):
+            self.commands.append((command, args, kwargs))
+            return self
+        return queue_command
+    
+    def execute(self):
+        commands, self.commands = self.commands, []
+        return [command(*args, **kwargs) for command, args, kwargs in commands]
+
+
+class FakeRedis:
+    """
+    In-memory stand-in for the raw ``decode_responses=True`` client
+    
+    Strings, hashes, lists and streams all live in ``data`` keyed by Redis
+    key; TTLs are recorded in ``ttls`` but never expire anything.
+    """
+    
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+        self.subscribers = {}
+        self.stream_sequence = 0
+    
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+    
+    def expire(self, key, seconds):
+        self.ttls[key] = seconds
+        return key in self.data
+    
+    def delete(self, *keys):
+        return sum(1 for key in keys if self.data.pop(key, None) is not None)
+    
+    # Strings
+    def get(self, key):
+        return self.data.get(key)
+    
+    def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+    
+    def set(self, key, value, ex=None):
+        self.data[key] = str(value)
+        if ex is not None:
+            self.ttls[key] = ex
+        return True
+    
+    # Hashes
+    def hset(self, key, field=None, value=None, mapping=None):
+        values = self.data.setdefault(key, {})
+        updates = dict(mapping or {})
+        if field is not None:
+            updates[field] = value
+        values.update({name: str(item) for name, item in updates.items()})
+        return len(updates)
+    
+    def hget(self, key, field):
+        return self.data.get(key, {}).get(field)
+    
+    def hgetall(self, key):
+        return dict(self.data.get(key, {}))
+    
+    def hincrby(self, key, field, amount=1):
+        values = self.data.setdefault(key, {})
+        values[field] = str(int(values.get(field, 0)) + amount)
+        return int(values[field])
+    
+    # Lists
+    def rpush(self, key, *values):
+        items = self.data.setdefault(key, [])
+        items.extend(values)
+        return len(items)
+    
+    def lpush(self, key, *values):
+        items = self.data.setdefault(key, [])
+        items[:0] = reversed(values)
+        return len(items)
+    
+    def lrange(self, key, start, end):
+        items = self.data.get(key, [])
+        return list(items[start:] if end == -1 else items[start:end + 1])
+    
+    def ltrim(self, key, start, end):
+        items = self.data.get(key, [])
+        self.data[key] = list(items[start:] if end == -1 else items[start:end + 1])
+        return True
+    
+    # Streams
+    def xadd(self, key, fields, maxlen=None, approximate=False):
+        self.stream_sequence += 1
+        entry_id = f"{1700000000000 + self.stream_sequence}-0"
+        self.data.setdefault(key, []).append((entry_id, {name: str(value) for name, value in fields.items()}))
+        return entry_id
+    
+    def xrevrange(self, key, count=None):
+        return list(reversed(self.data.get(key, [])))[:count]
+    
+    # Pub/sub
+    def pubsub(self, ignore_subscribe_messages=False):
+        return FakePubSub(self)
+    
+    def publish(self, channel, message):
+        subscribers = list(self.subscribers.get(channel, []))
+        for subscriber in subscribers:
+            subscriber.messages.put({'type': 'message', 'channel': channel, 'data': message})
+        return len(subscribers)
+
+
+class FakeRedisClient:
+    """Stand-in for the RedisClient wrapper, holding a FakeRedis as ``client``"""
+    
+    def __init__(self, available=True):
+        self.client = FakeRedis()
+        self.available = available
+    
+    def is_available(self):
+        return self.available
+    
+    def get_client(self):
+        return self.client
+    
+    def publish(self, channel, message):
+        self.client.publish(channel, message)
+        return True
+
+
+@pytest.fixture(scope="function")
+def fake_redis():
+    """In-memory Redis installed as the global client; ``fake_redis.client`` is the raw client."""
+    fake = FakeRedisClient()
+    with patch('src.shared.database.redis_client.redis_client', fake):
+        yield fake
+
+
 @pytest.fixture(scope="function")
 def mock_ai_services():
     """Mock AI services for testing without external dependencies."""
@@ -223,7 +412,7 @@ def _create_test_data():
     
     # Create checklist item
     test_checklist_item = ChecklistItem(
-        title="W-2 Forms",
+        item_name="W-2 Forms",
         description="Employee W-2 tax forms",
         checklist_id=test_checklist.id,
         status="pending"
@@ -3,7 +3,9 @@ Comprehensive Page Load Tests for CPA WorkflowPilot
 Tests that all major pages load without errors after architectural refactoring.
 """
 
+import json
 import pytest
+from contextlib import contextmanager
 from flask import Flask
 from datetime import datetime, date
 import os
@@ -15,6 +17,38 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../.
 from app import create_app
 from src.shared.database.db_import import db
 from src.models import User, Firm, Client, Project, Task, WorkType
+from src.shared.database.query_profiler import profile_queries
+
+# Most statements a page may run against the test data (measured on SQLite,
+# without Redis, so cached views count their miss). Pages that list rows
+# should stay flat as rows are added; lazy loads per row show up as repeated
+# fingerprints and fail the N+1 check regardless of the count.
+QUERY_BUDGETS = {
+    '/dashboard': 15,
+    '/tasks/': 5,
+    '/projects/': 3,
+    '/clients/': 1,
+    '/contacts/': 1,
+    '/users/': 1,
+    '/checklists': 2,
+    '/uploaded-documents': 1,
+    '/calendar': 1,
+    '/kanban': 3,
+    '/reports/time-tracking': 0,  # placeholder report, no queries yet
+}
+
+
+@pytest.fixture
+def query_budget():
+    """Fail when the block runs more statements than its budget, or repeats one (likely N+1)"""
+    @contextmanager
+    def within(budget, label=''):
+        with profile_queries(label) as profile:
+            yield profile
+        summary = json.dumps(profile.to_dict(), indent=2)
+        assert profile.count <= budget, f'{label}: {profile.count} queries exceeds budget of {budget}\n{summary}'
+        assert not profile.n_plus_one(), f'{label}: repeated statements (likely N+1)\n{summary}'
+    return within
 
 
 class TestPageLoads:
@@ -23,7 +57,7 @@ class TestPageLoads:
     @pytest.fixture(scope='class')
     def app(self):
         """Create test Flask app"""
-        app = create_app()
+        app = create_app('testing')
         app.config['TESTING'] = True
         app.config['WTF_CSRF_ENABLED'] = False
         app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
@@ -58,7 +92,7 @@ class TestPageLoads:
             db.session.add(firm)
             
             # Create test user
-            user = User(id=1, name='Test User', role='Admin', firm_id=1, is_active=True)
+            user = User(id=1, name='Test User', role='Admin', firm_id=1)
             db.session.add(user)
             
             # Create test client
@@ -74,7 +108,6 @@ class TestPageLoads:
                 id=1, 
                 name='Test Project',
                 client_id=1,
-                client_name='Test Client',
                 firm_id=1,
                 status='Active',
                 start_date=date.today(),
@@ -234,6 +267,14 @@ class TestPageLoads:
         response = auth_session.get('/admin/templates')
         assert response.status_code == 200
 
+    # Query budgets
+    @pytest.mark.parametrize('path,budget', sorted(QUERY_BUDGETS.items()))
+    def test_page_stays_within_query_budget(self, auth_session, query_budget, path, budget):
+        """Test page loads run a bounded number of queries and no N+1 patterns"""
+        with query_budget(budget, label=path):
+            response = auth_session.get(path)
+        assert response.status_code == 200
+
 
 class TestPageLoadPerformance:
     """Performance tests for page loading"""
@@ -0,0 +1,158 @@
+"""
+Unit tests for hashed, cached access code lookups and failed-attempt throttling.
+Tests hash matching, cached hits and misses, and the per-IP token bucket.
+"""
+
+import time
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import event
+
+from src.shared.database.db_import import db
+from src.shared.utils.access_codes import (
+    FailedAttemptThrottle, access_code_cache, hash_access_code
+)
+from src.models.auth import Firm
+from src.modules.auth.firm_repository import FirmRepository
+from src.modules.auth.models import ClientUser
+from src.modules.client.models import Client
+from src.modules.client.portal_service import PortalService
+from src.modules.document.models import DocumentChecklist
+from src.modules.document.repository import DocumentRepository
+
+
+@pytest.fixture
+def code_cache():
+    access_code_cache.clear()
+    yield access_code_cache
+    access_code_cache.clear()
+
+
+@pytest.fixture
+def firms(db_session, code_cache):
+    """An active and a closed firm."""
+    firms = [Firm(name='Acme CPA', access_code='ACME'),
+             Firm(name='Closed CPA', access_code='CLOSED', is_active=False)]
+    db_session.add_all(firms)
+    db_session.commit()
+    return firms
+
+
+@pytest.fixture
+def checklist(db_session, test_user, firms):
+    """Publicly shared checklist of a client with a portal login."""
+    client = Client(name='Globex', firm_id=firms[0].id)
+    db_session.add(client)
+    db_session.flush()
+    db_session.add(ClientUser(client_id=client.id, email='ap@globex.test', access_code='GLOBEX01'))
+    checklist = DocumentChecklist(client_id=client.id, name='2024 Return', created_by=test_user.id,
+                                  public_access_token='share-token', public_access_enabled=True)
+    db_session.add(checklist)
+    db_session.commit()
+    return checklist
+
+
+@pytest.fixture
+def repository():
+    return FirmRepository()
+
+
+def count_selects(func):
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db.engine, 'before_cursor_execute', listener)
+    try:
+        result = func()
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', listener)
+    return result, [statement for statement in statements if statement.startswith('SELECT')]
+
+
+class TestAccessCodeLookup:
+    """Test that codes are matched by hash and repeated lookups skip the database."""
+
+    def test_hash_columns_follow_assignments(self, db_session, repository, firms, checklist):
+        """Test that hash columns track code changes and lookups follow them."""
+        firm = firms[0]
+        assert firm.access_code_hash == hash_access_code('ACME')
+        assert firm.access_code_hash != 'ACME'
+        assert checklist.access_token_hash == hash_access_code('share-token')
+
+        firm.access_code = 'ACME2'
+        db_session.commit()
+        assert repository.get_by_access_code('ACME') is None
+        assert repository.get_by_access_code('ACME2').id == firm.id
+
+    def test_misses_are_cached(self, db_session, repository, code_cache):
+        """Test that an unknown code is looked up once, by hash only."""
+        _, first = count_selects(lambda: repository.get_by_access_code('NOPE'))
+        _, second = count_selects(lambda: repository.get_by_access_code('NOPE'))
+        assert len(first) == 1
+        assert second == []
+        assert 'NOPE' not in ' '.join(first)
+
+    def test_active_and_enabled_flags_still_apply(self, repository, firms, checklist):
+        """Test that closed firms and disabled shares are not matched."""
+        assert repository.get_by_access_code('CLOSED') is None
+        assert repository.get_by_access_code('CLOSED', active_only=False).id == firms[1].id
+
+        documents = DocumentRepository()
+        assert documents.get_checklist_by_token('share-token').id == checklist.id
+        checklist.public_access_enabled = False
+        assert documents.get_checklist_by_token('share-token') is None
+
+    def test_client_portal_login_uses_hashed_code(self, checklist):
+        """Test that portal logins match the hashed client code."""
+        service = PortalService()
+        assert service.authenticate_client(' GLOBEX01 ')['success']
+        assert not service.authenticate_client('GLOBEX02')['success']
+
+
+class TestFailedAttemptThrottle:
+    """Test the per-IP token bucket."""
+
+    def test_burst_then_refuse(self):
+        """Test that failures past the burst are refused until reset."""
+        throttle = FailedAttemptThrottle(burst=3, refill_seconds=60)
+        for _ in range(3):
+            assert throttle.allow('10.0.0.1')
+            throttle.record_failure('10.0.0.1')
+
+        assert not throttle.allow('10.0.0.1')
+        assert throttle.retry_after('10.0.0.1') > 0
+        assert throttle.allow('10.0.0.2')
+
+        throttle.reset('10.0.0.1')
+        assert throttle.allow('10.0.0.1')
+
+    def test_tokens_refill(self):
+        """Test that spent tokens come back over time."""
+        throttle = FailedAttemptThrottle(burst=1, refill_seconds=0.01)
+        throttle.record_failure('10.0.0.1')
+        assert not throttle.allow('10.0.0.1')
+
+        time.sleep(0.02)
+        assert throttle.allow('10.0.0.1')
+
+
+class TestThrottleClientAddress:
+    """Test that the throttle key is the forwarded client address behind trusted proxies."""
+
+    def client_address(self, proxy_hops):
+        from src.app import create_app
+        from src.config import TestingConfig
+
+        with patch.object(TestingConfig, 'PROXY_FIX_X_FOR', proxy_hops):
+            app = create_app('testing')
+        with patch('src.modules.auth.routes.access_code_throttle') as throttle:
+            throttle.allow.return_value = False
+            app.test_client().post('/authenticate', environ_base={'REMOTE_ADDR': '10.0.0.2'},
+                                   headers={'X-Forwarded-For': '198.51.100.1, 203.0.113.9'})
+        return throttle.allow.call_args[0][0]
+
+    def test_forwarded_address_is_trusted_only_for_configured_hops(self):
+        """Test that only the configured number of proxy hops is trusted."""
+        assert self.client_address(0) == '10.0.0.2'
+        assert self.client_address(1) == '203.0.113.9'
+        assert self.client_address(2) == '198.51.100.1'
@@ -0,0 +1,180 @@
+"""
+Unit tests for the commit-time activity log buffer.
+Tests that buffered rows follow the session's commit or rollback, the
+end-of-request flush and the cached user-to-firm lookup.
+"""
+
+import pytest
+from unittest.mock import patch
+
+from celery.signals import task_postrun
+from flask import Flask
+
+from src.shared.database.db_import import db
+from src.models.auth import ActivityLog, Firm, User
+from src.shared.services import activity_buffer as activity_buffer_module
+from src.shared.services.activity_buffer import (
+    ActivityBuffer, ACTIVITY_QUEUE_KEY, init_activity_buffer, user_firm_cache
+)
+
+
+class RecordingBuffer(ActivityBuffer):
+    """Records the bulk inserts instead of writing ActivityLog rows"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.inserts = []
+
+    def _insert(self, session, rows):
+        self.inserts.append(rows)
+
+
+@pytest.fixture
+def without_global_buffer():
+    """create_app installs the global buffer on the shared session; keep it out of these tests."""
+    global_buffer = activity_buffer_module.activity_buffer
+    installed_on = global_buffer._installed_on
+    global_buffer.uninstall()
+    yield
+    if installed_on is not None:
+        global_buffer.install(installed_on)
+
+
+@pytest.fixture
+def make_buffer(without_global_buffer):
+    buffers = []
+
+    def make_buffer(**kwargs):
+        buffer = RecordingBuffer(**kwargs)
+        buffers.append(buffer)
+        return buffer
+
+    yield make_buffer
+    for buffer in buffers:
+        buffer.uninstall()
+
+
+@pytest.fixture
+def file_db_app(tmp_path, without_global_buffer):
+    """App on a file database: the flush writes on a connection of its own."""
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + str(tmp_path / 'activity.db')
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def firm_cache():
+    user_firm_cache.invalidate()
+    yield user_firm_cache
+    user_firm_cache.invalidate()
+
+
+class TestActivityBuffer:
+    """Test that buffered rows follow the session's commit or rollback."""
+
+    def test_rows_are_written_in_one_insert_on_commit(self, db_session, make_buffer):
+        """Test that rows logged in a transaction go out in one insert on commit."""
+        buffer = make_buffer(writer='inline')
+        buffer.append('CREATE TASK', user_id=1, task_id=7)
+        buffer.append('UPDATE TASK', user_id=1, task_id=7)
+        assert buffer.inserts == []
+
+        db_session.commit()
+        assert len(buffer.inserts) == 1
+        assert [row['action'] for row in buffer.inserts[0]] == ['CREATE TASK', 'UPDATE TASK']
+
+        db_session.commit()
+        assert len(buffer.inserts) == 1
+
+    def test_rows_are_dropped_on_rollback(self, db_session, make_buffer):
+        """Test that a rollback discards the buffered rows."""
+        buffer = make_buffer(writer='inline')
+        buffer.append('DELETE TASK', user_id=1)
+        db_session.rollback()
+        db_session.commit()
+
+        assert buffer.pending() == []
+        assert buffer.inserts == []
+
+    def test_background_writer_queues_rows_after_commit(self, db_session, fake_redis, make_buffer):
+        """Test that the background writer queues committed rows in Redis."""
+        buffer = make_buffer(writer='background')
+        buffer.append('CREATE PROJECT', user_id=2, project_id=3)
+        db_session.commit()
+
+        assert buffer.inserts == []
+        assert len(fake_redis.client.data[ACTIVITY_QUEUE_KEY]) == 1
+
+    def test_rows_logged_outside_a_request_are_flushed(self, app_context, make_buffer):
+        """Test that rows are flushed when an app context or Celery task ends."""
+        # init_activity_buffer registers teardown hooks, so it gets an app of its own
+        worker_app = Flask(__name__)
+        worker_app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+        db.init_app(worker_app)
+        buffer = make_buffer(writer='inline')
+        with patch.object(activity_buffer_module, 'activity_buffer', buffer):
+            init_activity_buffer(worker_app)
+
+            # A task or CLI command that ends its app context
+            with worker_app.app_context():
+                buffer.append('SYNC', user_id=1)
+            assert len(buffer.inserts) == 1
+
+            # A worker that keeps one app context: flushed after each task
+            buffer.append('RECUR', user_id=1)
+            task_postrun.send(sender=None, task=None)
+            assert [rows[0]['action'] for rows in buffer.inserts] == ['SYNC', 'RECUR']
+
+
+class TestActivityBufferFlush:
+    """Test that the end-of-request flush writes only the buffered rows."""
+
+    def test_flush_leaves_uncommitted_changes_alone(self, file_db_app):
+        """Test that the flush does not commit the request's own changes."""
+        buffer = ActivityBuffer(writer='inline')
+        try:
+            db.session.add(Firm(name='Never committed', access_code='NOPE'))
+            buffer.append('VIEW', user_id=1)
+
+            buffer.flush()
+            assert buffer.pending() == []
+            db.session.rollback()
+        finally:
+            buffer.uninstall()
+
+        assert Firm.query.count() == 0
+        assert [row.action for row in ActivityLog.query] == ['VIEW']
+
+
+class TestMembershipCache:
+    """Test that a user's cached firm is dropped when the change commits."""
+
+    def test_moved_and_deleted_users_are_forgotten(self, db_session, test_firm, firm_cache):
+        """Test that moving or deleting a user clears only that user's entry."""
+        other_firm = Firm(name='Globex CPA', access_code='GLOBEX')
+        dana = User(name='Dana', firm_id=test_firm.id)
+        sam = User(name='Sam', firm_id=test_firm.id)
+        db_session.add_all([other_firm, dana, sam])
+        db_session.commit()
+
+        assert firm_cache.get_firm_id(dana.id) == test_firm.id
+        assert firm_cache.get_firm_id(sam.id) == test_firm.id
+
+        dana.firm_id = other_firm.id
+        sam.name = 'Samira'
+        db_session.flush()
+        assert dana.id in firm_cache._entries
+        db_session.commit()
+        assert dana.id not in firm_cache._entries
+        assert sam.id in firm_cache._entries
+        assert firm_cache.get_firm_id(dana.id) == other_firm.id
+
+        sam_id = sam.id
+        db_session.delete(sam)
+        db_session.commit()
+        assert firm_cache.get_firm_id(sam_id) is None
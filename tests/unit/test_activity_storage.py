@@ -0,0 +1,116 @@
+"""
+Unit tests for month-sharded activity storage and daily rollups (SQLite).
+Tests shard rotation, cross-shard reads, archiving, retention and rollups.
+"""
+
+import gzip
+import json
+from datetime import date, datetime
+
+import pytest
+from flask import Flask
+
+from src.shared.database.db_import import db
+from src.models.auth import Firm, User, ActivityLog
+from src.shared.database.activity_storage import ActivityStorage, month_table
+from src.shared.services.activity_buffer import ActivityBuffer, user_firm_cache
+
+
+@pytest.fixture
+def storage_app():
+    """
+    App on a database of its own: maintenance rotates and drops shards on
+    separate connections and commits, which the shared rollback-only
+    session cannot contain.
+    """
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        db.session.add(Firm(id=1, name='Acme CPA', access_code='ACME'))
+        db.session.add(User(id=1, name='Dana', firm_id=1))
+        db.session.commit()
+        # User ids repeat across test databases
+        user_firm_cache.invalidate()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def storage(storage_app, tmp_path):
+    return ActivityStorage(db, archive_dir=str(tmp_path), retention_months=12)
+
+
+def add_activity(timestamp, action='UPDATE TASK', project_id=None):
+    db.session.execute(ActivityLog.__table__.insert(), [{
+        'action': action, 'timestamp': timestamp, 'user_id': 1, 'project_id': project_id
+    }])
+    db.session.commit()
+
+
+class TestActivityStorage:
+    """Test shard rotation, cross-shard reads, retention and rollups."""
+
+    def test_old_months_rotate_into_shards_and_stay_readable(self, storage):
+        """Test that rotated months are still read and summarized."""
+        add_activity(datetime(2024, 1, 10, 9), 'CREATE PROJECT', project_id=5)
+        add_activity(datetime(2024, 1, 20, 9), project_id=5)
+        add_activity(datetime(2024, 5, 2, 9), project_id=5)
+
+        result = storage.maintain(now=datetime(2024, 5, 15))
+        assert result['rows_rotated'] == 2
+        assert db.session.query(ActivityLog).count() == 1
+
+        activities = storage.recent(limit=10, firm_id=1, project_id=5)
+        assert [activity.timestamp.month for activity in activities] == [5, 1, 1]
+        assert activities[-1].user.name == 'Dana'
+
+        assert storage.rebuild_rollups() == 3
+        assert storage.summary(firm_id=1)['count'] == 3
+        assert storage.summary(user_id=1, since=date(2024, 2, 1))['count'] == 1
+
+    def test_expired_months_are_archived_and_dropped(self, storage, tmp_path):
+        """Test that months past retention are archived to gzip and dropped."""
+        add_activity(datetime(2023, 1, 5, 12), 'DELETE TASK')
+        storage.maintain(now=datetime(2024, 5, 15))
+
+        with gzip.open(tmp_path / f"{month_table((2023, 1))}.jsonl.gz", 'rt') as archive:
+            rows = [json.loads(line) for line in archive]
+        assert [row['action'] for row in rows] == ['DELETE TASK']
+        assert storage.recent(limit=10) == []
+
+    def test_rebuild_keeps_rollups_of_archived_months(self, storage):
+        """Test that rebuilding never drops rollups of archived months."""
+        rows = [{'action': 'UPDATE TASK', 'timestamp': timestamp, 'user_id': 1, 'project_id': None}
+                for timestamp in (datetime(2023, 1, 5, 12), datetime(2023, 1, 6, 12), datetime(2024, 5, 2, 9))]
+        db.session.execute(ActivityLog.__table__.insert(), rows)
+        storage.record_rollups(db.session, rows, lambda user_id: 1)
+        db.session.commit()
+        storage.maintain(now=datetime(2024, 5, 15))
+        assert storage.summary(firm_id=1)['count'] == 3
+
+        # January 2023 only survives in the rollup; neither call may touch it
+        storage.rebuild_rollups()
+        storage.rebuild_rollups(start=date(2023, 1, 1))
+        assert storage.summary(firm_id=1)['count'] == 3
+
+        db.session.query(ActivityLog).delete()
+        db.session.commit()
+        storage.rebuild_rollups()
+        assert storage.summary(firm_id=1)['count'] == 3
+
+    def test_buffered_rows_are_counted_into_the_rollup(self, storage):
+        """Test that rows written by the activity buffer reach the rollup."""
+        buffer = ActivityBuffer(writer='inline')
+        try:
+            buffer.append('CREATE TASK', user_id=1, project_id=5)
+            buffer.append('UPDATE TASK', user_id=1, project_id=5)
+            buffer.append('LOGIN', user_id=1)
+            db.session.commit()
+        finally:
+            buffer.uninstall()
+
+        assert storage.summary(firm_id=1, project_id=5)['count'] == 2
+        assert storage.summary(user_id=1)['count'] == 3
@@ -0,0 +1,88 @@
+"""
+Unit tests for Redis-backed batch progress tracking.
+Tests progress counters and the firm-scoped checklist progress endpoint.
+"""
+
+import pytest
+from flask import session
+
+from src.modules.document.ai_routes import checklist_analysis_progress
+from src.shared.utils.batch_progress import BatchProgressTracker
+
+
+@pytest.fixture
+def tracker(fake_redis):
+    return BatchProgressTracker(fake_redis)
+
+
+class TestBatchProgressTracker:
+    """Test batch progress counters."""
+
+    def test_progress_counts_results(self, tracker):
+        """Test that recorded results add up to the batch progress."""
+        assert tracker.start('batch-1', 4, checklist_id=7, firm_id=3)
+        tracker.record_result('batch-1', True)
+        tracker.record_result('batch-1', True)
+        tracker.record_result('batch-1', False)
+
+        progress = tracker.get_progress('batch-1')
+        assert progress['status'] == 'running'
+        assert progress['completed'] == 2
+        assert progress['failed'] == 1
+        assert progress['processed'] == 3
+        assert progress['percent_complete'] == 75.0
+        assert progress['firm_id'] == 3
+
+    def test_checklist_progress_points_at_latest_batch(self, tracker):
+        """Test that a checklist reports its most recent batch."""
+        tracker.start('batch-1', 2, checklist_id=7)
+        tracker.start('batch-2', 1, checklist_id=7)
+        tracker.finish('batch-2', successful=1, failed=0)
+
+        progress = tracker.get_checklist_progress(7)
+        assert progress['batch_id'] == 'batch-2'
+        assert progress['status'] == 'completed'
+        assert progress['percent_complete'] == 100.0
+
+    def test_unavailable_redis_is_a_no_op(self, fake_redis):
+        """Test that nothing is stored or read without Redis."""
+        fake_redis.available = False
+        tracker = BatchProgressTracker(fake_redis)
+
+        assert not tracker.start('batch-1', 1)
+        assert not tracker.record_result('batch-1', True)
+        assert tracker.get_progress('batch-1') is None
+
+    def test_record_without_batch_id_is_ignored(self, tracker):
+        """Test that results outside a batch are not counted."""
+        assert not tracker.record_result(None, True)
+
+
+class TestChecklistAnalysisProgressRoute:
+    """Test that checklist progress is only shown to the firm that owns the batch."""
+
+    def get_progress(self, app):
+        with app.test_request_context('/api/checklists/7/analysis-progress'):
+            session['firm_id'] = 3
+            response = checklist_analysis_progress(7)
+        if isinstance(response, tuple):
+            return response[0], response[1]
+        return response, response.status_code
+
+    def test_own_batch_is_returned(self, app, tracker):
+        """Test that the caller's firm sees its batch."""
+        tracker.start('batch-1', 2, checklist_id=7, firm_id=3)
+
+        response, status = self.get_progress(app)
+        assert status == 200
+        assert response.get_json()['progress']['batch_id'] == 'batch-1'
+
+    def test_other_firms_batch_is_hidden(self, app, tracker):
+        """Test that another firm's batch is a 404."""
+        tracker.start('batch-1', 2, checklist_id=7, firm_id=4)
+        assert self.get_progress(app)[1] == 404
+
+    def test_batch_without_firm_is_hidden(self, app, tracker):
+        """Test that a batch stored without a firm is a 404."""
+        tracker.start('batch-1', 2, checklist_id=7)
+        assert self.get_progress(app)[1] == 404
@@ -0,0 +1,84 @@
+"""
+Unit tests for set-based bulk task updates, deletes and subtask reorders.
+Tests firm scoping, the update whitelist and cleanup of dependent rows.
+"""
+
+import pytest
+from datetime import date
+
+from src.models.auth import ActivityLog, Firm
+from src.modules.project.models import Task, TaskComment
+from src.modules.project.task_repository import TaskRepository
+
+
+@pytest.fixture
+def other_firm(db_session):
+    firm = Firm(name='Other CPA', access_code='OTHER')
+    db_session.add(firm)
+    db_session.flush()
+    return firm
+
+
+@pytest.fixture
+def add_task(db_session, test_firm):
+    def add_task(title, **fields):
+        task = Task(title=title, firm_id=fields.pop('firm_id', test_firm.id), **fields)
+        db_session.add(task)
+        db_session.flush()
+        return task
+    return add_task
+
+
+class TestBulkTasks:
+    """Test that bulk operations stay firm-scoped and clear dependent rows."""
+
+    def test_bulk_update_is_scoped_to_firm(self, db_session, test_firm, other_firm, add_task):
+        """Test that only the caller's tasks and whitelisted fields are updated."""
+        own = add_task('Own', priority='Low')
+        foreign = add_task('Foreign', firm_id=other_firm.id, priority='Low')
+
+        result = TaskRepository().bulk_update(
+            [own.id, foreign.id], {'priority': 'High', 'title': 'x', 'due_date': date(2024, 4, 15)}, test_firm.id)
+        db_session.expire_all()
+
+        assert result['updated_count'] == 1
+        # Fields outside the whitelist are ignored
+        assert (own.priority, own.title, own.due_date) == ('High', 'Own', date(2024, 4, 15))
+        assert foreign.priority == 'Low'
+
+    def test_bulk_delete_removes_subtasks_and_clears_references(self, db_session, test_firm, test_user,
+                                                                other_firm, add_task):
+        """Test that deleting a parent removes its subtasks and their dependent rows."""
+        parent = add_task('Parent')
+        subtask = add_task('Subtask', parent_task_id=parent.id)
+        recurring = add_task('Next occurrence', master_task_id=subtask.id)
+        foreign = add_task('Foreign', firm_id=other_firm.id)
+        db_session.add(TaskComment(comment='note', task_id=subtask.id, user_id=test_user.id))
+        activity = ActivityLog(action='Edited', user_id=test_user.id, task_id=subtask.id)
+        db_session.add(activity)
+        db_session.flush()
+        task_ids = [parent.id, subtask.id, recurring.id, foreign.id]
+        subtask_id = subtask.id
+
+        result = TaskRepository().bulk_delete([parent.id, foreign.id], test_firm.id)
+        db_session.expire_all()
+
+        assert result['deleted_count'] == 2
+        remaining = Task.query.filter(Task.id.in_(task_ids))
+        assert sorted(task.title for task in remaining) == ['Foreign', 'Next occurrence']
+        assert TaskComment.query.filter_by(task_id=subtask_id).count() == 0
+        assert db_session.get(ActivityLog, activity.id).task_id is None
+        assert recurring.master_task_id is None
+
+    def test_reorder_subtasks_ignores_other_parents(self, db_session, add_task):
+        """Test that ids outside the parent's subtasks keep their order."""
+        parent = add_task('Parent')
+        first = add_task('First', parent_task_id=parent.id)
+        second = add_task('Second', parent_task_id=parent.id)
+        stray = add_task('Stray', subtask_order=7)
+
+        reordered = TaskRepository().reorder_subtasks(parent.id, [second.id, first.id, stray.id])
+        db_session.expire_all()
+
+        assert reordered == 2
+        assert (second.subtask_order, first.subtask_order, stray.subtask_order) == (1, 2, 7)
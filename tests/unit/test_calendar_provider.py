@@ -0,0 +1,116 @@
+"""
+Unit tests for the cached calendar month provider.
+Tests month grouping, adjacent-month prefetch and commit-time invalidation.
+"""
+
+import pytest
+from datetime import date
+from unittest.mock import patch
+
+from sqlalchemy import text
+
+from src.modules.project.calendar_provider import CalendarCache, CalendarProvider, adjacent_month
+from src.modules.project.view_invalidation import invalidate_calendar_after_commit
+
+
+class FakeTaskRepository:
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    def get_calendar_rows(self, firm_id, start_date, end_date):
+        self.calls.append((start_date, end_date))
+        return [row for row in self.rows if start_date <= row['due_date'] <= end_date]
+
+
+def calendar_row(task_id, due_date, is_completed=False):
+    return {
+        'id': task_id, 'title': f'Task {task_id}', 'description': None, 'due_date': due_date,
+        'status': 'Completed' if is_completed else 'Not Started', 'priority': 'Medium',
+        'is_completed': is_completed, 'project_completed': False,
+        'project_name': 'Tax Return', 'assignee_name': 'Alex'
+    }
+
+
+@pytest.fixture
+def repository():
+    return FakeTaskRepository([
+        calendar_row(1, date(2024, 2, 28)),
+        calendar_row(2, date(2024, 3, 4)),
+        calendar_row(3, date(2024, 3, 4), is_completed=True),
+        calendar_row(4, date(2024, 4, 1)),
+    ])
+
+
+@pytest.fixture
+def cache(fake_redis):
+    return CalendarCache(fake_redis)
+
+
+@pytest.fixture
+def provider(repository, cache):
+    return CalendarProvider(repository, cache)
+
+
+class TestCalendarProvider:
+    """Test month grouping, adjacent-month prefetch and invalidation."""
+
+    def test_groups_by_date_with_flags_computed_at_read(self, provider):
+        """Test that overdue and due-soon flags follow the day of the read."""
+        march = provider.get_month(1, 2024, 3, today=date(2024, 3, 5))
+
+        assert march['total_tasks'] == 2
+        first, second = march['tasks_by_date']['2024-03-04']
+        assert first['is_overdue']
+        assert not second['is_overdue']  # Completed tasks are never overdue
+
+        march = provider.get_month(1, 2024, 3, today=date(2024, 3, 2))
+        assert not march['tasks_by_date']['2024-03-04'][0]['is_overdue']
+        assert march['tasks_by_date']['2024-03-04'][0]['is_due_soon']
+
+    def test_miss_loads_adjacent_months_in_one_query(self, provider, repository):
+        """Test that a miss caches the neighbouring months from the same query."""
+        provider.get_month(1, 2024, 3)
+        assert repository.calls == [(date(2024, 2, 1), date(2024, 4, 30))]
+
+        february = provider.get_month(1, 2024, 2)
+        april = provider.get_month(1, 2024, 4)
+        assert len(repository.calls) == 1
+        assert list(february['tasks_by_date']) == ['2024-02-28']
+        assert list(april['tasks_by_date']) == ['2024-04-01']
+
+    def test_invalidation_drops_only_the_touched_month(self, provider, repository, cache):
+        """Test that invalidating a date reloads only its month."""
+        provider.get_month(1, 2024, 3)
+        repository.rows.append(calendar_row(5, date(2024, 3, 20)))
+
+        cache.invalidate_dates(1, [date(2024, 3, 20), None])
+        assert provider.get_month(1, 2024, 3, prefetch=False)['total_tasks'] == 3
+        assert repository.calls[-1] == (date(2024, 3, 1), date(2024, 3, 31))
+
+        calls = len(repository.calls)
+        provider.get_month(1, 2024, 4)
+        assert len(repository.calls) == calls
+
+    def test_invalidation_waits_for_commit(self, db_session, provider, cache, fake_redis):
+        """Test that the cached month is dropped when the transaction commits."""
+        cached = fake_redis.client.data
+        provider.get_month(1, 2024, 3, prefetch=False)
+
+        with patch('src.modules.project.calendar_provider.calendar_cache', cache):
+            db_session.execute(text('SELECT 1'))
+            invalidate_calendar_after_commit(1, [date(2024, 3, 20), None], db_session)
+            # The month stays cached until the commit, so a racing read cannot re-cache it after the delete
+            provider.get_month(1, 2024, 3, prefetch=False)
+            assert 'calendar:1:2024-03' in cached
+            db_session.commit()
+            assert 'calendar:1:2024-03' not in cached
+
+            provider.get_month(1, 2024, 3, prefetch=False)
+            db_session.commit()
+            assert 'calendar:1:2024-03' in cached
+
+    def test_adjacent_month_wraps_years(self):
+        """Test month arithmetic across year boundaries."""
+        assert adjacent_month(2024, 12, 1) == (2025, 1)
+        assert adjacent_month(2024, 1, -1) == (2023, 12)
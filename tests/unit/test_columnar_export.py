@@ -0,0 +1,81 @@
+"""
+Unit tests for Parquet/XLSX export writers.
+Tests batched writes, column typing, sheet rollover and formula-safe cells.
+"""
+
+from datetime import date, datetime
+from unittest.mock import patch
+
+import pytest
+
+from src.shared.utils import columnar_export
+from src.shared.utils.columnar_export import PARQUET_AVAILABLE, write_parquet, write_xlsx
+
+KEYS = ['id', 'title', 'due_date', 'created_at', 'hours', 'is_billable']
+LABELS = ['ID', 'Title', 'Due Date', 'Created At', 'Hours', 'Billable']
+KINDS = ['integer', 'string', 'date', 'datetime', 'float', 'boolean']
+
+requires_parquet = pytest.mark.skipif(not PARQUET_AVAILABLE, reason='pyarrow not installed')
+
+
+def make_rows(count):
+    return [
+        (i, f'=SUM(A{i})', date(2024, 1, 1) if i % 2 else None, datetime(2024, 1, 1, 9, 30), 1.5, bool(i % 2))
+        for i in range(count)
+    ]
+
+
+class TestColumnarExport:
+    """Test batched columnar file writers."""
+
+    def test_xlsx_keeps_types_and_never_writes_formulas(self, tmp_path):
+        """Test that XLSX cells keep their types and formula-like text stays text."""
+        import openpyxl
+
+        path = str(tmp_path / 'tasks.xlsx')
+        row_count = write_xlsx(path, LABELS, KINDS, iter(make_rows(25)), batch_size=10)
+
+        worksheet = openpyxl.load_workbook(path).active
+        assert row_count == 25
+        assert [cell.value for cell in worksheet[1]] == LABELS
+        assert [cell.value for cell in worksheet[3]] == \
+            [1, '=SUM(A1)', datetime(2024, 1, 1), datetime(2024, 1, 1, 9, 30), 1.5, True]
+        assert worksheet['B3'].data_type == 's'
+        assert worksheet['C2'].value is None
+
+    def test_xlsx_continues_on_new_sheet_past_row_limit(self, tmp_path):
+        """Test that rows past the sheet limit continue on numbered sheets."""
+        import openpyxl
+
+        path = str(tmp_path / 'tasks.xlsx')
+        with patch.object(columnar_export, 'XLSX_MAX_ROWS', 11):
+            write_xlsx(path, LABELS, KINDS, iter(make_rows(25)), sheet_name='Tasks', batch_size=7)
+
+        workbook = openpyxl.load_workbook(path)
+        assert workbook.sheetnames == ['Tasks', 'Tasks (2)', 'Tasks (3)']
+        assert [ws.max_row - 1 for ws in workbook.worksheets] == [10, 10, 5]
+
+    @requires_parquet
+    def test_parquet_schema_comes_from_column_kinds(self, tmp_path):
+        """Test that the Parquet schema follows the declared kinds, not the first batch."""
+        import pyarrow.parquet as pq
+
+        path = str(tmp_path / 'tasks.parquet')
+        # First batch has only null due dates; the column must still be a date
+        rows = [(0, 'a', None, datetime(2024, 1, 1), None, False)] + make_rows(20)
+        row_count = write_parquet(path, KEYS, KINDS, iter(rows), batch_size=1)
+
+        table = pq.read_table(path)
+        assert row_count == 21
+        assert table.num_rows == 21
+        assert str(table.schema.field('due_date').type) == 'date32[day]'
+        assert table.column('id').to_pylist()[:3] == [0, 0, 1]
+
+    @requires_parquet
+    def test_parquet_with_no_rows(self, tmp_path):
+        """Test that an empty export still writes the schema."""
+        import pyarrow.parquet as pq
+
+        path = str(tmp_path / 'empty.parquet')
+        assert write_parquet(path, KEYS, KINDS, iter([])) == 0
+        assert pq.read_table(path).column_names == KEYS
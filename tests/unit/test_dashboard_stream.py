@@ -0,0 +1,82 @@
+"""
+Unit tests for dashboard server-sent events.
+Tests replay after reconnects, overflow resyncs and malformed Last-Event-ID values.
+"""
+
+import json
+
+import pytest
+
+from src.modules.dashboard.stream_service import DashboardStreamBroker
+
+
+def update(event_id, update_type='task_updated'):
+    return json.dumps({'id': event_id, 'update_type': update_type})
+
+
+def event_ids(frames):
+    return [int(frame.split('\n')[0][4:]) for frame in frames if frame.startswith('id: ')]
+
+
+@pytest.fixture
+def broker(fake_redis):
+    # Updates 1 and 2 were already trimmed from the stored list
+    fake_redis.client.data['dashboard:updates:1'] = [update(3), update(4), update(5)]
+    return DashboardStreamBroker(fake_redis, max_queue_size=2, heartbeat_seconds=1, max_connection_seconds=5)
+
+
+@pytest.fixture
+def open_stream(broker):
+    streams = []
+
+    def open_stream(last_event_id):
+        stream = broker.stream(1, last_event_id)
+        streams.append(stream)
+        assert next(stream).startswith('retry: ')
+        return stream
+
+    yield open_stream
+    for stream in streams:
+        stream.close()
+
+
+class TestDashboardStream:
+    """Test that reconnecting streams replay, resync and recover from bad input."""
+
+    def test_replay_after_gap(self, broker, open_stream):
+        """Test that a reconnect replays only the missed updates."""
+        # Resuming inside the stored window replays only what was missed, without a resync
+        stream = open_stream('3')
+        assert event_ids([next(stream), next(stream)]) == [4, 5]
+
+        # Live updates already replayed are skipped; newer ones are delivered
+        broker._dispatch(1, update(5))
+        broker._dispatch(1, update(6))
+        assert event_ids([next(stream)]) == [6]
+
+        # Resuming from before the stored window asks the browser to resync first
+        stream = open_stream('1')
+        frames = [next(stream) for _ in range(4)]
+        assert 'event: resync' in frames[0]
+        assert event_ids(frames[1:]) == [3, 4, 5]
+
+    def test_overflow_ends_stream_with_resync(self, broker, open_stream):
+        """Test that a listener that falls behind is told to resync and dropped."""
+        stream = open_stream('5')
+        for event_id in (6, 7, 8):
+            broker._dispatch(1, update(event_id))
+
+        assert 'event: resync' in next(stream)
+        with pytest.raises(StopIteration):
+            next(stream)
+        assert broker.get_stats()['listeners'] == 0
+
+    def test_malformed_last_event_id_replays_everything(self, fake_redis, open_stream):
+        """Test that unreadable ids and stored entries never break the replay."""
+        fake_redis.client.data['dashboard:updates:1'].insert(0, 'not json')
+        for last_event_id in ('abc', '', None):
+            stream = open_stream(last_event_id)
+            frames = [next(stream) for _ in range(3)]
+            assert event_ids(frames) == [3, 4, 5]
+            assert not any('event: resync' in frame for frame in frames)
+            stream.close()
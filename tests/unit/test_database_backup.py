@@ -0,0 +1,126 @@
+"""
+Unit tests for online, deduplicated database backups.
+Tests content-defined chunking, snapshot dedup, restore, garbage collection and retention.
+"""
+
+import io
+import json
+import os
+import random
+import sqlite3
+import time
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from src.shared.database.backup import (
+    BackupManager, BackupMetrics, SQLiteBackupSource, BackupError, iter_chunks
+)
+
+
+@pytest.fixture
+def database(tmp_path):
+    """WAL-mode SQLite database with 2000 rows, left open for writes during backups."""
+    connection = sqlite3.connect(str(tmp_path / 'workflow.db'))
+    connection.execute('PRAGMA journal_mode=WAL')
+    connection.execute('CREATE TABLE items (id INTEGER PRIMARY KEY, payload BLOB)')
+    connection.executemany('INSERT INTO items (payload) VALUES (?)',
+                           [(os.urandom(400),) for _ in range(2000)])
+    connection.commit()
+    yield connection
+    connection.close()
+
+
+@pytest.fixture
+def manager(tmp_path, database):
+    return BackupManager(str(tmp_path / 'backups'),
+                         source=SQLiteBackupSource(str(tmp_path / 'workflow.db'), step_sleep=0))
+
+
+def restored_row_count(manager, backup_id, restored_path):
+    manager.restore_backup(backup_id, str(restored_path))
+    restored = sqlite3.connect(restored_path)
+    try:
+        assert restored.execute('PRAGMA integrity_check').fetchone()[0] == 'ok'
+        return restored.execute('SELECT COUNT(*) FROM items').fetchone()[0]
+    finally:
+        restored.close()
+
+
+class TestContentDefinedChunking:
+    """Test chunk boundaries survive shifted content."""
+
+    def test_insert_only_changes_nearby_chunks(self):
+        """Test that an insert at the front leaves most chunks unchanged."""
+        data = random.Random(1).randbytes(2 * 1024 * 1024)
+        original = list(iter_chunks(io.BytesIO(data)))
+        shifted = list(iter_chunks(io.BytesIO(b'inserted' + data)))
+
+        assert b''.join(original) == data
+        assert len(set(original) & set(shifted)) >= len(original) - 2
+
+
+class TestBackupManager:
+    """Test snapshot creation, restore, garbage collection and retention."""
+
+    def test_second_snapshot_only_stores_changed_chunks(self, manager, database):
+        """Test that a snapshot after a small change reuses most chunks."""
+        first = manager.create_backup()
+        database.execute('UPDATE items SET payload = ? WHERE id = 1', (b'changed',))
+        database.commit()
+        second = manager.create_backup()
+
+        assert first['metrics']['journal_mode'] == 'wal'
+        assert first['metrics']['writer_blocked_ms'] == 0.0
+        assert second['metrics']['chunks_new'] < first['metrics']['chunks_new']
+        assert second['metrics']['dedup_ratio'] > 0.5
+
+    def test_restore_reproduces_database(self, manager, tmp_path):
+        """Test that a restored snapshot is an intact copy."""
+        backup = manager.create_backup()
+        assert restored_row_count(manager, backup['backup_id'], tmp_path / 'restored.db') == 2000
+
+    def test_chunks_reused_during_garbage_collection_are_kept(self, manager, tmp_path):
+        """Test that garbage collection spares chunks a running backup just reused."""
+        first = manager.create_backup()
+        os.remove(first['manifest'])
+        stale = time.time() - 7200
+        for chunk_path in manager.chunk_dir.glob('*/*'):
+            os.utime(chunk_path, (stale, stale))
+
+        # Collect garbage after the chunks are stored but before the manifest is written
+        finish = BackupMetrics.finish
+
+        def finish_then_collect(metrics):
+            finish(metrics)
+            manager.collect_garbage()
+
+        with patch.object(BackupMetrics, 'finish', finish_then_collect):
+            second = manager.create_backup()
+
+        assert second['metrics']['chunks_new'] == 0
+        assert restored_row_count(manager, second['backup_id'], tmp_path / 'restored.db') == 2000
+
+    def test_restore_unknown_backup(self, manager, tmp_path):
+        """Test that restoring a missing snapshot raises BackupError."""
+        with pytest.raises(BackupError):
+            manager.restore_backup('missing', str(tmp_path / 'x.db'))
+
+    def test_retention_keeps_recent_and_daily_snapshots(self, manager):
+        """Test that retention keeps the newest and one per recent day."""
+        now = datetime(2024, 3, 20, 12, 0)
+        backup_ids = [manager.create_backup()['backup_id'] for _ in range(4)]
+
+        # Backdate manifests: two today, one 3 days ago, one 60 days ago
+        ages = [timedelta(hours=1), timedelta(hours=2), timedelta(days=3), timedelta(days=60)]
+        for backup_id, age in zip(backup_ids, ages):
+            manifest_path = manager.manifest_dir / f"{backup_id}.json"
+            manifest = json.loads(manifest_path.read_text())
+            manifest['created_at'] = (now - age).isoformat()
+            manifest_path.write_text(json.dumps(manifest))
+
+        result = manager.apply_retention(keep_last=1, keep_daily=7, keep_weekly=0, now=now)
+
+        assert sorted(result['deleted']) == sorted([backup_ids[1], backup_ids[3]])
+        assert len(manager.list_backups()) == 2
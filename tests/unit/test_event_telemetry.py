@@ -0,0 +1,130 @@
+"""
+Unit tests for event telemetry and commit-time event publishing.
+Tests expiring day/hour telemetry buckets and events held back until the commit.
+"""
+
+import pytest
+from datetime import datetime
+from unittest.mock import patch
+
+from src.models.auth import Firm
+from src.modules.project.task_repository import TaskRepository
+from src.modules.project.task_service import TaskService
+from src.shared.events.base import BaseEvent
+from src.shared.events.publisher import (
+    EventPublisher, delete_expired_telemetry, event_counts_key, event_log_key, expired_telemetry_keys,
+    publish_event_after_commit
+)
+
+
+class SampleEvent(BaseEvent):
+    def get_payload(self):
+        return {}
+
+
+class OtherEvent(BaseEvent):
+    def get_payload(self):
+        return {}
+
+
+@pytest.fixture
+def publisher(fake_redis):
+    return EventPublisher(fake_redis)
+
+
+@pytest.fixture
+def published():
+    with patch('src.shared.events.publisher.publish_event') as publish:
+        yield publish
+
+
+class TestEventTelemetry:
+    """Test bucket naming, the stats read and expiry cleanup."""
+
+    def test_bucket_names(self):
+        """Test day and hour bucket names and which are past retention."""
+        moment = datetime(2024, 3, 5, 7, 59)
+        assert event_counts_key(moment) == 'event_counts:2024-03-05'
+        assert event_log_key(moment) == 'event_log:2024-03-05:07'
+
+        now = datetime(2024, 3, 31, 12)
+        stale = expired_telemetry_keys(now, horizon_days=10)
+        # Day buckets older than 7 days and hour buckets older than 24 hours
+        assert stale[0] == 'event_counts:2024-03-23'
+        assert stale[2] == 'event_counts:2024-03-21'
+        assert 'event_counts:2024-03-24' not in stale
+        assert 'event_log:2024-03-30:11' in stale
+        assert 'event_log:2024-03-30:12' not in stale
+        assert len(stale) == 3 + (10 * 24 - 24)
+
+    def test_publish_writes_buckets_and_stats_read_one_hash(self, fake_redis, publisher):
+        """Test that publishing counts into the day bucket and logs into the hour bucket."""
+        redis = fake_redis.client
+        moment = datetime(2024, 3, 5, 7, 30)
+        with patch('src.shared.events.publisher.datetime') as clock:
+            clock.utcnow.return_value = moment
+            for event in (SampleEvent(firm_id=1, user_id=2), SampleEvent(firm_id=1, user_id=2),
+                          OtherEvent(firm_id=3, user_id=4)):
+                assert publisher.publish(event)
+            stats = publisher.get_event_stats()
+
+        assert redis.data['event_counts:2024-03-05'] == {'SampleEvent': '2', 'OtherEvent': '1'}
+        assert redis.ttls['event_counts:2024-03-05'] == 7 * 86400
+        assert redis.ttls['event_log:2024-03-05:07'] == 24 * 3600
+
+        entries = redis.data['event_log:2024-03-05:07']
+        assert [fields['event_type'] for _, fields in entries] == ['SampleEvent', 'SampleEvent', 'OtherEvent']
+        assert entries[2][1]['firm_id'] == '3'
+
+        assert stats['daily_counts'] == {'SampleEvent': 2, 'OtherEvent': 1}
+        assert stats['total_event_types'] == 2
+
+    def test_cleanup_deletes_only_expired_buckets(self, fake_redis):
+        """Test that cleanup removes past-retention buckets by name."""
+        redis = fake_redis.client
+        now = datetime(2024, 3, 31, 12)
+        for key in ('event_counts:2024-03-20', 'event_counts:2024-03-30',
+                    'event_log:2024-03-29:08', 'event_log:2024-03-31:09'):
+            redis.data[key] = {'x': '1'}
+
+        assert delete_expired_telemetry(redis, now) == (1, 1)
+        assert sorted(redis.data) == ['event_counts:2024-03-30', 'event_log:2024-03-31:09']
+        assert delete_expired_telemetry(redis, now) == (0, 0)
+
+
+class TestPublishAfterCommit:
+    """Test that events about flushed rows wait for the commit."""
+
+    def test_event_is_published_on_commit_and_dropped_on_rollback(self, db_session, test_firm, published):
+        """Test that a queued event follows the transaction's outcome."""
+        db_session.get(Firm, test_firm.id)  # Opens a transaction
+        publish_event_after_commit(SampleEvent(firm_id=test_firm.id))
+        published.assert_not_called()
+        db_session.commit()
+        assert published.call_count == 1
+
+        db_session.get(Firm, test_firm.id)
+        publish_event_after_commit(OtherEvent(firm_id=test_firm.id))
+        db_session.rollback()
+        db_session.commit()
+        assert published.call_count == 1
+
+    def test_without_a_transaction_the_event_goes_out_at_once(self, db_session, test_firm, published):
+        """Test that nothing is held back when no transaction is open."""
+        publish_event_after_commit(SampleEvent(firm_id=test_firm.id))
+        assert published.call_count == 1
+
+    def test_task_created_event_follows_the_commit(self, db_session, test_firm, test_user, published):
+        """Test that create_task publishes only once its transaction commits."""
+        # Hold back the @transactional commit to look between the flush and the commit
+        with patch.object(db_session, 'commit') as commit:
+            result = TaskService(TaskRepository()).create_task(
+                'Prepare 1040', '', firm_id=test_firm.id, user_id=test_user.id
+            )
+        commit.assert_called_once()
+        published.assert_not_called()
+
+        db_session.commit()
+        assert result['success']
+        (event, _), _ = published.call_args
+        assert (type(event).__name__, event.task_id) == ('TaskCreatedEvent', result['task_id'])
@@ -0,0 +1,104 @@
+"""
+Unit tests for the cached Kanban board builder.
+Tests column grouping, per-firm caching and commit-time invalidation.
+"""
+
+import pytest
+from datetime import date
+from unittest.mock import patch
+
+from sqlalchemy import text
+
+from src.modules.project.kanban_provider import KanbanCache, KanbanBoardBuilder
+from src.modules.project.view_invalidation import invalidate_board_after_commit
+
+
+class FakeProjectRepository:
+    def __init__(self, columns, cards):
+        self.columns = columns
+        self.cards = cards
+        self.calls = 0
+
+    def get_kanban_columns(self, firm_id):
+        self.calls += 1
+        return [dict(column) for column in self.columns]
+
+    def get_kanban_cards(self, firm_id):
+        self.calls += 1
+        return [dict(card) for card in self.cards]
+
+
+def kanban_card(project_id, current_status_id=None, due_date=None):
+    return {
+        'id': project_id, 'name': f'Project {project_id}', 'status': 'Active', 'priority': 'Medium',
+        'due_date': due_date, 'client_name': 'Acme', 'current_status_id': current_status_id,
+        'is_completed': False, 'total_tasks': 4, 'completed_tasks': 1, 'progress_percentage': 25
+    }
+
+
+@pytest.fixture
+def repository():
+    return FakeProjectRepository(
+        columns=[
+            {'id': 11, 'title': 'Review', 'work_type': 'Tax', 'color': '#3b82f6', 'position': 2},
+            {'id': 10, 'title': 'Intake', 'work_type': 'Tax', 'color': '#6b7280', 'position': 1},
+        ],
+        cards=[
+            kanban_card(1, current_status_id=11, due_date=date(2024, 4, 15)),
+            kanban_card(2),
+            kanban_card(3, current_status_id=99),
+        ]
+    )
+
+
+@pytest.fixture
+def cache(fake_redis):
+    return KanbanCache(fake_redis)
+
+
+@pytest.fixture
+def builder(repository, cache):
+    return KanbanBoardBuilder(repository, cache)
+
+
+class TestKanbanBoardBuilder:
+    """Test column grouping and per-firm caching."""
+
+    def test_groups_cards_into_status_columns(self, builder):
+        """Test that cards land in their status column, in column order."""
+        board = builder.get_board(1)
+
+        assert list(board['columns']) == ['status_10', 'status_11', 'completed']
+        assert [card['id'] for card in board['columns']['status_11']['projects']] == [1]
+        # No status: first column; unknown status: left off the board
+        assert [card['id'] for card in board['columns']['status_10']['projects']] == [2]
+        assert board['total_projects'] == 3
+
+    def test_cached_board_is_reused_until_invalidated(self, builder, repository, cache):
+        """Test that the cached board round-trips and is rebuilt after invalidation."""
+        builder.get_board(1)
+        board = builder.get_board(1)
+        assert repository.calls == 2
+        assert board['columns']['status_11']['projects'][0]['due_date'] == date(2024, 4, 15)
+
+        cache.invalidate(1)
+        builder.get_board(1)
+        assert repository.calls == 4
+
+    def test_board_invalidation_waits_for_commit(self, db_session, builder, repository, cache):
+        """Test that the board is dropped on commit, or at once outside a transaction."""
+        builder.get_board(1)
+
+        with patch('src.modules.project.kanban_provider.kanban_cache', cache):
+            db_session.execute(text('SELECT 1'))
+            invalidate_board_after_commit(1, db_session)
+            builder.get_board(1)
+            assert repository.calls == 2
+            db_session.commit()
+            builder.get_board(1)
+            assert repository.calls == 4
+
+            # Nothing left to commit: the board goes at once
+            invalidate_board_after_commit(1, db_session)
+            builder.get_board(1)
+            assert repository.calls == 6
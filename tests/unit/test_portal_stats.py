@@ -0,0 +1,109 @@
+"""
+Unit tests for aggregated client portal checklist statistics.
+Tests that portal checklist counts come from one cached grouped query.
+"""
+
+import pytest
+from sqlalchemy import event
+
+from src.shared.database.db_import import db
+from src.modules.client.models import Client
+from src.modules.client.portal_service import PortalService
+from src.modules.document.models import ChecklistItem, DocumentChecklist
+
+
+@pytest.fixture
+def portal_client(db_session, test_firm, test_user):
+    """Client with an active checklist, an empty one and an archived one."""
+    client = Client(name='Globex', firm_id=test_firm.id)
+    db_session.add(client)
+    db_session.flush()
+    checklists = [
+        DocumentChecklist(client_id=client.id, name='2024 Return', created_by=test_user.id),
+        DocumentChecklist(client_id=client.id, name='Empty', created_by=test_user.id),
+        DocumentChecklist(client_id=client.id, name='Archived', created_by=test_user.id, is_active=False)
+    ]
+    db_session.add_all(checklists)
+    db_session.flush()
+    active, _, archived = checklists
+    db_session.add_all([
+        ChecklistItem(checklist_id=active.id, item_name='W-2', status='uploaded'),
+        ChecklistItem(checklist_id=active.id, item_name='1099', status='not_applicable'),
+        ChecklistItem(checklist_id=active.id, item_name='1098', status='pending'),
+        ChecklistItem(checklist_id=active.id, item_name='K-1', status='pending'),
+        ChecklistItem(checklist_id=archived.id, item_name='Old W-2', status='pending')
+    ])
+    db_session.commit()
+    return client
+
+
+@pytest.fixture
+def checklist_ids(db_session, portal_client):
+    """Ids of the active and the empty checklist."""
+    return [checklist_id for (checklist_id,) in db_session.query(DocumentChecklist.id)
+            .filter_by(client_id=portal_client.id, is_active=True).order_by(DocumentChecklist.id)]
+
+
+@pytest.fixture
+def service(fake_redis):
+    return PortalService()
+
+
+def count_selects(func):
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db.engine, 'before_cursor_execute', listener)
+    try:
+        result = func()
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', listener)
+    return result, [statement for statement in statements if statement.startswith('SELECT')]
+
+
+class TestPortalStats:
+    """Test that portal checklist counts come from one cached grouped query."""
+
+    def test_client_counts_come_from_one_grouped_query(self, portal_client, checklist_ids):
+        """Test that per-checklist counts for a client are read in one query."""
+        client_id = portal_client.id
+        active_id, empty_id = checklist_ids
+        stats, statements = count_selects(lambda: DocumentChecklist.aggregate_stats(client_id=client_id))
+
+        assert len(statements) == 1
+        assert set(stats) == {active_id, empty_id}
+        assert {key: stats[active_id][key] for key in ('total', 'uploaded', 'pending', 'completed', 'progress')} == \
+            {'total': 4, 'uploaded': 1, 'pending': 2, 'completed': 2, 'progress': 50}
+        assert stats[empty_id]['total'] == 0
+
+    def test_dashboard_reads_cached_counts(self, db_session, service, portal_client, checklist_ids):
+        """Test that a warm dashboard reads counts from the cache, not per checklist."""
+        client_id = portal_client.id
+        active_id, empty_id = checklist_ids
+        service.get_client_dashboard_data(client_id)
+        db_session.expunge_all()
+
+        data, statements = count_selects(lambda: service.get_client_dashboard_data(client_id))
+        checklists = {checklist.id: checklist for checklist in data['checklists']}
+        assert checklists[active_id].completed_items_count == 2
+        assert checklists[active_id].progress_percentage == 50
+        assert checklists[empty_id].stats['total'] == 0
+        # client, checklists and their items; no per-checklist counting
+        assert len(statements) == 3
+        assert not [s for s in statements if 'GROUP BY' in s]
+
+    def test_status_change_invalidates_cached_counts(self, db_session, fake_redis, service, portal_client):
+        """Test that changing an item's status drops the client's cached counts."""
+        client_id = portal_client.id
+        before = service.get_client_statistics(client_id)['statistics']
+        assert (before['total_checklists'], before['pending_items']) == (2, 2)
+
+        pending_item = ChecklistItem.query.join(DocumentChecklist).filter(
+            DocumentChecklist.client_id == client_id, DocumentChecklist.is_active.is_(True),
+            ChecklistItem.status == 'pending'
+        ).order_by(ChecklistItem.id).first()
+        assert service.update_item_status(pending_item.id, client_id, 'already_provided')['success']
+        assert f'portal_stats:{client_id}' not in fake_redis.client.data
+
+        after = service.get_client_statistics(client_id)['statistics']
+        assert (after['completed_items'], after['pending_items']) == (3, 1)
+        assert after['completion_percentage'] == 75
@@ -0,0 +1,137 @@
+"""
+Unit tests for the in-memory autocomplete prefix index.
+Tests word-start matching, ranking, lazy per-firm builds, eviction and background rebuilds.
+"""
+
+import pytest
+
+from src.shared.utils.prefix_index import FirmPrefixIndex, PrefixIndexCache, normalize
+
+
+@pytest.fixture
+def index():
+    return FirmPrefixIndex.build([
+        ('client', 1, 'Acme Holdings LLC'),
+        ('project', 1, '2024 Tax Return - Acme'),
+        ('task', 1, 'Review tax return'),
+        ('task', 2, 'Taxes: quarterly estimate'),
+    ])
+
+
+@pytest.fixture
+def labels(index):
+    def labels(query, **kwargs):
+        return [s['label'] for s in index.search(query, **kwargs)]
+    return labels
+
+
+@pytest.fixture
+def data():
+    return {
+        1: [('client', 1, 'Acme Holdings')],
+        2: [('client', 2, 'Beta Partners')],
+        3: [('client', 3, 'Gamma Group')],
+    }
+
+
+@pytest.fixture
+def loads():
+    return []
+
+
+@pytest.fixture
+def cache(data, loads):
+    def loader(firm_id):
+        loads.append(firm_id)
+        return list(data[firm_id])
+
+    return PrefixIndexCache(loader, max_entries=4)
+
+
+class TestFirmPrefixIndex:
+    """Test word-start prefix matching and ranking."""
+
+    def test_matches_any_word_start(self, labels):
+        """Test that queries match the start of any word in order."""
+        assert labels('acme') == ['Acme Holdings LLC', '2024 Tax Return - Acme']
+        assert labels('tax ret') == ['Review tax return', '2024 Tax Return - Acme']
+        assert labels('olding') == []
+
+    def test_start_of_name_ranks_first_and_types_filter(self, labels):
+        """Test ranking, entity filters and limits."""
+        assert labels('tax') == ['Taxes: quarterly estimate', 'Review tax return', '2024 Tax Return - Acme']
+        assert labels('tax', entities={'project'}) == ['2024 Tax Return - Acme']
+        assert labels('tax', limit=1) == ['Taxes: quarterly estimate']
+
+    def test_add_replace_and_remove(self, index, labels):
+        """Test that entries can be added, renamed and removed in place."""
+        index.add('client', 2, 'Zeta Corp')
+        assert labels('zet') == ['Zeta Corp']
+
+        index.add('client', 2, 'Omega Corp')
+        assert labels('zet') == []
+        assert labels('corp') == ['Omega Corp']
+
+        before = len(index)
+        assert index.remove('client', 2) == 2
+        assert len(index) == before - 2
+        assert labels('omega') == []
+
+    def test_normalize_folds_case_accents_and_punctuation(self, index):
+        """Test that names and queries are folded the same way."""
+        assert normalize('  Société  Générale, S.A. ') == 'societe generale s a'
+        assert [s['id'] for s in index.search('TAXES quarterly')] == [2]
+
+
+class TestPrefixIndexCache:
+    """Test lazy builds, incremental updates and eviction of cold firms."""
+
+    def test_builds_lazily_once_and_is_firm_scoped(self, cache, loads):
+        """Test that a firm's index is built on first search only."""
+        assert loads == []
+        assert len(cache.search(1, 'acme')) == 1
+        assert cache.search(1, 'beta') == []
+        assert loads == [1]
+
+    def test_events_update_loaded_firms_only(self, cache):
+        """Test that updates for firms without an index are ignored."""
+        cache.search(1, 'acme')
+        cache.add(1, 'task', 10, 'Acme payroll')
+        cache.add(2, 'task', 11, 'Beta payroll')
+
+        assert [s['id'] for s in cache.search(1, 'payroll')] == [10]
+        assert cache.get_stats()['firms'] == 1
+
+    def test_least_recently_used_firm_is_evicted(self, cache, loads):
+        """Test that the coldest firm is dropped past the entry budget."""
+        cache.search(1, 'a')
+        cache.search(2, 'b')
+        cache.search(1, 'a')
+        cache.search(3, 'g')  # 6 keys > 4: firm 2 is the coldest
+
+        stats = cache.get_stats()
+        assert stats['firms'] == 2
+        assert stats['evictions'] == 1
+
+        cache.search(2, 'beta')
+        assert loads == [1, 2, 3, 2]
+
+    def test_stale_index_is_served_while_rebuilt_in_background(self, cache, data, loads):
+        """Test that a stale index keeps answering until its rebuild lands."""
+        rebuilds = []
+        cache.run_in_background = rebuilds.append
+        cache.max_age = 0
+        cache.search(1, 'acme')
+        data[1] = [('client', 1, 'Acme Renamed')]
+
+        # The stale index answers and a single rebuild is scheduled
+        assert cache.search(1, 'renamed') == []
+        assert cache.search(1, 'acme')[0]['label'] == 'Acme Holdings'
+        assert len(rebuilds) == 1
+        assert loads == [1]
+
+        # Changes made while the rebuild runs are kept
+        cache.add(1, 'task', 10, 'Acme payroll')
+        rebuilds[0]()
+        assert cache.search(1, 'renamed')[0]['label'] == 'Acme Renamed'
+        assert [s['id'] for s in cache.search(1, 'payroll')] == [10]
@@ -0,0 +1,100 @@
+"""
+Unit tests for the denormalized project task counters.
+Tests that ORM and bulk task writes keep Project counters current, and drift repair.
+"""
+
+import pytest
+
+from src.models.auth import Firm
+from src.modules.client.models import Client
+from src.modules.project.models import Project, Task
+from src.modules.project.progress import find_drift, repair
+from src.modules.project.task_repository import TaskRepository
+
+
+@pytest.fixture
+def firm(db_session):
+    firm = Firm(name='Acme CPA', access_code='ACME')
+    db_session.add(firm)
+    db_session.flush()
+    return firm
+
+
+@pytest.fixture
+def projects(db_session, firm):
+    client = Client(name='Globex', firm_id=firm.id)
+    db_session.add(client)
+    db_session.flush()
+    projects = [Project(name='2024 Tax Return', client_id=client.id, firm_id=firm.id),
+                Project(name='Q1 Bookkeeping', client_id=client.id, firm_id=firm.id)]
+    db_session.add_all(projects)
+    db_session.commit()
+    return projects
+
+
+@pytest.fixture
+def project(projects):
+    return projects[0]
+
+
+@pytest.fixture
+def other_project(projects):
+    return projects[1]
+
+
+@pytest.fixture
+def add_task(db_session, firm, project):
+    def add_task(title, status='Not Started', project=project):
+        task = Task(title=title, status=status, firm_id=firm.id, project_id=project.id)
+        db_session.add(task)
+        db_session.commit()
+        return task
+    return add_task
+
+
+class TestProjectProgress:
+    """Test that task writes keep Project counters current."""
+
+    def test_orm_writes_adjust_counters(self, db_session, firm, project, other_project, add_task):
+        """Test that inserts, status changes, moves and deletes adjust the counters."""
+        first = add_task('Collect W-2s')
+        second = add_task('Prepare return')
+        add_task('File extension', status='Completed')
+        assert (project.task_count, project.completed_task_count) == (3, 1)
+
+        first.status = 'Completed'
+        db_session.commit()
+        assert project.progress_percentage == 67
+
+        second.project_id = other_project.id
+        db_session.commit()
+        db_session.delete(first)
+        db_session.commit()
+        assert (project.task_count, project.completed_task_count) == (1, 1)
+        assert other_project.task_count == 1
+        assert find_drift(firm.id) == []
+
+    def test_bulk_writes_recount_touched_projects(self, db_session, firm, project, add_task):
+        """Test that bulk updates and deletes recount the projects they touch."""
+        tasks = [add_task(f'Task {index}') for index in range(4)]
+        repository = TaskRepository()
+
+        repository.bulk_update([task.id for task in tasks[:3]], {'status': 'Completed'}, firm_id=firm.id)
+        repository.bulk_delete([tasks[0].id, tasks[3].id], firm_id=firm.id)
+        db_session.commit()
+
+        assert (project.task_count, project.completed_task_count) == (2, 2)
+        assert find_drift(firm.id) == []
+
+    def test_repair_reports_and_fixes_drift(self, db_session, firm, project, other_project, add_task):
+        """Test that repair reports drifted projects and recounts them."""
+        add_task('Collect W-2s', status='Completed')
+        db_session.execute(Project.__table__.update().where(Project.firm_id == firm.id).values(task_count=9))
+        db_session.commit()
+
+        result = repair(firm.id)
+        assert sorted(item['project_id'] for item in result['drifted']) == \
+            sorted([project.id, other_project.id])
+        assert result['repaired'] == 2
+        assert find_drift(firm.id) == []
+        assert project.task_count == 1
@@ -0,0 +1,113 @@
+"""
+Unit tests for the per-request SQL profiler and N+1 detection.
+Tests fingerprinting, nested profiles, response headers and the log line.
+"""
+
+import json
+import logging
+
+import pytest
+from flask import Flask
+from sqlalchemy import text
+
+from src.shared.database.db_import import db
+from src.shared.database.query_profiler import fingerprint, init_query_profiler, profile_queries
+from src.models import Firm, User
+
+
+@pytest.fixture
+def profiler_app():
+    """
+    App with the profiler installed and four firms of one user each, on a
+    database of its own so query counts are exact.
+    """
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['SQL_PROFILER_ENABLED'] = True
+    app.config['SQL_PROFILER_N_PLUS_ONE_THRESHOLD'] = 3
+    db.init_app(app)
+    init_query_profiler(app)
+
+    @app.route('/users')
+    def users():
+        firm_ids = [firm_id for (firm_id,) in db.session.query(Firm.id).all()]
+        # One lookup per firm: the N+1 shape the profiler should flag
+        names = [user.name for firm_id in firm_ids
+                 for user in User.query.filter_by(firm_id=firm_id).all()]
+        return {'names': names}
+
+    @app.route('/firms')
+    def firms():
+        return {'firms': len(Firm.query.all())}
+
+    with app.app_context():
+        db.create_all()
+        for number in range(1, 5):
+            db.session.add(Firm(id=number, name=f'Firm {number}', access_code=f'CODE{number}'))
+            db.session.add(User(name=f'User {number}', role='Admin', firm_id=number))
+        db.session.commit()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+class TestFingerprint:
+    """Test that statements differing only in values share a fingerprint."""
+
+    def test_literals_placeholders_and_lists_collapse(self):
+        """Test that literals, placeholders and IN lists collapse to one shape."""
+        assert fingerprint("SELECT * FROM task  WHERE id = 42 AND title = 'It''s' -- lookup") == \
+            "SELECT * FROM task WHERE id = ? AND title = ?"
+        assert fingerprint('SELECT * FROM task WHERE project_id IN (?, ?, ?)') == \
+            fingerprint('SELECT * FROM task WHERE project_id IN (%(id_1)s, %(id_2)s)')
+        assert fingerprint('INSERT INTO t (a, b) VALUES ($1, $2), ($3, $4)') == \
+            'INSERT INTO t (a, b) VALUES (?)'
+        # Casts and identifiers containing digits are kept
+        assert fingerprint('SELECT col2::text FROM t1 WHERE x = :x') == \
+            'SELECT col2::text FROM t1 WHERE x = ?'
+
+
+class TestQueryProfiler:
+    """Test per-request counts, N+1 flagging, headers and the log line."""
+
+    def test_profile_block_counts_and_flags_repeats(self, profiler_app):
+        """Test that nested profiles both count and repeated shapes are flagged."""
+        with profile_queries('outer', threshold=3) as outer:
+            db.session.execute(text('SELECT 1')).all()
+            with profile_queries('inner', threshold=3) as inner:
+                for firm_id in range(1, 5):
+                    db.session.execute(text(f'SELECT name FROM firm WHERE id = {firm_id}')).all()
+
+        assert outer.count == inner.count + 1
+        assert inner.fingerprints['SELECT name FROM firm WHERE id = ?'] == 4
+        assert ('SELECT name FROM firm WHERE id = ?', 4) in inner.n_plus_one()
+        assert outer.db_time_ms >= inner.db_time_ms
+
+        # Statements outside any profile are not recorded
+        db.session.execute(text('SELECT 2')).all()
+        assert outer.count == inner.count + 1
+
+    def test_request_headers_and_log_line(self, profiler_app, caplog):
+        """Test that requests get count headers and flagged ones log a warning."""
+        client = profiler_app.test_client()
+        with caplog.at_level(logging.INFO, logger='src.shared.database.query_profiler'):
+            flagged = client.get('/users')
+            clean = client.get('/firms')
+
+        assert flagged.headers['X-Query-Count'] == '5'
+        assert flagged.headers['X-Query-N-Plus-One'] == '1'
+        assert clean.headers['X-Query-Count'] == '1'
+        assert clean.headers['X-Query-N-Plus-One'] == '0'
+        assert 'X-Query-Time-Ms' in clean.headers
+
+        records = [record for record in caplog.records if record.name == 'src.shared.database.query_profiler']
+        assert [record.levelname for record in records] == ['WARNING', 'INFO']
+        summary = json.loads(records[0].getMessage().split(' ', 1)[1])
+        assert summary['endpoint'] == 'users'
+        assert summary['queries'] == 5
+        assert summary['n_plus_one'][0]['count'] == 4
+
+        # Disabled: no headers and nothing recorded
+        profiler_app.config['SQL_PROFILER_ENABLED'] = False
+        assert 'X-Query-Count' not in client.get('/firms').headers
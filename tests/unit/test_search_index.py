@@ -0,0 +1,101 @@
+"""
+Unit tests for the full-text search index (SQLite FTS5 backend).
+Tests trigger sync, firm partitioning and prefix ranking.
+"""
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from src.shared.database.search_index import SQLiteSearchBackend, query_terms
+
+
+@pytest.fixture
+def backend():
+    return SQLiteSearchBackend()
+
+
+@pytest.fixture
+def connection(backend):
+    """Standalone database with the indexed tables, the FTS index and its backfill."""
+    connection = create_engine('sqlite://').connect()
+    for statement in (
+        "CREATE TABLE project (id INTEGER PRIMARY KEY, name VARCHAR(200), firm_id INTEGER)",
+        "CREATE TABLE client (id INTEGER PRIMARY KEY, name VARCHAR(120), email VARCHAR(120), "
+        "contact_person VARCHAR(100), firm_id INTEGER, is_active BOOLEAN)",
+        "CREATE TABLE task (id INTEGER PRIMARY KEY, title VARCHAR(200), description TEXT, "
+        "project_id INTEGER, firm_id INTEGER)",
+        "INSERT INTO project (id, name, firm_id) VALUES (1, '2024 Tax Return', 1)",
+        "INSERT INTO task (id, title, description, project_id, firm_id) "
+        "VALUES (1, 'Existing task', 'indexed by backfill', NULL, 1)",
+    ):
+        connection.exec_driver_sql(statement)
+
+    for statement in backend.install_statements() + backend.backfill_statements():
+        connection.exec_driver_sql(statement)
+    yield connection
+    connection.close()
+
+
+@pytest.fixture
+def search(backend, connection):
+    def search(firm_id, entity, query):
+        return backend.search(connection, firm_id, entity, query_terms(query), 20)
+    return search
+
+
+@pytest.fixture
+def execute(connection):
+    def execute(sql):
+        connection.execute(text(sql))
+    return execute
+
+
+class TestSQLiteSearchIndex:
+    """Test trigger sync, firm partitioning and prefix ranking."""
+
+    def test_backfill_and_prefix_match(self, search):
+        """Test that backfilled rows are found by word prefixes."""
+        assert search(1, 'task', 'exist') == [1]
+        assert search(1, 'task', 'backfill') == [1]
+        assert search(1, 'project', 'tax ret') == [1]
+
+    def test_triggers_keep_index_in_sync(self, search, execute):
+        """Test that inserts, updates and deletes reach the index."""
+        execute("INSERT INTO task (id, title, project_id, firm_id) VALUES (2, 'Payroll filing', 1, 1)")
+        assert search(1, 'task', 'payroll') == [2]
+
+        execute("UPDATE task SET title = 'Quarterly estimate' WHERE id = 2")
+        assert search(1, 'task', 'payroll') == []
+        assert search(1, 'task', 'quart') == [2]
+
+        execute("DELETE FROM task WHERE id = 2")
+        assert search(1, 'task', 'quart') == []
+
+    def test_results_are_firm_partitioned(self, search, execute):
+        """Test that a firm only finds its own rows."""
+        execute("INSERT INTO task (id, title, firm_id) VALUES (2, 'Existing audit', 2)")
+
+        assert search(1, 'task', 'existing') == [1]
+        assert search(2, 'task', 'existing') == [2]
+        assert search(2, 'project', 'tax') == []
+
+    def test_title_matches_rank_above_description(self, search, execute):
+        """Test that a title match outranks a description match."""
+        execute("INSERT INTO task (id, title, description, firm_id) VALUES (2, 'Review', 'audit notes', 1)")
+        execute("INSERT INTO task (id, title, description, firm_id) VALUES (3, 'Audit', 'review notes', 1)")
+
+        assert search(1, 'task', 'audit') == [3, 2]
+
+    def test_inactive_clients_are_not_indexed(self, search, execute):
+        """Test that only active clients are searchable."""
+        execute("INSERT INTO client (id, name, email, firm_id, is_active) VALUES (1, 'Acme LLC', 'a@acme.com', 1, 1)")
+        execute("INSERT INTO client (id, name, firm_id, is_active) VALUES (2, 'Acme Trust', 1, 0)")
+        assert search(1, 'client', 'acme') == [1]
+
+        execute("UPDATE client SET is_active = 1 WHERE id = 2")
+        assert sorted(search(1, 'client', 'acme')) == [1, 2]
+
+    def test_query_terms_drop_syntax(self):
+        """Test that FTS syntax characters are stripped from the query."""
+        assert query_terms('Smith, "John" OR *') == ['smith', 'john', 'or']
+        assert query_terms('  ') == []
@@ -0,0 +1,141 @@
+"""
+Unit tests for service container lifetimes, constructor injection and disposal.
+Tests singleton, scoped and transient lifetimes under concurrent requests.
+"""
+
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import pytest
+from flask import Flask
+
+from src.shared.di_container import SCOPED, SINGLETON, TRANSIENT, ServiceContainer
+
+
+class Repository:
+    disposed = []
+
+    def dispose(self):
+        Repository.disposed.append(self)
+
+
+class IReportService(ABC):
+    @abstractmethod
+    def build(self):
+        pass
+
+
+class ReportService(IReportService):
+    def __init__(self, repository: Repository, cache: Optional['SharedCache'] = None, page_size=50):
+        self.repository = repository
+        self.cache = cache
+        self.page_size = page_size
+
+    def build(self):
+        return self.page_size
+
+
+class SharedCache:
+    instances = 0
+    lock = threading.Lock()
+
+    def __init__(self):
+        with SharedCache.lock:
+            SharedCache.instances += 1
+
+
+class Unregistered:
+    pass
+
+
+class NeedsUnregistered:
+    def __init__(self, helper: Unregistered):
+        self.helper = helper
+
+
+class First:
+    def __init__(self, second: 'Second'):
+        self.second = second
+
+
+class Second:
+    def __init__(self, first: First):
+        self.first = first
+
+
+@pytest.fixture
+def container():
+    Repository.disposed = []
+    SharedCache.instances = 0
+    container = ServiceContainer()
+    container.register(Repository, lifetime=SCOPED)
+    container.register(SharedCache, lifetime=SINGLETON)
+    container.register(IReportService, ReportService, lifetime=SCOPED)
+    return container
+
+
+@pytest.fixture
+def container_app(container):
+    """App whose request teardown disposes the container's scoped services."""
+    app = Flask(__name__)
+    container.init_app(app)
+    return app
+
+
+class TestServiceContainer:
+    """Test that lifetimes hold under concurrent requests."""
+
+    def test_constructor_injection_from_type_hints(self, container, container_app):
+        """Test that constructors are resolved from type hints, and cycles are reported."""
+        with container_app.app_context():
+            service = container.get(IReportService)
+            assert service.repository is container.get(Repository)
+            assert service.cache is container.get(SharedCache)
+            assert service.page_size == 50
+
+        # Required, unregistered concrete dependencies are built; cycles are reported
+        container.register(NeedsUnregistered, lifetime=TRANSIENT)
+        assert isinstance(container.get(NeedsUnregistered).helper, Unregistered)
+
+        container.register(First)
+        container.register(Second)
+        with pytest.raises(ValueError, match='Circular dependency'):
+            container.get(First)
+
+    def test_concurrent_requests_share_singletons_and_isolate_scopes(self, container, container_app):
+        """Test that concurrent requests share one singleton and get their own scoped services."""
+        barrier = threading.Barrier(8)
+
+        def request(number):
+            with container_app.test_request_context(f'/report/{number}'):
+                barrier.wait()
+                service = container.get(IReportService)
+                again = container.get(IReportService)
+                return id(service), id(again), id(service.repository), id(service.cache)
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(request, range(32)))
+
+        assert SharedCache.instances == 1
+        assert len({cache for _, _, _, cache in results}) == 1
+        for service, again, _, _ in results:
+            assert service == again
+        # Every request got its own repository, and each was disposed at teardown
+        assert len(Repository.disposed) == 32
+        assert len({id(repository) for repository in Repository.disposed}) == 32
+
+    def test_transient_and_explicit_scopes(self, container):
+        """Test transient resolution and explicitly opened scopes."""
+        container.register(Repository, lifetime=TRANSIENT)
+        assert container.get(Repository) is not container.get(Repository)
+
+        container.register(Repository, lifetime=SCOPED)
+        with container.scope():
+            first = container.get(Repository)
+            assert first is container.get(Repository)
+        assert Repository.disposed == [first]
+
+        # No scope open: scoped services resolve like transient ones
+        assert container.get(Repository) is not container.get(Repository)
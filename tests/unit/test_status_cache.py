@@ -0,0 +1,115 @@
+"""
+Unit tests for the in-process workflow status cache.
+Tests that status reads stay off the database until a status write commits.
+"""
+
+import re
+
+import pytest
+from sqlalchemy import event
+
+from src.shared.database.db_import import db
+from src.modules.client.models import Client
+from src.modules.project.models import Project, Task, TaskStatus, WorkType
+from src.modules.project.status_cache import workflow_statuses
+
+STATUS_TABLE = re.compile(r'\b(FROM|JOIN) task_status\b')
+
+
+@pytest.fixture
+def status_cache():
+    """The process-wide cache, emptied so no snapshot outlives the test's rolled-back rows."""
+    workflow_statuses.invalidate()
+    yield workflow_statuses
+    workflow_statuses.invalidate()
+
+
+@pytest.fixture
+def work_type(db_session, test_firm, status_cache):
+    work_type = WorkType(name='Bookkeeping', firm_id=test_firm.id)
+    db_session.add(work_type)
+    db_session.flush()
+    db_session.add_all([
+        TaskStatus(name='Intake', firm_id=test_firm.id, work_type_id=work_type.id, position=1, is_default=True),
+        TaskStatus(name='Review', firm_id=test_firm.id, work_type_id=work_type.id, position=2, color='#f59e0b'),
+        TaskStatus(name='Filed', firm_id=test_firm.id, work_type_id=work_type.id, position=3, is_terminal=True)
+    ])
+    db_session.commit()
+    return work_type
+
+
+@pytest.fixture
+def statuses(db_session, work_type):
+    """Intake, Review and Filed, by name."""
+    return {status.name: status for status in TaskStatus.query.filter_by(work_type_id=work_type.id)}
+
+
+@pytest.fixture
+def status_queries():
+    queries = []
+
+    def count_query(conn, cursor, statement, *args):
+        if STATUS_TABLE.search(statement):
+            queries.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', count_query)
+    yield queries
+    event.remove(db.engine, 'before_cursor_execute', count_query)
+
+
+class TestStatusCache:
+    """Test that status reads stay off the database until a status write commits."""
+
+    def test_warm_reads_issue_no_status_queries(self, db_session, test_firm, work_type, statuses,
+                                                status_cache, status_queries):
+        """Test that status lookups on projects and tasks are served from the snapshot."""
+        client = Client(name='Globex', firm_id=test_firm.id)
+        db_session.add(client)
+        db_session.flush()
+        project = Project(name='2024 Books', client_id=client.id, firm_id=test_firm.id,
+                          work_type_id=work_type.id, current_status_id=statuses['Review'].id)
+        db_session.add(project)
+        db_session.flush()
+        task = Task(title='Review books', firm_id=test_firm.id, project_id=project.id,
+                    status_id=statuses['Review'].id)
+        db_session.add(task)
+        db_session.commit()
+
+        filed_id, work_type_id, firm_id = statuses['Filed'].id, work_type.id, test_firm.id
+        status_cache.snapshot()
+        project = db_session.get(Project, project.id)
+        task = db_session.get(Task, task.id)
+        status_queries.clear()
+
+        assert project.current_workflow_status_name == 'Review'
+        assert (task.current_status, task.status_color, task.is_completed) == ('Review', '#f59e0b', False)
+        assert [status.name for status in project.workflow_statuses] == ['Intake', 'Review', 'Filed']
+        assert status_cache.terminal_for(work_type_id).id == filed_id
+        assert [column['title'] for column in status_cache.columns_for_firm(firm_id)
+                if column['work_type'] == 'Bookkeeping'] == ['Intake', 'Review', 'Filed']
+        assert status_queries == []
+
+    def test_committed_status_writes_reload_the_snapshot(self, db_session, work_type, statuses, status_cache):
+        """Test that committed renames and bulk updates reach the cache."""
+        review = statuses['Review']
+        assert status_cache.get(review.id).name == 'Review'
+
+        review.name = 'Partner review'
+        db_session.commit()
+        assert status_cache.get(review.id).name == 'Partner review'
+
+        TaskStatus.query.filter_by(work_type_id=work_type.id).update({'is_default': False})
+        db_session.commit()
+        assert status_cache.default_for(work_type.id).id == statuses['Intake'].id
+        assert not any(status.is_default for status in status_cache.for_work_type(work_type.id))
+
+    def test_rolled_back_statuses_leave_the_cache(self, db_session, test_firm, work_type, status_cache):
+        """Test that a status seen before a rollback is gone after it."""
+        archived = TaskStatus(name='Archived', firm_id=test_firm.id, work_type_id=work_type.id, position=4)
+        db_session.add(archived)
+        db_session.flush()
+        archived_id = archived.id
+        assert status_cache.get(archived_id).name == 'Archived'
+
+        db_session.rollback()
+        assert status_cache.get(archived_id) is None
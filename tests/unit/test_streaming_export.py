@@ -0,0 +1,129 @@
+"""
+Unit tests for streaming CSV/JSON export helpers.
+Tests chunked encoding, column selection and the export routes' column lists.
+"""
+
+import csv
+import io
+import json
+from datetime import date, datetime
+from unittest.mock import patch
+
+import pytest
+from flask import session
+
+from src.models.auth import Firm
+from src.modules.client.models import Client
+from src.modules.export.routes import export_projects
+from src.modules.export.service import ExportService
+from src.modules.project.models import Project
+from src.modules.project.repository import ProjectRepository
+from src.modules.project.service import ProjectService
+from src.shared.utils.streaming_export import (
+    ExportColumn, iter_csv, iter_json, parse_column_list, select_export_columns
+)
+
+
+@pytest.fixture
+def rows():
+    return [
+        (i, f'Task, "{i}"', date(2024, 1, 1), datetime(2024, 1, 1, 9, 30), None)
+        for i in range(500)
+    ]
+
+
+@pytest.fixture
+def export_firm(db_session):
+    """Firm with one completed project, exported through a real ExportService."""
+    firm = Firm(name='Acme CPA', access_code='ACME')
+    db_session.add(firm)
+    db_session.flush()
+    client = Client(name='Client A', firm_id=firm.id)
+    db_session.add(client)
+    db_session.flush()
+    db_session.add(Project(name='2024 Return', client_id=client.id, firm_id=firm.id,
+                           start_date=date(2024, 1, 2), completion_date=date(2024, 4, 15),
+                           status='Completed'))
+    db_session.flush()
+
+    service = ExportService(ProjectService(ProjectRepository()), object(), object(), job_store=object())
+    with patch('src.modules.export.routes.get_service', return_value=service):
+        yield firm
+
+
+class TestStreamingExport:
+    """Test chunked encoding of export rows."""
+
+    def test_csv_is_chunked_and_complete(self, rows):
+        """Test that CSV output arrives in several chunks and parses back whole."""
+        chunks = list(iter_csv(['ID', 'Title', 'Due Date', 'Created At', 'Hours'], iter(rows),
+                               flush_bytes=1024))
+
+        assert len(chunks) > 1
+        parsed = list(csv.reader(io.StringIO(''.join(chunks))))
+        assert parsed[0] == ['ID', 'Title', 'Due Date', 'Created At', 'Hours']
+        assert parsed[1] == ['0', 'Task, "0"', '2024-01-01', '2024-01-01 09:30', '']
+        assert len(parsed) == 501
+
+    def test_json_is_a_single_valid_document(self, rows):
+        """Test that JSON chunks join into one document."""
+        keys = ['id', 'title', 'due_date', 'created_at', 'hours']
+        chunks = list(iter_json({'firm_id': 7}, 'tasks', keys, iter(rows), flush_bytes=1024))
+
+        assert len(chunks) > 1
+        document = json.loads(''.join(chunks))
+        assert document['firm_id'] == 7
+        assert len(document['tasks']) == 500
+        assert document['tasks'][0]['due_date'] == '2024-01-01'
+
+    def test_json_with_no_rows(self):
+        """Test that an empty export is still a valid document."""
+        document = json.loads(''.join(iter_json({'firm_id': 7}, 'tasks', ['id'], iter([]))))
+        assert document == {'firm_id': 7, 'tasks': []}
+
+    def test_column_selection(self):
+        """Test parsing and validating requested column lists."""
+        available = [ExportColumn('id', 'ID', None), ExportColumn('title', 'Title', None)]
+
+        assert parse_column_list(' title, id ,') == ['title', 'id']
+        assert parse_column_list('') is None
+        assert [c.key for c in select_export_columns(available, ['title', 'id'])] == ['title', 'id']
+        assert select_export_columns(available, None) == available
+        with pytest.raises(ValueError):
+            select_export_columns(available, ['bogus'])
+
+
+class TestExportRoutes:
+    """Test the default CSV layout and that bad column lists are client errors."""
+
+    def export(self, app, firm, format, query=''):
+        with app.test_request_context(f'/export/projects/{format}{query}'):
+            session['firm_id'] = firm.id
+            response = export_projects(format)
+        if isinstance(response, tuple):
+            response, status = response
+            response.status_code = status
+        return response
+
+    def test_csv_keeps_its_original_columns(self, app, export_firm):
+        """Test that CSV keeps its original columns and JSON has every column."""
+        response = self.export(app, export_firm, 'csv')
+        assert response.status_code == 200
+
+        rows = list(csv.reader(io.StringIO(response.get_data(as_text=True))))
+        assert rows[0] == ['ID', 'Name', 'Description', 'Status', 'Start Date', 'End Date',
+                           'Client', 'Created At']
+        assert rows[1][1:7] == ['2024 Return', '', 'Completed', '2024-01-02', '2024-04-15', 'Client A']
+
+        # JSON keeps every exportable column
+        document = json.loads(self.export(app, export_firm, 'json').get_data(as_text=True))
+        assert 'priority' in document['projects'][0]
+
+    def test_unknown_columns_are_a_bad_request(self, app, export_firm):
+        """Test that an unknown column is a 400 and known ones pick the layout."""
+        response = self.export(app, export_firm, 'csv', '?columns=name,bogus')
+        assert response.status_code == 400
+        assert 'bogus' in response.get_json()['error']
+
+        response = self.export(app, export_firm, 'csv', '?columns=status,name')
+        assert response.get_data(as_text=True).splitlines()[:2] == ['Status,Name', 'Completed,2024 Return']
@@ -0,0 +1,87 @@
+"""
+Unit tests for the subtask closure table.
+Tests that subtask create, convert and delete keep ancestry rows exact.
+"""
+
+import pytest
+
+from src.modules.project.models import Task, TaskClosure
+from src.modules.project.task_closure import rebuild
+from src.modules.project.task_repository import TaskRepository
+from src.modules.project.task_service import TaskService
+
+
+@pytest.fixture
+def service():
+    return TaskService(TaskRepository())
+
+
+@pytest.fixture
+def roots(db_session, test_firm):
+    roots = [Task(title='Year-end close', firm_id=test_firm.id), Task(title='Payroll', firm_id=test_firm.id)]
+    db_session.add_all(roots)
+    db_session.commit()
+    return roots
+
+
+@pytest.fixture
+def root(roots):
+    return roots[0]
+
+
+@pytest.fixture
+def other_root(roots):
+    return roots[1]
+
+
+@pytest.fixture
+def add_subtask(db_session, service, test_user):
+    def add_subtask(parent, title):
+        result = service.create_subtask(parent.id, title, '', user_id=test_user.id)
+        return db_session.get(Task, result['subtask']['id'])
+    return add_subtask
+
+
+def closure_rows(session):
+    return sorted(session.query(TaskClosure.ancestor_id, TaskClosure.descendant_id, TaskClosure.depth))
+
+
+class TestTaskClosure:
+    """Test that subtask create, convert and delete keep ancestry rows exact."""
+
+    def test_nested_subtasks_answer_ancestry_queries(self, root, add_subtask):
+        """Test root, level and recursive subtask lookups from closure rows."""
+        child = add_subtask(root, 'Reconcile accounts')
+        grandchild = add_subtask(child, 'Bank statements')
+
+        assert grandchild.root_task == root
+        assert grandchild.task_hierarchy_level == 2
+        assert root.task_hierarchy_level == 0
+        assert root.get_all_subtasks_recursive() == [child, grandchild]
+
+    def test_convert_moves_the_whole_subtree_and_rejects_cycles(self, db_session, test_user, service,
+                                                               root, other_root, add_subtask):
+        """Test that converting moves descendants along and cycles are refused."""
+        child = add_subtask(root, 'Reconcile accounts')
+        grandchild = add_subtask(child, 'Bank statements')
+
+        result = service.convert_to_subtask(root.id, grandchild.id, user_id=test_user.id)
+        assert result[1] == 400
+
+        service.convert_to_subtask(child.id, other_root.id, user_id=test_user.id)
+        assert grandchild.root_task == other_root
+        assert root.get_all_subtasks_recursive() == []
+        assert other_root.get_all_subtasks_recursive() == [child, grandchild]
+
+        maintained = closure_rows(db_session)
+        rebuild()
+        assert closure_rows(db_session) == maintained
+
+    def test_delete_removes_the_subtree_rows(self, db_session, test_firm, test_user, service, root, add_subtask):
+        """Test that deleting a subtask removes its subtree's rows only."""
+        child = add_subtask(root, 'Reconcile accounts')
+        add_subtask(child, 'Bank statements')
+        accruals = add_subtask(root, 'Accruals')
+
+        service.delete_task(child.id, firm_id=test_firm.id, user_id=test_user.id)
+        assert [row[:2] for row in closure_rows(db_session)] == [(root.id, accruals.id)]
@@ -0,0 +1,102 @@
+"""
+Unit tests for bulk template-to-project instantiation.
+Tests offset due dates, remapped dependencies and firm-scoped clients.
+"""
+
+import pytest
+from datetime import date
+
+from src.models.auth import Firm
+from src.modules.client.models import Client
+from src.modules.project.models import Project, Task, Template, TemplateTask
+from src.modules.project.repository import ProjectRepository
+from src.modules.project.service import ProjectService
+from src.shared.exceptions import NotFoundError
+
+
+@pytest.fixture
+def clients(db_session, test_firm):
+    clients = [Client(name='Globex', firm_id=test_firm.id), Client(name='Initech', firm_id=test_firm.id)]
+    db_session.add_all(clients)
+    db_session.flush()
+    return clients
+
+
+@pytest.fixture
+def template(db_session, test_firm, test_user, clients):
+    """Three-task template whose later tasks depend on the earlier ones."""
+    template = Template(name='Tax Return Workflow', firm_id=test_firm.id, task_dependency_mode=True)
+    db_session.add(template)
+    db_session.flush()
+    collect = TemplateTask(title='Collect documents', order=0, template_id=template.id, days_from_start=0)
+    db_session.add(collect)
+    db_session.flush()
+    prepare = TemplateTask(title='Prepare return', order=1, template_id=template.id, days_from_start=14,
+                           default_priority='High', default_assignee_id=test_user.id,
+                           dependencies=str(collect.id))
+    db_session.add(prepare)
+    db_session.flush()
+    db_session.add(TemplateTask(title='Partner review', order=2, template_id=template.id, days_from_start=21,
+                                dependencies=f'{collect.id},{prepare.id}'))
+    db_session.commit()
+    return template
+
+
+@pytest.fixture
+def service():
+    return ProjectService(ProjectRepository())
+
+
+class TestTemplateInstantiation:
+    """Test that templates expand into projects, tasks and dependency links."""
+
+    def test_projects_get_offset_due_dates_and_remapped_dependencies(self, db_session, test_firm, test_user,
+                                                                     service, template, clients):
+        """Test that each project gets its own tasks, due dates and dependency ids."""
+        globex, initech = clients
+        created = service.create_projects_from_template(template.id, [
+            {'name': '2024 Return - Globex', 'client_id': globex.id, 'start_date': date(2024, 3, 1)},
+            {'name': '2024 Return - Initech', 'client_id': initech.id, 'start_date': date(2024, 3, 4),
+             'due_date': date(2024, 4, 15)}
+        ], firm_id=test_firm.id, user_id=test_user.id)
+
+        assert [project['due_date'] for project in created] == [date(2024, 3, 22), date(2024, 4, 15)]
+        for project in created:
+            stored = db_session.get(Project, project['id'])
+            assert (stored.template_origin_id, stored.task_count, stored.completed_task_count) == (template.id, 3, 0)
+
+            tasks = Task.query.filter_by(project_id=project['id']).order_by(Task.id).all()
+            collect, prepare, review = tasks
+            assert [(task.due_date - stored.start_date).days for task in tasks] == [0, 14, 21]
+            assert (prepare.priority, prepare.assignee_id) == ('High', test_user.id)
+            assert prepare.dependencies == str(collect.id)
+            assert review.dependencies == f'{collect.id},{prepare.id}'
+
+    def test_single_project_resolves_client_by_name(self, db_session, test_firm, test_user,
+                                                    service, template, clients):
+        """Test that a single project finds its client by name within the firm."""
+        result = service.create_project_from_template(
+            template.id, 'Initech', '2024 Return', date(2024, 3, 1), priority='High',
+            firm_id=test_firm.id, user_id=test_user.id
+        )
+        assert result['success']
+        project = db_session.get(Project, result['project']['id'])
+        assert (project.client_id, project.priority, project.task_dependency_mode) == \
+            (clients[1].id, 'High', False)
+        assert Task.query.filter_by(project_id=project.id).count() == 3
+
+    def test_foreign_client_creates_nothing(self, db_session, test_firm, test_user, service, template, clients):
+        """Test that one foreign client fails the whole batch."""
+        other_firm = Firm(name='Other CPA', access_code='OTHER')
+        db_session.add(other_firm)
+        db_session.flush()
+        hooli = Client(name='Hooli', firm_id=other_firm.id)
+        db_session.add(hooli)
+        db_session.commit()
+
+        with pytest.raises(NotFoundError):
+            service.create_projects_from_template(template.id, [
+                {'name': 'Globex', 'client_id': clients[0].id, 'start_date': date(2024, 3, 1)},
+                {'name': 'Hooli', 'client_id': hooli.id, 'start_date': date(2024, 3, 1)}
+            ], firm_id=test_firm.id, user_id=test_user.id)
+        assert Project.query.filter_by(template_origin_id=template.id).count() == 0
@@ -0,0 +1,129 @@
+"""
+Unit tests for per-firm lane accounting used by fair Celery routing.
+Tests pending/in-flight counters, concurrency caps and task deferral.
+"""
+
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from src.shared.utils.tenant_queues import TenantQueueTracker, INTERACTIVE_LANE, BATCH_LANE
+
+try:
+    from celery.exceptions import Retry
+    from src.workers import ai_worker, fair_routing
+    WORKERS_AVAILABLE = True
+except (ImportError, SyntaxError):
+    # src.workers imports every worker module on package import
+    WORKERS_AVAILABLE = False
+
+
+@pytest.fixture
+def tracker(fake_redis):
+    return TenantQueueTracker(
+        fake_redis,
+        concurrency={INTERACTIVE_LANE: 0, BATCH_LANE: 2},
+        overrides={'7': {BATCH_LANE: 5}}
+    )
+
+
+@pytest.fixture
+def batch_cap_of_two(fake_redis):
+    """Global tracker settings with a batch cap of two for every firm."""
+    with patch('src.shared.utils.tenant_queues.DEFAULT_TENANT_CONCURRENCY', {BATCH_LANE: 2}), \
+            patch('src.shared.utils.tenant_queues.TENANT_CONCURRENCY_OVERRIDES', {}):
+        yield
+
+
+class TestTenantQueueTracker:
+    """Test lane/firm pending and in-flight counters."""
+
+    def test_depths_per_firm_and_lane(self, tracker):
+        """Test that depths are reported per lane and firm."""
+        tracker.record_enqueued(BATCH_LANE, 1, count=10)
+        tracker.record_enqueued(INTERACTIVE_LANE, 2)
+        assert tracker.record_started(BATCH_LANE, 1, count=10) == 1
+
+        depths = tracker.get_depths()
+        assert depths['success']
+        assert depths['lanes'][BATCH_LANE]['firms']['1'] == {
+            'pending': 0, 'inflight': 1, 'concurrency_cap': 2
+        }
+        assert depths['lanes'][INTERACTIVE_LANE]['pending'] == 1
+
+        tracker.record_finished(BATCH_LANE, 1)
+        assert '1' not in tracker.get_depths()['lanes'][BATCH_LANE]['firms']
+
+    def test_concurrency_caps_and_overrides(self, tracker):
+        """Test default caps, per-firm overrides and unlimited lanes."""
+        for _ in range(3):
+            tracker.record_started(BATCH_LANE, 1)
+            tracker.record_started(BATCH_LANE, 7)
+
+        assert tracker.is_over_capacity(BATCH_LANE, 1)
+        assert not tracker.is_over_capacity(BATCH_LANE, 7)
+        assert not tracker.is_over_capacity(INTERACTIVE_LANE, 1, inflight=100)
+
+    def test_simultaneous_starts_get_distinct_counts(self, tracker):
+        """Test that only starts past the cap are over it."""
+        # Decided from each start's own count, only starts past the cap are over it
+        counts = [tracker.record_started(BATCH_LANE, 1) for _ in range(5)]
+        assert counts == [1, 2, 3, 4, 5]
+        assert [tracker.is_over_capacity(BATCH_LANE, 1, inflight=count) for count in counts] == \
+            [False, False, True, True, True]
+
+    def test_finished_never_goes_negative(self, tracker):
+        """Test that releasing an unknown slot leaves the count at zero."""
+        tracker.record_finished(BATCH_LANE, 3)
+        assert tracker.get_inflight(BATCH_LANE, 3) == 0
+
+
+@pytest.mark.skipif(not WORKERS_AVAILABLE, reason='src.workers does not import')
+class TestFairRoutingDeferral:
+    """Test that tasks starting together defer only past the firm's cap."""
+
+    def test_simultaneous_starts_defer_only_the_overflow(self, batch_cap_of_two):
+        """Test that the third and later starts defer."""
+        headers = fair_routing.fair_options(BATCH_LANE, 1)['headers']
+        tasks = [SimpleNamespace(request=SimpleNamespace(headers=dict(headers))) for _ in range(5)]
+
+        # Every task starts before any of them checks its cap
+        for task in tasks:
+            fair_routing._track_started(task=task)
+        deferred = [fair_routing.should_defer(task.request) for task in tasks]
+
+        assert deferred == [False, False, True, True, True]
+
+    def test_no_count_means_no_deferral(self):
+        """Test that a task that never started is not deferred."""
+        request = SimpleNamespace(headers=fair_routing.fair_options(BATCH_LANE, 1)['headers'])
+        assert not fair_routing.should_defer(request)
+
+    def test_large_batch_chunks_are_throttled(self, batch_cap_of_two):
+        """Test that chunks of a large batch are checked against the firm's cap."""
+        documents = [(document_id, f'doc{document_id}.pdf', f'/tmp/doc{document_id}.pdf', 7, 1)
+                     for document_id in range(120)]
+
+        with patch.object(ai_worker, 'chord') as chord, \
+                patch.object(ai_worker, 'BatchProgressTracker'):
+            ai_worker._dispatch_analysis_batch(documents, checklist_id=7, firm_id=1)
+        header = chord.call_args[0][0]
+
+        # Every chunk message is a cap-checking task in the firm's batch lane
+        assert {signature.task for signature in header} == {ai_worker.analyze_document_chunk.name}
+        assert sum(signature.options['headers'][fair_routing.ITEMS_HEADER] for signature in header) == 120
+        assert {signature.options['headers'][fair_routing.LANE_HEADER] for signature in header} == {BATCH_LANE}
+
+        # A chunk starting while the firm is at its cap is deferred before analyzing anything
+        chunk = header[0]
+        ai_worker.analyze_document_chunk.push_request(headers=dict(chunk.options['headers']))
+        try:
+            with patch.object(ai_worker, 'analyze_document_item') as analyze_item:
+                for _ in range(3):
+                    fair_routing._track_started(task=ai_worker.analyze_document_chunk)
+                with pytest.raises(Retry):
+                    ai_worker.analyze_document_chunk(*chunk.args)
+        finally:
+            ai_worker.analyze_document_chunk.pop_request()
+
+        analyze_item.assert_not_called()
@@ -0,0 +1,76 @@
+"""
+Unit tests for the aggregated user directory.
+Tests that user listings count tasks in one grouped query and page by cursor.
+"""
+
+import pytest
+from datetime import date, timedelta
+
+from sqlalchemy import event
+
+from src.shared.database.db_import import db
+from src.models.auth import Firm, User
+from src.modules.auth.firm_repository import FirmRepository
+from src.modules.auth.repository import UserRepository
+from src.modules.auth.service import AuthService
+from src.modules.project.models import Task
+from src.shared.exceptions import ValidationError
+
+
+@pytest.fixture
+def firm(db_session):
+    """Firm with three users, one of them holding open, overdue and completed tasks."""
+    firm, other_firm = Firm(name='Acme CPA', access_code='ACME'), Firm(name='Other CPA', access_code='OTHER')
+    db_session.add_all([firm, other_firm])
+    db_session.flush()
+    dana, alex = User(name='Dana', firm_id=firm.id), User(name='Alex', firm_id=firm.id, role='Admin')
+    db_session.add_all([dana, alex, User(name='Casey', firm_id=firm.id), User(name='Blake', firm_id=other_firm.id)])
+    db_session.flush()
+    yesterday = date.today() - timedelta(days=1)
+    db_session.add_all([
+        Task(title='Open', firm_id=firm.id, assignee_id=dana.id),
+        Task(title='Overdue', firm_id=firm.id, assignee_id=dana.id, due_date=yesterday),
+        Task(title='Done late', firm_id=firm.id, assignee_id=dana.id, due_date=yesterday, status='Completed'),
+        Task(title='Alex open', firm_id=firm.id, assignee_id=alex.id)
+    ])
+    db_session.commit()
+    return firm
+
+
+@pytest.fixture
+def service():
+    return AuthService(FirmRepository(), UserRepository())
+
+
+class TestUserDirectory:
+    """Test that user listings count tasks in one grouped query."""
+
+    def test_counts_come_from_one_query(self, firm, service):
+        """Test that the firm's users and their task counts are read in one SELECT."""
+        firm_id = firm.id
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            users = service.get_users_by_firm(firm_id)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+
+        assert len([statement for statement in statements if statement.startswith('SELECT')]) == 1
+        assert [user['name'] for user in users] == ['Alex', 'Casey', 'Dana']
+        dana = users[2]
+        assert (dana['task_count'], dana['open_task_count'], dana['overdue_task_count'],
+                dana['completed_task_count']) == (3, 2, 1, 1)
+        assert users[1]['task_count'] == 0
+
+    def test_cursor_pages_cover_every_user_once(self, firm, service):
+        """Test that cursor pages walk the directory without gaps or repeats."""
+        first = service.get_user_directory_page(firm.id, limit=2)
+        assert [user['name'] for user in first['users']] == ['Alex', 'Casey']
+
+        second = service.get_user_directory_page(firm.id, cursor=first['next_cursor'], limit=2)
+        assert [user['name'] for user in second['users']] == ['Dana']
+        assert second['next_cursor'] is None
+
+        with pytest.raises(ValidationError):
+            service.get_user_directory_page(firm.id, cursor='not-a-cursor')
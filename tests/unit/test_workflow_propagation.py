@@ -0,0 +1,122 @@
+"""
+Unit tests for set-based task status propagation from project workflow events.
+Tests single-statement task updates and cache invalidation after the commit.
+"""
+
+import asyncio
+from datetime import date
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import event
+
+from src.shared.database.db_import import db
+from src.modules.client.models import Client
+from src.modules.project.event_handlers import (
+    ProjectCompletionTaskUpdateHandler, ProjectWorkflowTaskUpdateHandler
+)
+from src.modules.project.models import Project, Task, TaskStatus, WorkType
+from src.shared.events.schemas import ProjectCompletedEvent, ProjectWorkflowAdvancedEvent
+
+
+@pytest.fixture
+def work_type(db_session, test_firm):
+    """Work type with four workflow steps."""
+    work_type = WorkType(name='Payroll', firm_id=test_firm.id)
+    db_session.add(work_type)
+    db_session.flush()
+    db_session.add_all([TaskStatus(name=f'Step {position}', firm_id=test_firm.id, work_type_id=work_type.id,
+                                   position=position) for position in range(1, 5)])
+    db_session.flush()
+    return work_type
+
+
+@pytest.fixture
+def step_ids(db_session, work_type):
+    return [status_id for (status_id,) in
+            db_session.query(TaskStatus.id).filter_by(work_type_id=work_type.id).order_by(TaskStatus.position)]
+
+
+@pytest.fixture
+def project(db_session, test_firm, work_type):
+    client = Client(name='Globex', firm_id=test_firm.id)
+    db_session.add(client)
+    db_session.flush()
+    project = Project(name='2024 Payroll', client_id=client.id, firm_id=test_firm.id, work_type_id=work_type.id)
+    db_session.add(project)
+    db_session.flush()
+    db_session.add_all([Task(title=f'Step {number}', firm_id=test_firm.id, project_id=project.id)
+                        for number in range(1, 5)])
+    db_session.commit()
+    return project
+
+
+def task_statuses(session, project_id):
+    return [status for (status,) in
+            session.query(Task.status).filter_by(project_id=project_id).order_by(Task.id)]
+
+
+def handle(handler, event_):
+    return asyncio.run(handler.handle(event_))
+
+
+class TestWorkflowPropagation:
+    """Test that workflow moves rewrite task statuses without loading tasks."""
+
+    def test_workflow_move_is_one_task_update(self, db_session, test_firm, work_type, step_ids, project):
+        """Test that advancing the workflow updates every task in one statement."""
+        project_id, work_type_id = project.id, work_type.id
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            handled = handle(ProjectWorkflowTaskUpdateHandler(), ProjectWorkflowAdvancedEvent(
+                project_id=project_id, project_name='2024 Payroll', firm_id=test_firm.id,
+                old_status_id=step_ids[0], new_status_id=step_ids[2],
+                old_status_name='Step 1', new_status_name='Step 3', work_type_id=work_type_id, user_id=None
+            ))
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+
+        assert handled
+        assert task_statuses(db_session, project_id) == ['Completed', 'Completed', 'In Progress', 'Not Started']
+        assert len([s for s in statements if s.startswith('UPDATE task ')]) == 1
+        assert not [s for s in statements if s.startswith('SELECT task.id AS task_id')]
+
+        project = db_session.get(Project, project_id)
+        assert (project.task_count, project.completed_task_count) == (4, 2)
+
+    def test_project_completion_completes_every_task(self, db_session, test_firm, work_type, project):
+        """Test that completing the project completes all of its tasks."""
+        project_id = project.id
+        handle(ProjectCompletionTaskUpdateHandler(), ProjectCompletedEvent(
+            project_id=project_id, project_name='2024 Payroll', firm_id=test_firm.id,
+            work_type_id=work_type.id, user_id=None
+        ))
+
+        assert task_statuses(db_session, project_id) == ['Completed'] * 4
+        assert db_session.get(Project, project_id).completed_task_count == 4
+
+    def test_cached_views_are_dropped_after_the_commit(self, db_session, test_firm, work_type, project):
+        """Test that calendar and Kanban caches are invalidated only after the commit."""
+        project_id, work_type_id, firm_id = project.id, work_type.id, test_firm.id
+        second_task = db_session.query(Task.id).filter_by(project_id=project_id).order_by(Task.id)[1].id
+        db_session.query(Task).filter_by(id=second_task).update({'due_date': date(2024, 4, 15)})
+        db_session.commit()
+        order = []
+        # Inside the test transaction a session commit releases a savepoint
+        listener = lambda conn, name, context: order.append('commit')
+        event.listen(db.engine, 'release_savepoint', listener)
+        try:
+            with patch('src.modules.project.calendar_provider.calendar_cache') as calendar_cache, \
+                    patch('src.modules.project.kanban_provider.kanban_cache') as kanban_cache:
+                calendar_cache.invalidate_dates.side_effect = lambda firm_id, dates: order.append(('calendar', dates))
+                kanban_cache.invalidate.side_effect = lambda firm_id: order.append(('kanban', firm_id))
+                handle(ProjectCompletionTaskUpdateHandler(), ProjectCompletedEvent(
+                    project_id=project_id, project_name='2024 Payroll', firm_id=firm_id,
+                    work_type_id=work_type_id, user_id=None
+                ))
+        finally:
+            event.remove(db.engine, 'release_savepoint', listener)
+
+        assert order == ['commit', ('calendar', {date(2024, 4, 15)}), ('kanban', firm_id)]